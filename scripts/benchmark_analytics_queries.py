@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark the ArangoDB analytics APIs with AQL profiling enabled.
+
+Seeds a scratch database with synthetic module communications, conversations
+and messages, runs every analytics API repeatedly through an AQLQueryProfiler
+and prints (or writes) the per-API execution statistics so regressions show
+up when comparing runs.
+
+Usage:
+    python scripts/benchmark_analytics_queries.py --communications 50000 --runs 20
+    python scripts/benchmark_analytics_queries.py --output analytics_profile.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from granger_hub.core.storage.arango_conversation import ArangoConversationStore
+from granger_hub.core.storage.graph_backend import ArangoGraphBackend
+from granger_hub.core.storage.query_profiler import AQLQueryProfiler
+
+load_dotenv()
+
+MODULES = [f"module_{i}" for i in range(20)]
+ACTIONS = ["process", "analyze", "store", "fetch", "validate", "transform"]
+
+
+def seed(backend: ArangoGraphBackend, store: ArangoConversationStore,
+         communications: int, conversations: int, messages_per_conversation: int):
+    """Bulk insert synthetic analytics data."""
+    now = datetime.now()
+    backend.db.collection("modules").import_bulk(
+        [{"_key": m, "name": m, "capabilities": []} for m in MODULES],
+        on_duplicate="ignore"
+    )
+
+    edges = []
+    for _ in range(communications):
+        source, target = random.sample(MODULES, 2)
+        edges.append({
+            "_from": f"modules/{source}",
+            "_to": f"modules/{target}",
+            "action": random.choice(ACTIONS),
+            "timestamp": (now - timedelta(minutes=random.randint(0, 60 * 24 * 60))).isoformat(),
+            "success": random.random() > 0.1,
+            "duration_ms": random.uniform(1, 500)
+        })
+    backend.db.collection("communications").import_bulk(edges, batch_size=10000)
+
+    convs, msgs = [], []
+    for c in range(conversations):
+        participants = random.sample(MODULES, 2)
+        conv_id = f"bench_conv_{c}"
+        convs.append({
+            "_key": conv_id,
+            "participants": participants,
+            "topic": f"benchmark topic {c}",
+            "started_at": now.isoformat(),
+            "last_message_at": now.isoformat(),
+            "message_count": messages_per_conversation,
+            "status": random.choice(["active", "completed", "archived"])
+        })
+        for seq in range(1, messages_per_conversation + 1):
+            sender, receiver = participants if seq % 2 else participants[::-1]
+            msgs.append({
+                "id": f"{conv_id}_msg_{seq}",
+                "conversation_id": conv_id,
+                "sender": sender,
+                "receiver": receiver,
+                "action": random.choice(ACTIONS),
+                "content": {},
+                "timestamp": now.isoformat(),
+                "sequence": seq
+            })
+    store.db.collection("conversations").import_bulk(convs, on_duplicate="replace")
+    store.db.collection("messages").import_bulk(msgs, batch_size=10000, on_duplicate="replace")
+
+
+async def run(args):
+    profiler = AQLQueryProfiler()
+    config = {
+        "host": args.host,
+        "port": args.port,
+        "username": os.getenv("ARANGO_USER", "root"),
+        "password": os.getenv("ARANGO_PASSWORD", ""),
+        "database": args.database
+    }
+    backend = ArangoGraphBackend(**config, profiler=profiler)
+    store = ArangoConversationStore(**config, profiler=profiler)
+    await backend.initialize()
+    await store.initialize()
+
+    if not args.skip_seed:
+        seed(backend, store, args.communications, args.conversations, args.messages)
+
+    since = datetime.now() - timedelta(days=30)
+    for _ in range(args.runs):
+        module = random.choice(MODULES)
+        await backend.get_communication_stats(start_time=since)
+        await backend.get_module_communication_summary(module, start_time=since)
+        await store.get_module_conversation_stats(module)
+        await store.get_conversation_analytics()
+
+    report = {
+        "generated_at": datetime.now().isoformat(),
+        "dataset": {
+            "communications": args.communications,
+            "conversations": args.conversations,
+            "messages_per_conversation": args.messages
+        },
+        "queries": profiler.summary()
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output)
+        print(f"Wrote profile to {args.output}")
+    else:
+        print(output)
+
+    await backend.close()
+    await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile ArangoDB analytics queries")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=8529)
+    parser.add_argument("--database", default="granger_benchmark")
+    parser.add_argument("--communications", type=int, default=20000)
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=10, help="Messages per conversation")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse existing data")
+    parser.add_argument("--output", help="Write JSON report to this file")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
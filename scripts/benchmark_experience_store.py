@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Benchmark the RL experience store.
+
+Writes synthetic experiences through log_experience, log_experiences and
+ExperienceWriter, then reports rows/sec for loading them back as Experience
+objects and as stacked arrays. A JSON-text baseline mirroring the previous
+storage format is included for comparison.
+
+Usage:
+    python scripts/benchmark_experience_store.py --rows 100000 --dim 20
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import granger_hub.rl.experience_collection as experience_collection
+from granger_hub.rl.experience_collection import (
+    ExperienceWriter,
+    close_experience_db,
+    load_experience_arrays,
+    load_experiences,
+    log_experience,
+    log_experiences
+)
+
+DECISION_TYPE = "module_selection"
+
+
+def rate(rows: int, seconds: float) -> float:
+    return rows / seconds if seconds > 0 else float("inf")
+
+
+def json_baseline(path: Path, states: np.ndarray, single_rows: int):
+    """Per-row connection and JSON states, as the store worked before."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE experiences (state TEXT, next_state TEXT, action TEXT, reward REAL)")
+    conn.commit()
+    conn.close()
+
+    start = time.perf_counter()
+    for state in states[:single_rows]:
+        conn = sqlite3.connect(path)
+        conn.execute("INSERT INTO experiences VALUES (?, ?, ?, ?)",
+                     (json.dumps(state.tolist()), json.dumps(state.tolist()), '"marker"', 1.0))
+        conn.commit()
+        conn.close()
+    write_seconds = time.perf_counter() - start
+
+    conn = sqlite3.connect(path)
+    conn.executemany("INSERT INTO experiences VALUES (?, ?, ?, ?)",
+                     ((json.dumps(s.tolist()), json.dumps(s.tolist()), '"marker"', 1.0)
+                      for s in states[single_rows:]))
+    conn.commit()
+    start = time.perf_counter()
+    rows = conn.execute("SELECT state, next_state, action, reward FROM experiences").fetchall()
+    loaded = [(np.array(json.loads(s)), np.array(json.loads(n)), json.loads(a), r)
+              for s, n, a, r in rows]
+    load_seconds = time.perf_counter() - start
+    conn.close()
+    return {
+        "write_rows_per_second": rate(single_rows, write_seconds),
+        "load_rows_per_second": rate(len(loaded), load_seconds)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the RL experience store")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=20)
+    parser.add_argument("--single-rows", type=int, default=2_000,
+                        help="Rows written one at a time with log_experience")
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    states = rng.random((args.rows, args.dim)).astype(np.float32)
+    actions = rng.choice(["marker", "arangodb", "sparta", "arxiv"], size=args.rows)
+    rewards = rng.normal(size=args.rows)
+    single = min(args.single_rows, args.rows)
+    writer_rows = (args.rows - single) // 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        experience_collection.EXPERIENCE_DB_PATH = Path(tmp) / "experiences.db"
+        report = {"rows": args.rows, "dim": args.dim}
+
+        start = time.perf_counter()
+        for i in range(single):
+            log_experience(DECISION_TYPE, states[i], actions[i], rewards[i], next_state=states[i])
+        report["log_experience_rows_per_second"] = rate(single, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ExperienceWriter(batch_size=args.batch_size) as writer:
+            for i in range(single, single + writer_rows):
+                writer.append(DECISION_TYPE, states[i], actions[i], rewards[i], next_state=states[i])
+        report["writer_rows_per_second"] = rate(writer_rows, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        for begin in range(single + writer_rows, args.rows, args.batch_size):
+            log_experiences([
+                {"decision_type": DECISION_TYPE, "state": states[i], "action": actions[i],
+                 "reward": rewards[i], "next_state": states[i]}
+                for i in range(begin, min(begin + args.batch_size, args.rows))
+            ])
+        batched = args.rows - single - writer_rows
+        report["log_experiences_rows_per_second"] = rate(batched, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        experiences = load_experiences(DECISION_TYPE, limit=args.rows)
+        report["load_experiences_rows_per_second"] = rate(len(experiences), time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch = load_experience_arrays(DECISION_TYPE, limit=args.rows)
+        report["load_experience_arrays_rows_per_second"] = rate(
+            len(batch["rewards"]), time.perf_counter() - start
+        )
+        close_experience_db()
+
+        report["json_baseline"] = json_baseline(Path(tmp) / "baseline.db", states, single)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
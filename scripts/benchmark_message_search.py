@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local message search index.
+
+Indexes synthetic conversation messages in batches (default 1M) and reports
+indexing throughput plus p50/p95/p99 query latency for text, vector and
+hybrid search.
+
+Usage:
+    python scripts/benchmark_message_search.py --messages 1000000
+    python scripts/benchmark_message_search.py --messages 200000 --no-vectors --db /tmp/search.db
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from granger_hub.core.storage.message_search import MessageSearchIndex, HashingEmbedder
+
+VOCABULARY = (
+    "pdf table extraction arangodb graph store query satellite firmware vulnerability "
+    "youtube transcript lecture arxiv paper citation marker document schema negotiation "
+    "sparta cwe nist compliance encryption quantum migration pipeline retry timeout error "
+    "embedding vector memory cache latency throughput routing module hub reward agent"
+).split()
+MODULES = ["marker", "arangodb", "sparta", "youtube", "arxiv", "unsloth", "test_reporter"]
+
+
+def synthetic_messages(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(count):
+        sender, receiver = rng.sample(MODULES, 2)
+        yield {
+            "id": f"msg_{i}",
+            "conversation_id": f"conv_{i // 20}",
+            "sender": sender,
+            "receiver": receiver,
+            "action": rng.choice(["store", "query", "process", "ack"]),
+            "content": {"text": " ".join(rng.choices(VOCABULARY, k=rng.randint(5, 30)))},
+            "timestamp": f"2026-01-01T00:00:{i % 60:02d}"
+        }
+
+
+def time_queries(index: MessageSearchIndex, mode: str, queries, limit: int):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search_messages(query, limit=limit, mode=mode)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies = np.array(latencies)
+    return {
+        "queries": len(latencies),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p95_ms": float(np.percentile(latencies, 95)),
+        "p99_ms": float(np.percentile(latencies, 99))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark message search")
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--no-vectors", action="store_true")
+    parser.add_argument("--db", help="SQLite path (in-memory by default)")
+    args = parser.parse_args()
+
+    embedder = None if args.no_vectors else HashingEmbedder(dim=args.dim)
+    index = MessageSearchIndex(Path(args.db) if args.db else None, embedder=embedder)
+
+    start = time.perf_counter()
+    batch = []
+    for msg in synthetic_messages(args.messages):
+        batch.append(msg)
+        if len(batch) >= args.batch_size:
+            index.add_messages(batch)
+            batch = []
+    index.add_messages(batch)
+    index_seconds = time.perf_counter() - start
+
+    rng = random.Random(1)
+    queries = [" ".join(rng.sample(VOCABULARY, rng.randint(1, 3))) for _ in range(args.queries)]
+    modes = ["text"] if args.no_vectors else ["text", "vector", "hybrid"]
+
+    report = {
+        "messages": index.count(),
+        "vectors": not args.no_vectors,
+        "index_seconds": index_seconds,
+        "index_messages_per_second": args.messages / index_seconds,
+        "search": {mode: time_queries(index, mode, queries, args.limit) for mode in modes}
+    }
+    print(json.dumps(report, indent=2))
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
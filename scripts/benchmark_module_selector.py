@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark batched RL module selection under concurrent load.
+
+Fires bursts of concurrent routing requests at BatchingModuleSelector and,
+for comparison, at select_module_with_rl one request at a time, reporting
+throughput and p50/p99 decision latency for both.
+
+Usage:
+    python scripts/benchmark_module_selector.py --requests 20000 --concurrency 256
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from granger_hub.rl.hub_decisions import (
+    configure_decision_journal,
+    initialize_rl_agents,
+    select_module_with_rl
+)
+from granger_hub.rl.selector_service import BatchingModuleSelector
+
+MODULES = ["arxiv-mcp-server", "marker", "arangodb", "sparta", "youtube_transcripts",
+           "claude_max_proxy", "mcp-screenshot", "unsloth", "test-reporter"]
+
+
+def synthetic_tasks(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [{
+        "type": rng.choice(["search", "extract", "analyze", "store", "generate"]),
+        "description": rng.choice(["research paper lookup", "complex multi-page PDF",
+                                   "cyber threat report", "transcript summary"]),
+        "data_size_mb": rng.lognormvariate(1, 2),
+        "priority": rng.choice(["low", "medium", "high"])
+    } for _ in range(count)]
+
+
+def summarize(latencies_ms, seconds):
+    latencies = np.array(latencies_ms)
+    return {
+        "requests": len(latencies),
+        "requests_per_second": len(latencies) / seconds,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99))
+    }
+
+
+async def run_batched(tasks, concurrency, max_batch_size, max_wait_ms):
+    selector = BatchingModuleSelector(max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+    latencies = []
+
+    async def request(task):
+        start = time.perf_counter()
+        await selector.select(task, MODULES)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for begin in range(0, len(tasks), concurrency):
+        await asyncio.gather(*(request(task) for task in tasks[begin:begin + concurrency]))
+    report = summarize(latencies, time.perf_counter() - start)
+    report["avg_batch_size"] = selector.get_stats()["avg_batch_size"]
+    return report
+
+
+async def run_unbatched(tasks, concurrency):
+    latencies = []
+
+    async def request(task):
+        start = time.perf_counter()
+        select_module_with_rl(task, MODULES)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    for begin in range(0, len(tasks), concurrency):
+        # Requests in a burst queue behind each other on the event loop
+        burst_start = time.perf_counter()
+        for task in tasks[begin:begin + concurrency]:
+            await request(task)
+            latencies[-1] = (time.perf_counter() - burst_start) * 1000
+    return summarize(latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched module selection")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    args = parser.parse_args()
+
+    configure_decision_journal(db_path=None)
+    initialize_rl_agents(MODULES, reset=True)
+    tasks = synthetic_tasks(args.requests)
+
+    report = {
+        "concurrency": args.concurrency,
+        "batched": asyncio.run(run_batched(tasks, args.concurrency,
+                                           args.max_batch_size, args.max_wait_ms)),
+        "unbatched": asyncio.run(run_unbatched(tasks, args.concurrency))
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark strided PatchTransformer patching against per-patch copies.
+
+Builds univariate and multivariate series and reports patching and
+reconstruction time for the original per-patch loops versus the strided
+view / overlap-add implementation, checking that both agree.
+
+Usage:
+    python scripts/benchmark_patches.py --length 1000000 --features 8
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from granger_hub.forecast.patches import PatchTransformer
+
+
+def loop_patches(series, patch_length, stride):
+    n_patches = (len(series) - patch_length) // stride + 1
+    patches = np.zeros((n_patches, patch_length) + series.shape[1:])
+    for i in range(n_patches):
+        start = i * stride
+        patches[i] = series[start:start + patch_length]
+    return patches
+
+
+def loop_reconstruct(patches, stride):
+    n_patches, patch_length = patches.shape[:2]
+    length = (n_patches - 1) * stride + patch_length
+    output = np.zeros((length,) + patches.shape[2:])
+    counts = np.zeros((length,) + patches.shape[2:])
+    for i in range(n_patches):
+        start = i * stride
+        output[start:start + patch_length] += patches[i]
+        counts[start:start + patch_length] += 1
+    return output / counts
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def compare(series, transformer):
+    expected, loop_seconds = timed(
+        lambda: loop_patches(series, transformer.patch_length, transformer.stride))
+    actual, view_seconds = timed(lambda: transformer.create_patches(series))
+    rebuilt_expected, loop_rebuild_seconds = timed(lambda: loop_reconstruct(expected, transformer.stride))
+    rebuilt, rebuild_seconds = timed(lambda: transformer.reconstruct_from_patches(actual))
+    return {
+        "patches": len(actual),
+        "loop_patch_seconds": loop_seconds,
+        "view_patch_seconds": view_seconds,
+        "loop_patch_mb": expected.nbytes / 1e6,
+        "view_shares_input": bool(np.shares_memory(actual, series)),
+        "loop_reconstruct_seconds": loop_rebuild_seconds,
+        "reconstruct_seconds": rebuild_seconds,
+        "reconstruct_speedup": loop_rebuild_seconds / rebuild_seconds,
+        "patches_equal": bool(np.array_equal(expected, actual)),
+        "max_abs_diff": float(np.abs(rebuilt_expected - rebuilt).max())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PatchTransformer")
+    parser.add_argument("--length", type=int, default=1_000_000)
+    parser.add_argument("--features", type=int, default=8)
+    parser.add_argument("--patch-length", type=int, default=16)
+    parser.add_argument("--stride", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    transformer = PatchTransformer(args.patch_length, args.stride)
+    results = {
+        "univariate": compare(rng.normal(size=args.length), transformer),
+        "multivariate": compare(rng.normal(size=(args.length // args.features, args.features)), transformer)
+    }
+    print(json.dumps({"length": args.length, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
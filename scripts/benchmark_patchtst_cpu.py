@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark PatchTST CPU inference runtimes.
+
+Builds a randomly initialised PatchTST model (no download) and reports
+CPU windows/sec of PatchTSTBackend.predict_batch for each runtime
+(eager, TorchScript, ONNX Runtime) with and without dynamic int8
+quantization, plus the largest deviation from eager float32 forecasts
+and the time to load a second backend from the process model cache.
+Requires torch and transformers; onnx and onnxruntime for the onnx rows.
+
+Usage:
+    python scripts/benchmark_patchtst_cpu.py --windows 4096 --batch-size 256 --threads 4
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from granger_hub.forecast.model_backends import ModelConfig, create_backend
+
+
+def throughput(backend, windows, horizon, batch_size, repeats):
+    backend.predict_batch(windows[:batch_size], horizon)  # Warm-up
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predictions = [backend.predict_batch(windows[i:i + batch_size], horizon)
+                       for i in range(0, len(windows), batch_size)]
+        best = min(best, time.perf_counter() - start)
+    return len(windows) / best, np.concatenate(predictions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PatchTST CPU runtimes")
+    parser.add_argument("--windows", type=int, default=4096)
+    parser.add_argument("--context-length", type=int, default=96)
+    parser.add_argument("--horizon", type=int, default=24)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--runtimes", nargs="+", default=["eager", "torchscript", "onnx"])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    t = np.arange(args.context_length)
+    windows = (np.sin(0.05 * (t + rng.uniform(0, 100, (args.windows, 1))))
+               + 0.1 * rng.normal(size=(args.windows, args.context_length))).astype(np.float32)
+
+    results = {}
+    reference = None
+    for runtime in args.runtimes:
+        for quantize in (False, True):
+            config = ModelConfig(model_name="patchtst-benchmark", context_length=args.context_length,
+                                 runtime=runtime, quantize=quantize, num_threads=args.threads)
+            name = f"{runtime}{'_int8' if quantize else ''}"
+            try:
+                start = time.perf_counter()
+                backend = create_backend(config)
+                load_seconds = time.perf_counter() - start
+            except ImportError as e:
+                results[name] = {"skipped": str(e)}
+                continue
+
+            per_second, predictions = throughput(backend, windows, args.horizon,
+                                                 args.batch_size, args.repeats)
+            if reference is None:
+                reference = predictions
+            results[name] = {
+                "windows_per_second": per_second,
+                "load_seconds": load_seconds,
+                "max_abs_diff_vs_eager": float(np.abs(predictions - reference).max())
+            }
+
+    start = time.perf_counter()
+    create_backend(ModelConfig(model_name="patchtst-benchmark", context_length=args.context_length))
+    cached_load_seconds = time.perf_counter() - start
+
+    import torch
+    print(json.dumps({
+        "windows": args.windows,
+        "batch_size": args.batch_size,
+        "torch_threads": torch.get_num_threads(),
+        "cached_load_seconds": cached_load_seconds,
+        **results
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
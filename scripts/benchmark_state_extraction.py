@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch RL state extraction against the per-task functions.
+
+Generates synthetic tasks, pipelines and errors and reports rows/sec for
+extract_*_state in a loop versus the extract_*_states batch variants,
+checking that both produce the same matrices.
+
+Usage:
+    python scripts/benchmark_state_extraction.py --rows 200000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from granger_hub.rl.state_extraction import (
+    MODULE_CAPABILITIES,
+    extract_error_state,
+    extract_error_states,
+    extract_pipeline_state,
+    extract_pipeline_states,
+    extract_task_state,
+    extract_task_states
+)
+
+DESCRIPTIONS = [
+    "Find research papers on quantum computing security",
+    "Extract tables from multiple complex PDF reports",
+    "Store advanced cyber threat indicators",
+    "Summarize lecture transcript",
+    "Validate generated dataset"
+]
+ERRORS = [TimeoutError("module timeout"), ConnectionError("refused"),
+          ValueError("validation failed"), MemoryError("resource exhausted"), KeyError("x")]
+
+
+def synthetic_rows(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    modules = list(MODULE_CAPABILITIES)
+    tasks, pipelines, constraints, errors, contexts = [], [], [], [], []
+    for _ in range(count):
+        tasks.append({
+            "type": rng.choice(["search", "extract", "analyze", "store", "generate", "other"]),
+            "description": rng.choice(DESCRIPTIONS),
+            "data_size_mb": rng.lognormvariate(1, 2),
+            "priority": rng.choice(["low", "medium", "high", "critical"]),
+            "real_time": rng.random() < 0.2,
+            "requirements": ["r"] * rng.randint(0, 12),
+            "complexity": rng.random()
+        })
+        pipelines.append(rng.sample(modules, rng.randint(1, 4)))
+        constraints.append({"max_time_seconds": rng.choice([60, 120, 300]), "max_memory_mb": 2000})
+        errors.append(rng.choice(ERRORS))
+        contexts.append({"module": rng.choice(modules), "retry_count": rng.randint(0, 5),
+                         "time_elapsed": rng.uniform(0, 600), "critical_path": rng.random() < 0.5})
+    return tasks, pipelines, constraints, errors, contexts
+
+
+def compare(name, scalar, batch, rows):
+    start = time.perf_counter()
+    expected = np.stack(scalar())
+    scalar_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = batch()
+    batch_seconds = time.perf_counter() - start
+
+    return name, {
+        "scalar_rows_per_second": rows / scalar_seconds,
+        "batch_rows_per_second": rows / batch_seconds,
+        "speedup": scalar_seconds / batch_seconds,
+        "max_abs_diff": float(np.abs(expected - actual).max())
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RL state extraction")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    tasks, pipelines, constraints, errors, contexts = synthetic_rows(args.rows)
+    results = dict([
+        compare("task", lambda: [extract_task_state(t) for t in tasks],
+                lambda: extract_task_states(tasks), args.rows),
+        compare("pipeline",
+                lambda: [extract_pipeline_state(p, t, c) for p, t, c in zip(pipelines, tasks, constraints)],
+                lambda: extract_pipeline_states(pipelines, tasks, constraints), args.rows),
+        compare("error", lambda: [extract_error_state(e, c) for e, c in zip(errors, contexts)],
+                lambda: extract_error_states(errors, contexts), args.rows)
+    ])
+    print(json.dumps({"rows": args.rows, **results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -24,9 +24,14 @@ import logging
 from ..forecast.sklearn_wrapper import TimeSeriesRegressor, StreamingTimeSeriesRegressor
 from ..forecast.data_handlers import load_time_series, save_forecast_results
 from ..forecast.visualization import ForecastVisualizer
+from ..forecast.cache import ForecastCache
+from ..forecast.profiling import DataProfiler, detect_season_lengths, detect_trends, profile_matrix
 
 logger = logging.getLogger(__name__)
 
+# Profiles are reused across commands in one process
+_profiler = DataProfiler()
+
 
 @click.group()
 def forecast_cli():
@@ -37,7 +42,7 @@ def forecast_cli():
 @forecast_cli.command(name="forecast")
 @click.argument('input_file', type=click.Path(exists=True))
 @click.option('--horizon', '-h', default=24, help='Number of steps to forecast')
-@click.option('--model', '-m', type=click.Choice(['auto', 'patchtst', 'sklearn', 'ollama']), 
+@click.option('--model', '-m', type=click.Choice(['auto', 'patchtst', 'statistical', 'sklearn', 'ollama']), 
               default='auto', help='Model backend to use')
 @click.option('--context-length', '-c', default=96, help='Historical context window')
 @click.option('--output', '-o', type=click.Path(), help='Output file for results')
@@ -45,7 +50,8 @@ def forecast_cli():
 @click.option('--plot', '-p', is_flag=True, help='Generate visualization')
 @click.option('--graph', '-g', is_flag=True, help='Generate interactive D3.js graph')
 @click.option('--serve', '-s', is_flag=True, help='Serve graph on local HTTP server')
-def forecast_file(input_file, horizon, model, context_length, output, confidence_intervals, plot, graph, serve):
+@click.option('--cache/--no-cache', default=True, help='Reuse forecasts of unchanged input')
+def forecast_file(input_file, horizon, model, context_length, output, confidence_intervals, plot, graph, serve, cache):
     """
     Forecast time series data from a CSV file.
     
@@ -71,7 +77,8 @@ def forecast_file(input_file, horizon, model, context_length, output, confidence
         forecaster = TimeSeriesRegressor(
             model_type=model,
             context_length=context_length,
-            horizon=horizon
+            horizon=horizon,
+            cache=ForecastCache() if cache else None
         )
         
         # Fit and predict
@@ -117,7 +124,7 @@ def forecast_file(input_file, horizon, model, context_length, output, confidence
                 if hasattr(data, 'timestamps'):
                     # Extend timestamps for predictions
                     from datetime import timedelta
-                    last_ts = data.timestamps[-1]
+                    last_ts = data.last_timestamp
                     freq = data.frequency or 'hourly'
                     delta = timedelta(hours=1) if freq == 'hourly' else timedelta(days=1)
                     
@@ -125,21 +132,20 @@ def forecast_file(input_file, horizon, model, context_length, output, confidence
                     for i in range(1, horizon + 1):
                         pred_timestamps.append(last_ts + delta * i)
                     
-                    timestamps = list(data.timestamps[-context_length:]) + pred_timestamps
+                    timestamps = list(pd.to_datetime(data.timestamps[-context_length:])) + pred_timestamps
                 
-                # Create visualization
-                html_content = visualizer.create_forecast_graph(
-                    historical,
-                    predictions,
-                    intervals,
-                    timestamps=timestamps,
-                    title=f"Forecast for {Path(input_file).name}"
-                )
-                
-                # Save or serve
+                # Serve (rendered on request) or save
                 if serve:
                     click.echo("Starting local server for visualization...")
-                    visualizer.serve_visualization(html_content, port=8888)
+                    url = visualizer.serve_forecast(
+                        historical,
+                        predictions,
+                        intervals,
+                        timestamps=timestamps,
+                        title=f"Forecast for {Path(input_file).name}",
+                        port=8888
+                    )
+                    click.echo(f"Serving {url} (brush to zoom, double-click to reset)")
                     click.echo("Press Ctrl+C to stop the server")
                     import time
                     try:
@@ -148,6 +154,15 @@ def forecast_file(input_file, horizon, model, context_length, output, confidence
                     except KeyboardInterrupt:
                         pass
                 else:
+                    # Create visualization
+                    html_content = visualizer.create_forecast_graph(
+                        historical,
+                        predictions,
+                        intervals,
+                        timestamps=timestamps,
+                        title=f"Forecast for {Path(input_file).name}"
+                    )
+                    
                     # Save to file
                     graph_file = output.replace('.csv', '.html') if output else 'forecast_graph.html'
                     visualizer.save_to_file(html_content, graph_file)
@@ -220,20 +235,112 @@ def forecast_stream(model, context_length, input_source):
         sys.exit(1)
 
 
+@forecast_cli.command(name="forecast-many")
+@click.argument('input_file', type=click.Path(exists=True))
+@click.option('--horizon', '-h', default=24, help='Number of steps to forecast')
+@click.option('--model', '-m', type=click.Choice(['patchtst', 'statistical', 'ollama']),
+              default='statistical', help='Model backend shared by all series')
+@click.option('--context-length', '-c', default=96, help='Historical context window')
+@click.option('--id-column', default='series_id', help='Column identifying each series')
+@click.option('--time-column', default='timestamp', help='Timestamp column')
+@click.option('--value-column', default='value', help='Value column')
+@click.option('--batch-size', default=256, help='Series per model call')
+@click.option('--workers', default=4, help='Batches run concurrently')
+@click.option('--runtime', type=click.Choice(['eager', 'torchscript', 'onnx']), default='eager',
+              help='PatchTST inference runtime')
+@click.option('--quantize', is_flag=True, help='Dynamic int8 quantization (PatchTST)')
+@click.option('--threads', type=int, default=None, help='CPU threads for model inference')
+@click.option('--output', '-o', type=click.Path(), help='Output CSV for the combined forecasts')
+def forecast_many(input_file, horizon, model, context_length, id_column, time_column,
+                  value_column, batch_size, workers, runtime, quantize, threads, output):
+    """
+    Forecast every series of a long-format CSV with one loaded model.
+    
+    Examples:
+        claude-coms forecast-many metrics.csv --horizon 12 -o forecasts.csv
+        claude-coms forecast-many metrics.csv --model patchtst --runtime onnx --quantize --threads 4
+    """
+    from ..forecast.model_backends import ModelConfig
+    from ..forecast.service import ForecastService
+    
+    try:
+        frame = pd.read_csv(input_file)
+        click.echo(f"Loaded {frame[id_column].nunique()} series ({len(frame)} rows) from {input_file}")
+        
+        service = ForecastService.from_config(
+            ModelConfig(model_type=model, context_length=context_length, runtime=runtime,
+                        quantize=quantize, num_threads=threads),
+            horizon=horizon,
+            batch_size=batch_size,
+            max_workers=workers
+        )
+        try:
+            forecasts = service.forecast_many(
+                frame,
+                id_column=id_column,
+                time_column=time_column,
+                value_column=value_column
+            )
+        finally:
+            service.close()
+        
+        if output:
+            forecasts.to_csv(output, index=False)
+            click.echo(f"Results saved to {output}")
+        else:
+            click.echo(forecasts.to_string(index=False, max_rows=50))
+            
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
+@forecast_cli.command(name="profile-many")
+@click.argument('input_file', type=click.Path(exists=True))
+@click.option('--horizon', '-h', default=24, help='Forecast horizon used for model selection')
+@click.option('--id-column', default='series_id', help='Column identifying each series')
+@click.option('--time-column', default='timestamp', help='Timestamp column')
+@click.option('--value-column', default='value', help='Value column')
+@click.option('--output', '-o', type=click.Path(), help='Output CSV for the profiles')
+def profile_many(input_file, horizon, id_column, time_column, value_column, output):
+    """
+    Profile every series of a long-format CSV and suggest a model for each.
+    
+    Examples:
+        claude-coms profile-many metrics.csv -o profiles.csv
+    """
+    try:
+        frame = pd.read_csv(input_file)
+        if time_column in frame.columns:
+            frame = frame.sort_values([id_column, time_column], kind='stable')
+        groups = frame.groupby(id_column, sort=False)[value_column]
+        ids, values = zip(*[(series_id, group.to_numpy()) for series_id, group in groups])
+        
+        profiles = pd.DataFrame({id_column: ids, **_profiler.profile_many(values)})
+        profiles['model'] = select_best_models(profiles, horizon)
+        click.echo(f"Profiled {len(profiles)} series from {input_file}")
+        
+        if output:
+            profiles.to_csv(output, index=False)
+            click.echo(f"Results saved to {output}")
+        else:
+            columns = [id_column, 'length', 'has_trend', 'season_length', 'dominant_period',
+                       'stationarity', 'model']
+            click.echo(profiles[columns].to_string(index=False, max_rows=50))
+            
+    except Exception as e:
+        click.echo(f"Error: {str(e)}", err=True)
+        sys.exit(1)
+
+
 def analyze_data_profile(data) -> dict:
     """Analyze time series characteristics to guide model selection."""
     values = data.values if hasattr(data, 'values') else data
+    values = np.asarray(values)
     
-    profile = {
-        'length': len(values),
-        'is_multivariate': len(values.shape) > 1 and values.shape[1] > 1,
-        'has_trend': detect_trend(values),
-        'has_seasonality': detect_seasonality(values),
-        'stationarity': check_stationarity(values),
-        'missing_values': np.isnan(values).any(),
-        'variance': np.var(values),
-    }
-    
+    # Profile the first column of multivariate data
+    profile = _profiler.profile(values[:, 0] if values.ndim > 1 else values)
+    profile['is_multivariate'] = values.ndim > 1 and values.shape[1] > 1
     return profile
 
 
@@ -248,75 +355,61 @@ def select_best_model(profile: dict, horizon: int) -> str:
     if profile['is_multivariate'] or horizon > 48:
         return 'patchtst'
     
-    # Sklearn for:
+    # Statistical models for:
     # - Simple patterns
     # - Short series (<500 points)
     # - When low latency is critical
     if profile['length'] < 500 and not profile['has_seasonality']:
-        return 'sklearn'
+        return 'statistical'
     
-    # Check if transformers are available
+    return _default_model()
+
+
+def select_best_models(profiles, horizon: int) -> np.ndarray:
+    """Vectorized select_best_model over profile columns (dict or DataFrame)."""
+    lengths = np.asarray(profiles['length'])
+    multivariate = (np.asarray(profiles['is_multivariate'], dtype=bool)
+                    if 'is_multivariate' in profiles else np.zeros(len(lengths), dtype=bool))
+    if horizon > 48:
+        return np.full(len(lengths), 'patchtst', dtype=object)
+    
+    simple = (lengths < 500) & ~np.asarray(profiles['has_seasonality'], dtype=bool)
+    models = np.where(multivariate, 'patchtst', np.where(simple, 'statistical', None)).astype(object)
+    undecided = models == None  # noqa: E711 (elementwise)
+    if undecided.any():
+        models[undecided] = _default_model()
+    return models
+
+
+def _default_model() -> str:
+    """PatchTST when transformers is installed, statistical models otherwise."""
     try:
         import transformers
         return 'patchtst'  # Default to best accuracy
     except ImportError:
-        logger.warning("Transformers not installed, falling back to ollama")
-        return 'ollama'
+        logger.warning("Transformers not installed, falling back to statistical models")
+        return 'statistical'
 
 
 def detect_trend(values: np.ndarray) -> bool:
-    """Simple trend detection."""
+    """Simple trend detection (slope > 1% of value range)."""
     if len(values.shape) > 1:
         values = values[:, 0]  # Use first column for multivariate
-    
-    # Linear regression slope
-    x = np.arange(len(values))
-    slope = np.polyfit(x, values, 1)[0]
-    
-    # Significant trend if slope > 1% of value range
-    return abs(slope) > 0.01 * (values.max() - values.min())
+    return bool(detect_trends(np.asarray(values, dtype=float)[np.newaxis])[0])
 
 
 def detect_seasonality(values: np.ndarray) -> bool:
-    """Simple seasonality detection using autocorrelation."""
+    """Simple seasonality detection using autocorrelation at lags 7, 12 and 24."""
     if len(values.shape) > 1:
         values = values[:, 0]
-    
-    if len(values) < 50:
-        return False
-    
-    # Check autocorrelation at common seasonal lags
-    from scipy import signal
-    
-    # Normalize
-    values = (values - np.mean(values)) / (np.std(values) + 1e-8)
-    
-    # Check lags 7 (weekly), 12 (monthly), 24 (daily)
-    for lag in [7, 12, 24]:
-        if lag < len(values) // 2:
-            correlation = np.corrcoef(values[:-lag], values[lag:])[0, 1]
-            if correlation > 0.7:
-                return True
-    
-    return False
+    return bool(detect_season_lengths(np.asarray(values, dtype=float)[np.newaxis])[0])
 
 
 def check_stationarity(values: np.ndarray) -> bool:
-    """Check if series is stationary (simplified)."""
+    """Check if series is stationary (similar half-series mean and variance)."""
     if len(values.shape) > 1:
         values = values[:, 0]
-    
-    # Split series and compare statistics
-    mid = len(values) // 2
-    first_half = values[:mid]
-    second_half = values[mid:]
-    
-    # Compare means and variances
-    mean_diff = abs(np.mean(first_half) - np.mean(second_half))
-    var_ratio = np.var(first_half) / (np.var(second_half) + 1e-8)
-    
-    # Stationary if statistics are similar
-    return mean_diff < 0.1 * np.std(values) and 0.5 < var_ratio < 2.0
+    return bool(profile_matrix(values)['stationarity'][0])
 
 
 def display_results(predictions: np.ndarray, intervals: Optional[dict], data):
@@ -409,7 +502,7 @@ def handle_forecast_slash_command(args: List[str]) -> str:
     try:
         # Parse arguments
         if not args:
-            return "Usage: /forecast <file> [--horizon N] [--model auto|patchtst|sklearn|ollama]"
+            return "Usage: /forecast <file> [--horizon N] [--model auto|patchtst|statistical|sklearn|ollama]"
         
         file_path = args[0]
         horizon = 24
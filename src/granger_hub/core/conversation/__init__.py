@@ -9,6 +9,7 @@ This module provides the core components for multi-turn conversations between mo
 from .conversation_message import ConversationMessage, ConversationState
 from .conversation_module import ConversationModule
 from .conversation_manager import ConversationManager
+from .conversation_archive import ConversationArchive
 from .conversation_protocol import (
     ConversationProtocol,
     ConversationIntent,
@@ -24,6 +25,7 @@ __all__ = [
     "ConversationState",
     "ConversationModule",
     "ConversationManager",
+    "ConversationArchive",
     "ConversationProtocol",
     "ConversationIntent",
     "ConversationPhase",
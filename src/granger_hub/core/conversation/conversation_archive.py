@@ -0,0 +1,181 @@
+"""
+Compressed archive tier for completed conversations.
+
+Purpose: Moves finished conversations out of the live SQLite database into
+append-only, compressed JSONL segment files with a manifest index, so memory
+and database size stay bounded on long-running deployments while archived
+history remains readable.
+
+Each archived conversation is written as one independently compressed frame
+(zstd when the ``zstandard`` package is installed, gzip otherwise) holding a
+single JSON line with the conversation record and its messages. The manifest
+(``manifest.jsonl``) stores the conversation record plus the segment file,
+byte offset and length of every frame, so listing conversations needs no
+decompression and reading one back decompresses only its frame.
+
+Sample Input:
+>>> archive = ConversationArchive(Path("archive"))
+>>> archive.write([{"conversation": {...}, "messages": [...]}])
+
+Expected Output:
+>>> archive.read("conv-id")
+{"conversation": {...}, "messages": [...]}
+"""
+
+import gzip
+import json
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Any, Optional, List
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class ConversationArchive:
+    """Append-only compressed segment store with a manifest index."""
+
+    MANIFEST_NAME = "manifest.jsonl"
+
+    def __init__(self,
+                 archive_dir: Path,
+                 segment_max_bytes: int = 64 * 1024 * 1024,
+                 compression: Optional[str] = None):
+        """Initialize the archive.
+
+        Args:
+            archive_dir: Directory holding segments and the manifest
+            segment_max_bytes: Start a new segment once the current one reaches this size
+            compression: "zstd" or "gzip" (defaults to zstd when available)
+        """
+        self.archive_dir = Path(archive_dir)
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.compression = compression or ("zstd" if zstandard else "gzip")
+        if self.compression == "zstd" and zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package")
+
+        self.manifest_path = self.archive_dir / self.MANIFEST_NAME
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._lock = Lock()
+        self._load_manifest()
+
+    def _load_manifest(self):
+        """Load the manifest index into memory."""
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, "r") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._index[entry["conversation_id"]] = entry
+
+    def _segment_suffix(self, compression: str) -> str:
+        return ".jsonl.zst" if compression == "zstd" else ".jsonl.gz"
+
+    def _current_segment(self) -> Path:
+        """Return the segment new frames are appended to."""
+        suffix = self._segment_suffix(self.compression)
+        segments = sorted(self.archive_dir.glob(f"segment_*{suffix}"))
+        if segments and segments[-1].stat().st_size < self.segment_max_bytes:
+            return segments[-1]
+        number = len(list(self.archive_dir.glob("segment_*")))
+        return self.archive_dir / f"segment_{number:06d}{suffix}"
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.compression == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    def _decompress(self, data: bytes, compression: str) -> bytes:
+        if compression == "zstd":
+            if zstandard is None:
+                raise ImportError("Reading zstd segments requires the zstandard package")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def write(self, records: List[Dict[str, Any]]) -> int:
+        """Archive conversations.
+
+        Args:
+            records: Items of the form {"conversation": {...}, "messages": [...]};
+                the conversation dict must contain ``conversation_id``
+
+        Returns:
+            Number of conversations archived
+        """
+        if not records:
+            return 0
+
+        with self._lock:
+            segment = self._current_segment()
+            entries = []
+            with open(segment, "ab") as f:
+                for record in records:
+                    conversation = record["conversation"]
+                    line = json.dumps(record, default=str).encode() + b"\n"
+                    frame = self._compress(line)
+                    offset = f.tell()
+                    f.write(frame)
+                    entries.append({
+                        "conversation_id": conversation["conversation_id"],
+                        "segment": segment.name,
+                        "offset": offset,
+                        "length": len(frame),
+                        "compression": self.compression,
+                        "message_count": len(record.get("messages", [])),
+                        "conversation": conversation
+                    })
+                f.flush()
+
+            # Manifest is only appended after the frames are on disk
+            with open(self.manifest_path, "a") as f:
+                for entry in entries:
+                    f.write(json.dumps(entry) + "\n")
+            for entry in entries:
+                self._index[entry["conversation_id"]] = entry
+
+        return len(entries)
+
+    def contains(self, conversation_id: str) -> bool:
+        """Check whether a conversation is archived."""
+        return conversation_id in self._index
+
+    def get_entry(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Get the manifest entry for a conversation."""
+        return self._index.get(conversation_id)
+
+    def list_entries(self) -> List[Dict[str, Any]]:
+        """List manifest entries for all archived conversations."""
+        return list(self._index.values())
+
+    def read(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Read an archived conversation and its messages.
+
+        Args:
+            conversation_id: Conversation to read
+
+        Returns:
+            {"conversation": {...}, "messages": [...]} or None if not archived
+        """
+        entry = self._index.get(conversation_id)
+        if not entry:
+            return None
+
+        with open(self.archive_dir / entry["segment"], "rb") as f:
+            f.seek(entry["offset"])
+            frame = f.read(entry["length"])
+        return json.loads(self._decompress(frame, entry["compression"]))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get archive size statistics."""
+        segments = list(self.archive_dir.glob("segment_*"))
+        return {
+            "conversations": len(self._index),
+            "messages": sum(e["message_count"] for e in self._index.values()),
+            "segments": len(segments),
+            "bytes": sum(s.stat().st_size for s in segments),
+            "compression": self.compression
+        }
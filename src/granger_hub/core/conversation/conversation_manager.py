@@ -5,11 +5,17 @@ Purpose: Manages conversation state, routing, and persistence for multi-turn
 conversations between modules.
 
 This implements Task #002 from the multi-turn conversation implementation.
+
+Storage is tiered: recent message histories are kept in an in-memory LRU
+(evicted histories are still in SQLite), and completed conversations can be
+moved out of SQLite into a compressed ConversationArchive. Reads fall
+through memory -> SQLite -> archive.
 """
 
 import asyncio
 import sqlite3
 import json
+from collections import OrderedDict
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from pathlib import Path
@@ -17,10 +23,12 @@ import uuid
 
 try:
     from .conversation_message import ConversationMessage, ConversationState
+    from .conversation_archive import ConversationArchive
     from ..modules.module_registry import ModuleRegistry
 except ImportError:
     # For standalone testing
     from conversation_message import ConversationMessage, ConversationState
+    from conversation_archive import ConversationArchive
     import sys
     from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent / "modules"))
@@ -33,22 +41,33 @@ class ConversationManager:
     def __init__(self, 
                  registry: ModuleRegistry,
                  db_path: Optional[Path] = None,
-                 conversation_timeout: int = 300):
+                 conversation_timeout: int = 300,
+                 max_cached_conversations: int = 1000,
+                 archive_dir: Optional[Path] = None,
+                 archive_after_seconds: int = 3600):
         """Initialize conversation manager.
         
         Args:
             registry: Module registry for finding modules
             db_path: Optional path to SQLite database for persistence
             conversation_timeout: Seconds before conversation times out
+            max_cached_conversations: Message histories kept in memory; least
+                recently used histories are evicted (they remain in SQLite)
+            archive_dir: Optional directory for the compressed archive tier
+            archive_after_seconds: Age since last activity after which ended
+                conversations are archived by cleanup_inactive_conversations
         """
         self.registry = registry
         self.db_path = db_path or Path("conversations.db")
         self.conversation_timeout = conversation_timeout
+        self.max_cached_conversations = max_cached_conversations
+        self.archive_after_seconds = archive_after_seconds
+        self.archive = ConversationArchive(archive_dir) if archive_dir else None
         
         # In-memory conversation tracking
         self.active_conversations: Dict[str, ConversationState] = {}
         self.conversations = self.active_conversations  # Alias for compatibility
-        self.message_history: Dict[str, List[ConversationMessage]] = {}
+        self.message_history: "OrderedDict[str, List[ConversationMessage]]" = OrderedDict()
         self.module_conversations: Dict[str, List[str]] = {}  # module -> conversation IDs
         
         # Initialize database
@@ -129,7 +148,7 @@ class ConversationManager:
         
         # Store in memory
         self.active_conversations[conversation_id] = conversation
-        self.message_history[conversation_id] = []
+        self._cache_history(conversation_id, [])
         
         # Track for modules
         for module in [initiator, target]:
@@ -168,7 +187,12 @@ class ConversationManager:
         conversation.add_message(message.id)
         # Note: turn_count is incremented by add_message in ConversationState
         conversation.last_activity = datetime.now().isoformat()
-        self.message_history[message.conversation_id].append(message)
+        history = self.message_history.get(message.conversation_id)
+        if history is None:
+            # Evicted from memory; reload from SQLite before appending
+            history = await self._load_messages(message.conversation_id)
+        self._cache_history(message.conversation_id, history)
+        history.append(message)
         
         # Persist message and updated conversation
         await self._persist_message(message)
@@ -207,11 +231,13 @@ class ConversationManager:
         # Try to load from database
         return await self._load_conversation(conversation_id)
     
-    async def get_conversation_history(self, 
-                                       conversation_id: str,
-                                       limit: Optional[int] = None) -> List[ConversationMessage]:
+    async def get_conversation_messages(self,
+                                        conversation_id: str,
+                                        limit: Optional[int] = None) -> List[ConversationMessage]:
         """Get message history for a conversation.
         
+        Reads through memory, SQLite and the archive tier.
+        
         Args:
             conversation_id: Conversation to retrieve
             limit: Optional limit on number of messages
@@ -221,12 +247,13 @@ class ConversationManager:
         """
         # Check memory first
         if conversation_id in self.message_history:
+            self.message_history.move_to_end(conversation_id)
             history = self.message_history[conversation_id]
             if limit:
                 return history[-limit:]
             return history
         
-        # Load from database
+        # Load from database (falls back to the archive)
         return await self._load_messages(conversation_id, limit)
     
     async def end_conversation(self, conversation_id: str) -> bool:
@@ -273,7 +300,7 @@ class ConversationManager:
         return conversations
     
     async def cleanup_inactive_conversations(self):
-        """Clean up timed-out conversations."""
+        """Clean up timed-out conversations and archive old ended ones."""
         now = datetime.now()
         
         for conv_id, conversation in list(self.active_conversations.items()):
@@ -283,6 +310,112 @@ class ConversationManager:
                     conversation.status = "timeout"
                     await self._persist_conversation(conversation)
                     print(f"Conversation {conv_id} timed out")
+        
+        if self.archive:
+            await self.archive_completed_conversations(self.archive_after_seconds)
+    
+    def _cache_history(self, conversation_id: str, history: List[ConversationMessage]):
+        """Insert or refresh a message history in the in-memory LRU."""
+        self.message_history[conversation_id] = history
+        self.message_history.move_to_end(conversation_id)
+        # Every message is already persisted, so evicted histories only
+        # need to be dropped from memory.
+        while len(self.message_history) > self.max_cached_conversations:
+            self.message_history.popitem(last=False)
+    
+    async def archive_completed_conversations(self, older_than_seconds: int = 0) -> int:
+        """Move ended conversations from SQLite into the archive tier.
+        
+        Args:
+            older_than_seconds: Only archive conversations inactive for longer than this
+            
+        Returns:
+            Number of conversations archived
+        """
+        if not self.archive:
+            return 0
+        
+        cutoff = datetime.fromtimestamp(
+            datetime.now().timestamp() - older_than_seconds
+        ).isoformat()
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT conversation_id, participants, started_at, last_activity,
+                       status, turn_count, context
+                FROM conversations
+                WHERE status != 'active' AND last_activity <= ?
+            """, (cutoff,))
+            rows = [
+                row for row in cursor.fetchall()
+                if row[0] not in self.active_conversations
+                or not self.active_conversations[row[0]].is_active()
+            ]
+            if not rows:
+                return 0
+            
+            records = []
+            for row in rows:
+                cursor.execute("""
+                    SELECT message_id, source, target, type, content,
+                           timestamp, turn_number, context, in_reply_to
+                    FROM conversation_messages
+                    WHERE conversation_id = ?
+                    ORDER BY turn_number
+                """, (row[0],))
+                records.append({
+                    "conversation": {
+                        "conversation_id": row[0],
+                        "participants": json.loads(row[1]),
+                        "started_at": row[2],
+                        "last_activity": row[3],
+                        "status": row[4],
+                        "turn_count": row[5],
+                        "context": json.loads(row[6]) if row[6] else {}
+                    },
+                    "messages": [self._message_row_to_dict(m) for m in cursor.fetchall()]
+                })
+            
+            archived = self.archive.write(records)
+            
+            # Only drop rows from SQLite once they are safely archived
+            conv_ids = [(record["conversation"]["conversation_id"],) for record in records]
+            cursor.executemany(
+                "DELETE FROM conversation_messages WHERE conversation_id = ?", conv_ids
+            )
+            cursor.executemany(
+                "DELETE FROM conversations WHERE conversation_id = ?", conv_ids
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        
+        for record in records:
+            conv_id = record["conversation"]["conversation_id"]
+            self.message_history.pop(conv_id, None)
+            self.active_conversations.pop(conv_id, None)
+            for module in record["conversation"]["participants"]:
+                if conv_id in self.module_conversations.get(module, []):
+                    self.module_conversations[module].remove(conv_id)
+        
+        return archived
+    
+    @staticmethod
+    def _message_row_to_dict(row: Tuple) -> Dict[str, Any]:
+        """Convert a conversation_messages row to an archive record."""
+        return {
+            "message_id": row[0],
+            "source": row[1],
+            "target": row[2],
+            "type": row[3],
+            "content": json.loads(row[4]),
+            "timestamp": row[5],
+            "turn_number": row[6],
+            "context": json.loads(row[7]) if row[7] else {},
+            "in_reply_to": row[8]
+        }
     
     async def _persist_conversation(self, conversation: ConversationState):
         """Persist conversation state to database."""
@@ -359,7 +492,7 @@ class ConversationManager:
         conn.close()
         
         if not row:
-            return None
+            return self._load_archived_conversation(conversation_id)
         
         # Also load message history for proper state
         messages = await self._load_messages(conversation_id)
@@ -401,6 +534,17 @@ class ConversationManager:
         rows = cursor.fetchall()
         conn.close()
         
+        if not rows and self.archive and self.archive.contains(conversation_id):
+            record = self.archive.read(conversation_id)
+            rows = [
+                (m["message_id"], m["source"], m["target"], m["type"],
+                 json.dumps(m["content"]), m["timestamp"], m["turn_number"],
+                 json.dumps(m["context"]), m["in_reply_to"])
+                for m in record["messages"]
+            ]
+            if limit:
+                rows = rows[:limit]
+        
         messages = []
         for row in rows:
             messages.append(ConversationMessage(
@@ -418,6 +562,24 @@ class ConversationManager:
         
         return messages
     
+    def _load_archived_conversation(self, conversation_id: str) -> Optional[ConversationState]:
+        """Rebuild a conversation state from the archive tier."""
+        if not self.archive or not self.archive.contains(conversation_id):
+            return None
+        
+        record = self.archive.read(conversation_id)
+        conversation = record["conversation"]
+        return ConversationState(
+            conversation_id=conversation_id,
+            participants=conversation["participants"],
+            started_at=conversation["started_at"],
+            last_activity=conversation["last_activity"],
+            status=conversation["status"],
+            turn_count=conversation["turn_count"],
+            context=conversation["context"],
+            message_history=[m["message_id"] for m in record["messages"]]
+        )
+    
     async def end_conversation(self, conversation_id: str, reason: str = "completed"):
         """End a conversation.
         
@@ -487,4 +649,16 @@ class ConversationManager:
                 "context": json.loads(row[6]) if row[6] else {}
             })
         
+        # Read through to the archive tier
+        if self.archive:
+            if conversation_id:
+                entry = self.archive.get_entry(conversation_id)
+                if not conversations and entry:
+                    conversations.append(entry["conversation"])
+            else:
+                conversations.extend(
+                    entry["conversation"] for entry in self.archive.list_entries()
+                )
+                conversations.sort(key=lambda c: c["started_at"] or "", reverse=True)
+        
         return conversations
\ No newline at end of file
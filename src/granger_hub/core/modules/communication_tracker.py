@@ -3,11 +3,20 @@ Communication progress tracker for ModuleCommunicator.
 
 Purpose: Provides progress tracking functionality for module communications,
 including message logging, task tracking, and statistics collection.
+
+Writes share one long-lived connection whose statement cache keeps the
+fixed SQL below prepared, and are committed in groups (every
+``commit_batch_size`` writes or ``commit_interval`` seconds, whichever comes
+first) instead of once per message. Per-operation latencies are kept in
+histograms and published through ``get_stats``.
 """
 
 import asyncio
 import aiosqlite
+import bisect
 import json
+import time
+from contextlib import asynccontextmanager
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional, List, TYPE_CHECKING
@@ -21,18 +30,109 @@ if TYPE_CHECKING:
     from ..granger_hub.task_executor import Task
 
 
+# Statements are kept as constants so the connection's statement cache
+# reuses the prepared versions on every call.
+INSERT_MESSAGE_SQL = """
+    INSERT INTO messages (id, source, target, action, data, timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_RESPONSE_SQL = """
+    UPDATE messages
+    SET response = ?, status = 'completed'
+    WHERE id = ?
+"""
+
+FIND_PENDING_MESSAGE_SQL = """
+    SELECT id FROM messages
+    WHERE source = ? AND target = ? AND response IS NULL
+    ORDER BY timestamp DESC
+    LIMIT 1
+"""
+
+INSERT_TASK_SQL = """
+    INSERT INTO tasks (id, instruction, requester, task_type, status, created_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+UPDATE_TASK_SQL = """
+    UPDATE tasks
+    SET status = ?, completed_at = ?, result = ?
+    WHERE id = ?
+"""
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds)."""
+    
+    BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+    
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+    
+    def record(self, duration_ms: float) -> None:
+        """Record one observation."""
+        self.counts[bisect.bisect_left(self.BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+    
+    def percentile(self, q: float) -> float:
+        """Upper bucket bound containing the q-th percentile (0-100)."""
+        if self.count == 0:
+            return 0.0
+        rank = q / 100.0 * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return self.BUCKETS_MS[i] if i < len(self.BUCKETS_MS) else self.max_ms
+        return self.max_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "count": self.count,
+            "avg_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+            "buckets": {
+                (f"le_{bound}" if i < len(self.BUCKETS_MS) else "inf"): c
+                for i, (bound, c) in enumerate(
+                    zip(self.BUCKETS_MS + (float("inf"),), self.counts)
+                )
+            }
+        }
+
+
 class ProgressTracker:
     """Tracks progress of module communications and tasks."""
     
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(self,
+                 db_path: Optional[Path] = None,
+                 commit_interval: float = 0.05,
+                 commit_batch_size: int = 100):
         """Initialize the progress tracker.
         
         Args:
             db_path: Path to SQLite database (uses in-memory if None)
+            commit_interval: Maximum seconds a write waits before being committed
+            commit_batch_size: Commit immediately once this many writes are pending
+                (1 commits every write)
         """
         self.db_path = str(db_path) if db_path else ":memory:"
+        self.commit_interval = commit_interval
+        self.commit_batch_size = max(1, commit_batch_size)
         self._db: Optional[aiosqlite.Connection] = None
         self._initialized = False
+        self._pending_writes = 0
+        self._commit_task: Optional[asyncio.Task] = None
+        self._latency: Dict[str, LatencyHistogram] = {}
     
     async def _ensure_initialized(self):
         """Ensure database is initialized."""
@@ -41,7 +141,10 @@ class ProgressTracker:
     
     async def _initialize_db(self):
         """Initialize the database schema."""
-        self._db = await aiosqlite.connect(self.db_path)
+        self._db = await aiosqlite.connect(self.db_path, cached_statements=256)
+        if self.db_path != ":memory:":
+            await self._db.execute("PRAGMA journal_mode=WAL")
+            await self._db.execute("PRAGMA synchronous=NORMAL")
         
         # Create tables
         await self._db.execute("""
@@ -83,9 +186,57 @@ class ProgressTracker:
             )
         """)
         
+        # Request lookup by route, and status scans (pending sync, stats)
+        await self._db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_messages_route
+            ON messages (source, target, timestamp)
+        """)
+        await self._db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_messages_status
+            ON messages (status, timestamp)
+        """)
+        await self._db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tasks_status
+            ON tasks (status)
+        """)
+        
         await self._db.commit()
         self._initialized = True
     
+    @asynccontextmanager
+    async def _timed(self, operation: str):
+        """Record the latency of an operation in its histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            histogram = self._latency.get(operation)
+            if histogram is None:
+                histogram = self._latency[operation] = LatencyHistogram()
+            histogram.record((time.perf_counter() - start) * 1000)
+    
+    async def _write_done(self):
+        """Account for a write and commit the group when due."""
+        self._pending_writes += 1
+        if self._pending_writes >= self.commit_batch_size:
+            await self.flush()
+        elif self._commit_task is None or self._commit_task.done():
+            self._commit_task = asyncio.create_task(self._commit_later())
+    
+    async def _commit_later(self):
+        """Commit pending writes after the commit interval."""
+        await asyncio.sleep(self.commit_interval)
+        self._commit_task = None
+        await self.flush()
+    
+    async def flush(self):
+        """Commit all pending writes now."""
+        if self._db is None or self._pending_writes == 0:
+            return
+        async with self._timed("commit"):
+            self._pending_writes = 0
+            await self._db.commit()
+    
     async def log_message(self, source: str, target: str, action: str, data: Dict[str, Any]) -> str:
         """Log a message being sent.
         
@@ -96,51 +247,52 @@ class ProgressTracker:
             data: Message data
             
         Returns:
-            Message ID
+            Message ID (pass it to ``log_response`` to update by primary key)
         """
         await self._ensure_initialized()
         
         message_id = str(uuid.uuid4())
         timestamp = datetime.now().isoformat()
         
-        await self._db.execute("""
-            INSERT INTO messages (id, source, target, action, data, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (message_id, source, target, action, json.dumps(data), timestamp))
-        
-        await self._db.commit()
+        async with self._timed("log_message"):
+            await self._db.execute(
+                INSERT_MESSAGE_SQL,
+                (message_id, source, target, action, json.dumps(data), timestamp)
+            )
+            await self._write_done()
         logger.debug(f"Logged message {message_id}: {source} -> {target}")
         
         return message_id
     
-    async def log_response(self, source: str, target: str, response: Dict[str, Any]) -> None:
+    async def log_response(self,
+                           source: str,
+                           target: str,
+                           response: Dict[str, Any],
+                           message_id: Optional[str] = None) -> None:
         """Log a response to a message.
         
         Args:
             source: Source module name (who sent the response)
             target: Target module name (who receives the response)
             response: Response data
+            message_id: ID returned by ``log_message`` for the request; when
+                omitted the most recent unanswered message from target to
+                source is used
         """
         await self._ensure_initialized()
         
-        # Find the most recent message from target to source
-        cursor = await self._db.execute("""
-            SELECT id FROM messages 
-            WHERE source = ? AND target = ? AND response IS NULL
-            ORDER BY timestamp DESC
-            LIMIT 1
-        """, (target, source))
-        
-        row = await cursor.fetchone()
-        if row:
-            message_id = row[0]
-            await self._db.execute("""
-                UPDATE messages 
-                SET response = ?, status = 'completed'
-                WHERE id = ?
-            """, (json.dumps(response), message_id))
-            await self._db.commit()
-            logger.debug(f"Logged response for message {message_id}")
+        async with self._timed("log_response"):
+            if message_id is None:
+                # Find the most recent message from target to source
+                cursor = await self._db.execute(FIND_PENDING_MESSAGE_SQL, (target, source))
+                row = await cursor.fetchone()
+                if not row:
+                    return
+                message_id = row[0]
+            
+            await self._db.execute(UPDATE_RESPONSE_SQL, (json.dumps(response), message_id))
+            await self._write_done()
+        logger.debug(f"Logged response for message {message_id}")
     
     async def log_task(self, task: 'Task') -> None:
         """Log a new task.
@@ -150,19 +302,16 @@ class ProgressTracker:
         """
         await self._ensure_initialized()
         
-        await self._db.execute("""
-            INSERT INTO tasks (id, instruction, requester, task_type, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (
-            task.id,
-            task.instruction,
-            task.requester,
-            task.type,
-            task.status,
-            task.created_at
-        ))
-        
-        await self._db.commit()
+        async with self._timed("log_task"):
+            await self._db.execute(INSERT_TASK_SQL, (
+                task.id,
+                task.instruction,
+                task.requester,
+                task.type,
+                task.status,
+                task.created_at
+            ))
+            await self._write_done()
         logger.debug(f"Logged task {task.id}: {task.instruction[:50]}...")
     
     async def log_task_completion(self, task_id: str, result: Dict[str, Any]) -> None:
@@ -177,15 +326,22 @@ class ProgressTracker:
         completed_at = datetime.now().isoformat()
         status = "completed" if result.get("status") == "completed" else "failed"
         
-        await self._db.execute("""
-            UPDATE tasks
-            SET status = ?, completed_at = ?, result = ?
-            WHERE id = ?
-        """, (status, completed_at, json.dumps(result), task_id))
-        
-        await self._db.commit()
+        async with self._timed("log_task_completion"):
+            await self._db.execute(
+                UPDATE_TASK_SQL,
+                (status, completed_at, json.dumps(result), task_id)
+            )
+            await self._write_done()
         logger.debug(f"Task {task_id} completed with status: {status}")
     
+    def get_latency_histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-operation latency histograms.
+        
+        Returns:
+            Mapping of operation name to histogram summary
+        """
+        return {op: hist.to_dict() for op, hist in self._latency.items()}
+    
     async def get_stats(self) -> Dict[str, Any]:
         """Get overall statistics.
         
@@ -236,16 +392,21 @@ class ProgressTracker:
             },
             "modules": {
                 "active": module_stats[0] or 0
-            }
+            },
+            "latency": self.get_latency_histograms()
         }
     
     async def close(self):
         """Close the database connection."""
+        if self._commit_task and not self._commit_task.done():
+            self._commit_task.cancel()
+        self._commit_task = None
         if self._db:
+            await self.flush()
             await self._db.close()
             self._db = None
             self._initialized = False
 
 
 # Export classes
-__all__ = ['ProgressTracker']
\ No newline at end of file
+__all__ = ['ProgressTracker', 'LatencyHistogram']
\ No newline at end of file
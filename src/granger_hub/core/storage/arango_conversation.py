@@ -18,7 +18,8 @@ Expected Output:
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Tuple
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, List, Tuple, Deque
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict, field
 import json
@@ -26,6 +27,11 @@ import hashlib
 
 from arango import ArangoClient
 from arango.database import StandardDatabase
+from arango.exceptions import DocumentInsertError
+
+from .query_profiler import AQLQueryProfiler
+from .message_search import MessageSearchIndex
+from ..conversation.conversation_archive import ConversationArchive
 
 logger = logging.getLogger(__name__)
 
@@ -67,6 +73,24 @@ class Conversation:
         return {k: v for k, v in asdict(self).items() if v is not None}
 
 
+@dataclass
+class CachedContext:
+    """Sliding window over a conversation, kept in memory for context assembly."""
+    conversation: Dict[str, Any]
+    recent_messages: Deque[Dict[str, Any]]
+    action_counts: Dict[str, int] = field(default_factory=dict)
+    
+    def append(self, message: Dict[str, Any]) -> None:
+        """Add a message, keeping window action counts in step with evictions."""
+        if len(self.recent_messages) == self.recent_messages.maxlen:
+            evicted = self.recent_messages[0]["action"]
+            self.action_counts[evicted] -= 1
+            if not self.action_counts[evicted]:
+                del self.action_counts[evicted]
+        self.recent_messages.append(message)
+        self.action_counts[message["action"]] = self.action_counts.get(message["action"], 0) + 1
+
+
 class ArangoConversationStore:
     """Stores and manages conversations in ArangoDB."""
     
@@ -75,7 +99,12 @@ class ArangoConversationStore:
                  port: int = 8529,
                  username: str = "root",
                  password: str = "",
-                 database: str = "claude_modules"):
+                 database: str = "claude_modules",
+                 profiler: Optional[AQLQueryProfiler] = None,
+                 search_index: Optional[MessageSearchIndex] = None,
+                 context_window: int = 50,
+                 max_cached_contexts: int = 1000,
+                 archive: Optional[ConversationArchive] = None):
         """Initialize conversation store.
         
         Args:
@@ -84,12 +113,25 @@ class ArangoConversationStore:
             username: Database username
             password: Database password
             database: Database name
+            profiler: Optional profiler recording analytics query statistics
+            search_index: Optional local index updated as messages are added
+            context_window: Recent messages kept in memory per conversation;
+                context requests up to this size are served without queries
+            max_cached_contexts: Conversations kept in the context cache (LRU)
+            archive: Optional compressed archive that archive_conversation moves
+                messages into; get_conversation_messages reads through to it
         """
         self.client = ArangoClient(hosts=f"http://{host}:{port}")
         self.database_name = database
         self.username = username
         self.password = password
         self.db: Optional[StandardDatabase] = None
+        self.profiler = profiler
+        self.search_index = search_index
+        self.context_window = context_window
+        self.max_cached_contexts = max_cached_contexts
+        self.archive = archive
+        self._context_cache: "OrderedDict[str, CachedContext]" = OrderedDict()
         self._initialized = False
     
     async def initialize(self):
@@ -141,6 +183,53 @@ class ArangoConversationStore:
         conversations.add_persistent_index(fields=["last_message_at"], unique=False)
         conversations.add_persistent_index(fields=["tags[*]"], unique=False)
     
+    def _execute_analytics(self, name: str, query: str, bind_vars: Optional[Dict[str, Any]] = None):
+        """Execute an analytics query, recording its statistics if profiling.
+        
+        Args:
+            name: Analytics API name
+            query: AQL query
+            bind_vars: Query bind variables
+            
+        Returns:
+            Result cursor
+        """
+        if self.profiler:
+            return self.profiler.execute(self.db, name, query, bind_vars)
+        return self.db.aql.execute(query, bind_vars=bind_vars or {})
+    
+    def _cache_context(self, conversation: Dict[str, Any],
+                       entry: Optional[CachedContext] = None) -> CachedContext:
+        """Insert a conversation window into the LRU context cache."""
+        if entry is None:
+            entry = CachedContext(
+                conversation=conversation,
+                recent_messages=deque(maxlen=self.context_window)
+            )
+        self._context_cache[conversation["_key"]] = entry
+        self._context_cache.move_to_end(conversation["_key"])
+        while len(self._context_cache) > self.max_cached_contexts:
+            self._context_cache.popitem(last=False)
+        return entry
+    
+    def invalidate_context(self, conversation_id: str) -> None:
+        """Drop a conversation from the context cache."""
+        self._context_cache.pop(conversation_id, None)
+    
+    def _get_recent_messages(self, conversation_id: str, limit: int) -> List[Dict[str, Any]]:
+        """Fetch the last ``limit`` messages in chronological order."""
+        cursor = self.db.aql.execute(
+            """
+            FOR msg IN messages
+                FILTER msg.conversation_id == @conv_id
+                SORT msg.sequence DESC
+                LIMIT @limit
+                RETURN msg
+            """,
+            bind_vars={"conv_id": conversation_id, "limit": limit}
+        )
+        return list(reversed(list(cursor)))
+    
     def _generate_conversation_id(self, participants: List[str]) -> str:
         """Generate unique conversation ID from participants.
         
@@ -193,11 +282,50 @@ class ArangoConversationStore:
             context=context or {}
         )
         
-        self.db.collection("conversations").insert(conversation.to_dict())
+        conversation_doc = conversation.to_dict()
+        self.db.collection("conversations").insert(conversation_doc)
+        self._cache_context(conversation_doc)
         logger.info(f"Started conversation {conv_id} between {participants}")
         
         return conv_id
     
+    def _next_sequence(self, conversation_id: str) -> int:
+        """Look up the next message sequence number in the store."""
+        cursor = self.db.collection("messages").find(
+            {"conversation_id": conversation_id},
+            sort="sequence DESC",
+            limit=1
+        )
+        
+        last_sequence = 0
+        for msg in cursor:
+            last_sequence = msg["sequence"]
+            break
+        
+        # Archived messages keep their sequence numbers
+        entry = self.archive.get_entry(conversation_id) if self.archive else None
+        if entry:
+            last_sequence = max(last_sequence, entry["conversation"].get("turn_count", 0))
+        
+        return last_sequence + 1
+    
+    @staticmethod
+    def _build_message(conversation_id: str, sequence: int, sender: str, receiver: str,
+                       action: str, content: Dict[str, Any],
+                       metadata: Optional[Dict[str, Any]]) -> ConversationMessage:
+        """Create the message record for a sequence number."""
+        return ConversationMessage(
+            id=f"{conversation_id}_msg_{sequence}",
+            conversation_id=conversation_id,
+            sender=sender,
+            receiver=receiver,
+            action=action,
+            content=content,
+            timestamp=datetime.now().isoformat(),
+            sequence=sequence,
+            metadata=metadata
+        )
+    
     async def add_message(self,
                          conversation_id: str,
                          sender: str,
@@ -218,37 +346,34 @@ class ArangoConversationStore:
         Returns:
             Message ID
         """
-        # Get current sequence number
         messages = self.db.collection("messages")
-        cursor = messages.find(
-            {"conversation_id": conversation_id},
-            sort="sequence DESC",
-            limit=1
-        )
+        entry = self._context_cache.get(conversation_id)
         
-        last_message = None
-        for msg in cursor:
-            last_message = msg
-            break
-        
-        sequence = (last_message["sequence"] + 1) if last_message else 1
+        # Next sequence number comes from the cached window when available
+        if entry is not None:
+            sequence = entry.conversation.get("message_count", 0) + 1
+        else:
+            sequence = self._next_sequence(conversation_id)
         
-        # Create message
-        message_id = f"{conversation_id}_msg_{sequence}"
-        message = ConversationMessage(
-            id=message_id,
-            conversation_id=conversation_id,
-            sender=sender,
-            receiver=receiver,
-            action=action,
-            content=content,
-            timestamp=datetime.now().isoformat(),
-            sequence=sequence,
-            metadata=metadata
-        )
+        message = self._build_message(conversation_id, sequence, sender, receiver,
+                                      action, content, metadata)
+        message_doc = message.to_dict()
         
         # Store message
-        messages.insert(message.to_dict())
+        try:
+            meta = messages.insert(message_doc)
+        except DocumentInsertError:
+            if entry is None:
+                raise
+            # Another writer advanced the conversation; resync from the store
+            self.invalidate_context(conversation_id)
+            entry = None
+            sequence = self._next_sequence(conversation_id)
+            message = self._build_message(conversation_id, sequence, sender, receiver,
+                                          action, content, metadata)
+            message_doc = message.to_dict()
+            meta = messages.insert(message_doc)
+        message_id = message.id
         
         # Update conversation
         conversations = self.db.collection("conversations")
@@ -260,6 +385,17 @@ class ArangoConversationStore:
             }
         )
         
+        # Write-through to the context cache
+        if entry is not None:
+            entry.conversation["last_message_at"] = message.timestamp
+            entry.conversation["message_count"] = sequence
+            entry.append({**message_doc, **meta})
+            self._context_cache.move_to_end(conversation_id)
+        
+        # Index incrementally for search_messages
+        if self.search_index:
+            self.search_index.add_messages([message_doc])
+        
         logger.debug(f"Added message {message_id} to conversation {conversation_id}")
         
         return message_id
@@ -270,6 +406,9 @@ class ArangoConversationStore:
                                       offset: int = 0) -> List[Dict[str, Any]]:
         """Get messages from a conversation.
         
+        Messages of an archived conversation are read back from the archive,
+        followed by any messages added after it was archived.
+        
         Args:
             conversation_id: Conversation ID
             limit: Maximum number of messages
@@ -278,6 +417,16 @@ class ArangoConversationStore:
         Returns:
             List of messages
         """
+        limit = limit or 1000
+        archived = []
+        if self.archive and self.archive.contains(conversation_id):
+            archived = self.archive.read(conversation_id)["messages"][offset:offset + limit]
+            # Live messages continue where the archive ends
+            offset = max(offset - self.archive.get_entry(conversation_id)["message_count"], 0)
+            limit -= len(archived)
+            if not limit:
+                return archived
+        
         query = """
         FOR msg IN messages
             FILTER msg.conversation_id == @conv_id
@@ -291,11 +440,11 @@ class ArangoConversationStore:
             bind_vars={
                 "conv_id": conversation_id,
                 "offset": offset,
-                "limit": limit or 1000
+                "limit": limit
             }
         )
         
-        return list(cursor)
+        return archived + list(cursor)
     
     async def get_conversation_context(self,
                                      participants: List[str],
@@ -311,14 +460,32 @@ class ArangoConversationStore:
         """
         conv_id = self._generate_conversation_id(participants)
         
-        # Get conversation
-        try:
-            conversation = self.db.collection("conversations").get(conv_id)
-        except:
-            return {"exists": False, "participants": participants}
-        
-        # Get recent messages
-        messages = await self.get_conversation_messages(conv_id, limit=limit)
+        entry = self._context_cache.get(conv_id)
+        if entry is not None and limit <= self.context_window:
+            # Served from the sliding window, no database round trips
+            self._context_cache.move_to_end(conv_id)
+            conversation = entry.conversation
+            messages = list(entry.recent_messages)[-limit:] if limit > 0 else []
+            action_counts = dict(entry.action_counts)
+        else:
+            # Get conversation
+            try:
+                conversation = self.db.collection("conversations").get(conv_id)
+            except Exception:
+                conversation = None
+            if not conversation:
+                return {"exists": False, "participants": participants}
+            
+            # Get recent messages, warming the cache with a full window
+            fetch = max(limit, self.context_window)
+            window = self._get_recent_messages(conv_id, fetch)
+            recent = CachedContext(conversation, deque(maxlen=self.context_window))
+            for msg in window[-self.context_window:]:
+                recent.append(msg)
+            if conversation.get("status") != "archived":
+                self._cache_context(conversation, recent)
+            messages = window[-limit:] if limit > 0 else []
+            action_counts = dict(recent.action_counts)
         
         # Build context
         context = {
@@ -330,6 +497,7 @@ class ArangoConversationStore:
             "last_message_at": conversation["last_message_at"],
             "message_count": conversation["message_count"],
             "recent_messages": messages,
+            "recent_action_counts": action_counts,
             "stored_context": conversation.get("context", {})
         }
         
@@ -389,6 +557,62 @@ class ArangoConversationStore:
         cursor = self.db.aql.execute(query, bind_vars=bind_vars)
         return list(cursor)
     
+    async def search_messages(self,
+                              query: str,
+                              limit: int = 10,
+                              mode: str = "hybrid",
+                              participant: Optional[str] = None,
+                              conversation_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search message content through the local search index.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum results
+            mode: "text", "vector" or "hybrid" ranking
+            participant: Restrict to messages sent or received by a module
+            conversation_id: Restrict to one conversation
+            
+        Returns:
+            Ranked message references with scores
+        """
+        if not self.search_index:
+            raise RuntimeError("search_messages requires a MessageSearchIndex")
+        
+        return self.search_index.search_messages(
+            query,
+            limit=limit,
+            mode=mode,
+            conversation_id=conversation_id,
+            participant=participant
+        )
+    
+    async def rebuild_search_index(self, batch_size: int = 5000) -> int:
+        """Index all stored messages (e.g. after attaching a new index).
+        
+        Args:
+            batch_size: Messages fetched per batch
+            
+        Returns:
+            Number of newly indexed messages
+        """
+        if not self.search_index:
+            raise RuntimeError("rebuild_search_index requires a MessageSearchIndex")
+        
+        cursor = self.db.aql.execute(
+            "FOR msg IN messages RETURN msg",
+            batch_size=batch_size,
+            stream=True
+        )
+        indexed = 0
+        batch = []
+        for msg in cursor:
+            batch.append(msg)
+            if len(batch) >= batch_size:
+                indexed += self.search_index.add_messages(batch)
+                batch = []
+        indexed += self.search_index.add_messages(batch)
+        return indexed
+    
     async def analyze_conversation(self, conversation_id: str) -> Dict[str, Any]:
         """Analyze a conversation.
         
@@ -468,25 +692,75 @@ class ArangoConversationStore:
                 {"_key": conversation_id},
                 update_data
             )
+            entry = self._context_cache.get(conversation_id)
+            if entry is not None:
+                entry.conversation.update(update_data)
             return True
         except Exception as e:
             logger.error(f"Failed to summarize conversation: {e}")
             return False
     
-    async def archive_conversation(self, conversation_id: str) -> bool:
+    async def archive_conversation(self,
+                                   conversation_id: str,
+                                   archive: Optional[ConversationArchive] = None) -> bool:
         """Archive a conversation.
         
         Args:
             conversation_id: Conversation ID
+            archive: Compressed archive to move the messages into (defaults
+                to the store's archive); when neither is set only the status
+                changes
             
         Returns:
             True if successful
         """
+        archive = archive or self.archive
         try:
+            if archive:
+                conversation = self.db.collection("conversations").get(conversation_id)
+                if conversation:
+                    cursor = self.db.aql.execute(
+                        """
+                        FOR msg IN messages
+                            FILTER msg.conversation_id == @conv_id
+                            SORT msg.sequence ASC
+                            RETURN msg
+                        """,
+                        bind_vars={"conv_id": conversation_id}
+                    )
+                    live = list(cursor)
+                    # Re-archiving keeps the messages archived earlier
+                    previous = archive.read(conversation_id) if archive.contains(conversation_id) else None
+                    messages = (previous["messages"] if previous else []) + [
+                        {k: v for k, v in msg.items() if not k.startswith("_")}
+                        for msg in live
+                    ]
+                    archive.write([{
+                        "conversation": {
+                            "conversation_id": conversation_id,
+                            "participants": conversation["participants"],
+                            "started_at": conversation["started_at"],
+                            "last_activity": conversation["last_message_at"],
+                            "status": "archived",
+                            "turn_count": max((msg["sequence"] for msg in messages), default=0),
+                            "context": conversation.get("context", {})
+                        },
+                        "messages": messages
+                    }])
+                    # Only the messages just written leave the collection
+                    self.db.aql.execute(
+                        """
+                        FOR key IN @keys
+                            REMOVE key IN messages OPTIONS { ignoreErrors: true }
+                        """,
+                        bind_vars={"keys": [msg["_key"] for msg in live]}
+                    )
+            
             self.db.collection("conversations").update_match(
                 {"_key": conversation_id},
                 {"status": "archived", "archived_at": datetime.now().isoformat()}
             )
+            self.invalidate_context(conversation_id)
             logger.info(f"Archived conversation {conversation_id}")
             return True
         except Exception as e:
@@ -502,48 +776,40 @@ class ArangoConversationStore:
         Returns:
             Conversation statistics
         """
+        # One pass over the module's conversations and one over its messages
         query = """
-        LET conversations = (
+        LET conv_stats = FIRST(
             FOR conv IN conversations
                 FILTER @module IN conv.participants
-                RETURN conv
-        )
-        
-        LET messages_sent = (
-            FOR msg IN messages
-                FILTER msg.sender == @module
-                RETURN msg
+                COLLECT AGGREGATE
+                    total = COUNT(1),
+                    active = SUM(conv.status == "active" ? 1 : 0),
+                    partners = PUSH(REMOVE_VALUE(conv.participants, @module))
+                RETURN {total, active, partners}
         )
         
-        LET messages_received = (
+        LET msg_stats = FIRST(
             FOR msg IN messages
-                FILTER msg.receiver == @module
-                RETURN msg
+                FILTER msg.sender == @module OR msg.receiver == @module
+                COLLECT AGGREGATE
+                    sent = SUM(msg.sender == @module ? 1 : 0),
+                    received = SUM(msg.receiver == @module ? 1 : 0)
+                RETURN {sent, received}
         )
         
         RETURN {
-            total_conversations: LENGTH(conversations),
-            active_conversations: LENGTH(
-                FOR c IN conversations
-                    FILTER c.status == "active"
-                    RETURN c
-            ),
-            messages_sent: LENGTH(messages_sent),
-            messages_received: LENGTH(messages_received),
-            unique_partners: LENGTH(
-                UNIQUE(
-                    FLATTEN(
-                        FOR c IN conversations
-                            RETURN REMOVE_VALUE(c.participants, @module)
-                    )
-                )
-            )
+            total_conversations: conv_stats.total || 0,
+            active_conversations: conv_stats.active || 0,
+            messages_sent: msg_stats.sent || 0,
+            messages_received: msg_stats.received || 0,
+            unique_partners: LENGTH(UNIQUE(FLATTEN(conv_stats.partners || [])))
         }
         """
         
-        cursor = self.db.aql.execute(
+        cursor = self._execute_analytics(
+            "get_module_conversation_stats",
             query,
-            bind_vars={"module": module_name}
+            {"module": module_name}
         )
         
         return next(cursor)
@@ -577,6 +843,8 @@ class ArangoConversationStore:
         )
         
         archived = list(cursor)
+        for conv_id in archived:
+            self.invalidate_context(conv_id)
         logger.info(f"Archived {len(archived)} old conversations")
         return len(archived)
     
@@ -616,40 +884,38 @@ class ArangoConversationStore:
         Returns:
             Analytics data
         """
-        # Count conversations
-        conv_count = self.db.collection("conversations").count()
-        
-        # Count messages
-        msg_count = self.db.collection("messages").count()
-        
-        # Get active modules
+        # Per-module participation and the status breakdown are aggregated
+        # server-side; statuses are counted per conversation, so conversations
+        # without participants still count. Collection LENGTH() is answered
+        # from the collection count.
         query = """
-        FOR conv IN conversations
-            FOR participant IN conv.participants
-                COLLECT module = participant WITH COUNT INTO count
-                RETURN {module: module, conversation_count: count}
-        """
-        
-        cursor = self.db.aql.execute(query)
-        active_modules = list(cursor)
+        LET active_modules = (
+            FOR conv IN conversations
+                FOR participant IN conv.participants
+                    COLLECT module = participant WITH COUNT INTO count
+                    RETURN {module: module, conversation_count: count}
+        )
         
-        # Get status breakdown
-        status_query = """
-        FOR conv IN conversations
-            COLLECT status = conv.status WITH COUNT INTO count
-            RETURN {status: status, count: count}
-        """
+        LET statuses = (
+            FOR conv IN conversations
+                COLLECT status = conv.status WITH COUNT INTO count
+                RETURN {[status]: count}
+        )
         
-        status_cursor = self.db.aql.execute(status_query)
-        status_breakdown = {item["status"]: item["count"] for item in status_cursor}
+        LET conv_count = LENGTH(conversations)
+        LET msg_count = LENGTH(messages)
         
-        return {
-            "total_conversations": conv_count,
-            "total_messages": msg_count,
-            "active_modules": active_modules,
-            "status_breakdown": status_breakdown,
-            "average_messages_per_conversation": msg_count / conv_count if conv_count > 0 else 0
+        RETURN {
+            total_conversations: conv_count,
+            total_messages: msg_count,
+            active_modules: active_modules,
+            status_breakdown: LENGTH(statuses) > 0 ? MERGE(statuses) : {},
+            average_messages_per_conversation: conv_count > 0 ? msg_count / conv_count : 0
         }
+        """
+        
+        cursor = self._execute_analytics("get_conversation_analytics", query)
+        return next(cursor)
     
     async def get_module_interaction_graph(self) -> Dict[str, Any]:
         """Get module interaction graph data.
@@ -32,6 +32,7 @@ import threading
 
 from .graph_backend import ArangoGraphBackend, ModuleNode, CommunicationEdge
 from .arango_conversation import ArangoConversationStore
+from .query_profiler import AQLQueryProfiler
 from ..modules.communication_tracker import ProgressTracker
 
 logger = logging.getLogger(__name__)
@@ -70,13 +71,15 @@ class HybridStorage:
     def __init__(self,
                  sqlite_path: Optional[Path] = None,
                  arango_config: Optional[Dict[str, Any]] = None,
-                 sync_interval: int = 60):  # seconds
+                 sync_interval: int = 60,  # seconds
+                 profiler: Optional[AQLQueryProfiler] = None):
         """Initialize hybrid storage.
         
         Args:
             sqlite_path: Path to SQLite database
             arango_config: ArangoDB configuration
             sync_interval: Interval for syncing data to ArangoDB
+            profiler: Optional profiler shared by the ArangoDB analytics APIs
         """
         # SQLite components
         self.sqlite_path = str(sqlite_path) if sqlite_path else ":memory:"
@@ -84,11 +87,14 @@ class HybridStorage:
         self._sqlite_db: Optional[aiosqlite.Connection] = None
         
         # ArangoDB components
+        self.profiler = profiler
         self.graph_backend = ArangoGraphBackend(
-            **arango_config if arango_config else {}
+            **arango_config if arango_config else {},
+            profiler=profiler
         )
         self.conversation_store = ArangoConversationStore(
-            **arango_config if arango_config else {}
+            **arango_config if arango_config else {},
+            profiler=profiler
         )
         
         # Sync management
@@ -437,40 +443,23 @@ class HybridStorage:
             start_time=start_date
         )
         
-        # Get module-specific communications
-        comms = await self.graph_backend.get_module_communications(
+        # Partners and action frequency are aggregated server-side
+        summary = await self.graph_backend.get_module_communication_summary(
             module,
-            direction="both",
-            limit=1000
+            start_time=start_date
         )
         
         self.metrics.arango_reads += 2
         
-        # Analyze patterns
         analysis = {
             "module": module,
             "period_days": days,
-            "total_communications": len(comms),
+            "total_communications": summary["total_communications"],
             "general_stats": stats,
-            "communication_partners": set(),
-            "action_frequency": {}
+            "communication_partners": summary["communication_partners"],
+            "action_frequency": summary["action_frequency"]
         }
         
-        for comm in comms:
-            # Extract partner
-            if comm["_from"].endswith(f"/{module}"):
-                partner = comm["_to"].split("/")[1]
-            else:
-                partner = comm["_from"].split("/")[1]
-            
-            analysis["communication_partners"].add(partner)
-            
-            # Count actions
-            action = comm.get("action", "unknown")
-            analysis["action_frequency"][action] = analysis["action_frequency"].get(action, 0) + 1
-        
-        analysis["communication_partners"] = list(analysis["communication_partners"])
-        
         return analysis
     
     async def _track_performance(self,
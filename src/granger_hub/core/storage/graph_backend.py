@@ -29,6 +29,8 @@ from arango.database import StandardDatabase
 from arango.graph import Graph
 from arango.exceptions import DocumentInsertError, GraphCreateError
 
+from .query_profiler import AQLQueryProfiler
+
 logger = logging.getLogger(__name__)
 
 
@@ -73,7 +75,8 @@ class ArangoGraphBackend:
                  port: int = 8529,
                  username: str = "root",
                  password: str = "",
-                 database: str = "claude_modules"):
+                 database: str = "claude_modules",
+                 profiler: Optional[AQLQueryProfiler] = None):
         """Initialize ArangoDB connection.
         
         Args:
@@ -82,6 +85,7 @@ class ArangoGraphBackend:
             username: Database username
             password: Database password
             database: Database name
+            profiler: Optional profiler recording analytics query statistics
         """
         self.client = ArangoClient(hosts=f"http://{host}:{port}")
         self.database_name = database
@@ -89,6 +93,7 @@ class ArangoGraphBackend:
         self.password = password
         self.db: Optional[StandardDatabase] = None
         self.graph: Optional[Graph] = None
+        self.profiler = profiler
         self._initialized = False
     
     async def initialize(self):
@@ -184,9 +189,28 @@ class ArangoGraphBackend:
         communications.add_persistent_index(fields=["timestamp"], unique=False)
         communications.add_persistent_index(fields=["action"], unique=False)
         
+        # Per-module time-ordered lookups (module communications and history)
+        communications.add_persistent_index(fields=["_from", "timestamp"], unique=False)
+        communications.add_persistent_index(fields=["_to", "timestamp"], unique=False)
+        
         # Index on communication success
         communications.add_persistent_index(fields=["success"], unique=False)
     
+    def _execute_analytics(self, name: str, query: str, bind_vars: Dict[str, Any]):
+        """Execute an analytics query, recording its statistics if profiling.
+        
+        Args:
+            name: Analytics API name
+            query: AQL query
+            bind_vars: Query bind variables
+            
+        Returns:
+            Result cursor
+        """
+        if self.profiler:
+            return self.profiler.execute(self.db, name, query, bind_vars)
+        return self.db.aql.execute(query, bind_vars=bind_vars)
+    
     async def add_module(self, module: ModuleNode) -> bool:
         """Add a module node to the graph.
         
@@ -396,41 +420,83 @@ class ArangoGraphBackend:
         
         filter_clause = f"FILTER {' AND '.join(filters)}" if filters else ""
         
+        # Single pass over communications: group by action and fold the
+        # per-action aggregates into the totals.
         query = f"""
-        LET total = (
-            FOR e IN communications
-                {filter_clause}
-                RETURN 1
-        )
-        LET successful = (
-            FOR e IN communications
-                {filter_clause}
-                FILTER e.success == true
-                RETURN 1
-        )
         LET by_action = (
             FOR e IN communications
                 {filter_clause}
-                COLLECT action = e.action WITH COUNT INTO count
-                RETURN {{action: action, count: count}}
+                COLLECT action = e.action AGGREGATE
+                    count = COUNT(1),
+                    successful = SUM(e.success == true ? 1 : 0),
+                    duration_sum = SUM(e.duration_ms),
+                    duration_count = SUM(e.duration_ms != null ? 1 : 0)
+                RETURN {{
+                    action: action,
+                    count: count,
+                    successful: successful,
+                    duration_sum: duration_sum,
+                    duration_count: duration_count
+                }}
         )
-        LET avg_duration = (
+        LET total = SUM(by_action[*].count)
+        LET successful = SUM(by_action[*].successful)
+        LET duration_count = SUM(by_action[*].duration_count)
+        
+        RETURN {{
+            total_communications: total,
+            successful_communications: successful,
+            success_rate: total > 0 ? successful / total : 0,
+            by_action: (FOR a IN by_action RETURN {{action: a.action, count: a.count}}),
+            avg_duration_ms: duration_count > 0 ? SUM(by_action[*].duration_sum) / duration_count : 0
+        }}
+        """
+        
+        cursor = self._execute_analytics("get_communication_stats", query, bind_vars)
+        return next(cursor)
+    
+    async def get_module_communication_summary(self,
+                                             name: str,
+                                             start_time: Optional[datetime] = None) -> Dict[str, Any]:
+        """Get aggregated communication history for a module.
+        
+        Args:
+            name: Module name
+            start_time: Only include communications at or after this time
+            
+        Returns:
+            Total communications, partner modules and action frequency
+        """
+        bind_vars = {"module": f"modules/{name}"}
+        time_filter = ""
+        if start_time:
+            time_filter = "FILTER e.timestamp >= @start_time"
+            bind_vars["start_time"] = start_time.isoformat()
+        
+        query = f"""
+        LET groups = (
             FOR e IN communications
-                {filter_clause}
-                FILTER e.duration_ms != null
-                RETURN e.duration_ms
+                FILTER e._from == @module OR e._to == @module
+                {time_filter}
+                LET partner = PARSE_IDENTIFIER(e._from == @module ? e._to : e._from).key
+                COLLECT p = partner, action = e.action WITH COUNT INTO count
+                RETURN {{partner: p, action: action, count: count}}
+        )
+        
+        LET actions = (
+            FOR g IN groups
+                COLLECT action = g.action AGGREGATE count = SUM(g.count)
+                RETURN {{[action == null ? "unknown" : action]: count}}
         )
         
         RETURN {{
-            total_communications: LENGTH(total),
-            successful_communications: LENGTH(successful),
-            success_rate: LENGTH(total) > 0 ? LENGTH(successful) / LENGTH(total) : 0,
-            by_action: by_action,
-            avg_duration_ms: LENGTH(avg_duration) > 0 ? AVG(avg_duration) : 0
+            total_communications: SUM(groups[*].count),
+            communication_partners: UNIQUE(groups[*].partner),
+            action_frequency: LENGTH(actions) > 0 ? MERGE(actions) : {{}}
         }}
         """
         
-        cursor = self.db.aql.execute(query, bind_vars=bind_vars)
+        cursor = self._execute_analytics("get_module_communication_summary", query, bind_vars)
         return next(cursor)
     
     async def get_module_graph_structure(self) -> Dict[str, Any]:
@@ -0,0 +1,445 @@
+"""
+Local Full-Text and Vector Search over Conversation Messages.
+
+Purpose: Maintains a local search index over stored conversation messages so
+modules can find prior conversations about a subject without scanning the
+conversation store. Text is indexed in an SQLite FTS5 inverted index (BM25
+ranking); when an embedder is configured, message vectors are also added to
+an approximate nearest-neighbor index (HNSW via hnswlib when installed,
+exact NumPy search otherwise). Messages are indexed incrementally as they
+are added, and hybrid queries merge both rankings with reciprocal rank
+fusion.
+
+Third-party packages:
+- numpy: https://numpy.org/doc/
+- hnswlib (optional): https://github.com/nmslib/hnswlib
+- scikit-learn (optional, HashingEmbedder): https://scikit-learn.org/
+
+Sample Input:
+>>> index = MessageSearchIndex(Path("message_search.db"), embedder=HashingEmbedder())
+>>> index.add_message("m1", "conv_1", "marker", "arangodb", "store", {"text": "PDF tables"})
+>>> index.search_messages("pdf tables", limit=5)
+
+Expected Output:
+- [{"message_id": "m1", "conversation_id": "conv_1", "score": 0.03, ...}]
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from threading import RLock
+from typing import Dict, Any, Optional, List, Callable, Iterable, Tuple
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+Embedder = Callable[[List[str]], np.ndarray]
+
+
+class HashingEmbedder:
+    """Stateless bag-of-words embedder based on feature hashing.
+
+    Needs no fitting, so vectors can be computed incrementally for each new
+    message. Vectors are L2-normalized float32.
+    """
+
+    def __init__(self, dim: int = 256):
+        from sklearn.feature_extraction.text import HashingVectorizer
+
+        self.dim = dim
+        self._vectorizer = HashingVectorizer(
+            n_features=dim, alternate_sign=False, norm="l2", ngram_range=(1, 2)
+        )
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        return self._vectorizer.transform(texts).toarray().astype(np.float32)
+
+
+class _VectorIndex:
+    """Cosine nearest-neighbor index keyed by integer labels."""
+
+    def __init__(self, dim: int, initial_capacity: int = 10000):
+        self.dim = dim
+        self._hnsw = None
+        if hnswlib is not None:
+            self._hnsw = hnswlib.Index(space="cosine", dim=dim)
+            self._hnsw.init_index(max_elements=initial_capacity, ef_construction=200, M=16)
+            self._hnsw.set_ef(64)
+        # Exact fallback: preallocated buffers grown by doubling
+        self._size = 0
+        self._vectors = np.empty((0 if self._hnsw else initial_capacity, dim), dtype=np.float32)
+        self._labels = np.empty(len(self._vectors), dtype=np.int64)
+        # Labels marked deleted in the HNSW graph
+        self._deleted = set()
+
+    def __len__(self) -> int:
+        if self._hnsw is not None:
+            return self._hnsw.get_current_count() - len(self._deleted)
+        return self._size
+
+    def add(self, vectors: np.ndarray, labels: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self._hnsw is not None:
+            needed = self._hnsw.get_current_count() + len(labels)
+            if needed > self._hnsw.get_max_elements():
+                self._hnsw.resize_index(max(needed, 2 * self._hnsw.get_max_elements()))
+            self._hnsw.add_items(vectors, labels)
+            self._deleted.difference_update(int(l) for l in labels)
+            return
+        needed = self._size + len(labels)
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors))
+            self._vectors = np.resize(self._vectors, (capacity, self.dim))
+            self._labels = np.resize(self._labels, capacity)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        self._vectors[self._size:needed] = vectors / norms
+        self._labels[self._size:needed] = labels
+        self._size = needed
+
+    def remove(self, labels: Iterable[int]):
+        """Drop vectors by label so they are never returned again."""
+        labels = {int(l) for l in labels}
+        if not labels:
+            return
+        if self._hnsw is not None:
+            for label in labels - self._deleted:
+                try:
+                    self._hnsw.mark_deleted(label)
+                except RuntimeError:
+                    continue  # label was never added
+                self._deleted.add(label)
+            return
+        keep = ~np.isin(self._labels[:self._size], list(labels))
+        size = int(keep.sum())
+        self._vectors[:size] = self._vectors[:self._size][keep]
+        self._labels[:size] = self._labels[:self._size][keep]
+        self._size = size
+
+    def query(self, vector: np.ndarray, k: int) -> List[Tuple[int, float]]:
+        """Return (label, cosine similarity) pairs, best first, one per label."""
+        if len(self) == 0:
+            return []
+        k = min(k, len(self))
+        vector = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        if self._hnsw is not None:
+            labels, distances = self._hnsw.knn_query(vector, k=k)
+            hits = [(int(l), float(1.0 - d)) for l, d in zip(labels[0], distances[0])]
+        else:
+            norm = np.linalg.norm(vector) or 1.0
+            scores = self._vectors[:self._size] @ (vector[0] / norm)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            hits = [(int(self._labels[i]), float(scores[i])) for i in top]
+        seen = set()
+        return [h for h in hits if not (h[0] in seen or seen.add(h[0]))]
+
+
+class MessageSearchIndex:
+    """Ranked full-text and vector search over conversation messages."""
+
+    def __init__(self,
+                 db_path: Optional[Path] = None,
+                 embedder: Optional[Embedder] = None,
+                 rrf_k: int = 60):
+        """Initialize the search index.
+
+        Args:
+            db_path: SQLite file holding the index (in-memory if None)
+            embedder: Optional callable mapping a list of texts to an (n, dim) array
+            rrf_k: Reciprocal rank fusion constant for hybrid ranking
+        """
+        self.db_path = str(db_path) if db_path else ":memory:"
+        self.embedder = embedder
+        self.rrf_k = rrf_k
+        self._lock = RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        if self.db_path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+        self._vectors: Optional[_VectorIndex] = None
+        if embedder is not None:
+            self._load_vectors()
+
+    def _create_tables(self):
+        """Create document, FTS5 and vector tables."""
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS message_docs (
+                rowid INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id TEXT UNIQUE NOT NULL,
+                conversation_id TEXT NOT NULL,
+                sender TEXT,
+                receiver TEXT,
+                action TEXT,
+                timestamp TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_message_docs_conversation
+                ON message_docs (conversation_id);
+            CREATE VIRTUAL TABLE IF NOT EXISTS message_fts USING fts5(
+                body, tokenize = 'porter unicode61'
+            );
+            CREATE TABLE IF NOT EXISTS message_vectors (
+                rowid INTEGER PRIMARY KEY,
+                vector BLOB NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def _load_vectors(self):
+        """Rebuild the in-memory ANN index from stored vectors."""
+        rows = self._conn.execute("SELECT rowid, vector FROM message_vectors").fetchall()
+        if not rows:
+            return
+        vectors = np.frombuffer(b"".join(r[1] for r in rows), dtype=np.float32)
+        vectors = vectors.reshape(len(rows), -1)
+        self._vectors = _VectorIndex(vectors.shape[1], initial_capacity=max(len(rows), 10000))
+        self._vectors.add(vectors, np.array([r[0] for r in rows], dtype=np.int64))
+        logger.info(f"Loaded {len(rows)} message vectors into search index")
+
+    @staticmethod
+    def message_text(content: Any) -> str:
+        """Flatten message content into indexable text."""
+        if isinstance(content, str):
+            return content
+        if isinstance(content, dict):
+            return " ".join(MessageSearchIndex.message_text(v) for v in content.values())
+        if isinstance(content, (list, tuple)):
+            return " ".join(MessageSearchIndex.message_text(v) for v in content)
+        if content is None:
+            return ""
+        return str(content)
+
+    def add_message(self,
+                    message_id: str,
+                    conversation_id: str,
+                    sender: str,
+                    receiver: str,
+                    action: str,
+                    content: Any,
+                    timestamp: Optional[str] = None):
+        """Index a single message."""
+        self.add_messages([{
+            "id": message_id,
+            "conversation_id": conversation_id,
+            "sender": sender,
+            "receiver": receiver,
+            "action": action,
+            "content": content,
+            "timestamp": timestamp
+        }])
+
+    def add_messages(self, messages: Iterable[Dict[str, Any]]) -> int:
+        """Index a batch of messages.
+
+        Args:
+            messages: Message dicts with id, conversation_id, sender, receiver,
+                action, content and timestamp (ConversationMessage.to_dict() format)
+
+        Returns:
+            Number of newly indexed messages
+        """
+        messages = list(messages)
+        if not messages:
+            return 0
+
+        with self._lock:
+            cursor = self._conn.cursor()
+            indexed = []
+            for msg in messages:
+                cursor.execute("""
+                    INSERT OR IGNORE INTO message_docs
+                    (message_id, conversation_id, sender, receiver, action, timestamp)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (msg["id"], msg["conversation_id"], msg.get("sender"),
+                      msg.get("receiver"), msg.get("action"), msg.get("timestamp")))
+                if cursor.rowcount == 0:
+                    continue  # already indexed
+                text = " ".join(filter(None, [msg.get("action"), self.message_text(msg.get("content"))]))
+                indexed.append((cursor.lastrowid, text))
+
+            cursor.executemany("INSERT INTO message_fts (rowid, body) VALUES (?, ?)", indexed)
+
+            if self.embedder is not None and indexed:
+                rowids = np.array([r for r, _ in indexed], dtype=np.int64)
+                vectors = np.asarray(self.embedder([t for _, t in indexed]), dtype=np.float32)
+                cursor.executemany(
+                    "INSERT INTO message_vectors (rowid, vector) VALUES (?, ?)",
+                    [(int(r), v.tobytes()) for r, v in zip(rowids, vectors)]
+                )
+                if self._vectors is None:
+                    self._vectors = _VectorIndex(vectors.shape[1])
+                self._vectors.add(vectors, rowids)
+
+            self._conn.commit()
+        return len(indexed)
+
+    @staticmethod
+    def _fts_query(query: str) -> str:
+        """Quote query terms so user input cannot break FTS5 syntax."""
+        terms = [t.replace('"', '""') for t in query.split() if t.strip()]
+        return " OR ".join(f'"{t}"' for t in terms)
+
+    def _filter_clause(self,
+                       conversation_id: Optional[str],
+                       participant: Optional[str]) -> Tuple[str, List[Any]]:
+        clauses, params = [], []
+        if conversation_id:
+            clauses.append("d.conversation_id = ?")
+            params.append(conversation_id)
+        if participant:
+            clauses.append("(d.sender = ? OR d.receiver = ?)")
+            params.extend([participant, participant])
+        return "".join(f" AND {c}" for c in clauses), params
+
+    def _text_search(self, query: str, limit: int,
+                     conversation_id: Optional[str],
+                     participant: Optional[str]) -> List[Tuple[int, float]]:
+        match = self._fts_query(query)
+        if not match:
+            return []
+        where, params = self._filter_clause(conversation_id, participant)
+        rows = self._conn.execute(f"""
+            SELECT message_fts.rowid, bm25(message_fts) AS rank
+            FROM message_fts
+            JOIN message_docs d ON d.rowid = message_fts.rowid
+            WHERE message_fts MATCH ?{where}
+            ORDER BY rank
+            LIMIT ?
+        """, [match, *params, limit]).fetchall()
+        # bm25() is lower-is-better; negate so higher scores rank first
+        return [(r[0], -r[1]) for r in rows]
+
+    def _vector_search(self, query: str, limit: int,
+                       conversation_id: Optional[str],
+                       participant: Optional[str]) -> List[Tuple[int, float]]:
+        if self.embedder is None or self._vectors is None:
+            return []
+        vector = np.asarray(self.embedder([query]), dtype=np.float32)[0]
+        filtered = bool(conversation_id or participant)
+        # Over-fetch when filtering, since ANN results are filtered afterwards
+        hits = self._vectors.query(vector, limit * 10 if filtered else limit)
+        if not filtered or not hits:
+            return hits[:limit]
+        where, params = self._filter_clause(conversation_id, participant)
+        placeholders = ",".join("?" * len(hits))
+        allowed = {r[0] for r in self._conn.execute(
+            f"SELECT d.rowid FROM message_docs d WHERE d.rowid IN ({placeholders}){where}",
+            [h[0] for h in hits] + params
+        )}
+        return [h for h in hits if h[0] in allowed][:limit]
+
+    def search_messages(self,
+                        query: str,
+                        limit: int = 10,
+                        mode: str = "hybrid",
+                        conversation_id: Optional[str] = None,
+                        participant: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Search indexed messages.
+
+        Args:
+            query: Free-text query
+            limit: Maximum results
+            mode: "text" (BM25), "vector" (embedding similarity) or "hybrid"
+                (reciprocal rank fusion of both; text only without an embedder)
+            conversation_id: Restrict to one conversation
+            participant: Restrict to messages sent or received by a module
+
+        Returns:
+            Ranked message references with scores, best first
+        """
+        if mode not in ("text", "vector", "hybrid"):
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        with self._lock:
+            text_hits = [] if mode == "vector" else self._text_search(
+                query, limit, conversation_id, participant)
+            vector_hits = [] if mode == "text" else self._vector_search(
+                query, limit, conversation_id, participant)
+
+            if mode == "text" or not vector_hits:
+                ranked = text_hits
+            elif mode == "vector" or not text_hits:
+                ranked = vector_hits
+            else:
+                fused: Dict[int, float] = {}
+                for hits in (text_hits, vector_hits):
+                    for rank, (rowid, _) in enumerate(hits):
+                        fused[rowid] = fused.get(rowid, 0.0) + 1.0 / (self.rrf_k + rank + 1)
+                ranked = sorted(fused.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+            if not ranked:
+                return []
+
+            placeholders = ",".join("?" * len(ranked))
+            docs = {r[0]: r for r in self._conn.execute(f"""
+                SELECT rowid, message_id, conversation_id, sender, receiver, action, timestamp
+                FROM message_docs WHERE rowid IN ({placeholders})
+            """, [r for r, _ in ranked])}
+
+        return [
+            {
+                "message_id": docs[rowid][1],
+                "conversation_id": docs[rowid][2],
+                "sender": docs[rowid][3],
+                "receiver": docs[rowid][4],
+                "action": docs[rowid][5],
+                "timestamp": docs[rowid][6],
+                "score": score
+            }
+            for rowid, score in ranked if rowid in docs
+        ]
+
+    def search_conversations(self, query: str, limit: int = 10, **kwargs) -> List[Dict[str, Any]]:
+        """Rank conversations by their best matching messages.
+
+        Args:
+            query: Free-text query
+            limit: Maximum conversations
+            **kwargs: Passed to search_messages
+
+        Returns:
+            [{"conversation_id", "score", "matches"}], best first
+        """
+        hits = self.search_messages(query, limit=limit * 5, **kwargs)
+        conversations: Dict[str, Dict[str, Any]] = {}
+        for hit in hits:
+            conv = conversations.setdefault(
+                hit["conversation_id"],
+                {"conversation_id": hit["conversation_id"], "score": 0.0, "matches": []}
+            )
+            conv["score"] = max(conv["score"], hit["score"])
+            conv["matches"].append(hit["message_id"])
+        return sorted(conversations.values(), key=lambda c: c["score"], reverse=True)[:limit]
+
+    def remove_conversation(self, conversation_id: str) -> int:
+        """Remove a conversation's messages from the text and vector indexes.
+
+        Document rowids are never reused (AUTOINCREMENT), so a removed
+        message's vector cannot be matched to a message indexed later.
+        """
+        with self._lock:
+            rowids = [r[0] for r in self._conn.execute(
+                "SELECT rowid FROM message_docs WHERE conversation_id = ?", (conversation_id,)
+            )]
+            self._conn.executemany("DELETE FROM message_fts WHERE rowid = ?", [(r,) for r in rowids])
+            self._conn.executemany("DELETE FROM message_vectors WHERE rowid = ?", [(r,) for r in rowids])
+            self._conn.execute("DELETE FROM message_docs WHERE conversation_id = ?", (conversation_id,))
+            self._conn.commit()
+            if self._vectors is not None:
+                self._vectors.remove(rowids)
+        return len(rowids)
+
+    def count(self) -> int:
+        """Number of indexed messages."""
+        return self._conn.execute("SELECT COUNT(*) FROM message_docs").fetchone()[0]
+
+    def close(self):
+        """Close the index database."""
+        self._conn.close()
@@ -0,0 +1,158 @@
+"""
+AQL Query Profiler for Storage Analytics APIs.
+
+Purpose: Executes analytics queries with ArangoDB profiling enabled and keeps
+per-API execution statistics (server execution time, documents scanned via
+full collection scans vs. indexes, peak memory) so regressions in the
+analytics endpoints show up in benchmarks.
+
+Third-party packages:
+- python-arango: https://docs.python-arango.com/
+
+Sample Input:
+- profiler.execute(db, "get_communication_stats", "FOR e IN communications ...", {})
+
+Expected Output:
+- Cursor over the query results, with the run recorded under its API name
+- profiler.summary() -> {"get_communication_stats": {"calls": 10, "avg_execution_time_ms": 1.2, ...}}
+"""
+
+import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Deque
+
+from arango.cursor import Cursor
+from arango.database import StandardDatabase
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryProfile:
+    """Execution statistics for a single profiled AQL query."""
+    name: str
+    recorded_at: str
+    execution_time_ms: float
+    round_trip_ms: float
+    scanned_full: int = 0
+    scanned_index: int = 0
+    filtered: int = 0
+    peak_memory_usage: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return asdict(self)
+
+
+class AQLQueryProfiler:
+    """Records AQL execution statistics per analytics API."""
+
+    def __init__(self, enabled: bool = True, max_records_per_query: int = 1000):
+        """Initialize profiler.
+
+        Args:
+            enabled: Whether queries are executed with profiling turned on
+            max_records_per_query: Number of recent runs kept per API name
+        """
+        self.enabled = enabled
+        self.max_records_per_query = max_records_per_query
+        self._profiles: Dict[str, Deque[QueryProfile]] = defaultdict(
+            lambda: deque(maxlen=self.max_records_per_query)
+        )
+
+    def execute(self,
+                db: StandardDatabase,
+                name: str,
+                query: str,
+                bind_vars: Optional[Dict[str, Any]] = None) -> Cursor:
+        """Execute a query and record its statistics under ``name``.
+
+        Args:
+            db: Database to run the query against
+            name: Analytics API name the query belongs to
+            query: AQL query
+            bind_vars: Query bind variables
+
+        Returns:
+            Result cursor
+        """
+        if not self.enabled:
+            return db.aql.execute(query, bind_vars=bind_vars or {})
+
+        start = time.perf_counter()
+        cursor = db.aql.execute(query, bind_vars=bind_vars or {}, profile=True)
+        round_trip_ms = (time.perf_counter() - start) * 1000
+        self.record(name, cursor, round_trip_ms)
+        return cursor
+
+    def record(self, name: str, cursor: Cursor, round_trip_ms: float = 0.0) -> QueryProfile:
+        """Record statistics from an executed cursor.
+
+        Args:
+            name: Analytics API name
+            cursor: Cursor returned by a profiled query
+            round_trip_ms: Client-side round trip time
+
+        Returns:
+            The recorded profile
+        """
+        stats = cursor.statistics() or {}
+        profile = QueryProfile(
+            name=name,
+            recorded_at=datetime.now().isoformat(),
+            execution_time_ms=float(stats.get("execution_time", 0.0)) * 1000,
+            round_trip_ms=round_trip_ms,
+            scanned_full=int(stats.get("scanned_full", 0)),
+            scanned_index=int(stats.get("scanned_index", 0)),
+            filtered=int(stats.get("filtered", 0)),
+            peak_memory_usage=int(stats.get("peak_memory_usage", 0))
+        )
+        self._profiles[name].append(profile)
+        logger.debug(
+            f"AQL {name}: {profile.execution_time_ms:.2f}ms, "
+            f"full={profile.scanned_full}, index={profile.scanned_index}"
+        )
+        return profile
+
+    def get_profiles(self, name: str) -> List[QueryProfile]:
+        """Get recorded runs for an analytics API.
+
+        Args:
+            name: Analytics API name
+
+        Returns:
+            Recorded profiles, oldest first
+        """
+        return list(self._profiles.get(name, []))
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Summarize recorded runs per analytics API.
+
+        Returns:
+            Mapping of API name to aggregate execution statistics
+        """
+        result = {}
+        for name, profiles in self._profiles.items():
+            if not profiles:
+                continue
+            times = sorted(p.execution_time_ms for p in profiles)
+            calls = len(times)
+            result[name] = {
+                "calls": calls,
+                "avg_execution_time_ms": sum(times) / calls,
+                "p50_execution_time_ms": times[calls // 2],
+                "p95_execution_time_ms": times[min(calls - 1, int(calls * 0.95))],
+                "max_execution_time_ms": times[-1],
+                "avg_round_trip_ms": sum(p.round_trip_ms for p in profiles) / calls,
+                "avg_scanned_full": sum(p.scanned_full for p in profiles) / calls,
+                "avg_scanned_index": sum(p.scanned_index for p in profiles) / calls,
+                "max_peak_memory_usage": max(p.peak_memory_usage for p in profiles)
+            }
+        return result
+
+    def reset(self):
+        """Discard all recorded profiles."""
+        self._profiles.clear()
@@ -9,7 +9,7 @@ This module provides forecasting capabilities that can be invoked through:
 - MCP: forecast action with data input
 
 Features:
-- Multiple model backends (PatchTST, Ollama, sklearn)
+- Multiple model backends (PatchTST, Ollama, statistical, sklearn)
 - Interactive D3.js visualizations
 - Streaming data support
 - Confidence intervals
@@ -29,9 +29,14 @@ from .model_backends import (
     ModelConfig,
     PatchTSTBackend,
     OllamaBackend,
-    StreamingForecastWrapper
+    StreamingForecastWrapper,
+    MultiStreamForecaster
 )
+from .statistical import StatisticalBackend
 from .visualization import ForecastVisualizer
+from .service import ForecastService
+from .cache import ForecastCache
+from .profiling import DataProfiler, profile_matrix
 
 __all__ = [
     # Main classes
@@ -39,6 +44,9 @@ __all__ = [
     "TimeSeriesRegressor",
     "StreamingTimeSeriesRegressor",
     "ForecastVisualizer",
+    "ForecastService",
+    "ForecastCache",
+    "DataProfiler",
     
     # Data structures
     "TimeSeriesData",
@@ -50,9 +58,12 @@ __all__ = [
     "load_time_series",
     "save_forecast_results",
     "create_backend",
+    "profile_matrix",
     
     # Backends
     "PatchTSTBackend",
     "OllamaBackend",
-    "StreamingForecastWrapper"
+    "StreamingForecastWrapper",
+    "MultiStreamForecaster",
+    "StatisticalBackend"
 ]
\ No newline at end of file
@@ -0,0 +1,239 @@
+"""
+Forecast result cache keyed on a fingerprint of the input data.
+Module: cache.py
+
+Forecasts are stored in SQLite under a hash of the exact input window
+(dtype, shape and bytes) plus the model, horizon and configuration, so
+re-running a forecast on unchanged data skips the model entirely. Rolling
+(backtest) predictions are also stored per series prefix, keyed by a
+fingerprint of the series' first points: when a series only gained new
+points at the end, the predictions of every window that lies within the
+cached prefix are reused and only the tail is computed.
+The least recently used entries are evicted once the cache holds more
+than max_entries.
+
+Sample Input:
+>>> cache = ForecastCache(Path("data/forecast_cache.db"))
+>>> key = forecast_cache_key(window, model="ollama", horizon=24)
+>>> cache.put(key, {"predictions": predictions})
+
+Expected Output:
+>>> cache.get(key)["predictions"]
+array([...])
+"""
+
+import hashlib
+import json
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Default forecast cache path
+FORECAST_CACHE_PATH = Path("data/forecast_cache.db")
+
+# Cached prefixes of one series checked per rolling lookup
+ROLLING_CANDIDATES = 8
+
+# Leading points that identify a series when no head length is given
+ROLLING_HEAD = 64
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS forecasts (
+        key TEXT PRIMARY KEY,
+        payload BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS rolling (
+        params_key TEXT NOT NULL,
+        series_key TEXT NOT NULL,
+        fingerprint TEXT NOT NULL,
+        length INTEGER NOT NULL,
+        predictions BLOB NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL,
+        PRIMARY KEY (params_key, fingerprint)
+    );
+    CREATE INDEX IF NOT EXISTS idx_forecasts_access ON forecasts(last_access);
+    CREATE INDEX IF NOT EXISTS idx_rolling_access ON rolling(last_access);
+    CREATE INDEX IF NOT EXISTS idx_rolling_series ON rolling(params_key, series_key, length);
+"""
+
+
+def data_fingerprint(values: Any) -> str:
+    """Hash an array's dtype, shape and contents."""
+    values = np.ascontiguousarray(values)
+    digest = hashlib.sha256(f"{values.dtype.str}{values.shape}".encode("utf-8"))
+    digest.update(values.data)
+    return digest.hexdigest()
+
+
+def params_cache_key(**params: Any) -> str:
+    """Hash model/configuration parameters."""
+    return hashlib.sha256(
+        json.dumps(params, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def forecast_cache_key(window: Any, **params: Any) -> str:
+    """Key for a forecast of window under the given model/configuration."""
+    return params_cache_key(data=data_fingerprint(window), **params)
+
+
+class ForecastCache:
+    """SQLite-backed forecast cache with LRU eviction and prefix reuse."""
+
+    def __init__(self, path: Optional[Path] = FORECAST_CACHE_PATH, max_entries: int = 1000,
+                 ttl_seconds: Optional[float] = None):
+        """
+        Args:
+            path: SQLite file; an in-memory database is used when None
+            max_entries: Entries per table kept before least recently used ones are evicted
+            ttl_seconds: Seconds an entry stays valid (no expiry when None)
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        else:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(rolling)")}
+        if columns and "series_key" not in columns:
+            # Rolling entries written before series keys cannot be looked up
+            self._conn.execute("DROP TABLE rolling")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.windows_reused = 0
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ForecastCache":
+        # A shared resource: copies of an estimator (sklearn clone) use the same cache
+        return self
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached forecast, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, created_at FROM forecasts WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._expired(row[1], now):
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE forecasts SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        """Store a forecast, evicting least recently used entries."""
+        now = time.time()
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO forecasts (key, payload, created_at, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, payload, now, now)
+            )
+            self._evict("forecasts", now)
+            self._conn.commit()
+
+    def get_rolling(self, params_key: str, values: np.ndarray,
+                    head: int = ROLLING_HEAD) -> Optional[np.ndarray]:
+        """
+        Get rolling predictions cached for the longest stored prefix of values.
+
+        Args:
+            params_key: Model/configuration key
+            values: The series
+            head: Leading points that identify the series (use the same
+                value as for put_rolling, e.g. the context length)
+
+        Returns:
+            Predictions of every window of that prefix (the first rows of
+            the predictions for values), or None if no prefix is cached
+        """
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT fingerprint, length, predictions, created_at FROM rolling "
+                "WHERE params_key = ? AND series_key = ? AND length <= ? "
+                "ORDER BY length DESC LIMIT ?",
+                (params_key, data_fingerprint(values[:head]), len(values), ROLLING_CANDIDATES)
+            ).fetchall()
+            for fingerprint, length, predictions, created_at in rows:
+                if self._expired(created_at, now) or data_fingerprint(values[:length]) != fingerprint:
+                    continue
+                self._conn.execute(
+                    "UPDATE rolling SET last_access = ? WHERE params_key = ? AND fingerprint = ?",
+                    (now, params_key, fingerprint)
+                )
+                self._conn.commit()
+                self.hits += 1
+                predictions = pickle.loads(predictions)
+                self.windows_reused += len(predictions)
+                return predictions
+            self.misses += 1
+        return None
+
+    def put_rolling(self, params_key: str, values: np.ndarray, predictions: np.ndarray,
+                    head: int = ROLLING_HEAD):
+        """Store the rolling predictions of every window of values (see get_rolling)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rolling "
+                "(params_key, series_key, fingerprint, length, predictions, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (params_key, data_fingerprint(values[:head]), data_fingerprint(values), len(values),
+                 pickle.dumps(np.asarray(predictions), protocol=pickle.HIGHEST_PROTOCOL), now, now)
+            )
+            self._evict("rolling", now)
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM forecasts")
+            self._conn.execute("DELETE FROM rolling")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry counts and hit/miss counters."""
+        with self._lock:
+            (forecasts,) = self._conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()
+            (rolling,) = self._conn.execute("SELECT COUNT(*) FROM rolling").fetchone()
+        return {
+            "forecasts": forecasts,
+            "rolling": rolling,
+            "hits": self.hits,
+            "misses": self.misses,
+            "windows_reused": self.windows_reused,
+            "max_entries": self.max_entries
+        }
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at >= self.ttl_seconds
+
+    def _evict(self, table: str, now: float):
+        if self.ttl_seconds is not None:
+            self._conn.execute(f"DELETE FROM {table} WHERE created_at <= ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            f"DELETE FROM {table} WHERE rowid IN ("
+            f"SELECT rowid FROM {table} ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
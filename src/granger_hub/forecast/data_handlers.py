@@ -5,7 +5,9 @@ Module: data_handlers.py
 Handles loading from various formats (CSV, JSON, etc.) and saving results.
 
 Sample input formats:
-- CSV: timestamp,value columns or just value column
+- CSV: timestamp,value columns or just value column (read in chunks)
+- Parquet: read by row group (requires pyarrow)
+- NPY: 1D array, memory-mapped
 - JSON: {"timestamps": [...], "values": [...]}
 - Array: Direct numpy array or list
 
@@ -14,54 +16,71 @@ Expected output: TimeSeriesData object with values, timestamps, and metadata
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Union, Tuple, Any
+from typing import Iterator, List, Optional, Dict, Union, Tuple, Any
 import numpy as np
 import pandas as pd
+import io
 import json
+import os
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Column names tried when no timestamp column is given
+TIMESTAMP_COLUMN_NAMES = ['timestamp', 'time', 'date', 'datetime', 'ts']
+
+# Rows read to pick the value/timestamp columns before projecting
+SAMPLE_ROWS = 1000
+
+# Rows parsed per CSV chunk / batch
+CHUNK_ROWS = 1_000_000
+
+# Leading intervals used to detect the sampling frequency
+FREQUENCY_SAMPLE_SIZE = 1000
+
 
 @dataclass
 class TimeSeriesData:
     """Container for time series data."""
     values: np.ndarray
-    timestamps: Optional[List[datetime]] = None
+    timestamps: Optional[np.ndarray] = None  # datetime64[ns]
     frequency: Optional[str] = None  # hourly, daily, weekly, etc.
     metadata: Dict[str, Any] = None
     
     def __post_init__(self):
-        # Ensure values is numpy array
+        # Ensure values is numpy array (memory-mapped arrays are kept as is)
         if not isinstance(self.values, np.ndarray):
             self.values = np.array(self.values)
         
         # Generate timestamps if not provided
         if self.timestamps is None:
             self.timestamps = self._generate_timestamps()
+        else:
+            self.timestamps = _as_datetime64(self.timestamps)
         
         # Detect frequency if not provided
         if self.frequency is None and len(self.timestamps) > 1:
             self.frequency = self._detect_frequency()
     
-    def _generate_timestamps(self) -> List[datetime]:
-        """Generate default timestamps."""
-        base = datetime.now()
-        return [base - timedelta(hours=len(self.values)-i-1) for i in range(len(self.values))]
+    @property
+    def last_timestamp(self) -> pd.Timestamp:
+        """Most recent timestamp (a datetime subclass)."""
+        return pd.Timestamp(self.timestamps[-1])
+    
+    def _generate_timestamps(self) -> np.ndarray:
+        """Generate default hourly timestamps ending now."""
+        now = np.datetime64(datetime.now(), 'ns')
+        return now - np.arange(len(self.values) - 1, -1, -1) * np.timedelta64(1, 'h')
     
     def _detect_frequency(self) -> str:
         """Detect the frequency of the time series."""
         if len(self.timestamps) < 2:
             return "unknown"
         
-        # Calculate average time delta
-        deltas = []
-        for i in range(1, min(10, len(self.timestamps))):
-            delta = self.timestamps[i] - self.timestamps[i-1]
-            deltas.append(delta.total_seconds())
-        
-        avg_seconds = np.mean(deltas)
+        # Typical spacing of the first observations
+        deltas = np.diff(self.timestamps[:FREQUENCY_SAMPLE_SIZE + 1]) / np.timedelta64(1, 's')
+        avg_seconds = np.median(deltas)
         
         # Determine frequency
         if avg_seconds < 120:  # Less than 2 minutes
@@ -76,6 +95,16 @@ class TimeSeriesData:
             return "monthly"
 
 
+def _as_datetime64(timestamps: Any) -> np.ndarray:
+    """Convert timestamps to a datetime64[ns] array (timezone-aware ones to naive UTC)."""
+    if isinstance(timestamps, np.ndarray) and timestamps.dtype == np.dtype('datetime64[ns]'):
+        return timestamps
+    index = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    if index.tz is not None:
+        index = index.tz_convert(None)
+    return index.to_numpy(dtype='datetime64[ns]')
+
+
 @dataclass
 class ForecastResult:
     """Container for forecast results."""
@@ -89,16 +118,21 @@ def load_time_series(
     file_path: Union[str, Path],
     value_column: Optional[str] = None,
     timestamp_column: Optional[str] = None,
-    date_format: Optional[str] = None
+    date_format: Optional[str] = None,
+    tail: Optional[int] = None
 ) -> TimeSeriesData:
     """
     Load time series data from various file formats.
     
+    CSV and Parquet files are read in chunks/row groups with only the value
+    and timestamp columns parsed; .npy files are memory-mapped.
+    
     Args:
         file_path: Path to the data file
         value_column: Name of the value column (auto-detected if None)
         timestamp_column: Name of the timestamp column (optional)
         date_format: Format string for parsing dates
+        tail: Only load the last N rows (e.g. the model's context_length)
         
     Returns:
         TimeSeriesData object
@@ -112,68 +146,218 @@ def load_time_series(
     suffix = file_path.suffix.lower()
     
     if suffix == '.csv':
-        return _load_csv(file_path, value_column, timestamp_column, date_format)
+        data = _load_csv(file_path, value_column, timestamp_column, date_format, tail)
+    elif suffix in ['.parquet', '.pq']:
+        data = _load_parquet(file_path, value_column, timestamp_column, date_format, tail)
+    elif suffix == '.npy':
+        data = _load_npy(file_path, tail)
     elif suffix == '.json':
-        return _load_json(file_path)
+        data = _load_json(file_path)
     elif suffix in ['.txt', '.dat']:
-        return _load_text(file_path)
+        data = _load_text(file_path)
     elif suffix in ['.xlsx', '.xls']:
-        return _load_excel(file_path, value_column, timestamp_column)
+        data = _load_excel(file_path, value_column, timestamp_column)
     else:
         # Try to load as text
-        return _load_text(file_path)
+        data = _load_text(file_path)
+    
+    if tail and len(data.values) > tail and suffix not in ['.csv', '.parquet', '.pq', '.npy']:
+        data = TimeSeriesData(
+            values=data.values[-tail:],
+            timestamps=data.timestamps[-tail:],
+            frequency=data.frequency,
+            metadata=data.metadata
+        )
+    return data
+
+
+def iter_time_series_chunks(
+    file_path: Union[str, Path],
+    value_column: Optional[str] = None,
+    timestamp_column: Optional[str] = None,
+    date_format: Optional[str] = None,
+    chunk_rows: int = CHUNK_ROWS
+) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    """
+    Stream a CSV, Parquet or .npy file in chunks.
+    
+    Args:
+        file_path: Path to the data file
+        value_column: Name of the value column (auto-detected if None)
+        timestamp_column: Name of the timestamp column (optional)
+        date_format: Format string for parsing dates
+        chunk_rows: Rows per CSV chunk / .npy slice (Parquet yields row groups)
+        
+    Yields:
+        (values, timestamps) arrays per chunk; timestamps are datetime64[ns]
+        or None when the file has no timestamp column
+    """
+    file_path = Path(file_path)
+    suffix = file_path.suffix.lower()
+    
+    if suffix == '.csv':
+        columns, sample = _read_csv_sample(file_path)
+        value_column, timestamp_column = _select_columns(
+            sample, value_column, timestamp_column, date_format
+        )
+        for chunk in pd.read_csv(file_path, usecols=_projection(value_column, timestamp_column),
+                                 chunksize=chunk_rows):
+            yield _column_arrays(chunk, value_column, timestamp_column, date_format)
+    
+    elif suffix in ['.parquet', '.pq']:
+        parquet_file = _open_parquet(file_path)
+        value_column, timestamp_column = _select_parquet_columns(
+            parquet_file, value_column, timestamp_column, date_format
+        )
+        projection = _projection(value_column, timestamp_column)
+        for group in range(parquet_file.num_row_groups):
+            frame = parquet_file.read_row_group(group, columns=projection).to_pandas()
+            yield _column_arrays(frame, value_column, timestamp_column, date_format)
+    
+    elif suffix == '.npy':
+        values = _open_npy(file_path)
+        for start in range(0, len(values), chunk_rows):
+            yield values[start:start + chunk_rows], None
+    
+    else:
+        raise ValueError(f"Chunked loading is not supported for {suffix} files")
+
+
+def _projection(value_column: str, timestamp_column: Optional[str]) -> List[str]:
+    """Columns to read from the file."""
+    return [timestamp_column, value_column] if timestamp_column else [value_column]
+
+
+def _select_columns(
+    sample: pd.DataFrame,
+    value_column: Optional[str],
+    timestamp_column: Optional[str],
+    date_format: Optional[str]
+) -> Tuple[str, Optional[str]]:
+    """Pick the value and timestamp columns from a sample of the data."""
+    # Find value column
+    if value_column:
+        if value_column not in sample.columns:
+            raise ValueError(f"Column '{value_column}' not found in data")
+    else:
+        # Auto-detect numeric column
+        numeric_cols = sample.select_dtypes(include=[np.number]).columns
+        if len(numeric_cols) == 0:
+            raise ValueError("No numeric columns found in data")
+        
+        # Use the last numeric column as values
+        value_column = numeric_cols[-1]
+        logger.info(f"Auto-selected column '{value_column}' as values")
+    
+    # Find timestamp column
+    if timestamp_column:
+        return value_column, timestamp_column if timestamp_column in sample.columns else None
+    
+    # Look for common timestamp column names
+    for col_name in TIMESTAMP_COLUMN_NAMES:
+        if col_name in sample.columns:
+            try:
+                pd.to_datetime(sample[col_name], format=date_format)
+                logger.info(f"Auto-detected timestamp column: {col_name}")
+                return value_column, col_name
+            except (ValueError, TypeError):
+                continue
+    return value_column, None
+
+
+def _column_arrays(
+    frame: pd.DataFrame,
+    value_column: str,
+    timestamp_column: Optional[str],
+    date_format: Optional[str]
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Values and datetime64[ns] timestamps of a frame."""
+    values = frame[value_column].to_numpy()
+    timestamps = None
+    if timestamp_column:
+        timestamps = _as_datetime64(pd.to_datetime(frame[timestamp_column], format=date_format))
+    return values, timestamps
+
+
+def _concat_chunks(
+    chunks: List[Tuple[np.ndarray, Optional[np.ndarray]]]
+) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Join chunk arrays (empty input gives empty arrays)."""
+    if not chunks:
+        return np.empty(0), None
+    values = np.concatenate([values for values, _ in chunks])
+    timestamps = None
+    if chunks[0][1] is not None:
+        timestamps = np.concatenate([timestamps for _, timestamps in chunks])
+    return values, timestamps
+
+
+def _read_csv_sample(file_path: Path) -> Tuple[List[str], pd.DataFrame]:
+    """Header and the first SAMPLE_ROWS rows of a CSV."""
+    sample = pd.read_csv(file_path, nrows=SAMPLE_ROWS)
+    return list(sample.columns), sample
+
+
+def _read_csv_tail(
+    file_path: Path,
+    n_rows: int,
+    columns: List[str],
+    usecols: List[str],
+    block_size: int = 1 << 20
+) -> pd.DataFrame:
+    """Parse only the last n_rows lines of a CSV by reading backwards from the end."""
+    with open(file_path, 'rb') as f:
+        header_end = len(f.readline())
+        position = f.seek(0, os.SEEK_END)
+        data = b""
+        while position > header_end and data.count(b"\n") <= n_rows:
+            read_size = min(block_size, position - header_end)
+            position -= read_size
+            f.seek(position)
+            data = f.read(read_size) + data
+    
+    lines = data.splitlines()
+    if position > header_end:
+        # The first line read may start mid-row
+        lines = lines[1:]
+    lines = [line for line in lines if line.strip()][-n_rows:]
+    return pd.read_csv(io.BytesIO(b"\n".join(lines)), header=None, names=columns, usecols=usecols)
 
 
 def _load_csv(
     file_path: Path,
     value_column: Optional[str],
     timestamp_column: Optional[str],
-    date_format: Optional[str]
+    date_format: Optional[str],
+    tail: Optional[int] = None
 ) -> TimeSeriesData:
-    """Load time series from CSV file."""
+    """Load time series from CSV file (projected columns, chunked or tail-only)."""
     try:
-        # Read CSV
-        df = pd.read_csv(file_path)
-        
-        # Find value column
-        if value_column:
-            if value_column not in df.columns:
-                raise ValueError(f"Column '{value_column}' not found in CSV")
-            values = df[value_column].values
-        else:
-            # Auto-detect numeric column
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
-            if len(numeric_cols) == 0:
-                raise ValueError("No numeric columns found in CSV")
-            
-            # Use the last numeric column as values
-            value_column = numeric_cols[-1]
-            values = df[value_column].values
-            logger.info(f"Auto-selected column '{value_column}' as values")
+        columns, sample = _read_csv_sample(file_path)
+        value_column, timestamp_column = _select_columns(
+            sample, value_column, timestamp_column, date_format
+        )
+        projection = _projection(value_column, timestamp_column)
         
-        # Find timestamp column
-        timestamps = None
-        if timestamp_column:
-            if timestamp_column in df.columns:
-                timestamps = pd.to_datetime(df[timestamp_column], format=date_format).tolist()
+        if tail and len(sample) < SAMPLE_ROWS:
+            # Whole file already read
+            values, timestamps = _column_arrays(sample.iloc[-tail:], value_column, timestamp_column, date_format)
+        elif tail:
+            frame = _read_csv_tail(file_path, tail, columns, projection)
+            values, timestamps = _column_arrays(frame, value_column, timestamp_column, date_format)
         else:
-            # Look for common timestamp column names
-            for col_name in ['timestamp', 'time', 'date', 'datetime', 'ts']:
-                if col_name in df.columns:
-                    try:
-                        timestamps = pd.to_datetime(df[col_name], format=date_format).tolist()
-                        logger.info(f"Auto-detected timestamp column: {col_name}")
-                        break
-                    except:
-                        continue
+            values, timestamps = _concat_chunks(list(iter_time_series_chunks(
+                file_path, value_column, timestamp_column, date_format
+            )))
         
         # Create metadata
         metadata = {
             'source_file': str(file_path),
             'value_column': value_column,
             'timestamp_column': timestamp_column,
-            'shape': df.shape,
-            'columns': list(df.columns)
+            'shape': (len(values), len(columns)),
+            'columns': columns,
+            'tail': tail
         }
         
         return TimeSeriesData(
@@ -187,6 +371,92 @@ def _load_csv(
         raise
 
 
+def _open_parquet(file_path: Path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Parquet support requires pyarrow. Install with: pip install pyarrow")
+    return pq.ParquetFile(file_path)
+
+
+def _select_parquet_columns(
+    parquet_file,
+    value_column: Optional[str],
+    timestamp_column: Optional[str],
+    date_format: Optional[str]
+) -> Tuple[str, Optional[str]]:
+    """Pick columns from the first rows of the first row group."""
+    if parquet_file.num_row_groups == 0:
+        sample = parquet_file.schema_arrow.empty_table().to_pandas()
+    else:
+        sample = parquet_file.read_row_group(0).slice(0, SAMPLE_ROWS).to_pandas()
+    return _select_columns(sample, value_column, timestamp_column, date_format)
+
+
+def _load_parquet(
+    file_path: Path,
+    value_column: Optional[str],
+    timestamp_column: Optional[str],
+    date_format: Optional[str],
+    tail: Optional[int] = None
+) -> TimeSeriesData:
+    """Load time series from Parquet, reading only the needed columns and row groups."""
+    parquet_file = _open_parquet(file_path)
+    value_column, timestamp_column = _select_parquet_columns(
+        parquet_file, value_column, timestamp_column, date_format
+    )
+    projection = _projection(value_column, timestamp_column)
+    
+    groups = range(parquet_file.num_row_groups)
+    if tail:
+        # Walk back from the last row group until it covers the tail
+        metadata = parquet_file.metadata
+        rows, first = 0, parquet_file.num_row_groups
+        while first > 0 and rows < tail:
+            first -= 1
+            rows += metadata.row_group(first).num_rows
+        groups = range(first, parquet_file.num_row_groups)
+    
+    values, timestamps = _concat_chunks([
+        _column_arrays(parquet_file.read_row_group(group, columns=projection).to_pandas(),
+                       value_column, timestamp_column, date_format)
+        for group in groups
+    ])
+    if tail:
+        values = values[-tail:]
+        timestamps = timestamps[-tail:] if timestamps is not None else None
+    
+    return TimeSeriesData(
+        values=values,
+        timestamps=timestamps,
+        metadata={
+            'source_file': str(file_path),
+            'value_column': value_column,
+            'timestamp_column': timestamp_column,
+            'columns': parquet_file.schema_arrow.names,
+            'tail': tail
+        }
+    )
+
+
+def _open_npy(file_path: Path) -> np.ndarray:
+    values = np.load(file_path, mmap_mode='r')
+    if values.ndim != 1:
+        raise ValueError(f"Expected a 1D array in {file_path}, got shape {values.shape}")
+    return values
+
+
+def _load_npy(file_path: Path, tail: Optional[int] = None) -> TimeSeriesData:
+    """Load a 1D .npy array memory-mapped (only touched pages are read)."""
+    values = _open_npy(file_path)
+    if tail:
+        values = values[-tail:]
+    return TimeSeriesData(
+        values=values,
+        metadata={'source_file': str(file_path), 'tail': tail}
+    )
+
+
 def _load_json(file_path: Path) -> TimeSeriesData:
     """Load time series from JSON file."""
     try:
@@ -269,10 +539,23 @@ def _load_excel(
     """Load time series from Excel file."""
     try:
         df = pd.read_excel(file_path)
-        # Use same logic as CSV
-        return _load_csv(file_path, value_column, timestamp_column, None)
     except ImportError:
         raise ImportError("Excel support requires openpyxl. Install with: pip install openpyxl")
+    
+    # Use same column selection as CSV
+    value_column, timestamp_column = _select_columns(df, value_column, timestamp_column, None)
+    values, timestamps = _column_arrays(df, value_column, timestamp_column, None)
+    return TimeSeriesData(
+        values=values,
+        timestamps=timestamps,
+        metadata={
+            'source_file': str(file_path),
+            'value_column': value_column,
+            'timestamp_column': timestamp_column,
+            'shape': df.shape,
+            'columns': list(df.columns)
+        }
+    )
 
 
 def save_forecast_results(
@@ -321,9 +604,9 @@ def _save_csv(
     df = pd.DataFrame(data)
     
     # Add index or timestamps
-    if original_data and original_data.timestamps:
+    if original_data is not None and len(original_data.timestamps):
         # Generate future timestamps
-        last_ts = original_data.timestamps[-1]
+        last_ts = original_data.last_timestamp
         freq = original_data.frequency or 'hourly'
         
         if freq == 'hourly':
@@ -17,6 +17,7 @@ import json
 import logging
 
 from .ollama_forecast import OllamaForecaster
+from .cache import ForecastCache
 from .patches import PatchTransformer
 from .data_handlers import TimeSeriesData, ForecastResult
 
@@ -41,14 +42,21 @@ class ForecastConfig:
 class TimeSeriesForecaster:
     """Main forecaster that combines patching and Ollama for predictions."""
     
-    def __init__(self, config: Optional[ForecastConfig] = None):
+    def __init__(
+        self,
+        config: Optional[ForecastConfig] = None,
+        ollama_forecaster: Optional[OllamaForecaster] = None,
+        cache: Optional[ForecastCache] = None
+    ):
         self.config = config or ForecastConfig()
         self.patch_transformer = PatchTransformer(
             patch_length=self.config.patch_length,
             stride=self.config.stride
         )
-        self.ollama_forecaster = OllamaForecaster(
-            model_name=self.config.model_name
+        # Share one forecaster to avoid re-selecting the model over HTTP
+        self.ollama_forecaster = ollama_forecaster or OllamaForecaster(
+            model_name=self.config.model_name,
+            cache=cache
         )
         
     def forecast(
@@ -95,7 +103,7 @@ class TimeSeriesForecaster:
             )
             
             # Step 6: Create forecast timestamps
-            last_timestamp = time_series.timestamps[-1]
+            last_timestamp = time_series.last_timestamp
             forecast_timestamps = self._generate_timestamps(
                 last_timestamp, 
                 horizon, 
@@ -0,0 +1,213 @@
+"""
+CPU inference runtimes for PatchTST.
+Module: inference.py
+
+Loads each PatchTST model once per process and prepares it for CPU
+serving: optional dynamic int8 quantization of the linear layers, and
+execution in eager PyTorch, as a frozen TorchScript graph, or as an ONNX
+graph on ONNX Runtime. ONNX exports of pretrained models are kept on
+disk under a key of the model configuration, so they are exported once
+per machine.
+Every runtime is a callable that maps a float32 array of shape (batch,
+context_length, n_channels) to predictions of shape (batch,
+prediction_length, n_channels).
+
+Requires torch and transformers; onnx and onnxruntime for the onnx runtime.
+
+Sample input:
+    runner = load_patchtst_runner(ModelConfig(runtime="onnx", quantize=True, num_threads=4))
+    predictions = runner(contexts.astype(np.float32))
+
+Expected output: numpy array of shape (batch, prediction_length, n_channels)
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+import logging
+import tempfile
+import threading
+
+import numpy as np
+
+from .cache import params_cache_key
+
+logger = logging.getLogger(__name__)
+
+RUNTIMES = ("eager", "torchscript", "onnx")
+
+# Exported ONNX graphs of pretrained models (one file per model configuration)
+EXPORT_DIR = Path("data/model_exports")
+
+ONNX_OPSET = 17
+
+Runner = Callable[[np.ndarray], np.ndarray]
+
+# Loaded models and prepared runners, per configuration
+_models: Dict[Tuple, Tuple[Any, Any]] = {}
+_runners: Dict[Tuple, Runner] = {}
+_lock = threading.Lock()
+
+
+def _model_key(config) -> Tuple:
+    return (config.model_name, config.context_length, config.patch_length,
+            config.stride, config.num_features, config.device)
+
+
+def _runner_key(config) -> Tuple:
+    return _model_key(config) + (config.runtime, config.quantize, config.num_threads)
+
+
+def load_patchtst(config) -> Tuple[Any, Any]:
+    """
+    Load (or reuse) a PatchTST model in eval mode.
+
+    Pretrained Granite weights come from HuggingFace; other names build a
+    new model from the configuration. Either way each configuration is
+    loaded once per process.
+
+    Returns:
+        (PatchTSTConfig, PatchTSTForPrediction)
+    """
+    key = _model_key(config)
+    with _lock:
+        if key not in _models:
+            from transformers import PatchTSTConfig, PatchTSTForPrediction
+
+            if "granite" in config.model_name:
+                # Load pre-trained Granite model
+                model_config = PatchTSTConfig.from_pretrained(config.model_name)
+                model = PatchTSTForPrediction.from_pretrained(config.model_name)
+            else:
+                # Create new model with custom config
+                model_config = PatchTSTConfig(
+                    context_length=config.context_length,
+                    patch_length=config.patch_length,
+                    stride=config.stride,
+                    num_input_channels=config.num_features,
+                    prediction_length=24,  # Default horizon
+                )
+                model = PatchTSTForPrediction(model_config)
+            model.to(config.device)
+            model.eval()
+            _models[key] = (model_config, model)
+            logger.info(f"Loaded PatchTST model: {config.model_name}")
+        return _models[key]
+
+
+def load_patchtst_runner(config) -> Runner:
+    """Get the runner for config's runtime, quantization and thread count (cached per process)."""
+    if config.runtime not in RUNTIMES:
+        raise ValueError(f"Unknown runtime: {config.runtime}")
+    if config.runtime != "eager" and config.device != "cpu":
+        raise ValueError(f"The {config.runtime} runtime is CPU-only")
+
+    import torch
+    if config.num_threads:
+        # Process-wide setting shared by every torch runner
+        torch.set_num_threads(config.num_threads)
+
+    key = _runner_key(config)
+    if key in _runners:
+        return _runners[key]
+
+    model_config, model = load_patchtst(config)
+    n_channels = getattr(model_config, "num_input_channels", config.num_features)
+    example = torch.zeros(1, model_config.context_length, n_channels)
+
+    if config.runtime == "onnx":
+        runner = _onnx_runner(config, model, example)
+    else:
+        module = _prediction_module(model)
+        if config.quantize:
+            module = torch.ao.quantization.quantize_dynamic(module, {torch.nn.Linear}, dtype=torch.qint8)
+        if config.runtime == "torchscript":
+            with torch.no_grad():
+                module = torch.jit.freeze(torch.jit.trace(module, example, check_trace=False))
+        runner = _torch_runner(module, config.device)
+
+    with _lock:
+        return _runners.setdefault(key, runner)
+
+
+def clear_model_cache():
+    """Drop every loaded model and runner (exported files stay on disk)."""
+    with _lock:
+        _models.clear()
+        _runners.clear()
+
+
+def _prediction_module(model):
+    """Tensor-in, tensor-out wrapper around PatchTSTForPrediction (traceable/exportable)."""
+    import torch
+
+    class PredictionModule(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.model = model
+
+        def forward(self, past_values):
+            return self.model(past_values=past_values).prediction_outputs
+
+    return PredictionModule().eval()
+
+
+def _torch_runner(module, device: str) -> Runner:
+    import torch
+
+    def run(contexts: np.ndarray) -> np.ndarray:
+        # Zero-copy view of a float32 C-contiguous batch
+        inputs = torch.from_numpy(contexts).to(device)
+        with torch.inference_mode():
+            outputs = module(inputs)
+        return outputs.cpu().numpy()
+
+    return run
+
+
+def _onnx_runner(config, model, example) -> Runner:
+    import onnxruntime as ort
+
+    path = _export_onnx(config, model, example)
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    if config.num_threads:
+        options.intra_op_num_threads = config.num_threads
+    session = ort.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+    input_name = session.get_inputs()[0].name
+
+    def run(contexts: np.ndarray) -> np.ndarray:
+        return session.run(None, {input_name: contexts})[0]
+
+    return run
+
+
+def _export_onnx(config, model, example) -> Path:
+    """Export (once) and optionally int8-quantize the model; returns the ONNX file."""
+    import torch
+
+    # Only pretrained weights are the same in every process
+    export_dir = EXPORT_DIR if "granite" in config.model_name else Path(tempfile.mkdtemp(prefix="patchtst-"))
+    key = params_cache_key(model=_model_key(config), opset=ONNX_OPSET)
+    path = export_dir / f"patchtst-{key[:16]}.onnx"
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging = path.with_suffix(".tmp")
+        with torch.no_grad():
+            torch.onnx.export(
+                _prediction_module(model), example, str(staging),
+                input_names=["past_values"],
+                output_names=["prediction_outputs"],
+                dynamic_axes={"past_values": {0: "batch"}, "prediction_outputs": {0: "batch"}},
+                opset_version=ONNX_OPSET
+            )
+        staging.replace(path)
+        logger.info(f"Exported PatchTST to {path}")
+
+    if not config.quantize:
+        return path
+    quantized = path.with_name(path.stem + "-int8.onnx")
+    if not quantized.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(str(path), str(quantized), weight_type=QuantType.QInt8)
+    return quantized
@@ -6,6 +6,7 @@ Description: Data models and schemas for model backends
 Supports multiple backends:
 - HuggingFace PatchTST models
 - Ollama (for experimental LLM-based forecasting)
+- Native statistical models (Holt-Winters, AR, seasonal naive)
 - Custom transformer models
 
 Sample input: Time series data as numpy array or pandas DataFrame
@@ -25,13 +26,17 @@ logger = logging.getLogger(__name__)
 @dataclass
 class ModelConfig:
     """Configuration for forecast models."""
-    model_type: str = "patchtst"  # patchtst, ollama, custom
+    model_type: str = "patchtst"  # patchtst, ollama, statistical, custom
     model_name: str = "ibm-granite/granite-timeseries-patchtst"
     context_length: int = 96
     patch_length: int = 16
     stride: int = 8
     num_features: int = 1  # Univariate by default
     device: str = "cpu"
+    season_length: Optional[int] = None  # Statistical models detect it when None
+    runtime: str = "eager"  # PatchTST: eager, torchscript, onnx
+    quantize: bool = False  # PatchTST: dynamic int8 linear layers
+    num_threads: Optional[int] = None  # CPU threads for inference (library default when None)
 
 
 class ForecastBackend(ABC):
@@ -47,6 +52,26 @@ class ForecastBackend(ABC):
         """Generate predictions from context window."""
         pass
     
+    def predict_batch(self, contexts: np.ndarray, horizon: int) -> np.ndarray:
+        """
+        Generate predictions for a batch of context windows.
+        
+        Backends that can run several windows in one model call override
+        this; the default calls predict once per window.
+        
+        Args:
+            contexts: Windows of shape (batch, context_length) or
+                (batch, context_length, n_features)
+            horizon: Number of future points to predict
+            
+        Returns:
+            Array of shape (batch, horizon, ...)
+        """
+        return np.stack([
+            np.asarray(self.predict(context, horizon)["predictions"])
+            for context in contexts
+        ])
+    
     @abstractmethod
     def fine_tune(self, train_data: np.ndarray, val_data: np.ndarray):
         """Fine-tune model on custom data."""
@@ -59,35 +84,28 @@ class PatchTSTBackend(ForecastBackend):
     def __init__(self):
         self.model = None
         self.config = None
+        self.device = "cpu"
+        self.runtime = "eager"
         self.is_loaded = False
+        self._run = None
         
     def load_model(self, config: ModelConfig):
-        """Load PatchTST from HuggingFace."""
+        """
+        Load PatchTST (once per process) and prepare config.runtime.
+        
+        See inference.py for the eager/TorchScript/ONNX Runtime runners,
+        int8 quantization and thread settings.
+        """
         try:
-            from transformers import (
-                PatchTSTForPrediction, 
-                PatchTSTConfig,
-                PatchTSTForPretraining
-            )
+            from .inference import load_patchtst, load_patchtst_runner
             
-            if "granite" in config.model_name:
-                # Load pre-trained Granite model
-                self.config = PatchTSTConfig.from_pretrained(config.model_name)
-                self.model = PatchTSTForPrediction.from_pretrained(config.model_name)
-            else:
-                # Create new model with custom config
-                self.config = PatchTSTConfig(
-                    context_length=config.context_length,
-                    patch_length=config.patch_length,
-                    stride=config.stride,
-                    num_input_channels=config.num_features,
-                    prediction_length=24,  # Default horizon
-                )
-                self.model = PatchTSTForPrediction(self.config)
-            
-            self.model.to(config.device)
+            self.config, self.model = load_patchtst(config)
+            self._run = load_patchtst_runner(config)
+            self.device = config.device
+            self.runtime = config.runtime
             self.is_loaded = True
-            logger.info(f"Loaded PatchTST model: {config.model_name}")
+            logger.info(f"PatchTST ready: {config.model_name} "
+                        f"(runtime={config.runtime}, quantize={config.quantize})")
             
         except ImportError:
             logger.error("transformers library not installed. Run: pip install transformers")
@@ -102,35 +120,8 @@ class PatchTSTBackend(ForecastBackend):
             raise RuntimeError("Model not loaded. Call load_model first.")
         
         try:
-            import torch
-            
-            # Prepare input tensor
-            if len(context.shape) == 1:
-                # Univariate: add batch and channel dimensions
-                context = context.reshape(1, 1, -1)
-            elif len(context.shape) == 2:
-                # Add batch dimension
-                context = context.reshape(1, *context.shape)
-            
-            # Convert to torch tensor
-            inputs = torch.tensor(context, dtype=torch.float32)
-            
-            # Generate predictions
-            with torch.no_grad():
-                outputs = self.model(
-                    past_values=inputs,
-                    past_time_features=None,  # Can add time features if needed
-                )
-            
-            # Extract predictions
-            predictions = outputs.prediction_outputs.numpy().squeeze()
-            
-            # Handle horizon adjustment if needed
-            if len(predictions) > horizon:
-                predictions = predictions[:horizon]
-            elif len(predictions) < horizon:
-                # Pad or generate additional predictions
-                logger.warning(f"Model generated {len(predictions)} predictions, requested {horizon}")
+            context = np.asarray(context)
+            predictions = self.predict_batch(context[np.newaxis], horizon)[0]
             
             return {
                 "predictions": predictions,
@@ -142,6 +133,25 @@ class PatchTSTBackend(ForecastBackend):
             logger.error(f"Prediction failed: {str(e)}")
             raise
     
+    def predict_batch(self, contexts: np.ndarray, horizon: int) -> np.ndarray:
+        """Generate predictions for a batch of windows in one forward pass."""
+        if not self.is_loaded:
+            raise RuntimeError("Model not loaded. Call load_model first.")
+        
+        # PatchTST expects (batch, context_length, n_channels)
+        contexts = np.asarray(contexts)
+        univariate = contexts.ndim == 2
+        if univariate:
+            contexts = contexts[..., np.newaxis]
+        
+        # No copy for float32 C-contiguous input; otherwise copies only this
+        # batch (windows may be read-only strided views)
+        predictions = self._run(np.ascontiguousarray(contexts, dtype=np.float32))[:, :horizon]
+        if predictions.shape[1] < horizon:
+            logger.warning(f"Model generated {predictions.shape[1]} predictions, requested {horizon}")
+        
+        return predictions[..., 0] if univariate else predictions
+    
     def fine_tune(self, train_data: np.ndarray, val_data: np.ndarray):
         """Fine-tune PatchTST on custom data."""
         # Implementation would use HuggingFace Trainer
@@ -249,57 +259,180 @@ class OllamaBackend(ForecastBackend):
 
 
 class StreamingForecastWrapper:
-    """Wrapper for handling streaming data with any backend."""
+    """
+    Wrapper for handling streaming data with any backend.
+    
+    The context lives in a preallocated ring buffer written twice (at i and
+    i + context_length), so the current window is always a contiguous view
+    and updates are O(1). Forecasts are made every predict_every samples,
+    scored against the values that arrive later, and error metrics are
+    kept as running sums, so memory stays bounded on endless streams.
+    """
     
-    def __init__(self, backend: ForecastBackend, context_length: int):
+    def __init__(
+        self,
+        backend: ForecastBackend,
+        context_length: int,
+        horizon: int = 1,
+        predict_every: int = 1,
+        history_size: int = 1000
+    ):
+        """
+        Args:
+            backend: Model backend used for predictions
+            context_length: Number of recent values passed to the model
+            horizon: Steps forecast at each prediction
+            predict_every: Predict after every k-th sample once the buffer is full
+            history_size: Most recent predictions kept in prediction_history
+        """
+        if predict_every <= 0:
+            raise ValueError("predict_every must be positive")
         self.backend = backend
         self.context_length = context_length
-        self.buffer = deque(maxlen=context_length)
-        self.prediction_history = []
+        self.horizon = horizon
+        self.predict_every = predict_every
+        self.prediction_history = deque(maxlen=history_size)
+        self.samples = 0
+        self.last_forecast: Optional[np.ndarray] = None
         
-    def update(self, new_value: float) -> Optional[np.ndarray]:
-        """Add new value and generate prediction if buffer is full."""
-        self.buffer.append(new_value)
+        self._ring = np.zeros(2 * context_length)
+        self._pos = 0
+        self._forecast_at = 0
+        self._abs_error = 0.0
+        self._sq_error = 0.0
+        self._n_scored = 0
+    
+    @property
+    def context(self) -> np.ndarray:
+        """Current window, oldest first (a view valid until the next push)."""
+        return self._ring[self._pos:self._pos + self.context_length]
+    
+    @property
+    def ready(self) -> bool:
+        """Whether the buffer holds a full context window."""
+        return self.samples >= self.context_length
+    
+    def push(self, new_value: float) -> bool:
+        """
+        Add a value without predicting.
         
-        if len(self.buffer) == self.context_length:
-            context = np.array(self.buffer)
-            result = self.backend.predict(context, horizon=1)
-            prediction = result["predictions"][0]
-            
-            self.prediction_history.append({
-                "timestamp": len(self.prediction_history),
-                "actual": new_value,
-                "predicted": prediction,
-                "context": context.copy()
-            })
-            
-            return prediction
-        return None
+        Returns:
+            True if a prediction is due for this sample
+        """
+        self._score(new_value)
+        self._ring[self._pos] = self._ring[self._pos + self.context_length] = new_value
+        self._pos = (self._pos + 1) % self.context_length
+        self.samples += 1
+        return self.ready and (self.samples - self.context_length) % self.predict_every == 0
+    
+    def record_forecast(self, forecast: np.ndarray) -> float:
+        """Store a forecast made from the current context; returns its first step."""
+        self.last_forecast = np.asarray(forecast, dtype=float).reshape(-1)
+        self._forecast_at = self.samples
+        prediction = self.last_forecast[0]
+        self.prediction_history.append({
+            "timestamp": self.samples - 1,
+            "actual": self._ring[self._pos + self.context_length - 1],
+            "predicted": prediction
+        })
+        return prediction
+    
+    def update(self, new_value: float) -> Optional[float]:
+        """Add new value and generate prediction if one is due."""
+        if not self.push(new_value):
+            return None
+        result = self.backend.predict(self.context, horizon=self.horizon)
+        return self.record_forecast(result["predictions"])
     
     def get_metrics(self) -> Dict:
-        """Calculate performance metrics on historical predictions."""
-        if not self.prediction_history:
+        """Performance metrics of forecasts scored so far."""
+        if not self._n_scored:
             return {}
         
-        actuals = [p["actual"] for p in self.prediction_history[1:]]
-        predictions = [p["predicted"] for p in self.prediction_history[:-1]]
-        
-        if not actuals:
-            return {}
-        
-        actuals = np.array(actuals)
-        predictions = np.array(predictions)
-        
-        mae = np.mean(np.abs(actuals - predictions))
-        mse = np.mean((actuals - predictions) ** 2)
-        rmse = np.sqrt(mse)
+        mae = self._abs_error / self._n_scored
+        mse = self._sq_error / self._n_scored
         
         return {
             "mae": mae,
             "mse": mse,
-            "rmse": rmse,
-            "n_predictions": len(actuals)
+            "rmse": np.sqrt(mse),
+            "n_predictions": self._n_scored
         }
+    
+    def _score(self, actual: float):
+        """Compare an arriving value with the outstanding forecast."""
+        if self.last_forecast is None:
+            return
+        step = self.samples - self._forecast_at
+        if step < len(self.last_forecast):
+            error = actual - self.last_forecast[step]
+            self._abs_error += abs(error)
+            self._sq_error += error * error
+            self._n_scored += 1
+
+
+class MultiStreamForecaster:
+    """
+    Streaming forecasts for many concurrent series sharing one backend.
+    
+    Each stream keeps its own StreamingForecastWrapper; predictions that
+    fall due in the same update_many call are stacked and sent to
+    backend.predict_batch in micro-batches of batch_size windows.
+    """
+    
+    def __init__(
+        self,
+        backend: ForecastBackend,
+        context_length: int,
+        horizon: int = 1,
+        predict_every: int = 1,
+        batch_size: int = 256,
+        history_size: int = 100
+    ):
+        self.backend = backend
+        self.context_length = context_length
+        self.horizon = horizon
+        self.predict_every = predict_every
+        self.batch_size = batch_size
+        self.history_size = history_size
+        self.streams: Dict[str, StreamingForecastWrapper] = {}
+    
+    def stream(self, stream_id: str) -> StreamingForecastWrapper:
+        """Get (or create) the wrapper for a stream."""
+        wrapper = self.streams.get(stream_id)
+        if wrapper is None:
+            wrapper = StreamingForecastWrapper(
+                self.backend, self.context_length, self.horizon,
+                self.predict_every, self.history_size
+            )
+            self.streams[stream_id] = wrapper
+        return wrapper
+    
+    def update_many(self, values: Dict[str, float]) -> Dict[str, float]:
+        """
+        Add one value per stream and predict for every stream that is due.
+        
+        Returns:
+            Stream id -> first-step prediction, for streams that predicted
+        """
+        due = [stream_id for stream_id, value in values.items() if self.stream(stream_id).push(value)]
+        
+        predictions = {}
+        for start in range(0, len(due), self.batch_size):
+            batch_ids = due[start:start + self.batch_size]
+            contexts = np.stack([self.streams[stream_id].context for stream_id in batch_ids])
+            forecasts = self.backend.predict_batch(contexts, self.horizon)
+            for stream_id, forecast in zip(batch_ids, forecasts):
+                predictions[stream_id] = self.streams[stream_id].record_forecast(forecast)
+        return predictions
+    
+    def remove(self, stream_id: str):
+        """Forget a stream."""
+        self.streams.pop(stream_id, None)
+    
+    def get_metrics(self) -> Dict[str, Dict]:
+        """Per-stream performance metrics."""
+        return {stream_id: wrapper.get_metrics() for stream_id, wrapper in self.streams.items()}
 
 
 def create_backend(config: ModelConfig) -> ForecastBackend:
@@ -308,6 +441,9 @@ def create_backend(config: ModelConfig) -> ForecastBackend:
         backend = PatchTSTBackend()
     elif config.model_type == "ollama":
         backend = OllamaBackend()
+    elif config.model_type == "statistical":
+        from .statistical import StatisticalBackend
+        backend = StatisticalBackend()
     else:
         raise ValueError(f"Unknown model type: {config.model_type}")
     
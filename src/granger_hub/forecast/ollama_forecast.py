@@ -11,18 +11,23 @@ import json
 import logging
 from typing import Dict, List, Optional, Any
 
+from .cache import ForecastCache, forecast_cache_key
+from .statistical import forecast_matrix
+
 logger = logging.getLogger(__name__)
 
 
 class OllamaForecaster:
     """Forecaster that uses Ollama for predictions."""
     
-    def __init__(self, model_name: str = "auto", host: str = "localhost", port: int = 11434):
+    def __init__(self, model_name: str = "auto", host: str = "localhost", port: int = 11434,
+                 cache: Optional[ForecastCache] = None):
         self.model_name = model_name
         self.host = host
         self.port = port
         self.base_url = f"http://{host}:{port}"
         self.selected_model = None
+        self.cache = cache
         
         if model_name == "auto":
             self._auto_select_model()
@@ -86,6 +91,14 @@ class OllamaForecaster:
         # Limit to last 50 values
         recent_values = recent_values[-50:]
         
+        # Same values, model and context give the same prompt
+        key = None
+        if self.cache is not None:
+            key = forecast_cache_key(np.array(recent_values), model=model, horizon=horizon, context=context)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
         # Create prompt
         prompt = self._create_forecast_prompt(recent_values, horizon, context)
         
@@ -108,12 +121,15 @@ class OllamaForecaster:
                 result = response.json()
                 predictions = self._parse_predictions(result["response"], horizon)
                 
-                return {
+                forecast = {
                     "predictions": predictions,
                     "uncertainty": 0.1,  # Simple fixed uncertainty
                     "model": model,
                     "raw_response": result["response"]
                 }
+                if key:
+                    self.cache.put(key, forecast)
+                return forecast
             else:
                 logger.error(f"Ollama request failed: {response.status_code}")
                 return self._fallback_forecast(recent_values, horizon)
@@ -184,21 +200,19 @@ Example format: 23.4, 24.1, 23.8, 24.5"""
         return np.full(horizon, 0.0)
     
     def _fallback_forecast(self, values: List[float], horizon: int) -> Dict[str, Any]:
-        """Simple fallback forecast when Ollama fails."""
-        # Use last value as naive forecast
-        last_value = values[-1] if values else 0.0
-        
-        # Add small random walk
-        predictions = []
-        current = last_value
-        for _ in range(horizon):
-            current += np.random.normal(0, 0.01 * abs(current))
-            predictions.append(current)
+        """Statistical fallback forecast when Ollama fails."""
+        if len(values) < 2:
+            # Not enough history for a model: repeat the last value
+            predictions = np.full(horizon, values[-1] if values else 0.0)
+            method = "last_value"
+        else:
+            forecasts, methods = forecast_matrix(np.asarray(values, dtype=float)[np.newaxis], horizon)
+            predictions, method = forecasts[0], str(methods[0])
         
         return {
-            "predictions": np.array(predictions),
+            "predictions": predictions,
             "uncertainty": 0.2,
-            "model": "fallback",
+            "model": f"fallback_{method}",
             "error": "Ollama unavailable, using fallback"
         }
 
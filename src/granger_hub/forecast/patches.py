@@ -7,6 +7,7 @@ smaller subsequences (patches) for better pattern recognition.
 """
 
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Tuple, Optional
 
 
@@ -29,17 +30,29 @@ class PatchTransformer:
         if stride <= 0:
             raise ValueError("stride must be positive")
     
-    def create_patches(self, time_series: np.ndarray) -> np.ndarray:
+    def create_patches(
+        self,
+        time_series: np.ndarray,
+        copy: bool = False,
+        dtype: Optional[np.dtype] = None
+    ) -> np.ndarray:
         """
         Create patches from time series.
         
+        Patches are a strided, read-only view of the input, so no data is
+        copied however much the patches overlap. Floating inputs keep their
+        dtype (float32 stays float32); other inputs become float64.
+        
         Args:
             time_series: 1D or 2D array of time series values
+            copy: Return a contiguous, writable copy instead of a view
+            dtype: Convert the series to this dtype first
             
         Returns:
             Array of patches with shape (n_patches, patch_length) or
             (n_patches, patch_length, n_features) for multivariate
         """
+        time_series = self._as_float_array(time_series, dtype)
         if len(time_series) < self.patch_length:
             raise ValueError(
                 f"Time series length ({len(time_series)}) must be >= "
@@ -48,39 +61,32 @@ class PatchTransformer:
         
         # Handle 1D and 2D cases
         if len(time_series.shape) == 1:
-            return self._create_patches_1d(time_series)
+            patches = self._create_patches_1d(time_series)
         elif len(time_series.shape) == 2:
-            return self._create_patches_2d(time_series)
+            patches = self._create_patches_2d(time_series)
         else:
             raise ValueError("Time series must be 1D or 2D array")
+        
+        return np.ascontiguousarray(patches) if copy else patches
+    
+    @staticmethod
+    def _as_float_array(time_series: np.ndarray, dtype: Optional[np.dtype] = None) -> np.ndarray:
+        """Convert input to a floating array, keeping float32/float64 as is."""
+        time_series = np.asarray(time_series)
+        if dtype is None and not np.issubdtype(time_series.dtype, np.floating):
+            dtype = np.float64
+        return time_series.astype(dtype, copy=False) if dtype is not None else time_series
     
     def _create_patches_1d(self, series: np.ndarray) -> np.ndarray:
-        """Create patches from 1D time series."""
-        n_samples = len(series)
-        n_patches = (n_samples - self.patch_length) // self.stride + 1
-        
-        patches = np.zeros((n_patches, self.patch_length))
-        
-        for i in range(n_patches):
-            start_idx = i * self.stride
-            end_idx = start_idx + self.patch_length
-            patches[i] = series[start_idx:end_idx]
-        
-        return patches
+        """Create patches from 1D time series (strided view)."""
+        windows = sliding_window_view(series, self.patch_length)
+        return windows[::self.stride]
     
     def _create_patches_2d(self, series: np.ndarray) -> np.ndarray:
-        """Create patches from multivariate time series."""
-        n_samples, n_features = series.shape
-        n_patches = (n_samples - self.patch_length) // self.stride + 1
-        
-        patches = np.zeros((n_patches, self.patch_length, n_features))
-        
-        for i in range(n_patches):
-            start_idx = i * self.stride
-            end_idx = start_idx + self.patch_length
-            patches[i] = series[start_idx:end_idx]
-        
-        return patches
+        """Create patches from multivariate time series (strided view)."""
+        # (n_windows, n_features, patch_length) -> (n_windows, patch_length, n_features)
+        windows = sliding_window_view(series, self.patch_length, axis=0)
+        return windows[::self.stride].transpose(0, 2, 1)
     
     def reconstruct_from_patches(
         self, 
@@ -90,51 +96,42 @@ class PatchTransformer:
         """
         Reconstruct time series from patches (averaging overlaps).
         
+        Overlap-add runs once per position within a patch, adding that
+        position of every patch through a strided slice of the output.
+        
         Args:
             patches: Array of patches
             original_length: Target length for reconstruction
             
         Returns:
-            Reconstructed time series
+            Reconstructed time series (float32 for float32 patches)
         """
+        patches = np.asarray(patches)
         if len(patches) == 0:
             raise ValueError("No patches provided")
         
         # Determine dimensions
-        if len(patches.shape) == 2:
-            n_patches, patch_length = patches.shape
-            is_multivariate = False
-        else:
-            n_patches, patch_length, n_features = patches.shape
-            is_multivariate = True
+        n_patches, patch_length = patches.shape[:2]
         
         # Calculate output length if not provided
         if original_length is None:
             original_length = (n_patches - 1) * self.stride + patch_length
         
         # Initialize output and count arrays
-        if is_multivariate:
-            output = np.zeros((original_length, n_features))
-            counts = np.zeros((original_length, n_features))
-        else:
-            output = np.zeros(original_length)
-            counts = np.zeros(original_length)
-        
-        # Accumulate patches
-        for i in range(n_patches):
-            start_idx = i * self.stride
-            end_idx = min(start_idx + patch_length, original_length)
-            actual_length = end_idx - start_idx
-            
-            if is_multivariate:
-                output[start_idx:end_idx] += patches[i, :actual_length]
-                counts[start_idx:end_idx] += 1
-            else:
-                output[start_idx:end_idx] += patches[i, :actual_length]
-                counts[start_idx:end_idx] += 1
-        
-        # Average overlapping regions
-        output = np.divide(output, counts, where=counts > 0)
+        dtype = np.result_type(patches.dtype, np.float32)
+        output = np.zeros((original_length,) + patches.shape[2:], dtype=dtype)
+        counts = np.zeros(original_length, dtype=dtype)
+        
+        # Accumulate patches: position j of patch i lands at i * stride + j
+        for offset in range(min(patch_length, original_length)):
+            n_valid = min(n_patches, (original_length - offset - 1) // self.stride + 1)
+            positions = slice(offset, offset + n_valid * self.stride, self.stride)
+            output[positions] += patches[:n_valid, offset]
+            counts[positions] += 1
+        
+        # Average overlapping regions (uncovered points stay 0)
+        counts = counts.reshape((original_length,) + (1,) * (output.ndim - 1))
+        np.divide(output, counts, out=output, where=counts > 0)
         
         return output
     
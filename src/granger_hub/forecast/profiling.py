@@ -0,0 +1,318 @@
+"""
+Vectorized time series profiling for model selection.
+Module: profiling.py
+
+Computes trend, seasonality, dominant period and stationarity statistics
+for a matrix of series at once. Autocorrelation at every lag comes from
+one FFT per batch (plus cumulative sums for the overlapping segment
+statistics), so it equals the Pearson correlation of x[:-lag] and x[lag:]
+used by the CLI's per-series checks without a loop over lags.
+DataProfiler caches profiles per series fingerprint, so unchanged series
+are not profiled again.
+
+Sample input:
+    profiler = DataProfiler()
+    profiles = profiler.profile_many([sales, traffic, load])
+
+Expected output: dict of per-series columns, e.g. profiles["season_length"] -> array([7, 24, 0])
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+import logging
+
+import numpy as np
+
+from .cache import data_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Seasonal lags checked by detect_seasonality (weekly, monthly, daily)
+SEASONAL_LAGS = (7, 12, 24)
+SEASONALITY_THRESHOLD = 0.7
+
+# Series shorter than this are never considered seasonal
+MIN_SEASONAL_LENGTH = 50
+
+# Trend if the slope exceeds this fraction of the value range per step
+TREND_THRESHOLD = 0.01
+
+# Earliest autocorrelation peak within this fraction of the highest is the dominant period
+PERIOD_TOLERANCE = 0.9
+
+# Autocorrelation a peak needs to count as a period
+MIN_PERIOD_STRENGTH = 0.3
+
+PROFILE_COLUMNS = (
+    "length", "missing_values", "variance", "has_trend", "slope",
+    "has_seasonality", "season_length", "dominant_period", "seasonal_strength",
+    "stationarity", "mean_shift", "variance_ratio",
+)
+
+
+def autocorrelation(X: np.ndarray, max_lag: Optional[int] = None) -> np.ndarray:
+    """
+    Pearson correlation of x[:-lag] and x[lag:] for every row and lag.
+
+    Args:
+        X: Series of shape (n_series, length)
+        max_lag: Largest lag (length // 2 by default)
+
+    Returns:
+        Array of shape (n_series, max_lag + 1); column 0 is 1
+    """
+    X = np.asarray(X, dtype=float)
+    n_series, length = X.shape
+    max_lag = min(length // 2 if max_lag is None else max_lag, length - 2)
+    if max_lag < 1:
+        return np.ones((n_series, 1))
+
+    X = X - X.mean(axis=1, keepdims=True)
+    n_fft = 1 << (2 * length - 1).bit_length()
+    spectrum = np.fft.rfft(X, n_fft, axis=1)
+    power = spectrum.real ** 2 + spectrum.imag ** 2
+    products = np.fft.irfft(power, n_fft, axis=1)[:, :max_lag + 1]
+
+    # Sums and sums of squares of the leading (x[:-lag]) and trailing (x[lag:]) segments
+    zeros = np.zeros((n_series, 1))
+    sums = np.concatenate([zeros, np.cumsum(X, axis=1)], axis=1)
+    squares = np.concatenate([zeros, np.cumsum(X * X, axis=1)], axis=1)
+    lags = np.arange(max_lag + 1)
+    overlap = length - lags
+    sum_a, sum_b = sums[:, overlap], sums[:, -1:] - sums[:, lags]
+    square_a, square_b = squares[:, overlap], squares[:, -1:] - squares[:, lags]
+
+    covariance = products - sum_a * sum_b / overlap
+    variance_a = np.maximum(square_a - sum_a * sum_a / overlap, 0)
+    variance_b = np.maximum(square_b - sum_b * sum_b / overlap, 0)
+    return covariance / (np.sqrt(variance_a * variance_b) + 1e-12)
+
+
+def _slopes(X: np.ndarray) -> np.ndarray:
+    """Least-squares slope of each row against 0..length-1."""
+    length = X.shape[1]
+    t = np.arange(length) - (length - 1) / 2
+    return (X * t).sum(axis=1) / max((t * t).sum(), 1.0)
+
+
+def _linear_fit(X: np.ndarray) -> np.ndarray:
+    """Least-squares line of each row."""
+    length = X.shape[1]
+    t = np.arange(length) - (length - 1) / 2
+    return X.mean(axis=1, keepdims=True) + _slopes(X)[:, np.newaxis] * t
+
+
+def detect_trends(X: np.ndarray) -> np.ndarray:
+    """Whether each series' least-squares slope exceeds 1% of its range per step."""
+    return np.abs(_slopes(X)) > TREND_THRESHOLD * (X.max(axis=1) - X.min(axis=1))
+
+
+def detect_season_lengths(
+    X: np.ndarray,
+    candidates: Sequence[int] = SEASONAL_LAGS,
+    threshold: float = SEASONALITY_THRESHOLD,
+    acf: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Seasonal period of each series (0 when none is detected).
+
+    A lag counts if the lagged autocorrelation of the linearly detrended
+    series exceeds threshold (a trend alone correlates at every lag); the
+    lag with the highest correlation wins. Series shorter than 50 points
+    are never seasonal.
+
+    Args:
+        acf: Precomputed autocorrelation of the detrended series
+    """
+    n_series, length = X.shape
+    periods = np.zeros(n_series, dtype=np.int64)
+    lags = [lag for lag in candidates if lag < length // 2]
+    if length < MIN_SEASONAL_LENGTH or not lags:
+        return periods
+    if acf is None:
+        acf = autocorrelation(X - _linear_fit(X), max(lags))
+
+    correlations = acf[:, lags]
+    best = correlations.argmax(axis=1)
+    seasonal = correlations[np.arange(n_series), best] > threshold
+    periods[seasonal] = np.asarray(lags)[best[seasonal]]
+    return periods
+
+
+def dominant_periods(acf: np.ndarray, length: int, tolerance: float = PERIOD_TOLERANCE):
+    """
+    Dominant period of each series from its autocorrelation.
+
+    Peaks (lag >= 2) must reach MIN_PERIOD_STRENGTH and clear the
+    white-noise band 2 / sqrt(overlap);
+    the period is the earliest peak reaching tolerance times the highest,
+    so multiples of a period do not win on noise.
+
+    Args:
+        acf: Autocorrelation of shape (n_series, max_lag + 1)
+        length: Length of the series
+
+    Returns:
+        (periods, strengths); period 0 and strength 0 when there is no peak
+    """
+    n_series, n_lags = acf.shape
+    periods = np.zeros(n_series, dtype=np.int64)
+    strengths = np.zeros(n_series)
+    if n_lags < 4:
+        return periods, strengths
+
+    inner = acf[:, 2:-1]
+    noise = np.maximum(2 / np.sqrt(length - np.arange(2, n_lags - 1)), MIN_PERIOD_STRENGTH)
+    peaks = (inner > acf[:, 1:-2]) & (inner >= acf[:, 3:]) & (inner > noise)
+    heights = np.where(peaks, inner, 0.0)
+    best = heights.max(axis=1)
+    found = best > 0
+    first = (heights >= tolerance * best[:, np.newaxis]) & peaks
+    lags = first.argmax(axis=1)
+    periods[found] = lags[found] + 2
+    strengths[found] = inner[np.arange(n_series), lags][found]
+    return periods, strengths
+
+
+def _fill_missing(X: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs per row (leading NaNs take the first observed value)."""
+    missing = np.isnan(X)
+    if not missing.any():
+        return X
+    positions = np.arange(X.shape[1])
+    last = np.maximum.accumulate(np.where(missing, 0, positions), axis=1)
+    filled = X[np.arange(len(X))[:, np.newaxis], last]
+    first = np.where(missing.all(axis=1), 0, (~missing).argmax(axis=1))
+    leading = positions < first[:, np.newaxis]
+    filled[leading] = np.broadcast_to(X[np.arange(len(X)), first][:, np.newaxis], X.shape)[leading]
+    return np.nan_to_num(filled)
+
+
+def profile_matrix(X: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Profile every row of X.
+
+    Trend, seasonality and stationarity follow the CLI rules: slope above
+    1% of the range per step; detrended autocorrelation above 0.7 at lag
+    7, 12 or 24; half-series means within 0.1 std and variance ratio
+    between 0.5 and 2. Missing values are forward-filled first.
+
+    Args:
+        X: Series of shape (n_series, length)
+
+    Returns:
+        Column name -> array of one value per series (see PROFILE_COLUMNS)
+    """
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[np.newaxis]
+    n_series, length = X.shape
+    missing = np.isnan(X).any(axis=1)
+    X = _fill_missing(X)
+
+    detrended = X - _linear_fit(X)
+    acf = autocorrelation(detrended)
+    season_lengths = detect_season_lengths(X, acf=acf)
+    periods, strengths = dominant_periods(acf, length)
+
+    mid = length // 2
+    first, second = X[:, :mid], X[:, mid:]
+    if mid:
+        mean_shift = np.abs(first.mean(axis=1) - second.mean(axis=1))
+        variance_ratio = first.var(axis=1) / (second.var(axis=1) + 1e-8)
+    else:
+        mean_shift, variance_ratio = np.zeros(n_series), np.ones(n_series)
+    std = X.std(axis=1)
+
+    return {
+        "length": np.full(n_series, length),
+        "missing_values": missing,
+        "variance": std * std,
+        "has_trend": detect_trends(X),
+        "slope": _slopes(X),
+        "has_seasonality": season_lengths > 0,
+        "season_length": season_lengths,
+        "dominant_period": periods,
+        "seasonal_strength": strengths,
+        "stationarity": (mean_shift < 0.1 * std) & (variance_ratio > 0.5) & (variance_ratio < 2.0),
+        "mean_shift": mean_shift / (std + 1e-8),
+        "variance_ratio": variance_ratio,
+    }
+
+
+class DataProfiler:
+    """Batch profiler with an in-memory LRU cache keyed on series fingerprints."""
+
+    def __init__(self, max_entries: int = 10000, batch_size: int = 256):
+        """
+        Args:
+            max_entries: Series profiles kept before least recently used ones are evicted
+            batch_size: Series per profile_matrix call (small blocks stay in cache)
+        """
+        self.max_entries = max_entries
+        self.batch_size = batch_size
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def profile(self, values: np.ndarray) -> Dict[str, Any]:
+        """Profile one series; returns plain Python values."""
+        profiles = self.profile_many([values])
+        return {column: profiles[column][0].item() for column in PROFILE_COLUMNS}
+
+    def profile_many(self, series: Sequence[np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Profile many series of any lengths.
+
+        Cached series are looked up by fingerprint; the rest are grouped by
+        length and profiled batch_size rows at a time.
+
+        Returns:
+            Column name -> array with one value per series, in input order
+        """
+        series = [np.asarray(values, dtype=float).reshape(-1) for values in series]
+        if any(len(values) == 0 for values in series):
+            raise ValueError("Cannot profile an empty series")
+        keys = [data_fingerprint(values) for values in series]
+        rows: list = [None] * len(series)
+        pending: Dict[int, list] = {}
+        for index, key in enumerate(keys):
+            cached = self._cache.get(key)
+            if cached is None:
+                pending.setdefault(len(series[index]), []).append(index)
+            else:
+                self._cache.move_to_end(key)
+                rows[index] = cached
+        self.hits += len(series) - sum(len(indices) for indices in pending.values())
+
+        for group in pending.values():
+            self.misses += len(group)
+            for start in range(0, len(group), self.batch_size):
+                indices = group[start:start + self.batch_size]
+                profiles = profile_matrix(np.stack([series[index] for index in indices]))
+                columns = [profiles[column].tolist() for column in PROFILE_COLUMNS]
+                for index, values in zip(indices, zip(*columns)):
+                    row = dict(zip(PROFILE_COLUMNS, values))
+                    rows[index] = row
+                    self._remember(keys[index], row)
+
+        return {column: np.array([row[column] for row in rows]) for column in PROFILE_COLUMNS}
+
+    def clear(self):
+        """Drop all cached profiles."""
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry count and hit/miss counters."""
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "max_entries": self.max_entries
+        }
+
+    def _remember(self, key: str, row: Dict[str, Any]):
+        self._cache[key] = row
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
@@ -0,0 +1,236 @@
+"""
+Multi-series forecasting service.
+Module: service.py
+
+Forecasts many series per call with one loaded backend. The last
+context_length points of every series are stacked into a single matrix,
+normalized per row in one vectorized pass, split into batches of
+batch_size windows and sent to backend.predict_batch from a small worker
+pool. Predictions are denormalized together and returned as one
+long-format DataFrame. profile_many reports per-series data profiles
+(see profiling.py) for model selection.
+
+Sample input:
+    service = ForecastService.from_config(ModelConfig(model_type="patchtst"))
+    frame = service.forecast_many(df, id_column="series_id", time_column="timestamp")
+
+Expected output: DataFrame with columns series_id, step, timestamp, prediction
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+import logging
+
+import numpy as np
+import pandas as pd
+
+from .model_backends import ForecastBackend, ModelConfig, create_backend
+from .profiling import PROFILE_COLUMNS, DataProfiler
+
+logger = logging.getLogger(__name__)
+
+SeriesInput = Union[Dict[str, np.ndarray], pd.DataFrame]
+
+
+class ForecastService:
+    """Batch forecaster for many series sharing one backend."""
+
+    def __init__(
+        self,
+        backend: ForecastBackend,
+        context_length: int = 96,
+        horizon: int = 24,
+        batch_size: int = 256,
+        max_workers: int = 4,
+        normalization: str = "standard",
+        profiler: Optional[DataProfiler] = None
+    ):
+        """
+        Args:
+            backend: Loaded model backend shared by all requests
+            context_length: Most recent points of each series passed to the model
+            horizon: Default number of steps to forecast
+            batch_size: Series per backend.predict_batch call
+            max_workers: Batches run concurrently
+            normalization: standard, minmax, or none (per series)
+            profiler: Profile cache to share (a new one by default)
+        """
+        if normalization not in ("standard", "minmax", "none"):
+            raise ValueError(f"Unknown normalization: {normalization}")
+        self.backend = backend
+        self.context_length = context_length
+        self.horizon = horizon
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.normalization = normalization
+        self.profiler = profiler or DataProfiler()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="forecast")
+
+    @classmethod
+    def from_config(cls, config: ModelConfig, **kwargs) -> "ForecastService":
+        """Load a backend once and build a service around it."""
+        return cls(create_backend(config), context_length=config.context_length, **kwargs)
+
+    def forecast_many(
+        self,
+        series: SeriesInput,
+        horizon: Optional[int] = None,
+        id_column: str = "series_id",
+        time_column: Optional[str] = "timestamp",
+        value_column: str = "value"
+    ) -> pd.DataFrame:
+        """
+        Forecast every series.
+
+        Args:
+            series: Series id -> values, or a long-format DataFrame
+            horizon: Override the default horizon
+            id_column: Series id column of a DataFrame
+            time_column: Timestamp column of a DataFrame (optional)
+            value_column: Value column of a DataFrame
+
+        Returns:
+            Long-format DataFrame with one row per series and step; a
+            timestamp column is included when input timestamps are known
+        """
+        horizon = horizon or self.horizon
+        ids, flat, starts, last_times, steps = self._flatten(series, id_column, time_column, value_column)
+        if not ids:
+            return pd.DataFrame(columns=[id_column, "step", "prediction"])
+
+        contexts = self._context_matrix(flat, starts)
+        normalized, center, scale = self._normalize(contexts)
+        predictions = self._predict(normalized, horizon)
+        predictions = predictions * scale + center
+
+        n_series, n_steps = predictions.shape[:2]
+        result = {
+            id_column: np.repeat(np.asarray(ids, dtype=object), n_steps),
+            "step": np.tile(np.arange(1, n_steps + 1), n_series),
+        }
+        if last_times is not None:
+            offsets = steps[:, np.newaxis] * np.arange(1, n_steps + 1)
+            result["timestamp"] = (last_times[:, np.newaxis] + offsets).reshape(-1)
+        result["prediction"] = predictions.reshape(-1)
+        return pd.DataFrame(result)
+
+    def profile_many(
+        self,
+        series: SeriesInput,
+        id_column: str = "series_id",
+        time_column: Optional[str] = "timestamp",
+        value_column: str = "value"
+    ) -> pd.DataFrame:
+        """
+        Profile every series (trend, seasonality, dominant period, stationarity).
+
+        Profiles cover the full series and are cached per series
+        fingerprint by the service's DataProfiler.
+
+        Returns:
+            DataFrame with one row per series and the profiling.PROFILE_COLUMNS
+        """
+        ids, flat, starts, _, _ = self._flatten(series, id_column, time_column, value_column)
+        if not ids:
+            return pd.DataFrame(columns=[id_column, *PROFILE_COLUMNS])
+        ends = np.append(starts[1:], len(flat))
+        profiles = self.profiler.profile_many([flat[start:end] for start, end in zip(starts, ends)])
+        return pd.DataFrame({id_column: np.asarray(ids, dtype=object), **profiles})
+
+    def close(self):
+        """Shut down the worker pool."""
+        self._executor.shutdown(wait=True)
+
+    def _flatten(
+        self,
+        series: SeriesInput,
+        id_column: str,
+        time_column: Optional[str],
+        value_column: str
+    ) -> Tuple[List, np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """Concatenate all series; returns ids, values, start offsets and timing (frames only)."""
+        if isinstance(series, pd.DataFrame):
+            return self._split_frame(series, id_column, time_column, value_column)
+        ids = list(series)
+        values = [np.asarray(series[series_id], dtype=float).reshape(-1) for series_id in ids]
+        flat = np.concatenate(values) if values else np.empty(0)
+        starts = np.cumsum([0] + [len(v) for v in values[:-1]], dtype=np.int64)
+        return ids, flat, starts, None, None
+
+    def _split_frame(
+        self,
+        frame: pd.DataFrame,
+        id_column: str,
+        time_column: Optional[str],
+        value_column: str
+    ) -> Tuple[List, np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """Sort a long-format frame by series; returns ids, values and series start offsets."""
+        has_time = bool(time_column) and time_column in frame.columns
+        codes, ids = pd.factorize(frame[id_column], sort=False)
+        if has_time:
+            times = pd.to_datetime(frame[time_column]).to_numpy()
+            order = np.lexsort((times, codes))
+        else:
+            order = np.argsort(codes, kind="stable")
+
+        codes = codes[order]
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        flat = frame[value_column].to_numpy(dtype=float)[order]
+
+        last_times = steps = None
+        if has_time:
+            times = times[order]
+            ends = np.append(starts[1:], len(frame)) - 1
+            last_times = times[ends]
+            # Step between the last two observations (one hour for single points)
+            previous = np.where(ends > starts, ends - 1, ends)
+            steps = last_times - times[previous]
+            steps[steps == np.timedelta64(0)] = np.timedelta64(1, "h")
+        return list(ids), flat, starts, last_times, steps
+
+    def _context_matrix(self, flat: np.ndarray, starts: np.ndarray) -> np.ndarray:
+        """
+        Gather the last context_length points of every series in one indexing step.
+
+        Series are consecutive runs of flat beginning at starts; series
+        shorter than context_length are padded with their first value.
+        """
+        ends = np.append(starts[1:], len(flat))
+        if (ends <= starts).any():
+            raise ValueError("Cannot forecast an empty series")
+
+        offsets = np.arange(-self.context_length, 0)
+        indices = np.maximum(ends[:, np.newaxis] + offsets, starts[:, np.newaxis])
+
+        short = int((ends - starts < self.context_length).sum())
+        if short:
+            logger.info(f"Padded {short} series shorter than context_length={self.context_length}")
+        return flat[indices]
+
+    def _normalize(self, contexts: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Normalize each row; returns (normalized, center, scale) for denormalizing."""
+        if self.normalization == "standard":
+            center = contexts.mean(axis=1, keepdims=True)
+            scale = contexts.std(axis=1, keepdims=True) + 1e-8
+        elif self.normalization == "minmax":
+            center = contexts.min(axis=1, keepdims=True)
+            scale = contexts.max(axis=1, keepdims=True) - center + 1e-8
+        else:
+            return contexts, np.zeros((len(contexts), 1)), np.ones((len(contexts), 1))
+        return (contexts - center) / scale, center, scale
+
+    def _predict(self, contexts: np.ndarray, horizon: int) -> np.ndarray:
+        """Run predict_batch over batch_size slices on the worker pool."""
+        starts = range(0, len(contexts), self.batch_size)
+        batches = self._executor.map(
+            lambda start: self.backend.predict_batch(contexts[start:start + self.batch_size], horizon),
+            starts
+        )
+
+        predictions = None
+        for start, batch in zip(starts, batches):
+            batch = np.asarray(batch, dtype=float)
+            if predictions is None:
+                predictions = np.empty((len(contexts),) + batch.shape[1:])
+            predictions[start:start + len(batch)] = batch
+        return predictions
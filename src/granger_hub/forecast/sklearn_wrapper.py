@@ -20,6 +20,8 @@ from datetime import datetime, timedelta
 
 from .model_backends import create_backend, ModelConfig, StreamingForecastWrapper
 from .data_handlers import TimeSeriesData
+from .patches import PatchTransformer
+from .cache import ForecastCache, forecast_cache_key, params_cache_key
 
 logger = logging.getLogger(__name__)
 
@@ -34,13 +36,18 @@ class TimeSeriesRegressor(BaseEstimator, RegressorMixin):
     Parameters:
     -----------
     model_type : str
-        Type of model backend ('patchtst', 'ollama')
+        Type of model backend ('patchtst', 'ollama', 'statistical')
     context_length : int
         Number of historical points to use for prediction
     horizon : int
         Number of future points to predict
     model_name : str
         Specific model to load (e.g., 'ibm-granite/granite-timeseries-patchtst')
+    batch_size : int
+        Context windows per backend call for rolling-window prediction
+    cache : ForecastCache, optional
+        Reuse predictions for unchanged input (and for the unchanged
+        prefix of a series that only gained new points)
     **kwargs : dict
         Additional parameters passed to ModelConfig
     """
@@ -51,12 +58,16 @@ class TimeSeriesRegressor(BaseEstimator, RegressorMixin):
         context_length: int = 96,
         horizon: int = 24,
         model_name: Optional[str] = None,
+        batch_size: int = 256,
+        cache: Optional[ForecastCache] = None,
         **kwargs
     ):
         self.model_type = model_type
         self.context_length = context_length
         self.horizon = horizon
         self.model_name = model_name
+        self.batch_size = batch_size
+        self.cache = cache
         self.kwargs = kwargs
         
         # Will be set during fit
@@ -143,17 +154,18 @@ class TimeSeriesRegressor(BaseEstimator, RegressorMixin):
         # Handle different prediction scenarios
         if len(X_array) == self.context_length:
             # Single prediction
-            result = self.backend_.predict(X_array, self.horizon)
-            predictions = result["predictions"]
+            key = forecast_cache_key(X_array, params=self._cache_params_key()) if self.cache else None
+            predictions = self.cache.get(key) if key else None
+            if predictions is None:
+                result = self.backend_.predict(X_array, self.horizon)
+                predictions = result["predictions"]
+                # Fallback forecasts report an error; do not cache them
+                if key and "error" not in result:
+                    self.cache.put(key, predictions)
             
         elif len(X_array) > self.context_length:
             # Rolling window predictions
-            predictions = []
-            for i in range(len(X_array) - self.context_length + 1):
-                context = X_array[i:i + self.context_length]
-                result = self.backend_.predict(context, self.horizon)
-                predictions.append(result["predictions"])
-            predictions = np.array(predictions)
+            predictions = self._predict_windows(X_array)
             
         else:
             raise ValueError(
@@ -232,6 +244,42 @@ class TimeSeriesRegressor(BaseEstimator, RegressorMixin):
         
         return r2
     
+    def _predict_windows(self, X_array: np.ndarray) -> np.ndarray:
+        """Predict every context window, batch_size windows per backend call."""
+        # Strided view: one row per window, no copies
+        windows = PatchTransformer(self.context_length, stride=1).create_patches(X_array)
+        
+        # Windows within a cached prefix of the series keep their predictions
+        params_key = self._cache_params_key() if self.cache else None
+        cached = self.cache.get_rolling(params_key, X_array, self.context_length) if params_key else None
+        predictions = None
+        done = 0
+        if cached is not None:
+            done = len(cached)
+            predictions = np.empty((len(windows),) + cached.shape[1:], dtype=cached.dtype)
+            predictions[:done] = cached
+        
+        for start in range(done, len(windows), self.batch_size):
+            batch = self.backend_.predict_batch(windows[start:start + self.batch_size], self.horizon)
+            if predictions is None:
+                predictions = np.empty((len(windows),) + batch.shape[1:], dtype=batch.dtype)
+            predictions[start:start + len(batch)] = batch
+        
+        if params_key and done < len(windows):
+            self.cache.put_rolling(params_key, X_array, predictions, self.context_length)
+        return predictions
+    
+    def _cache_params_key(self) -> str:
+        """Cache key of everything besides the data that determines predictions."""
+        return params_cache_key(
+            model_type=self.model_type,
+            model_name=self.model_name or self._get_default_model_name(),
+            backend_model=getattr(self.backend_, "model_name", None),
+            context_length=self.context_length,
+            horizon=self.horizon,
+            kwargs=self.kwargs
+        )
+    
     def _validate_input(self, X):
         """Convert various input types to numpy array."""
         if isinstance(X, pd.DataFrame):
@@ -0,0 +1,221 @@
+"""
+Native statistical forecasting for many series at once.
+Module: statistical.py
+
+Seasonal naive, additive Holt-Winters (Holt's linear trend for
+non-seasonal series) and autoregressive models, each vectorized over a
+matrix of series: one NumPy operation per time step covers every series
+and every smoothing-parameter candidate, and AR coefficients are fitted
+with batched least squares. The "auto" method picks a model per series
+from its profile (see profiling.py): seasonal series get Holt-Winters,
+trending ones Holt's linear trend and the rest an AR model.
+
+Sample input:
+    forecasts, methods = forecast_matrix(contexts, horizon=24)
+
+Expected output: (n_series, 24) predictions and the method used per series
+"""
+
+from itertools import product
+from typing import Dict, Optional, Sequence, Tuple
+import logging
+
+import numpy as np
+
+from .model_backends import ForecastBackend, ModelConfig
+from .profiling import detect_season_lengths, detect_trends
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("auto", "seasonal_naive", "holt_winters", "ar")
+
+# Smoothing parameter grid searched per series (level, trend, season)
+ALPHAS = (0.1, 0.3, 0.6)
+BETAS = (0.01, 0.1)
+GAMMAS = (0.05, 0.3)
+
+
+def seasonal_naive(X: np.ndarray, horizon: int, period: int) -> np.ndarray:
+    """Repeat the last full season (last value when period <= 1)."""
+    period = max(1, min(period, X.shape[1]))
+    return X[:, -period:][:, np.arange(horizon) % period]
+
+
+def holt_winters(
+    X: np.ndarray,
+    horizon: int,
+    period: int = 0,
+    alphas: Sequence[float] = ALPHAS,
+    betas: Sequence[float] = BETAS,
+    gammas: Sequence[float] = GAMMAS
+) -> np.ndarray:
+    """
+    Additive Holt-Winters forecasts (Holt's linear trend when period < 2).
+
+    Every (alpha, beta, gamma) candidate is run for every series in one
+    pass; each series keeps the candidate with the lowest one-step-ahead
+    squared error.
+    """
+    n_series, length = X.shape
+    seasonal = period >= 2 and length >= 2 * period
+    grid = np.array(list(product(alphas, betas, gammas if seasonal else (0.0,))))
+    alpha, beta, gamma = (grid[:, i, np.newaxis] for i in range(3))
+    n_candidates = len(grid)
+
+    # Initial state from the first one or two seasons (first two points without season)
+    if seasonal:
+        first, second = X[:, :period].mean(axis=1), X[:, period:2 * period].mean(axis=1)
+        level0, trend0 = first, (second - first) / period
+        season = np.broadcast_to(X[:, :period] - first[:, np.newaxis],
+                                 (n_candidates, n_series, period)).copy()
+    else:
+        level0, trend0 = X[:, 0], X[:, 1] - X[:, 0]
+        season = np.zeros((n_candidates, n_series, 1))
+    level = np.broadcast_to(level0, (n_candidates, n_series)).copy()
+    trend = np.broadcast_to(trend0, (n_candidates, n_series)).copy()
+    sse = np.zeros((n_candidates, n_series))
+
+    for t in range(length):
+        y = X[:, t]
+        slot = t % period if seasonal else 0
+        s = season[:, :, slot]
+        error = y - (level + trend + s)
+        sse += error * error
+        previous = level
+        level = alpha * (y - s) + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous) + (1 - beta) * trend
+        if seasonal:
+            season[:, :, slot] = gamma * (y - level) + (1 - gamma) * s
+
+    best = sse.argmin(axis=0)
+    rows = np.arange(n_series)
+    steps = np.arange(1, horizon + 1)
+    forecast = level[best, rows, np.newaxis] + steps * trend[best, rows, np.newaxis]
+    if seasonal:
+        forecast += season[best, rows][:, (length + steps - 1) % period]
+    return forecast
+
+
+def ar_forecast(X: np.ndarray, horizon: int, order: int = 8, ridge: float = 1e-6) -> np.ndarray:
+    """
+    AR(order) with intercept, fitted per series by batched least squares.
+
+    Forecasts are produced recursively; order is reduced for short series.
+    """
+    n_series, length = X.shape
+    order = max(1, min(order, (length - 1) // 3))
+
+    # Lag matrix: rows t = order..length-1, columns [1, x[t-1], ..., x[t-order]]
+    windows = np.lib.stride_tricks.sliding_window_view(X, order, axis=1)[:, :-1, ::-1]
+    design = np.concatenate([np.ones(windows.shape[:2] + (1,)), windows], axis=2)
+    target = X[:, order:]
+
+    gram = np.einsum('nti,ntj->nij', design, design)
+    gram += ridge * np.eye(order + 1) * (np.trace(gram, axis1=1, axis2=2)[:, np.newaxis, np.newaxis] + 1)
+    coefficients = np.linalg.solve(gram, np.einsum('nti,nt->ni', design, target)[..., np.newaxis])[..., 0]
+
+    history = X[:, -order:][:, ::-1].copy()  # Most recent first
+    forecast = np.empty((n_series, horizon))
+    for step in range(horizon):
+        value = coefficients[:, 0] + (coefficients[:, 1:] * history).sum(axis=1)
+        forecast[:, step] = value
+        history = np.concatenate([value[:, np.newaxis], history[:, :-1]], axis=1)
+    return forecast
+
+
+def forecast_matrix(
+    X: np.ndarray,
+    horizon: int,
+    method: str = "auto",
+    season_length: Optional[int] = None,
+    ar_order: int = 8
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Forecast every row of X.
+
+    Args:
+        X: Series of shape (n_series, context_length)
+        horizon: Steps to forecast
+        method: auto, seasonal_naive, holt_winters or ar
+        season_length: Seasonal period for all series (detected per series if None)
+        ar_order: Lags used by the AR model
+
+    Returns:
+        (predictions of shape (n_series, horizon), method name per series)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown statistical method: {method}")
+    X = np.asarray(X, dtype=float)
+    n_series = len(X)
+
+    if season_length is not None:
+        periods = np.full(n_series, season_length, dtype=np.int64)
+    else:
+        periods = detect_season_lengths(X)
+
+    if method == "auto":
+        # Seasonal -> Holt-Winters, trending -> Holt, otherwise AR
+        methods = np.where(periods > 0, "holt_winters",
+                           np.where(detect_trends(X), "holt_winters", "ar"))
+    else:
+        methods = np.full(n_series, method)
+
+    predictions = np.empty((n_series, horizon))
+    for name in np.unique(methods):
+        selected = methods == name
+        for period in np.unique(periods[selected]):
+            rows = selected & (periods == period)
+            if name == "seasonal_naive":
+                predictions[rows] = seasonal_naive(X[rows], horizon, int(period))
+            elif name == "holt_winters":
+                predictions[rows] = holt_winters(X[rows], horizon, int(period))
+            else:
+                predictions[rows] = ar_forecast(X[rows], horizon, ar_order)
+    return predictions, methods
+
+
+class StatisticalBackend(ForecastBackend):
+    """CPU statistical models (no model download, no network)."""
+
+    def __init__(self):
+        self.method = "auto"
+        self.season_length = None
+        self.ar_order = 8
+        self.last_methods: Dict[str, int] = {}
+
+    def load_model(self, config: ModelConfig):
+        """Use config.model_name as the method ("auto" unless it names one)."""
+        self.method = config.model_name if config.model_name in METHODS else "auto"
+        self.season_length = config.season_length
+        logger.info(f"Statistical forecasting backend ready (method: {self.method})")
+
+    def predict(self, context: np.ndarray, horizon: int) -> Dict:
+        """Forecast a single context window."""
+        context = np.asarray(context)
+        predictions = self.predict_batch(context[np.newaxis], horizon)[0]
+        return {
+            "predictions": predictions,
+            "model_type": "statistical",
+            "method": next(iter(self.last_methods), self.method),
+        }
+
+    def predict_batch(self, contexts: np.ndarray, horizon: int) -> np.ndarray:
+        """Forecast a batch of windows; multivariate windows are forecast per channel."""
+        contexts = np.asarray(contexts, dtype=float)
+        if contexts.ndim == 3:
+            # (batch, length, features) -> one row per channel
+            n_batch, length, n_features = contexts.shape
+            rows = contexts.transpose(0, 2, 1).reshape(n_batch * n_features, length)
+            predictions = self._forecast(rows, horizon)
+            return predictions.reshape(n_batch, n_features, horizon).transpose(0, 2, 1)
+        return self._forecast(contexts, horizon)
+
+    def fine_tune(self, train_data: np.ndarray, val_data: np.ndarray):
+        """Statistical models are refitted on every context window."""
+        raise NotImplementedError("Statistical models are fitted per forecast")
+
+    def _forecast(self, rows: np.ndarray, horizon: int) -> np.ndarray:
+        predictions, methods = forecast_matrix(rows, horizon, self.method, self.season_length, self.ar_order)
+        names, counts = np.unique(methods, return_counts=True)
+        self.last_methods = dict(zip(names.tolist(), counts.tolist()))
+        return predictions
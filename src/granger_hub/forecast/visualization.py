@@ -3,20 +3,26 @@ Time Series Forecast Visualization using D3.js.
 Module: visualization.py
 
 Integrates with the arangodb D3 visualization engine to create interactive
-time series forecast visualizations with confidence intervals.
+time series forecast visualizations with confidence intervals. Series are
+downsampled with largest-triangle-three-buckets (LTTB) to a point budget
+before they reach the page; served visualizations fetch full detail for
+a zoomed range from the shared VisualizationServer.
 
 Sample usage:
     visualizer = ForecastVisualizer()
     html = visualizer.create_forecast_graph(historical_data, predictions, intervals)
     visualizer.save_to_file(html, "forecast.html")
+    url = visualizer.serve_forecast(historical_data, predictions, intervals)
 """
 
 import json
 import sys
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union, Any
+from typing import Dict, List, Optional, Sequence, Tuple, Union, Any
 import numpy as np
-from datetime import datetime, timedelta
+import pandas as pd
+from datetime import datetime
 import logging
 
 # Add arangodb visualization to path
@@ -39,18 +45,157 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Points per line sent to the browser
+DEFAULT_MAX_POINTS = 2000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices kept by largest-triangle-three-buckets downsampling.
+
+    The first and last points are always kept. The points between them
+    are split into n_out - 2 buckets, and each bucket keeps the point that
+    forms the largest triangle with the previously kept point and the mean
+    of the next bucket, which preserves peaks and troughs.
+
+    Args:
+        x: Increasing x coordinates
+        y: Values
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted indices into x/y (all indices when n_out >= len(y))
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:max(n_out, 0)], dtype=np.int64)
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[:n - 1], edges[:-1]) / sizes
+    mean_y = np.add.reduceat(y[:n - 1], edges[:-1]) / sizes
+    # The last bucket looks ahead to the final point
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for bucket in range(n_out - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        area = np.abs((x[a] - mean_x[bucket]) * (y[lo:hi] - y[a])
+                      - (x[a] - x[lo:hi]) * (mean_y[bucket] - y[a]))
+        a = lo + int(area.argmax())
+        indices[bucket + 1] = a
+    return indices
+
+
+@dataclass
+class ForecastPlotData:
+    """Historical values and forecast of one visualization, with range queries."""
+    times: np.ndarray  # int64 epoch milliseconds, historical then predictions
+    values: np.ndarray
+    historical_count: int
+    intervals: Dict[float, Tuple[np.ndarray, np.ndarray]]
+
+    @classmethod
+    def from_arrays(
+        cls,
+        historical_data: np.ndarray,
+        predictions: np.ndarray,
+        confidence_intervals: Optional[Dict[float, Tuple[np.ndarray, np.ndarray]]] = None,
+        timestamps: Optional[Sequence] = None
+    ) -> "ForecastPlotData":
+        """Build plot data; hourly timestamps from now are used when none are given."""
+        historical = np.asarray(historical_data, dtype=float).reshape(-1)
+        predictions = np.asarray(predictions, dtype=float).reshape(-1)
+        total_points = len(historical) + len(predictions)
+
+        if timestamps is None:
+            now = np.datetime64(datetime.now(), "ms").astype(np.int64)
+            times = now + np.arange(total_points, dtype=np.int64) * 3_600_000
+        else:
+            index = pd.to_datetime(list(timestamps) if not isinstance(timestamps, np.ndarray) else timestamps)
+            if index.tz is not None:
+                index = index.tz_localize(None)
+            times = index.to_numpy().astype("datetime64[ms]").astype(np.int64)[:total_points]
+
+        intervals = {
+            level: (np.asarray(lower, dtype=float).reshape(-1), np.asarray(upper, dtype=float).reshape(-1))
+            for level, (lower, upper) in (confidence_intervals or {}).items()
+        }
+        return cls(times, np.concatenate([historical, predictions])[:len(times)], len(historical), intervals)
+
+    def graph_data(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        max_points: int = DEFAULT_MAX_POINTS
+    ) -> Dict[str, Any]:
+        """
+        Nodes and links for the points within [start, end] (epoch ms).
+
+        Historical values and predictions are downsampled separately to at
+        most max_points each; interval bounds follow the kept predictions.
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.times, start, side="left"))
+        hi = len(self.times) if end is None else int(np.searchsorted(self.times, end, side="right"))
+        split = self.historical_count
+
+        nodes = []
+        for kind, first, last in (("historical", lo, min(hi, split)), ("prediction", max(lo, split), hi)):
+            if last <= first:
+                continue
+            kept = first + lttb_indices(self.times[first:last], self.values[first:last], max_points)
+            stamps = np.datetime_as_string(self.times[kept].astype("datetime64[ms]"), unit="s")
+            for index, stamp, value in zip(kept.tolist(), stamps.tolist(), self.values[kept].tolist()):
+                node = {
+                    "id": f"hist_{index}" if kind == "historical" else f"pred_{index - split}",
+                    "timestamp": stamp,
+                    "value": value,
+                    "type": kind,
+                    "index": index
+                }
+                if kind == "prediction":
+                    for level, (lower, upper) in self.intervals.items():
+                        node[f"ci_{int(level*100)}_lower"] = float(lower[index - split])
+                        node[f"ci_{int(level*100)}_upper"] = float(upper[index - split])
+                nodes.append(node)
+
+        links = [
+            {"source": source["id"], "target": target["id"], "value": 1}
+            for source, target in zip(nodes, nodes[1:])
+        ]
+        return {
+            "nodes": nodes,
+            "links": links,
+            "metadata": {
+                "type": "time_series_forecast",
+                "historical_count": split,
+                "prediction_count": len(self.values) - split,
+                "has_confidence_intervals": bool(self.intervals),
+                "points": len(nodes)
+            }
+        }
+
 
 class ForecastVisualizer:
     """Creates D3.js visualizations for time series forecasts."""
     
-    def __init__(self, use_d3_engine: bool = True):
+    def __init__(self, use_d3_engine: bool = True, max_points: int = DEFAULT_MAX_POINTS):
         """
         Initialize the forecast visualizer.
         
         Args:
             use_d3_engine: Whether to use the arangodb D3 engine
+            max_points: Points per line embedded in a page (LTTB downsampling)
         """
         self.use_d3_engine = use_d3_engine and D3_AVAILABLE
+        self.max_points = max_points
         
         if self.use_d3_engine:
             self.d3_engine = D3VisualizationEngine(use_llm=False, optimize_performance=False)
@@ -117,70 +262,24 @@ class ForecastVisualizer:
         confidence_intervals: Optional[Dict],
         timestamps: Optional[List[datetime]]
     ) -> Dict[str, Any]:
-        """Convert time series data to graph format for D3 engine."""
-        # Generate timestamps if not provided
-        if timestamps is None:
-            total_points = len(historical_data) + len(predictions)
-            timestamps = [datetime.now() + timedelta(hours=i) for i in range(total_points)]
-        
-        # Create nodes representing data points
-        nodes = []
-        links = []
-        
-        # Historical data points
-        for i, (ts, value) in enumerate(zip(timestamps[:len(historical_data)], historical_data)):
-            nodes.append({
-                "id": f"hist_{i}",
-                "timestamp": ts.isoformat(),
-                "value": float(value),
-                "type": "historical",
-                "index": i
-            })
-        
-        # Prediction data points
-        pred_start = len(historical_data)
-        for i, (ts, value) in enumerate(zip(timestamps[pred_start:], predictions)):
-            node_id = f"pred_{i}"
-            nodes.append({
-                "id": node_id,
-                "timestamp": ts.isoformat(),
-                "value": float(value),
-                "type": "prediction",
-                "index": pred_start + i
-            })
-            
-            # Add confidence intervals if available
-            if confidence_intervals:
-                for level, (lower, upper) in confidence_intervals.items():
-                    nodes[-1][f"ci_{int(level*100)}_lower"] = float(lower[i])
-                    nodes[-1][f"ci_{int(level*100)}_upper"] = float(upper[i])
-        
-        # Create links to show continuity
-        for i in range(len(nodes) - 1):
-            links.append({
-                "source": nodes[i]["id"],
-                "target": nodes[i + 1]["id"],
-                "value": 1
-            })
-        
-        return {
-            "nodes": nodes,
-            "links": links,
-            "metadata": {
-                "type": "time_series_forecast",
-                "historical_count": len(historical_data),
-                "prediction_count": len(predictions),
-                "has_confidence_intervals": confidence_intervals is not None
-            }
-        }
+        """Convert time series data to graph format for D3 engine (downsampled to max_points)."""
+        return ForecastPlotData.from_arrays(
+            historical_data, predictions, confidence_intervals, timestamps
+        ).graph_data(max_points=self.max_points)
     
     def _generate_custom_timeseries_html(
         self,
         graph_data: Dict[str, Any],
         config: VisualizationConfig,
-        title: str
+        title: str,
+        data_url: Optional[str] = None
     ) -> str:
-        """Generate custom HTML for time series visualization."""
+        """
+        Generate custom HTML for time series visualization.
+        
+        With data_url set, brushing a time range fetches that range at
+        full detail (up to max_points) and double-click resets the view.
+        """
         
         # Custom D3 script for time series
         d3_script = """
@@ -189,189 +288,214 @@ class ForecastVisualizer:
         const width = """ + str(config.width) + """ - margin.left - margin.right;
         const height = """ + str(config.height) + """ - margin.top - margin.bottom;
         
-        // Parse the data
-        const data = graphData.nodes;
-        const historicalData = data.filter(d => d.type === 'historical');
-        const predictionData = data.filter(d => d.type === 'prediction');
-        
-        // Set up scales
-        const parseTime = d3.timeParse("%Y-%m-%dT%H:%M:%S");
-        data.forEach(d => {
-            d.date = parseTime(d.timestamp.split('.')[0]);
-        });
-        
-        const xScale = d3.scaleTime()
-            .domain(d3.extent(data, d => d.date))
-            .range([0, width]);
-            
-        const yScale = d3.scaleLinear()
-            .domain([
-                d3.min(data, d => d.value) * 0.9,
-                d3.max(data, d => d.value) * 1.1
-            ])
-            .range([height, 0]);
+        const parseTime = d3.utcParse("%Y-%m-%dT%H:%M:%S");
+        const timeFormat = d3.utcFormat("%m/%d %H:%M");
+        const tooltip = d3.select("#tooltip");
         
         // Create SVG
-        const svg = d3.select("#graph-container")
+        const root = d3.select("#graph-container")
             .append("svg")
             .attr("width", width + margin.left + margin.right)
-            .attr("height", height + margin.top + margin.bottom)
-            .append("g")
+            .attr("height", height + margin.top + margin.bottom);
+        const svg = root.append("g")
             .attr("transform", `translate(${margin.left},${margin.top})`);
         
-        // Add axes
-        svg.append("g")
-            .attr("transform", `translate(0,${height})`)
-            .call(d3.axisBottom(xScale).tickFormat(d3.timeFormat("%m/%d %H:%M")));
+        function draw(nodes) {
+            svg.selectAll("*").remove();
             
-        svg.append("g")
-            .call(d3.axisLeft(yScale));
-        
-        // Add axis labels
-        svg.append("text")
-            .attr("transform", "rotate(-90)")
-            .attr("y", 0 - margin.left)
-            .attr("x", 0 - (height / 2))
-            .attr("dy", "1em")
-            .style("text-anchor", "middle")
-            .text("Value");
+            // Parse the data
+            const data = nodes;
+            const historicalData = data.filter(d => d.type === 'historical');
+            const predictionData = data.filter(d => d.type === 'prediction');
+        
+            // Set up scales
+            data.forEach(d => {
+                d.date = parseTime(d.timestamp.split('.')[0]);
+            });
+        
+            const xScale = d3.scaleTime()
+                .domain(d3.extent(data, d => d.date))
+                .range([0, width]);
             
-        svg.append("text")
-            .attr("transform", `translate(${width / 2}, ${height + margin.bottom})`)
-            .style("text-anchor", "middle")
-            .text("Time");
-        
-        // Line generator
-        const line = d3.line()
-            .x(d => xScale(d.date))
-            .y(d => yScale(d.value))
-            .curve(d3.curveMonotoneX);
-        
-        // Draw historical line
-        svg.append("path")
-            .datum(historicalData)
-            .attr("fill", "none")
-            .attr("stroke", "steelblue")
-            .attr("stroke-width", 2)
-            .attr("d", line)
-            .attr("class", "historical-line");
-        
-        // Draw prediction line
-        svg.append("path")
-            .datum(predictionData)
-            .attr("fill", "none")
-            .attr("stroke", "red")
-            .attr("stroke-width", 2)
-            .attr("stroke-dasharray", "5,5")
-            .attr("d", line)
-            .attr("class", "prediction-line");
-        
-        // Draw confidence intervals if available
-        const hasCI = predictionData.length > 0 && predictionData[0].ci_90_lower !== undefined;
-        
-        if (hasCI) {
-            // 90% confidence interval
-            const area90 = d3.area()
+            const yScale = d3.scaleLinear()
+                .domain([
+                    d3.min(data, d => d.value) * 0.9,
+                    d3.max(data, d => d.value) * 1.1
+                ])
+                .range([height, 0]);
+        
+            // Add axes
+            svg.append("g")
+                .attr("transform", `translate(0,${height})`)
+                .call(d3.axisBottom(xScale).tickFormat(timeFormat));
+            
+            svg.append("g")
+                .call(d3.axisLeft(yScale));
+        
+            // Add axis labels
+            svg.append("text")
+                .attr("transform", "rotate(-90)")
+                .attr("y", 0 - margin.left)
+                .attr("x", 0 - (height / 2))
+                .attr("dy", "1em")
+                .style("text-anchor", "middle")
+                .text("Value");
+            
+            svg.append("text")
+                .attr("transform", `translate(${width / 2}, ${height + margin.bottom})`)
+                .style("text-anchor", "middle")
+                .text("Time");
+        
+            // Line generator
+            const line = d3.line()
                 .x(d => xScale(d.date))
-                .y0(d => yScale(d.ci_90_lower))
-                .y1(d => yScale(d.ci_90_upper))
+                .y(d => yScale(d.value))
                 .curve(d3.curveMonotoneX);
-                
+        
+            // Draw historical line
+            svg.append("path")
+                .datum(historicalData)
+                .attr("fill", "none")
+                .attr("stroke", "steelblue")
+                .attr("stroke-width", 2)
+                .attr("d", line)
+                .attr("class", "historical-line");
+        
+            // Draw prediction line
             svg.append("path")
                 .datum(predictionData)
-                .attr("fill", "red")
-                .attr("fill-opacity", 0.1)
-                .attr("d", area90);
-                
-            // 50% confidence interval if available
-            if (predictionData[0].ci_50_lower !== undefined) {
-                const area50 = d3.area()
+                .attr("fill", "none")
+                .attr("stroke", "red")
+                .attr("stroke-width", 2)
+                .attr("stroke-dasharray", "5,5")
+                .attr("d", line)
+                .attr("class", "prediction-line");
+        
+            // Draw confidence intervals if available
+            const hasCI = predictionData.length > 0 && predictionData[0].ci_90_lower !== undefined;
+        
+            if (hasCI) {
+                // 90% confidence interval
+                const area90 = d3.area()
                     .x(d => xScale(d.date))
-                    .y0(d => yScale(d.ci_50_lower))
-                    .y1(d => yScale(d.ci_50_upper))
+                    .y0(d => yScale(d.ci_90_lower))
+                    .y1(d => yScale(d.ci_90_upper))
                     .curve(d3.curveMonotoneX);
-                    
+                
                 svg.append("path")
                     .datum(predictionData)
                     .attr("fill", "red")
-                    .attr("fill-opacity", 0.2)
-                    .attr("d", area50);
+                    .attr("fill-opacity", 0.1)
+                    .attr("d", area90);
+                
+                // 50% confidence interval if available
+                if (predictionData[0].ci_50_lower !== undefined) {
+                    const area50 = d3.area()
+                        .x(d => xScale(d.date))
+                        .y0(d => yScale(d.ci_50_lower))
+                        .y1(d => yScale(d.ci_50_upper))
+                        .curve(d3.curveMonotoneX);
+                    
+                    svg.append("path")
+                        .datum(predictionData)
+                        .attr("fill", "red")
+                        .attr("fill-opacity", 0.2)
+                        .attr("d", area50);
+                }
             }
-        }
         
-        // Add connecting line between historical and prediction
-        if (historicalData.length > 0 && predictionData.length > 0) {
-            const connectionData = [
-                historicalData[historicalData.length - 1],
-                predictionData[0]
-            ];
+            // Add connecting line between historical and prediction
+            if (historicalData.length > 0 && predictionData.length > 0) {
+                const connectionData = [
+                    historicalData[historicalData.length - 1],
+                    predictionData[0]
+                ];
             
-            svg.append("path")
-                .datum(connectionData)
-                .attr("fill", "none")
-                .attr("stroke", "gray")
-                .attr("stroke-width", 1)
-                .attr("stroke-dasharray", "2,2")
-                .attr("d", line);
-        }
+                svg.append("path")
+                    .datum(connectionData)
+                    .attr("fill", "none")
+                    .attr("stroke", "gray")
+                    .attr("stroke-width", 1)
+                    .attr("stroke-dasharray", "2,2")
+                    .attr("d", line);
+            }
         
-        // Add legend
-        const legend = svg.append("g")
-            .attr("transform", `translate(${width - 120}, 20)`);
-            
-        legend.append("line")
-            .attr("x1", 0).attr("x2", 20)
-            .attr("y1", 0).attr("y2", 0)
-            .style("stroke", "steelblue")
-            .style("stroke-width", 2);
-        legend.append("text")
-            .attr("x", 25).attr("y", 5)
-            .text("Historical");
+            // Add legend
+            const legend = svg.append("g")
+                .attr("transform", `translate(${width - 120}, 20)`);
             
-        legend.append("line")
-            .attr("x1", 0).attr("x2", 20)
-            .attr("y1", 20).attr("y2", 20)
-            .style("stroke", "red")
-            .style("stroke-width", 2)
-            .style("stroke-dasharray", "5,5");
-        legend.append("text")
-            .attr("x", 25).attr("y", 25)
-            .text("Forecast");
+            legend.append("line")
+                .attr("x1", 0).attr("x2", 20)
+                .attr("y1", 0).attr("y2", 0)
+                .style("stroke", "steelblue")
+                .style("stroke-width", 2);
+            legend.append("text")
+                .attr("x", 25).attr("y", 5)
+                .text("Historical");
             
-        if (hasCI) {
-            legend.append("rect")
-                .attr("x", 0).attr("y", 35)
-                .attr("width", 20).attr("height", 10)
-                .style("fill", "red")
-                .style("fill-opacity", 0.2);
+            legend.append("line")
+                .attr("x1", 0).attr("x2", 20)
+                .attr("y1", 20).attr("y2", 20)
+                .style("stroke", "red")
+                .style("stroke-width", 2)
+                .style("stroke-dasharray", "5,5");
             legend.append("text")
-                .attr("x", 25).attr("y", 45)
-                .text("Confidence");
+                .attr("x", 25).attr("y", 25)
+                .text("Forecast");
+            
+            if (hasCI) {
+                legend.append("rect")
+                    .attr("x", 0).attr("y", 35)
+                    .attr("width", 20).attr("height", 10)
+                    .style("fill", "red")
+                    .style("fill-opacity", 0.2);
+                legend.append("text")
+                    .attr("x", 25).attr("y", 45)
+                    .text("Confidence");
+            }
+        
+            // Brushing a range loads it at full detail
+            if (dataUrl) {
+                const brush = d3.brushX()
+                    .extent([[0, 0], [width, height]])
+                    .on("end", function(event) {
+                        if (!event.selection) return;
+                        const [start, end] = event.selection.map(xScale.invert);
+                        fetch(`${dataUrl}?start=${start.getTime()}&end=${end.getTime()}&points=${maxPoints}`)
+                            .then(response => response.json())
+                            .then(detail => draw(detail.nodes));
+                    });
+                svg.append("g")
+                    .attr("class", "brush")
+                    .call(brush);
+            }
+        
+            // Add dots for data points
+            svg.selectAll(".dot")
+                .data(data)
+                .enter().append("circle")
+                .attr("class", "dot")
+                .attr("cx", d => xScale(d.date))
+                .attr("cy", d => yScale(d.value))
+                .attr("r", 3)
+                .attr("fill", d => d.type === "historical" ? "steelblue" : "red")
+                .on("mouseover", function(event, d) {
+                    tooltip.style("opacity", 1)
+                        .html(`<strong>${d.type === "historical" ? "Historical" : "Forecast"}</strong><br/>
+                               Time: ${timeFormat(d.date)}<br/>
+                               Value: ${d.value.toFixed(4)}`)
+                        .style("left", (event.pageX + 10) + "px")
+                        .style("top", (event.pageY - 28) + "px");
+                })
+                .on("mouseout", function() {
+                    tooltip.style("opacity", 0);
+                });
         }
         
-        // Add interactivity
-        const tooltip = d3.select("#tooltip");
+        draw(graphData.nodes);
         
-        // Add dots for data points
-        svg.selectAll(".dot")
-            .data(data)
-            .enter().append("circle")
-            .attr("class", "dot")
-            .attr("cx", d => xScale(d.date))
-            .attr("cy", d => yScale(d.value))
-            .attr("r", 3)
-            .attr("fill", d => d.type === "historical" ? "steelblue" : "red")
-            .on("mouseover", function(event, d) {
-                tooltip.style("opacity", 1)
-                    .html(`<strong>${d.type === "historical" ? "Historical" : "Forecast"}</strong><br/>
-                           Time: ${d3.timeFormat("%m/%d %H:%M")(d.date)}<br/>
-                           Value: ${d.value.toFixed(4)}`)
-                    .style("left", (event.pageX + 10) + "px")
-                    .style("top", (event.pageY - 28) + "px");
-            })
-            .on("mouseout", function() {
-                tooltip.style("opacity", 0);
-            });
+        // Double-click returns to the overview
+        root.on("dblclick", () => draw(graphData.nodes));
         
         // Remove loading indicator
         d3.select(".loading").remove();
@@ -443,6 +567,8 @@ class ForecastVisualizer:
     
     <script>
         const graphData = {graph_data};
+        const dataUrl = {data_url};
+        const maxPoints = {max_points};
         {d3_script}
     </script>
 </body>
@@ -452,6 +578,8 @@ class ForecastVisualizer:
             title=title,
             width=config.width + 40,
             graph_data=json.dumps(graph_data),
+            data_url=json.dumps(data_url),
+            max_points=self.max_points,
             d3_script=d3_script
         )
     
@@ -487,33 +615,56 @@ class ForecastVisualizer:
         filepath.write_text(html_content, encoding='utf-8')
         logger.info(f"Visualization saved to {filepath.absolute()}")
     
-    def serve_visualization(self, html_content: str, port: int = 8888):
-        """Serve the visualization on a local HTTP server."""
-        import tempfile
+    def render_page(
+        self,
+        data: ForecastPlotData,
+        title: str = "Time Series Forecast",
+        data_url: Optional[str] = None,
+        width: int = 1200,
+        height: int = 600
+    ) -> str:
+        """Render the D3.js page for plot data (downsampled overview, optional range endpoint)."""
+        return self._generate_custom_timeseries_html(
+            data.graph_data(max_points=self.max_points),
+            VisualizationConfig(width=width, height=height),
+            title,
+            data_url=data_url
+        )
+    
+    def serve_visualization(self, html_content: str, port: int = 8888) -> str:
+        """Serve a finished HTML page from the shared local server; returns its URL."""
         import webbrowser
-        import http.server
-        import socketserver
-        import threading
+        from .viz_server import get_visualization_server
         
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.html', delete=False) as f:
-            f.write(html_content)
-            temp_path = f.name
-        
-        # Start simple HTTP server
-        Handler = http.server.SimpleHTTPRequestHandler
-        
-        def serve():
-            with socketserver.TCPServer(("", port), Handler) as httpd:
-                print(f"Serving at http://localhost:{port}/{Path(temp_path).name}")
-                httpd.serve_forever()
-        
-        # Start server in background
-        thread = threading.Thread(target=serve, daemon=True)
-        thread.start()
+        url = get_visualization_server(port=port).add_page(html_content)
+        print(f"Serving at {url}")
+        webbrowser.open(url)
+        return url
+    
+    def serve_forecast(
+        self,
+        historical_data: np.ndarray,
+        predictions: np.ndarray,
+        confidence_intervals: Optional[Dict[float, Tuple[np.ndarray, np.ndarray]]] = None,
+        timestamps: Optional[Sequence] = None,
+        title: str = "Time Series Forecast",
+        port: int = 8888
+    ) -> str:
+        """
+        Serve a zoomable forecast from the shared local server; returns its URL.
         
-        # Open browser
-        webbrowser.open(f"http://localhost:{port}/{Path(temp_path).name}")
+        The page is rendered on request from a downsampled overview and
+        fetches full detail for a brushed range from the server.
+        """
+        import webbrowser
+        from .viz_server import get_visualization_server
+        
+        data = ForecastPlotData.from_arrays(historical_data, predictions, confidence_intervals, timestamps)
+        server = get_visualization_server(port=port)
+        url = server.add_forecast(data, title=title, visualizer=self)
+        print(f"Serving at {url}")
+        webbrowser.open(url)
+        return url
 
 
 # Validation
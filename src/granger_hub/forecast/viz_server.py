@@ -0,0 +1,205 @@
+"""
+Shared async HTTP server for forecast visualizations.
+Module: viz_server.py
+
+One aiohttp server (on a background event loop) serves any number of
+visualizations. Forecast pages are rendered on request from an LTTB
+overview, and a JSON endpoint returns the points within a time range so
+the page can load detail on zoom instead of embedding every point.
+
+Routes:
+    GET /                   -> list of visualizations
+    GET /viz/{id}           -> HTML page
+    GET /api/viz/{id}       -> graph data; ?start=&end= (epoch ms) &points=
+
+Sample Input:
+>>> server = get_visualization_server(port=8888)
+>>> server.add_forecast(ForecastPlotData.from_arrays(history, predictions), title="Load")
+
+Expected Output:
+'http://localhost:8888/viz/3f9c2a1b7d4e'
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from aiohttp import web
+
+from .visualization import ForecastPlotData, ForecastVisualizer
+
+logger = logging.getLogger(__name__)
+
+# Points a single range request may ask for
+MAX_REQUEST_POINTS = 20000
+
+# Servers started by get_visualization_server, per (host, port)
+_servers: Dict[Tuple[str, int], "VisualizationServer"] = {}
+_servers_lock = threading.Lock()
+
+
+class VisualizationServer:
+    """Serve many forecast visualizations from one aiohttp application."""
+
+    def __init__(self, host: str = "localhost", port: int = 8888, max_visualizations: int = 100):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+            max_visualizations: Visualizations kept before the oldest are dropped
+        """
+        self.host = host
+        self.port = port
+        self.max_visualizations = max_visualizations
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._runner: Optional[web.AppRunner] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def add_page(self, html: str, title: str = "Visualization") -> str:
+        """Serve a finished HTML page; returns its URL."""
+        return self._add({"title": title, "html": html})
+
+    def add_forecast(
+        self,
+        data: ForecastPlotData,
+        title: str = "Time Series Forecast",
+        visualizer: Optional[ForecastVisualizer] = None
+    ) -> str:
+        """Serve a zoomable forecast rendered on request; returns its URL."""
+        return self._add({"title": title, "data": data, "visualizer": visualizer or ForecastVisualizer()})
+
+    def remove(self, viz_id: str):
+        """Stop serving a visualization."""
+        with self._lock:
+            self._entries.pop(viz_id, None)
+
+    async def astart(self):
+        """Start serving on the running event loop."""
+        app = web.Application()
+        app.router.add_get("/", self._index)
+        app.router.add_get("/viz/{viz_id}", self._page)
+        app.router.add_get("/api/viz/{viz_id}", self._data)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Visualization server listening on {self.url}")
+
+    async def astop(self):
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def start(self) -> "VisualizationServer":
+        """Start serving from a background event loop thread (no-op if running)."""
+        if self._thread is not None:
+            return self
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                loop.run_until_complete(self.astart())
+            except Exception as e:
+                errors.append(e)
+                loop.close()
+                ready.set()
+                return
+            self._loop = loop
+            ready.set()
+            loop.run_forever()
+            loop.run_until_complete(self.astop())
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="viz-server", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread = None
+            raise errors[0]
+        return self
+
+    def stop(self):
+        """Stop the background event loop started by start()."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop = self._thread = None
+
+    def _add(self, entry: Dict) -> str:
+        viz_id = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._entries[viz_id] = entry
+            while len(self._entries) > self.max_visualizations:
+                self._entries.popitem(last=False)
+        return f"{self.url}/viz/{viz_id}"
+
+    def _entry(self, request: web.Request) -> Dict:
+        with self._lock:
+            entry = self._entries.get(request.match_info["viz_id"])
+        if entry is None:
+            raise web.HTTPNotFound(text="Unknown visualization")
+        return entry
+
+    async def _index(self, request: web.Request) -> web.Response:
+        with self._lock:
+            entries = [(viz_id, entry["title"]) for viz_id, entry in self._entries.items()]
+        return web.json_response([
+            {"id": viz_id, "title": title, "url": f"/viz/{viz_id}"} for viz_id, title in entries
+        ])
+
+    async def _page(self, request: web.Request) -> web.Response:
+        entry = self._entry(request)
+        if "html" in entry:
+            return web.Response(text=entry["html"], content_type="text/html")
+        data_url = f"/api/viz/{request.match_info['viz_id']}"
+        html = await asyncio.get_running_loop().run_in_executor(
+            None, entry["visualizer"].render_page, entry["data"], entry["title"], data_url
+        )
+        return web.Response(text=html, content_type="text/html")
+
+    async def _data(self, request: web.Request) -> web.Response:
+        entry = self._entry(request)
+        if "data" not in entry:
+            raise web.HTTPNotFound(text="Visualization has no data endpoint")
+        try:
+            start = _float_param(request, "start")
+            end = _float_param(request, "end")
+            default_points = entry["visualizer"].max_points
+            points = min(int(request.query.get("points", default_points)), MAX_REQUEST_POINTS)
+        except ValueError:
+            raise web.HTTPBadRequest(text="start, end and points must be numbers")
+        if points < 2:
+            raise web.HTTPBadRequest(text="points must be at least 2")
+
+        graph_data = await asyncio.get_running_loop().run_in_executor(
+            None, entry["data"].graph_data, start, end, points
+        )
+        return web.json_response(graph_data)
+
+
+def _float_param(request: web.Request, name: str) -> Optional[float]:
+    value = request.query.get(name)
+    return None if value in (None, "") else float(value)
+
+
+def get_visualization_server(host: str = "localhost", port: int = 8888) -> VisualizationServer:
+    """Get the running shared server for host/port, starting it on first use."""
+    with _servers_lock:
+        server = _servers.get((host, port))
+        if server is None:
+            server = VisualizationServer(host, port).start()
+            _servers[(host, port)] = server
+        return server
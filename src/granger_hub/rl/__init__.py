@@ -11,7 +11,10 @@ from granger_hub.rl.state_extraction import (
     extract_task_state,
     extract_pipeline_state,
     extract_error_state,
-    extract_timeout_context
+    extract_timeout_context,
+    extract_task_states,
+    extract_pipeline_states,
+    extract_error_states
 )
 
 from granger_hub.rl.reward_calculation import (
@@ -24,16 +27,33 @@ from granger_hub.rl.reward_calculation import (
 from granger_hub.rl.hub_decisions import (
     initialize_rl_agents,
     select_module_with_rl,
+    select_modules_with_rl,
     optimize_pipeline_with_rl,
     allocate_resources_with_rl,
     handle_error_with_rl,
-    record_decision_outcome
+    record_decision_outcome,
+    record_decision_outcomes,
+    configure_decision_journal,
+    get_last_decision_id,
+    get_rl_agents,
+    get_rl_agents_version,
+    publish_rl_agents,
+    get_module_index,
+    save_rl_checkpoint
 )
 
+from granger_hub.rl.decision_journal import DecisionJournal
+from granger_hub.rl.selector_service import BatchingModuleSelector
+from granger_hub.rl.training_worker import TrainingWorker, PolicySnapshot, start_training_worker
+
 from granger_hub.rl.experience_collection import (
     initialize_experience_db,
     log_experience,
+    log_experiences,
     load_experiences,
+    load_experience_arrays,
+    close_experience_db,
+    ExperienceWriter,
     train_agents_offline,
     get_experience_statistics
 )
@@ -44,6 +64,9 @@ __all__ = [
     'extract_pipeline_state', 
     'extract_error_state',
     'extract_timeout_context',
+    'extract_task_states',
+    'extract_pipeline_states',
+    'extract_error_states',
     
     # Reward calculation
     'calculate_reward',
@@ -54,15 +77,33 @@ __all__ = [
     # Hub decisions
     'initialize_rl_agents',
     'select_module_with_rl',
+    'select_modules_with_rl',
+    'BatchingModuleSelector',
     'optimize_pipeline_with_rl',
     'allocate_resources_with_rl',
     'handle_error_with_rl',
     'record_decision_outcome',
+    'record_decision_outcomes',
+    'configure_decision_journal',
+    'get_last_decision_id',
+    'get_rl_agents',
+    'get_rl_agents_version',
+    'publish_rl_agents',
+    'get_module_index',
+    'save_rl_checkpoint',
+    'TrainingWorker',
+    'PolicySnapshot',
+    'start_training_worker',
+    'DecisionJournal',
     
     # Experience collection
     'initialize_experience_db',
     'log_experience',
+    'log_experiences',
     'load_experiences',
+    'load_experience_arrays',
+    'close_experience_db',
+    'ExperienceWriter',
     'train_agents_offline',
     'get_experience_statistics'
 ]
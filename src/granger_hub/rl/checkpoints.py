@@ -0,0 +1,236 @@
+"""
+Checkpointing and warm start for hub RL agents.
+Module: checkpoints.py
+Description: Atomic, compressed agent checkpoints with schema headers
+
+A checkpoint file is a small uncompressed JSON header followed by one
+compressed pickle of the agents (parameters and replay buffers included).
+The header records the module index and each agent's state/action
+dimensions, so compatibility can be checked without unpickling the body.
+The hub agents warm start from default_checkpoint_path() when they are
+first created, and a worker from start_training_worker writes there
+periodically. Files are written to a temporary path and renamed into place, so a crash
+mid-write never leaves a truncated checkpoint behind.
+
+Sample Input:
+>>> save_agents_checkpoint(get_rl_agents(), {"marker": 0}, Path("data/rl_agents.ckpt"))
+
+Expected Output:
+>>> read_checkpoint_header(Path("data/rl_agents.ckpt"))["modules"]
+{"marker": 0}
+"""
+
+import gzip
+import json
+import os
+import pickle
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Default checkpoint path
+CHECKPOINT_PATH = Path("data/rl_agents.ckpt")
+
+# Environment variable overriding CHECKPOINT_PATH; set it empty to disable checkpoints
+CHECKPOINT_PATH_ENV = "GRANGER_RL_CHECKPOINT_PATH"
+
+CHECKPOINT_MAGIC = b"GHRLCKPT"
+CHECKPOINT_FORMAT_VERSION = 1
+
+# Agent attributes that define the shape of its inputs and outputs
+SCHEMA_ATTRIBUTES = ("n_arms", "n_features", "state_dim", "action_dim", "continuous")
+
+
+def default_checkpoint_path() -> Optional[Path]:
+    """Checkpoint file used for warm start and by start_training_worker, or None if disabled."""
+    path = os.getenv(CHECKPOINT_PATH_ENV, str(CHECKPOINT_PATH))
+    return Path(path) if path else None
+
+
+def agent_schema(agent: Any) -> Dict[str, Any]:
+    """Describe an agent's class and state/action dimensions."""
+    schema = {"class": type(agent).__name__}
+    for attribute in SCHEMA_ATTRIBUTES:
+        value = getattr(agent, attribute, None)
+        if value is not None:
+            schema[attribute] = value.item() if isinstance(value, np.generic) else value
+    return schema
+
+
+def save_agents_checkpoint(
+    agents: Dict[str, Any],
+    module_to_index: Dict[str, int],
+    path: Optional[Path] = None,
+    compression: Optional[str] = None
+) -> Path:
+    """
+    Atomically write a checkpoint of the agents.
+
+    Args:
+        agents: Agent name -> agent (None entries are skipped)
+        module_to_index: Module name -> selector arm index
+        path: Checkpoint file (defaults to CHECKPOINT_PATH)
+        compression: "zstd" or "gzip" (defaults to zstd when available)
+
+    Returns:
+        Path of the written checkpoint
+    """
+    path = Path(path or CHECKPOINT_PATH)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    compression = compression or ("zstd" if zstandard else "gzip")
+    agents = {name: agent for name, agent in agents.items() if agent is not None}
+
+    payload = pickle.dumps(agents, protocol=pickle.HIGHEST_PROTOCOL)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package")
+        body = zstandard.ZstdCompressor(level=3).compress(payload)
+    else:
+        body = gzip.compress(payload, compresslevel=6)
+
+    header = json.dumps({
+        "format_version": CHECKPOINT_FORMAT_VERSION,
+        "created_at": time.time(),
+        "compression": compression,
+        "modules": module_to_index,
+        "agents": {name: agent_schema(agent) for name, agent in agents.items()},
+        "payload_bytes": len(payload)
+    }).encode("utf-8")
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(CHECKPOINT_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(body)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def _read_header(f) -> Dict[str, Any]:
+    if f.read(len(CHECKPOINT_MAGIC)) != CHECKPOINT_MAGIC:
+        raise ValueError("Not an RL agent checkpoint")
+    (header_length,) = struct.unpack("<I", f.read(4))
+    header = json.loads(f.read(header_length))
+    if header.get("format_version") != CHECKPOINT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format {header.get('format_version')}")
+    return header
+
+
+def read_checkpoint_header(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Read a checkpoint's header without loading the agents."""
+    with open(path or CHECKPOINT_PATH, "rb") as f:
+        return _read_header(f)
+
+
+def load_agents_checkpoint(path: Optional[Path] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Load a checkpoint.
+
+    Returns:
+        (header, agents)
+    """
+    with open(path or CHECKPOINT_PATH, "rb") as f:
+        header = _read_header(f)
+        body = f.read()
+    if header["compression"] == "zstd":
+        if zstandard is None:
+            raise ImportError("Checkpoint is zstd-compressed; install zstandard to load it")
+        payload = zstandard.ZstdDecompressor().decompress(body, max_output_size=header["payload_bytes"])
+    else:
+        payload = gzip.decompress(body)
+    return header, pickle.loads(payload)
+
+
+def grow_agent_arms(agent: Any, fresh_agent: Any, old_arms: int) -> Any:
+    """
+    Carry a bandit's learned arms over into an agent with more arms.
+
+    fresh_agent must be constructed exactly like agent but with more arms.
+    Per-arm arrays/lists (leading dimension equal to the arm count) keep the
+    learned values for the first old_arms arms and the fresh initial values
+    for new arms; other array state and scalar counters are copied from the
+    learned agent.
+
+    Args:
+        agent: Trained agent
+        fresh_agent: Newly constructed agent with the larger arm count
+        old_arms: Number of arms of the trained agent
+
+    Returns:
+        fresh_agent, updated in place
+    """
+    _carry_over(agent, fresh_agent, "n_arms", old_arms)
+    logger.info(f"Grew {type(agent).__name__} from {old_arms} to {fresh_agent.n_arms} arms")
+    return fresh_agent
+
+
+def grow_agent_actions(agent: Any, fresh_agent: Any, old_actions: int) -> Any:
+    """
+    Carry a discrete-action agent's learned state over into one with more actions.
+
+    Works like grow_agent_arms along action_dim. Torch networks are copied
+    through their state dicts: layers whose shape is unchanged keep their
+    learned weights, and output layers keep the learned rows for the first
+    old_actions actions while new actions start from the fresh
+    initialization. The fresh agent's optimizer is kept, since it is bound
+    to the new parameters.
+
+    Args:
+        agent: Trained agent
+        fresh_agent: Newly constructed agent with the larger action_dim
+        old_actions: Number of actions of the trained agent
+
+    Returns:
+        fresh_agent, updated in place
+    """
+    _carry_over(agent, fresh_agent, "action_dim", old_actions)
+    logger.info(f"Grew {type(agent).__name__} from {old_actions} to {fresh_agent.action_dim} actions")
+    return fresh_agent
+
+
+def _grow_rows(fresh_value: Any, old_value: Any, old_size: int, new_size: int) -> Any:
+    """Learned value if the shape is unchanged, else fresh rows below the learned ones."""
+    if fresh_value.shape == old_value.shape:
+        return old_value
+    if (len(fresh_value.shape) and fresh_value.shape[0] == new_size
+            and old_value.shape[0] == old_size and fresh_value.shape[1:] == old_value.shape[1:]):
+        fresh_value[:old_size] = old_value
+    return fresh_value
+
+
+def _carry_over(agent: Any, fresh_agent: Any, size_attribute: str, old_size: int):
+    """Copy learned state into fresh_agent, growing arrays sized by size_attribute."""
+    new_size = getattr(fresh_agent, size_attribute)
+    for attribute, fresh_value in vars(fresh_agent).items():
+        if attribute == size_attribute or not hasattr(agent, attribute):
+            continue
+        old_value = getattr(agent, attribute)
+
+        if isinstance(fresh_value, np.ndarray) and isinstance(old_value, np.ndarray):
+            setattr(fresh_agent, attribute, _grow_rows(fresh_value, old_value, old_size, new_size))
+        elif hasattr(fresh_value, "parameters") and hasattr(old_value, "state_dict"):
+            # torch.nn.Module
+            old_state = old_value.state_dict()
+            fresh_value.load_state_dict({
+                key: _grow_rows(value.clone(), old_state[key], old_size, new_size) if key in old_state else value
+                for key, value in fresh_value.state_dict().items()
+            })
+        elif isinstance(fresh_value, list) and isinstance(old_value, list):
+            if len(fresh_value) == new_size and len(old_value) == old_size:
+                fresh_value[:old_size] = old_value
+            elif len(fresh_value) == len(old_value):
+                setattr(fresh_agent, attribute, old_value)
+        elif isinstance(fresh_value, (int, float, bool, str)) and type(fresh_value) is type(old_value):
+            setattr(fresh_agent, attribute, old_value)
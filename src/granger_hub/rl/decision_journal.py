@@ -0,0 +1,318 @@
+"""
+Persistent journal of RL decisions awaiting delayed rewards.
+Module: decision_journal.py
+Description: Indexed decision storage for hub reward attribution
+
+Decisions are kept in a bounded in-memory LRU window for O(1) lookup and
+written through to SQLite keyed by a unique decision ID, so rewards that
+arrive after many newer decisions, or after a restart, can still be
+attributed. Entries expire after a configurable TTL. Each decision is
+attributed at most once: lookups for attribution claim it, and resolved
+or claimed decisions are not returned again.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Iterable, Set
+
+import numpy as np
+
+# Default decision journal path
+DECISION_DB_PATH = Path("data/rl_decisions.db")
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS decisions (
+        decision_id TEXT PRIMARY KEY,
+        decision_type TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        expires_at REAL NOT NULL,
+        payload TEXT NOT NULL,
+        reward REAL,
+        resolved_at REAL
+    )
+"""
+
+_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_decisions_expires ON decisions(expires_at)",
+    "CREATE INDEX IF NOT EXISTS idx_decisions_type_created ON decisions(decision_type, created_at)"
+]
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize NumPy values stored in decision payloads."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+class DecisionJournal:
+    """
+    Decision store with an in-memory window over an on-disk index.
+
+    Inserts are committed in groups (every commit_batch_size decisions or
+    commit_interval seconds) so logging stays off the disk on the decision
+    path; call flush() to force pending rows out.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_in_memory: int = 1000,
+        ttl_seconds: float = 7 * 24 * 3600,
+        commit_batch_size: int = 100,
+        commit_interval: float = 1.0
+    ):
+        """
+        Initialize the journal.
+
+        Args:
+            db_path: SQLite path; an in-memory database is used when None
+            max_in_memory: Number of recent decisions kept in memory
+            ttl_seconds: Seconds after which an unresolved decision expires
+            commit_batch_size: Pending inserts that trigger a commit
+            commit_interval: Maximum seconds between commits
+        """
+        self.db_path = Path(db_path) if db_path else None
+        self.max_in_memory = max_in_memory
+        self.ttl_seconds = ttl_seconds
+        self.commit_batch_size = commit_batch_size
+        self.commit_interval = commit_interval
+
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        else:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        for statement in _INDEXES:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+        self._window: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Decisions handed out for attribution and not yet resolved
+        self._claimed: Set[str] = set()
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._last_expiry = time.time()
+        self.last_decision_id: Optional[str] = None
+
+    def record(self, decision_type: str, **fields) -> str:
+        """
+        Store a decision and return its unique ID.
+
+        Args:
+            decision_type: Type of decision (module_selection, etc.)
+            **fields: Decision payload (state, action, context, ...)
+
+        Returns:
+            Decision ID
+        """
+        return self.record_many(decision_type, [fields])[0]
+
+    def record_many(self, decision_type: str, payloads: List[Dict[str, Any]]) -> List[str]:
+        """
+        Store several decisions of one type with a single insert.
+
+        Args:
+            decision_type: Type of decision (module_selection, etc.)
+            payloads: Decision payloads
+
+        Returns:
+            Decision IDs in payload order
+        """
+        with self._lock:
+            now = time.time()
+            timestamp = datetime.fromtimestamp(now).isoformat()
+            rows = []
+            decision_ids = []
+            for fields in payloads:
+                decision_id = f"{decision_type}_{uuid.uuid4().hex}"
+                decision = {
+                    **fields,
+                    'decision_type': decision_type,
+                    'decision_id': decision_id,
+                    'timestamp': timestamp,
+                    'created_at': now
+                }
+                rows.append((decision_id, decision_type, now, now + self.ttl_seconds,
+                             json.dumps(decision, default=_json_default)))
+                decision_ids.append(decision_id)
+                self._remember(decision)
+
+            self._conn.executemany(
+                "INSERT INTO decisions (decision_id, decision_type, created_at, expires_at, payload) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._pending += len(rows)
+            if decision_ids:
+                self.last_decision_id = decision_ids[-1]
+            self._maybe_commit(now)
+            return decision_ids
+
+    def get(self, decision_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a decision by ID.
+
+        Returns:
+            The decision, or None if it is unknown or expired
+        """
+        with self._lock:
+            decision = self._window.get(decision_id)
+            if decision is not None:
+                if self._expired(decision):
+                    return None
+                self._window.move_to_end(decision_id)
+                return decision
+            return self._load([decision_id], unresolved_only=False).get(decision_id)
+
+    def get_many(self, decision_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up several unresolved decisions, reading misses from disk in one query.
+
+        Decisions that are already resolved, or claimed and not yet
+        resolved, are left out so an outcome reported twice is not trained
+        on twice.
+
+        Returns:
+            Mapping of decision ID to decision for the IDs that were found
+        """
+        with self._lock:
+            return self._load(decision_ids, unresolved_only=True)
+
+    def claim(self, decision_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Look up unresolved decisions and reserve them for attribution.
+
+        Claimed decisions are not returned by get_many or claim until they
+        are released, so outcomes that arrive again before the first one is
+        resolved are ignored.
+
+        Returns:
+            Mapping of decision ID to decision for the IDs that were claimed
+        """
+        with self._lock:
+            found = self._load(decision_ids, unresolved_only=True)
+            self._claimed.update(found)
+            return found
+
+    def release(self, decision_ids: Iterable[str]) -> None:
+        """Return claimed decisions that were not resolved."""
+        with self._lock:
+            self._claimed.difference_update(decision_ids)
+
+    def _load(self, decision_ids: Iterable[str], unresolved_only: bool) -> Dict[str, Dict[str, Any]]:
+        """Look up decisions in the window, then the misses on disk."""
+        with self._lock:
+            found = {}
+            missing = []
+            for decision_id in decision_ids:
+                if unresolved_only and decision_id in self._claimed:
+                    continue
+                decision = self._window.get(decision_id)
+                if decision is None:
+                    missing.append(decision_id)
+                elif not self._expired(decision) and not (unresolved_only and 'resolved_at' in decision):
+                    found[decision_id] = decision
+
+            # Stay below SQLite's bound-parameter limit
+            now = time.time()
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT payload FROM decisions WHERE decision_id IN ({placeholders}) "
+                    "AND expires_at > ?" + (" AND resolved_at IS NULL" if unresolved_only else ""),
+                    (*chunk, now)
+                ).fetchall()
+                for (payload,) in rows:
+                    decision = json.loads(payload)
+                    found[decision['decision_id']] = decision
+            return found
+
+    def resolve(self, rewards: Dict[str, float]) -> None:
+        """Store the rewards attributed to decisions."""
+        with self._lock:
+            now = time.time()
+            for decision_id in rewards:
+                self._claimed.discard(decision_id)
+                if decision_id in self._window:
+                    self._window[decision_id]['resolved_at'] = now
+            self._conn.executemany(
+                "UPDATE decisions SET reward = ?, resolved_at = ? WHERE decision_id = ?",
+                [(float(reward), now, decision_id) for decision_id, reward in rewards.items()]
+            )
+            self._pending += len(rewards)
+            self._maybe_commit(now)
+
+    def expire(self) -> int:
+        """
+        Remove expired decisions from memory and disk.
+
+        Returns:
+            Number of decisions removed from disk
+        """
+        with self._lock:
+            now = time.time()
+            for decision_id in [d for d, decision in self._window.items() if self._expired(decision, now)]:
+                del self._window[decision_id]
+            removed = self._conn.execute("DELETE FROM decisions WHERE expires_at <= ?", (now,)).rowcount
+            self._conn.commit()
+            self._pending = 0
+            self._last_commit = time.monotonic()
+            self._last_expiry = now
+            return removed
+
+    def flush(self) -> None:
+        """Commit pending writes."""
+        with self._lock:
+            if self._pending:
+                self._conn.commit()
+                self._pending = 0
+            self._last_commit = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get journal size and resolution counts."""
+        with self._lock:
+            total, resolved = self._conn.execute(
+                "SELECT COUNT(*), COUNT(resolved_at) FROM decisions"
+            ).fetchone()
+        return {
+            'in_memory': len(self._window),
+            'stored': total,
+            'resolved': resolved,
+            'unresolved': total - resolved,
+            'ttl_seconds': self.ttl_seconds
+        }
+
+    def close(self) -> None:
+        """Flush and close the database."""
+        self.flush()
+        self._conn.close()
+
+    def _remember(self, decision: Dict[str, Any]) -> None:
+        self._window[decision['decision_id']] = decision
+        while len(self._window) > self.max_in_memory:
+            self._window.popitem(last=False)
+
+    def _expired(self, decision: Dict[str, Any], now: Optional[float] = None) -> bool:
+        return (now or time.time()) - decision['created_at'] >= self.ttl_seconds
+
+    def _maybe_commit(self, now: float) -> None:
+        if (self._pending >= self.commit_batch_size
+                or time.monotonic() - self._last_commit >= self.commit_interval):
+            self.flush()
+        # Sweep expired rows at most once per tenth of the TTL
+        if now - self._last_expiry >= self.ttl_seconds / 10:
+            self.expire()
+
@@ -19,6 +19,7 @@ from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 import logging
 import json
+import random
 
 from .rewards import CommunicationReward
 from .ollama_integration import get_ollama_client, OllamaConfig
@@ -34,12 +35,25 @@ class CommunicationEpisode:
     approaches to compute gains. Uses Ollama for optimization.
     """
     
-    def __init__(self, graph_backend, ollama_config: Optional[OllamaConfig] = None):
+    def __init__(self, graph_backend, ollama_config: Optional[OllamaConfig] = None,
+                 route_generator: Optional[Any] = None):
+        """
+        Args:
+            graph_backend: Graph backend for shortest paths and episode storage
+            ollama_config: Ollama configuration
+            route_generator: Object with generate_route_optimization(task) used
+                instead of Ollama (e.g. a StandInRouteGenerator for offline batches)
+        """
         self.graph_backend = graph_backend
-        self.ollama_client = get_ollama_client(ollama_config)
+        self.ollama_client = None if route_generator else get_ollama_client(ollama_config)
+        self.route_generator = route_generator or self.ollama_client
         self.reward_fn = CommunicationReward()
         
-    def collect_routing_episode(self, task: Dict) -> Dict:
+    def collect_routing_episode(self, task: Dict,
+                                rng: Optional[random.Random] = None,
+                                baseline_route: Optional[Dict] = None,
+                                optimized_route: Optional[Dict] = None,
+                                store: bool = True) -> Dict:
         """
         Collect one episode of route optimization.
         Similar to DeepRetrieval's query optimization.'
@@ -50,20 +64,24 @@ class CommunicationEpisode:
                 - target: Target module name
                 - message: Message to send
                 - constraints: Optional routing constraints
+            rng: Random source for simulated metrics (global random when None)
+            baseline_route: Precomputed baseline route
+            optimized_route: Precomputed optimized route
+            store: Store the episode in the graph
         
         Returns:
             Episode data with baseline and optimized results
         """
-        logger.info(f"Collecting routing episode: {task['source']} -> {task['target']}")
+        logger.debug(f"Collecting routing episode: {task['source']} -> {task['target']}")
         
         # 1. Baseline: Direct route
-        baseline_route = self._get_baseline_route(task)
-        baseline_metrics = self._execute_communication(baseline_route, task.get('message'))
+        baseline_route = baseline_route or self._get_baseline_route(task)
+        baseline_metrics = self._execute_communication(baseline_route, task.get('message'), rng)
         baseline_reward = self.reward_fn.compute_route_reward(baseline_metrics)
         
         # 2. Optimized: Ollama-suggested route
-        optimized_route = self._get_ollama_optimized_route(task)
-        optimized_metrics = self._execute_communication(optimized_route, task.get('message'))
+        optimized_route = optimized_route or self._get_ollama_optimized_route(task)
+        optimized_metrics = self._execute_communication(optimized_route, task.get('message'), rng)
         optimized_reward = self.reward_fn.compute_route_reward(optimized_metrics)
         
         # 3. Compute gain (GBR - Gain Beyond Route)
@@ -84,7 +102,8 @@ class CommunicationEpisode:
         }
         
         # Store episode in graph
-        self._store_episode(episode)
+        if store:
+            self._store_episode(episode)
         
         return episode
     
@@ -100,6 +119,10 @@ class CommunicationEpisode:
             # Fallback to direct connection
             path = [task['source'], task['target']]
         
+        return self._baseline_route_from_path(task, path)
+    
+    def _baseline_route_from_path(self, task: Dict, path: Optional[List[str]]) -> Dict:
+        """Build the baseline route for a shortest path."""
         return {
             "path": path or [task['source'], task['target']],
             "strategy": "shortest_path",
@@ -108,16 +131,24 @@ class CommunicationEpisode:
     
     def _get_ollama_optimized_route(self, task: Dict) -> Dict:
         """Get optimized route using Ollama."""
-        # Add graph context to task
+        # Use Ollama to optimize
+        result = self.route_generator.generate_route_optimization(
+            self._enrich_routing_task(task)
+        )
+        
+        return self._format_optimized_route(task, result)
+    
+    def _enrich_routing_task(self, task: Dict) -> Dict:
+        """Add graph context to a routing task."""
         enriched_task = task.copy()
         enriched_task['graph_context'] = self._get_routing_context(
             task['source'], 
             task['target']
         )
-        
-        # Use Ollama to optimize
-        result = self.ollama_client.generate_route_optimization(enriched_task)
-        
+        return enriched_task
+    
+    def _format_optimized_route(self, task: Dict, result: Dict) -> Dict:
+        """Convert a route optimization result into a route."""
         return {
             "path": result.get('route', [task['source'], task['target']]),
             "strategy": "ollama_optimized",
@@ -128,7 +159,8 @@ class CommunicationEpisode:
             }
         }
     
-    def _execute_communication(self, route: Dict, message: Any) -> Dict[str, float]:
+    def _execute_communication(self, route: Dict, message: Any,
+                               rng: Optional[random.Random] = None) -> Dict[str, float]:
         """Execute communication and collect metrics."""
         # In real implementation, this would actually send the message
         # For now, we simulate metrics based on route properties
@@ -146,9 +178,9 @@ class CommunicationEpisode:
         }
         
         # Add some randomness for realism
-        import random
+        rng = rng or random
         for key in ['success_rate', 'latency_ms']:
-            metrics[key] *= random.uniform(0.9, 1.1)
+            metrics[key] *= rng.uniform(0.9, 1.1)
             
         return metrics
     
@@ -169,6 +201,16 @@ class CommunicationEpisode:
         except Exception as e:
             logger.warning(f"Could not store episode in graph: {e}")
     
+    def _store_episodes(self, episodes: List[Dict]):
+        """Store a batch of episodes with one bulk insert."""
+        if not episodes:
+            return
+        try:
+            self.graph_backend.db["learning_episodes"].insert_many(episodes)
+            logger.info(f"Stored {len(episodes)} episodes")
+        except Exception as e:
+            logger.warning(f"Could not store episodes in graph: {e}")
+    
     def _get_routing_context(self, source: str, target: str) -> Dict:
         """Get relevant graph context for routing."""
         # Simplified context - in full implementation would query graph
@@ -182,19 +224,31 @@ class CommunicationEpisode:
         }
     
     def generate_training_batch(self, episode_type: str = "routing",
-                               batch_size: int = 32) -> List[Dict]:
+                               batch_size: int = 32,
+                               max_concurrent: Optional[int] = None,
+                               seed: Optional[int] = None) -> List[Dict]:
         """
         Generate a batch of training episodes.
         
         Args:
             episode_type: Type of episodes to generate
             batch_size: Number of episodes in batch
+            max_concurrent: Generate in parallel with at most this many
+                route generator calls in flight
+            seed: Seed for reproducible batches (implies parallel generation)
             
         Returns:
             List of episode data
         """
         episodes = []
         
+        if max_concurrent or seed is not None:
+            from .episode_generation import ParallelEpisodeGenerator
+            generator = ParallelEpisodeGenerator(
+                self, max_concurrent=max_concurrent or 8, seed=seed or 0
+            )
+            return generator.generate(batch_size, episode_type)
+        
         if episode_type == "routing":
             tasks = self._generate_routing_tasks(batch_size)
             for task in tasks:
@@ -206,7 +260,8 @@ class CommunicationEpisode:
         
         return episodes
     
-    def _generate_routing_tasks(self, count: int) -> List[Dict]:
+    def _generate_routing_tasks(self, count: int,
+                                rng: Optional[random.Random] = None) -> List[Dict]:
         """Generate routing tasks for training."""
         # Example tasks - in real system would query actual module pairs
         module_pairs = [
@@ -218,17 +273,17 @@ class CommunicationEpisode:
         ]
         
         tasks = []
-        import random
+        rng = rng or random
         
         for i in range(count):
-            source, target = random.choice(module_pairs)
+            source, target = rng.choice(module_pairs)
             task = {
                 "source": source,
                 "target": target,
                 "message": {"type": "training", "id": f"episode_{i}"},
                 "constraints": {
-                    "max_latency_ms": random.choice([100, 500, 1000]),
-                    "min_success_rate": random.choice([0.8, 0.9, 0.95])
+                    "max_latency_ms": rng.choice([100, 500, 1000]),
+                    "min_success_rate": rng.choice([0.8, 0.9, 0.95])
                 }
             }
             tasks.append(task)
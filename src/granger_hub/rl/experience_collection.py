@@ -9,6 +9,7 @@ for training RL agents in the ModuleCommunicator system.
 
 import json
 import sqlite3
+import threading
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -39,6 +40,40 @@ from granger_hub.rl.reward_calculation import (
 # Default experience database path
 EXPERIENCE_DB_PATH = Path("data/rl_experiences.db")
 
+# State vectors are stored as raw float32 bytes so loading is a single
+# np.frombuffer over the joined blobs instead of one json.loads per row.
+STATE_DTYPE = np.float32
+
+_INSERT_EXPERIENCE = """
+    INSERT INTO experiences (
+        timestamp, decision_type, state, action, reward,
+        next_state, done, metadata, module, task_type, outcome,
+        state_blob, next_state_blob, state_dim
+    ) VALUES (
+        :timestamp, :decision_type, '', :action, :reward,
+        NULL, :done, :metadata, :module, :task_type, :outcome,
+        :state_blob, :next_state_blob, :state_dim
+    )
+"""
+
+# Running totals are merged in SQL; the right-hand side sees the old row,
+# so the average is weighted by the counts before the update.
+_UPSERT_STATS = """
+    INSERT INTO experience_stats (decision_type, total_count, success_count, avg_reward, last_updated)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT(decision_type) DO UPDATE SET
+        avg_reward = (avg_reward * total_count + excluded.avg_reward * excluded.total_count)
+                     / (total_count + excluded.total_count),
+        total_count = total_count + excluded.total_count,
+        success_count = success_count + excluded.success_count,
+        last_updated = excluded.last_updated
+"""
+
+# One long-lived connection per database file, shared by log_experience,
+# the loaders and the background ExperienceWriter threads.
+_connections: Dict[str, sqlite3.Connection] = {}
+_db_lock = threading.RLock()
+
 
 def initialize_experience_db(db_path: Optional[Path] = None) -> None:
     """
@@ -67,10 +102,20 @@ def initialize_experience_db(db_path: Optional[Path] = None) -> None:
             metadata TEXT,
             module TEXT,
             task_type TEXT,
-            outcome TEXT
+            outcome TEXT,
+            state_blob BLOB,
+            next_state_blob BLOB,
+            state_dim INTEGER
         )
     """)
     
+    # Databases created before the binary columns existed
+    columns = {row[1] for row in cursor.execute("PRAGMA table_info(experiences)")}
+    for column, column_type in (("state_blob", "BLOB"), ("next_state_blob", "BLOB"),
+                                ("state_dim", "INTEGER")):
+        if column not in columns:
+            cursor.execute(f"ALTER TABLE experiences ADD COLUMN {column} {column_type}")
+    
     # Create index for efficient queries
     cursor.execute("""
         CREATE INDEX IF NOT EXISTS idx_experiences_type_time 
@@ -88,10 +133,141 @@ def initialize_experience_db(db_path: Optional[Path] = None) -> None:
         )
     """)
     
+    _migrate_json_states(cursor)
+    
     conn.commit()
     conn.close()
 
 
+def _migrate_json_states(cursor, batch_size: int = 5000) -> int:
+    """Convert rows written with JSON text states to float32 blobs."""
+    migrated = 0
+    while True:
+        rows = cursor.execute(
+            "SELECT id, state, next_state FROM experiences WHERE state_blob IS NULL LIMIT ?",
+            (batch_size,)
+        ).fetchall()
+        if not rows:
+            return migrated
+        
+        updates = []
+        for exp_id, state, next_state in rows:
+            state_array = np.asarray(json.loads(state) if state else [], dtype=STATE_DTYPE).ravel()
+            next_array = json.loads(next_state) if next_state else None
+            updates.append((
+                state_array.tobytes(),
+                _encode_state(next_array),
+                state_array.size,
+                exp_id
+            ))
+        cursor.executemany("""
+            UPDATE experiences
+            SET state_blob = ?, next_state_blob = ?, state_dim = ?, state = '', next_state = NULL
+            WHERE id = ?
+        """, updates)
+        migrated += len(updates)
+
+
+def _get_connection(db_path: Optional[Path] = None) -> sqlite3.Connection:
+    """Return the shared connection for a database, initializing it once."""
+    db_path = Path(db_path or EXPERIENCE_DB_PATH)
+    key = str(db_path.resolve())
+    with _db_lock:
+        conn = _connections.get(key)
+        if conn is None:
+            initialize_experience_db(db_path)
+            conn = sqlite3.connect(key, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            _connections[key] = conn
+        return conn
+
+
+def close_experience_db(db_path: Optional[Path] = None) -> None:
+    """
+    Close shared experience database connections.
+    
+    Args:
+        db_path: Database to close; closes every open database when omitted
+    """
+    with _db_lock:
+        if db_path is None:
+            keys = list(_connections)
+        else:
+            keys = [str(Path(db_path).resolve())]
+        for key in keys:
+            conn = _connections.pop(key, None)
+            if conn is not None:
+                conn.close()
+
+
+def _encode_state(state: Any) -> Optional[bytes]:
+    """Encode a state vector as float32 bytes."""
+    if state is None:
+        return None
+    return np.asarray(state, dtype=STATE_DTYPE).ravel().tobytes()
+
+
+def _decode_state(blob: Optional[bytes]) -> Optional[np.ndarray]:
+    """Decode a float32 blob into a writable state vector."""
+    if blob is None:
+        return None
+    return np.frombuffer(bytearray(blob), dtype=STATE_DTYPE)
+
+
+def _experience_row(
+    decision_type: str,
+    state: Any,
+    action: Any,
+    reward: float,
+    next_state: Any = None,
+    done: bool = False,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Prepare an experience for storage."""
+    state_blob = _encode_state(state)
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'decision_type': decision_type,
+        'action': json.dumps(action if isinstance(action, (list, dict)) else str(action)),
+        'reward': float(reward),
+        'done': int(done),
+        'metadata': json.dumps(metadata or {}),
+        'module': metadata.get('module') if metadata else None,
+        'task_type': metadata.get('task_type') if metadata else None,
+        'outcome': json.dumps(metadata.get('outcome')) if metadata and 'outcome' in metadata else None,
+        'state_blob': state_blob,
+        'next_state_blob': _encode_state(next_state),
+        'state_dim': 0 if state_blob is None else len(state_blob) // np.dtype(STATE_DTYPE).itemsize
+    }
+
+
+def _write_rows(conn: sqlite3.Connection, rows: List[Dict[str, Any]]) -> Optional[int]:
+    """Insert rows and merge their statistics in one transaction."""
+    if not rows:
+        return None
+    
+    totals = defaultdict(lambda: [0, 0, 0.0])
+    for row in rows:
+        entry = totals[row['decision_type']]
+        entry[0] += 1
+        entry[1] += 1 if row['reward'] > 0 else 0
+        entry[2] += row['reward']
+    
+    now = datetime.now().isoformat()
+    with _db_lock:
+        with conn:
+            if len(rows) == 1:
+                cursor = conn.execute(_INSERT_EXPERIENCE, rows[0])
+            else:
+                cursor = conn.executemany(_INSERT_EXPERIENCE, rows)
+            conn.executemany(_UPSERT_STATS, [
+                (decision_type, count, successes, reward_sum / count, now)
+                for decision_type, (count, successes, reward_sum) in totals.items()
+            ])
+        return cursor.lastrowid
+
+
 def log_experience(
     decision_type: str,
     state: np.ndarray,
@@ -116,47 +292,217 @@ def log_experience(
     Returns:
         Experience ID
     """
-    db_path = EXPERIENCE_DB_PATH
-    db_path.parent.mkdir(parents=True, exist_ok=True)
+    row = _experience_row(decision_type, state, action, reward, next_state, done, metadata)
+    return _write_rows(_get_connection(), [row])
+
+
+def log_experiences(experiences: List[Dict[str, Any]], db_path: Optional[Path] = None) -> int:
+    """
+    Log a batch of experiences in a single transaction.
     
-    conn = sqlite3.connect(str(db_path))
-    cursor = conn.cursor()
+    Args:
+        experiences: Dicts with the keyword arguments of log_experience
+        db_path: Optional custom database path
     
-    # Prepare data for storage
-    exp_data = {
-        'timestamp': datetime.now().isoformat(),
-        'decision_type': decision_type,
-        'state': json.dumps(state.tolist() if isinstance(state, np.ndarray) else state),
-        'action': json.dumps(action if isinstance(action, (list, dict)) else str(action)),
-        'reward': float(reward),
-        'next_state': json.dumps(next_state.tolist() if next_state is not None else None),
-        'done': int(done),
-        'metadata': json.dumps(metadata or {}),
-        'module': metadata.get('module') if metadata else None,
-        'task_type': metadata.get('task_type') if metadata else None,
-        'outcome': json.dumps(metadata.get('outcome')) if metadata and 'outcome' in metadata else None
-    }
+    Returns:
+        Number of experiences written
+    """
+    rows = [_experience_row(**exp) for exp in experiences]
+    _write_rows(_get_connection(db_path), rows)
+    return len(rows)
+
+
+class ExperienceWriter:
+    """
+    Buffered background writer for experiences.
     
-    # Insert experience
-    cursor.execute("""
-        INSERT INTO experiences (
-            timestamp, decision_type, state, action, reward,
-            next_state, done, metadata, module, task_type, outcome
-        ) VALUES (
-            :timestamp, :decision_type, :state, :action, :reward,
-            :next_state, :done, :metadata, :module, :task_type, :outcome
-        )
-    """, exp_data)
+    append() only queues the row; a daemon thread writes the buffer with
+    executemany once batch_size rows are pending or flush_interval seconds
+    have passed, keeping SQLite off the decision path.
+    """
     
-    experience_id = cursor.lastrowid
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        batch_size: int = 256,
+        flush_interval: float = 0.5
+    ):
+        self.db_path = Path(db_path or EXPERIENCE_DB_PATH)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._conn = _get_connection(self.db_path)
+        self._thread = threading.Thread(target=self._run, name="experience-writer", daemon=True)
+        self._thread.start()
+    
+    def append(
+        self,
+        decision_type: str,
+        state: np.ndarray,
+        action: Any,
+        reward: float,
+        next_state: Optional[np.ndarray] = None,
+        done: bool = False,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """Queue an experience for the next batch."""
+        if self._closed:
+            raise RuntimeError("ExperienceWriter is closed")
+        row = _experience_row(decision_type, state, action, reward, next_state, done, metadata)
+        with self._cond:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+    
+    @property
+    def pending(self) -> int:
+        """Number of queued experiences not yet written."""
+        with self._cond:
+            return len(self._buffer)
+    
+    def flush(self) -> int:
+        """Write all queued experiences now. Returns the number written."""
+        with self._cond:
+            rows, self._buffer = self._buffer, []
+        _write_rows(self._conn, rows)
+        self.written += len(rows)
+        return len(rows)
+    
+    def close(self) -> None:
+        """Flush remaining experiences and stop the writer thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+    
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                closed = self._closed
+            if closed:
+                return
+            self.flush()
+    
+    def __enter__(self) -> "ExperienceWriter":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _query_experience_rows(
+    columns: str,
+    decision_type: Optional[str],
+    limit: int,
+    since: Optional[datetime],
+    min_reward: Optional[float],
+    db_path: Optional[Path]
+) -> List[Tuple]:
+    """Run the filtered experience query shared by the loaders."""
+    query = f"SELECT {columns} FROM experiences WHERE 1=1"
+    params = {}
     
-    # Update statistics
-    _update_stats(cursor, decision_type, reward, metadata)
+    if decision_type:
+        query += " AND decision_type = :decision_type"
+        params['decision_type'] = decision_type
     
-    conn.commit()
-    conn.close()
+    if since:
+        query += " AND timestamp >= :since"
+        params['since'] = since.isoformat()
+    
+    if min_reward is not None:
+        query += " AND reward >= :min_reward"
+        params['min_reward'] = min_reward
     
-    return experience_id
+    query += " ORDER BY timestamp DESC LIMIT :limit"
+    params['limit'] = limit
+    
+    conn = _get_connection(db_path)
+    with _db_lock:
+        return conn.execute(query, params).fetchall()
+
+
+def _decode_actions(raw_actions) -> List[Any]:
+    """Decode JSON actions, parsing each distinct value once."""
+    decoded = {}
+    actions = []
+    for raw in raw_actions:
+        if raw not in decoded:
+            decoded[raw] = json.loads(raw)
+        actions.append(decoded[raw])
+    return actions
+
+
+def load_experience_arrays(
+    decision_type: Optional[str] = None,
+    limit: int = 1000,
+    since: Optional[datetime] = None,
+    min_reward: Optional[float] = None,
+    db_path: Optional[Path] = None
+) -> Dict[str, Any]:
+    """
+    Load experiences as stacked NumPy arrays.
+    
+    Args:
+        decision_type: Filter by decision type
+        limit: Maximum number of experiences to load
+        since: Load experiences since this datetime
+        min_reward: Minimum reward threshold
+        db_path: Optional custom database path
+    
+    Returns:
+        Dictionary with states (N, D) float32, actions (list), rewards (N,),
+        next_states (N, D) with NaN rows where missing, has_next_state (N,)
+        and dones (N,)
+    
+    Raises:
+        ValueError: If the selected experiences have different state sizes
+    """
+    rows = _query_experience_rows(
+        "state_blob, action, reward, next_state_blob, done, state_dim",
+        decision_type, limit, since, min_reward, db_path
+    )
+    if not rows:
+        return {
+            'states': np.empty((0, 0), dtype=STATE_DTYPE),
+            'actions': [],
+            'rewards': np.empty(0, dtype=STATE_DTYPE),
+            'next_states': np.empty((0, 0), dtype=STATE_DTYPE),
+            'has_next_state': np.empty(0, dtype=bool),
+            'dones': np.empty(0, dtype=bool)
+        }
+    
+    state_blobs, raw_actions, rewards, next_blobs, dones, dims = zip(*rows)
+    dim = dims[0]
+    if any(d != dim for d in dims):
+        raise ValueError(
+            f"Experiences have mixed state sizes {sorted(set(dims))}; "
+            "filter by decision_type to load a uniform batch"
+        )
+    
+    count = len(rows)
+    # Rows logged without a state have dimension 0 and no blob
+    states = _decode_state(b"".join(blob or b"" for blob in state_blobs)).reshape(count, dim)
+    has_next = np.fromiter((blob is not None for blob in next_blobs), dtype=bool, count=count)
+    next_states = np.full((count, dim), np.nan, dtype=STATE_DTYPE)
+    if has_next.any():
+        present = [blob for blob in next_blobs if blob is not None]
+        next_states[has_next] = np.frombuffer(b"".join(present), dtype=STATE_DTYPE).reshape(-1, dim)
+    
+    return {
+        'states': states,
+        'actions': _decode_actions(raw_actions),
+        'rewards': np.asarray(rewards, dtype=STATE_DTYPE),
+        'next_states': next_states,
+        'has_next_state': has_next,
+        'dones': np.asarray(dones, dtype=bool)
+    }
 
 
 def load_experiences(
@@ -177,54 +523,27 @@ def load_experiences(
     Returns:
         List of Experience objects
     """
-    initialize_experience_db()
-    
-    conn = sqlite3.connect(str(EXPERIENCE_DB_PATH))
-    cursor = conn.cursor()
-    
-    # Build query
-    query = "SELECT * FROM experiences WHERE 1=1"
-    params = {}
-    
-    if decision_type:
-        query += " AND decision_type = :decision_type"
-        params['decision_type'] = decision_type
-    
-    if since:
-        query += " AND timestamp >= :since"
-        params['since'] = since.isoformat()
-    
-    if min_reward is not None:
-        query += " AND reward >= :min_reward"
-        params['min_reward'] = min_reward
-    
-    query += " ORDER BY timestamp DESC LIMIT :limit"
-    params['limit'] = limit
+    rows = _query_experience_rows(
+        "state_blob, action, reward, next_state_blob, done",
+        decision_type, limit, since, min_reward, None
+    )
+    if not rows:
+        return []
     
-    cursor.execute(query, params)
-    rows = cursor.fetchall()
+    actions = _decode_actions(row[1] for row in rows)
     
     # Convert to Experience objects
     experiences = []
-    for row in rows:
-        state = np.array(json.loads(row[3]))
-        action = json.loads(row[4])
-        reward = row[5]
-        next_state = json.loads(row[6]) if row[6] else None
-        if next_state:
-            next_state = np.array(next_state)
-        done = bool(row[7])
-        
+    for (state_blob, _, reward, next_blob, done), action in zip(rows, actions):
         exp = Experience(
-            state=state,
+            state=_decode_state(state_blob),
             action=action,
             reward=reward,
-            next_state=next_state,
-            done=done
+            next_state=_decode_state(next_blob),
+            done=bool(done)
         )
         experiences.append(exp)
     
-    conn.close()
     return experiences
 
 
@@ -311,112 +630,80 @@ def get_experience_statistics(
     Returns:
         Dictionary of statistics
     """
-    initialize_experience_db()
-    
-    conn = sqlite3.connect(str(EXPERIENCE_DB_PATH))
-    cursor = conn.cursor()
-    
-    stats = {}
-    
-    # Get overall statistics
-    if decision_type:
-        cursor.execute("""
-            SELECT COUNT(*), AVG(reward), MIN(reward), MAX(reward)
-            FROM experiences
-            WHERE decision_type = ?
-        """, (decision_type,))
-    else:
+    conn = _get_connection()
+    with _db_lock:
+        cursor = conn.cursor()
+    
+        stats = {}
+    
+        # Get overall statistics
+        if decision_type:
+            cursor.execute("""
+                SELECT COUNT(*), AVG(reward), MIN(reward), MAX(reward)
+                FROM experiences
+                WHERE decision_type = ?
+            """, (decision_type,))
+        else:
+            cursor.execute("""
+                SELECT COUNT(*), AVG(reward), MIN(reward), MAX(reward)
+                FROM experiences
+            """)
+    
+        count, avg_reward, min_reward, max_reward = cursor.fetchone()
+    
+        stats['total_experiences'] = count or 0
+        stats['avg_reward'] = avg_reward or 0
+        stats['min_reward'] = min_reward or 0
+        stats['max_reward'] = max_reward or 0
+    
+        # Get per-type statistics
         cursor.execute("""
-            SELECT COUNT(*), AVG(reward), MIN(reward), MAX(reward)
+            SELECT decision_type, COUNT(*), AVG(reward)
             FROM experiences
+            GROUP BY decision_type
         """)
     
-    count, avg_reward, min_reward, max_reward = cursor.fetchone()
-    
-    stats['total_experiences'] = count or 0
-    stats['avg_reward'] = avg_reward or 0
-    stats['min_reward'] = min_reward or 0
-    stats['max_reward'] = max_reward or 0
-    
-    # Get per-type statistics
-    cursor.execute("""
-        SELECT decision_type, COUNT(*), AVG(reward)
-        FROM experiences
-        GROUP BY decision_type
-    """)
+        stats['by_type'] = {}
+        for dt, cnt, avg_r in cursor.fetchall():
+            stats['by_type'][dt] = {
+                'count': cnt,
+                'avg_reward': avg_r
+            }
     
-    stats['by_type'] = {}
-    for dt, cnt, avg_r in cursor.fetchall():
-        stats['by_type'][dt] = {
-            'count': cnt,
-            'avg_reward': avg_r
-        }
+        # Get time-based statistics if requested
+        if time_window:
+            since = datetime.now() - time_window
+            cursor.execute("""
+                SELECT COUNT(*), AVG(reward)
+                FROM experiences
+                WHERE timestamp >= ?
+            """, (since.isoformat(),))
+        
+            recent_count, recent_avg = cursor.fetchone()
+            stats['recent'] = {
+                'count': recent_count or 0,
+                'avg_reward': recent_avg or 0,
+                'time_window': str(time_window)
+            }
     
-    # Get time-based statistics if requested
-    if time_window:
-        since = datetime.now() - time_window
+        # Get module performance
         cursor.execute("""
-            SELECT COUNT(*), AVG(reward)
+            SELECT module, COUNT(*), AVG(reward)
             FROM experiences
-            WHERE timestamp >= ?
-        """, (since.isoformat(),))
-        
-        recent_count, recent_avg = cursor.fetchone()
-        stats['recent'] = {
-            'count': recent_count or 0,
-            'avg_reward': recent_avg or 0,
-            'time_window': str(time_window)
-        }
-    
-    # Get module performance
-    cursor.execute("""
-        SELECT module, COUNT(*), AVG(reward)
-        FROM experiences
-        WHERE module IS NOT NULL
-        GROUP BY module
-    """)
+            WHERE module IS NOT NULL
+            GROUP BY module
+        """)
     
-    stats['by_module'] = {}
-    for module, cnt, avg_r in cursor.fetchall():
-        stats['by_module'][module] = {
-            'count': cnt,
-            'avg_reward': avg_r
-        }
+        stats['by_module'] = {}
+        for module, cnt, avg_r in cursor.fetchall():
+            stats['by_module'][module] = {
+                'count': cnt,
+                'avg_reward': avg_r
+            }
     
-    conn.close()
     return stats
 
 
-def _update_stats(cursor, decision_type: str, reward: float, metadata: Optional[Dict] = None):
-    """Update experience statistics."""
-    # Check if stats exist
-    cursor.execute(
-        "SELECT total_count, success_count, avg_reward FROM experience_stats WHERE decision_type = ?",
-        (decision_type,)
-    )
-    row = cursor.fetchone()
-    
-    if row:
-        total_count, success_count, avg_reward = row
-        total_count += 1
-        if reward > 0:
-            success_count += 1
-        # Update running average
-        avg_reward = (avg_reward * (total_count - 1) + reward) / total_count
-        
-        cursor.execute("""
-            UPDATE experience_stats
-            SET total_count = ?, success_count = ?, avg_reward = ?, last_updated = ?
-            WHERE decision_type = ?
-        """, (total_count, success_count, avg_reward, datetime.now().isoformat(), decision_type))
-    else:
-        # Insert new stats
-        cursor.execute("""
-            INSERT INTO experience_stats (decision_type, total_count, success_count, avg_reward, last_updated)
-            VALUES (?, 1, ?, ?, ?)
-        """, (decision_type, 1 if reward > 0 else 0, reward, datetime.now().isoformat()))
-
-
 def _get_decision_type_for_agent(agent_name: str) -> str:
     """Map agent name to decision type."""
     mapping = {
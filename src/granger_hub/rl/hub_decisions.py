@@ -5,12 +5,17 @@ Description: Functions for hub decisions operations
 
 This module integrates rl_commons to provide intelligent decision-making
 for the ModuleCommunicator hub. It uses real RL algorithms, not mocks.
+Agents are created on first use, warm-started from the default checkpoint
+(see checkpoints.default_checkpoint_path) when one exists.
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Sequence, Tuple, TYPE_CHECKING
 import numpy as np
-from datetime import datetime
+from pathlib import Path
 import json
+import threading
+
+from loguru import logger
 
 # Import rl_commons components
 try:
@@ -34,13 +39,27 @@ from granger_hub.rl.state_extraction import (
     extract_task_state,
     extract_pipeline_state,
     extract_error_state,
-    extract_timeout_context
+    extract_timeout_context,
+    extract_task_states
 )
 from granger_hub.rl.reward_calculation import (
     calculate_module_selection_reward,
     calculate_pipeline_reward,
     calculate_resource_reward
 )
+from granger_hub.rl.decision_journal import DecisionJournal, DECISION_DB_PATH
+from granger_hub.rl.checkpoints import (
+    SCHEMA_ATTRIBUTES,
+    agent_schema,
+    default_checkpoint_path,
+    grow_agent_actions,
+    grow_agent_arms,
+    load_agents_checkpoint,
+    save_agents_checkpoint
+)
+
+if TYPE_CHECKING:
+    from granger_hub.rl.training_worker import TrainingWorker
 
 # Global agents for different decision types
 _module_selector: Optional[ContextualBandit] = None
@@ -48,59 +67,153 @@ _pipeline_optimizer: Optional[DQNAgent] = None
 _resource_allocator: Optional[PPOAgent] = None
 _error_handler: Optional[DQNAgent] = None
 _module_to_index: Dict[str, int] = {}
+_index_to_module: Dict[int, str] = {}
 
+# Bumped on every publish, so holders of agent copies can tell they were replaced
+_agents_version = 0
+_publish_lock = threading.Lock()
 
-def initialize_rl_agents(modules: List[str], reset: bool = False) -> None:
-    """
-    Initialize RL agents for different decision types.
-    
-    Args:
-        modules: List of available module names
-        reset: Whether to reset existing agents
-    """
-    global _module_selector, _pipeline_optimizer, _resource_allocator
-    global _error_handler, _module_to_index
-    
-    # Create module index mapping
-    _module_to_index = {module: i for i, module in enumerate(modules)}
-    
-    # Initialize module selector (contextual bandit)
-    if reset or _module_selector is None:
-        _module_selector = ContextualBandit(
+# Background trainer receiving decision outcomes, if one is running
+_training_worker: Optional["TrainingWorker"] = None
+
+
+def _agent_spec(name: str, n_modules: int) -> Tuple[type, Dict[str, Any]]:
+    """Agent class and constructor arguments for a decision type."""
+    if name == 'module_selector':
+        # Contextual bandit, one arm per module
+        return ContextualBandit, dict(
             name="module_selector",
-            n_arms=len(modules),
+            n_arms=n_modules,
             n_features=20  # Task state dimension (from extract_task_state)
         )
-    
-    # Initialize pipeline optimizer (DQN)
-    if reset or _pipeline_optimizer is None:
-        _pipeline_optimizer = DQNAgent(
+    if name == 'pipeline_optimizer':
+        # DQN over pipeline edits
+        return DQNAgent, dict(
             name="pipeline_optimizer",
             state_dim=15,  # Pipeline state dimension
-            action_dim=len(modules) * 3,  # Actions: add/remove/reorder modules
+            action_dim=n_modules * 3,  # Actions: add/remove/reorder modules
             learning_rate=0.001,
             buffer_size=10000
         )
-    
-    # Initialize resource allocator (PPO for continuous actions)
-    if reset or _resource_allocator is None:
-        _resource_allocator = PPOAgent(
+    if name == 'resource_allocator':
+        # PPO for continuous actions
+        return PPOAgent, dict(
             name="resource_allocator",
             state_dim=12,  # Resource state dimension
             action_dim=4,  # CPU%, Memory%, Timeout, Priority
             continuous=True,
             learning_rate=0.0003
         )
+    # Error handler (DQN)
+    return DQNAgent, dict(
+        name="error_handler",
+        state_dim=20,  # Error context dimension
+        action_dim=5,  # retry, fallback, skip, escalate, adapt
+        learning_rate=0.001,
+        buffer_size=5000
+    )
+
+
+def _schema_mismatches(agent: Any, spec_kwargs: Dict[str, Any]) -> List[str]:
+    """Dimension attributes where a loaded agent differs from its spec."""
+    schema = agent_schema(agent)
+    return [
+        attribute for attribute in SCHEMA_ATTRIBUTES
+        if attribute in spec_kwargs and attribute in schema and schema[attribute] != spec_kwargs[attribute]
+    ]
+
+
+# Dimensions that grow with the module set, and how learned state is carried over
+_GROWABLE_DIMENSIONS = {'n_arms': grow_agent_arms, 'action_dim': grow_agent_actions}
+
+
+def _grow_agent(agent: Any, agent_class: type, spec_kwargs: Dict[str, Any]) -> Optional[Any]:
+    """
+    Fit an agent to its current spec.
     
-    # Initialize error handler (DQN)
-    if reset or _error_handler is None:
-        _error_handler = DQNAgent(
-            name="error_handler",
-            state_dim=20,  # Error context dimension
-            action_dim=5,  # retry, fallback, skip, escalate, adapt
-            learning_rate=0.001,
-            buffer_size=5000
-        )
+    Returns the agent itself when its dimensions match, a grown copy when
+    only a module-dependent dimension is smaller than the spec, and None
+    when the agent cannot be reused.
+    """
+    mismatches = _schema_mismatches(agent, spec_kwargs)
+    if not mismatches:
+        return agent
+    if len(mismatches) == 1 and mismatches[0] in _GROWABLE_DIMENSIONS:
+        dimension = mismatches[0]
+        old_size = getattr(agent, dimension)
+        if old_size < spec_kwargs[dimension]:
+            return _GROWABLE_DIMENSIONS[dimension](agent, agent_class(**spec_kwargs), old_size)
+    return None
+
+
+def initialize_rl_agents(
+    modules: List[str],
+    reset: bool = False,
+    checkpoint_path: Optional[Path] = None
+) -> None:
+    """
+    Initialize RL agents for different decision types.
+    
+    Existing modules keep their selector arm; new modules are appended as new
+    arms (and new pipeline optimizer actions) so learned values and network
+    weights survive module set changes. With a checkpoint,
+    agents that are not yet in memory are warm-started from it when their
+    state/action dimensions still match.
+    
+    Args:
+        modules: List of available module names
+        reset: Whether to reset existing agents
+        checkpoint_path: Optional checkpoint to warm start from
+    """
+    global _module_to_index, _index_to_module
+    
+    current = {name: None for name in get_rl_agents()} if reset else get_rl_agents()
+    module_to_index = {} if reset else dict(_module_to_index)
+    
+    loaded = {}
+    if checkpoint_path and Path(checkpoint_path).exists() and current['module_selector'] is None:
+        try:
+            header, loaded = load_agents_checkpoint(checkpoint_path)
+            module_to_index = {**header['modules'], **module_to_index}
+            logger.info(f"Warm start from {checkpoint_path}: {sorted(loaded)}")
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable RL checkpoint {checkpoint_path}: {e}")
+    
+    # Create module index mapping (stable indices, new modules appended)
+    for module in modules:
+        if module not in module_to_index:
+            module_to_index[module] = max(module_to_index.values(), default=-1) + 1
+    _module_to_index = module_to_index
+    _index_to_module = {i: module for module, i in _module_to_index.items()}
+    n_modules = len(_module_to_index)
+    
+    agents = {}
+    for name, agent in current.items():
+        agent_class, kwargs = _agent_spec(name, n_modules)
+        if agent is None and name in loaded:
+            agent = _grow_agent(loaded[name], agent_class, kwargs)
+            if agent is None:
+                mismatches = _schema_mismatches(loaded[name], kwargs)
+                logger.warning(f"Checkpointed {name} does not match current dimensions {mismatches}; reinitializing")
+        elif agent is not None:
+            agent = _grow_agent(agent, agent_class, kwargs) or agent
+        
+        agents[name] = agent if agent is not None else agent_class(**kwargs)
+    
+    publish_rl_agents(agents)
+
+
+def save_rl_checkpoint(path: Optional[Path] = None) -> Path:
+    """
+    Write a checkpoint of the serving agents and module index.
+    
+    Args:
+        path: Checkpoint file (defaults to CHECKPOINT_PATH)
+    
+    Returns:
+        Path of the written checkpoint
+    """
+    return save_agents_checkpoint(get_rl_agents(), _module_to_index, path)
 
 
 def select_module_with_rl(
@@ -121,7 +234,7 @@ def select_module_with_rl(
     """
     # Ensure agents are initialized
     if _module_selector is None:
-        initialize_rl_agents(available_modules)
+        initialize_rl_agents(available_modules, checkpoint_path=default_checkpoint_path())
     
     # Extract state from task
     # Merge context into task if provided
@@ -141,8 +254,7 @@ def select_module_with_rl(
     action_index = action.action_id
     
     # Convert action index back to module name
-    index_to_module = {v: k for k, v in _module_to_index.items()}
-    selected_module = index_to_module.get(action_index, available_modules[0])
+    selected_module = _index_to_module.get(action_index, available_modules[0])
     
     # Log the decision for later reward update
     _log_decision(
@@ -157,6 +269,86 @@ def select_module_with_rl(
     return selected_module
 
 
+def select_modules_with_rl(
+    tasks: Sequence[Dict[str, Any]],
+    available_modules: List[str],
+    contexts: Optional[Sequence[Optional[Dict[str, Any]]]] = None
+) -> List[str]:
+    """
+    Select modules for a batch of tasks in one pass.
+    
+    States for all tasks are extracted as one matrix and scored against
+    every arm in one vectorized LinUCB pass (see _select_arms).
+    
+    Args:
+        tasks: Task descriptions
+        available_modules: Modules that can handle the tasks
+        contexts: Optional per-task context merged into each task
+    
+    Returns:
+        Selected module name per task
+    """
+    if not tasks:
+        return []
+    
+    # Ensure agents are initialized
+    if _module_selector is None:
+        initialize_rl_agents(available_modules, checkpoint_path=default_checkpoint_path())
+    
+    contexts = contexts or [None] * len(tasks)
+    tasks_with_context = [
+        {**task, **context} if context else task
+        for task, context in zip(tasks, contexts)
+    ]
+    states = extract_task_states(tasks_with_context)
+    
+    actions = _select_arms(_module_selector, states)
+    
+    selected_modules = []
+    decisions = []
+    for state, action, task, context in zip(states, actions, tasks, contexts):
+        action_index = int(getattr(action, 'action_id', action))
+        selected_module = _index_to_module.get(action_index, available_modules[0])
+        selected_modules.append(selected_module)
+        decisions.append({
+            'state': state,
+            'action': action_index,
+            'selected_module': selected_module,
+            'task': task,
+            'context': context
+        })
+    
+    # Log the decisions for later reward update
+    get_decision_journal().record_many("module_selection", decisions)
+    
+    return selected_modules
+
+
+def _select_arms(selector: Any, states: np.ndarray) -> Sequence[Any]:
+    """
+    Choose an arm for every row of a state matrix.
+    
+    ContextualBandit is LinUCB with per-arm A matrices and b vectors, so all
+    rows are scored at once: one batched inverse of the arm matrices, then
+    matrix products for the expected rewards and confidence widths of every
+    (row, arm) pair. This picks the same arms as select_action row by row.
+    Agents without that state fall back to their own select_action per row.
+    """
+    batch_select = getattr(selector, 'select_actions', None)
+    if batch_select is not None:
+        return batch_select(states)
+    if not (hasattr(selector, 'A') and hasattr(selector, 'b')):
+        return [selector.select_action(RLState(features=state)) for state in states]
+    
+    A_inv = np.linalg.inv(np.asarray(selector.A, dtype=np.float64))     # (arms, d, d)
+    theta = np.einsum('ade,ae->ad', A_inv, np.asarray(selector.b, dtype=np.float64))
+    states = np.asarray(states, dtype=np.float64)                       # (n, d)
+    expected = states @ theta.T                                         # (n, arms)
+    variance = np.einsum('and,nd->na', states[np.newaxis] @ A_inv, states)
+    ucb = expected + getattr(selector, 'alpha', 1.0) * np.sqrt(np.maximum(variance, 0.0))
+    return np.argmax(ucb, axis=1)
+
+
 def optimize_pipeline_with_rl(
     pipeline: List[str],
     requirements: Dict[str, Any],
@@ -175,7 +367,7 @@ def optimize_pipeline_with_rl(
     """
     # Ensure agents are initialized
     if _pipeline_optimizer is None:
-        initialize_rl_agents(pipeline)
+        initialize_rl_agents(pipeline, checkpoint_path=default_checkpoint_path())
     
     # Extract state from pipeline
     # Create task dict from requirements
@@ -226,7 +418,7 @@ def allocate_resources_with_rl(
     """
     # Ensure agents are initialized
     if _resource_allocator is None:
-        initialize_rl_agents([module])
+        initialize_rl_agents([module], checkpoint_path=default_checkpoint_path())
     
     # Create state vector
     task_state = extract_task_state(task)
@@ -287,7 +479,7 @@ def handle_error_with_rl(
     """
     # Ensure agents are initialized
     if _error_handler is None:
-        initialize_rl_agents([module])
+        initialize_rl_agents([module], checkpoint_path=default_checkpoint_path())
     
     # Extract error context
     error_context = {
@@ -327,7 +519,7 @@ def record_decision_outcome(
     decision_id: str,
     outcome: Dict[str, Any],
     reward: Optional[float] = None
-) -> None:
+) -> bool:
     """
     Record the outcome of a decision for learning.
     
@@ -335,11 +527,150 @@ def record_decision_outcome(
         decision_id: ID of the decision (from logging)
         outcome: Outcome metrics (success, latency, quality, etc.)
         reward: Optional pre-calculated reward
+    
+    Returns:
+        True if the decision was found and its agent updated
+    """
+    return record_decision_outcomes([
+        {'decision_id': decision_id, 'outcome': outcome, 'reward': reward}
+    ]) == 1
+
+
+def record_decision_outcomes(outcomes: List[Dict[str, Any]]) -> int:
     """
-    # Load the decision from log
-    decision = _load_decision(decision_id)
-    if not decision:
-        return
+    Record outcomes for a batch of decisions.
+    
+    Decisions are looked up in one pass over the journal, so rewards for
+    long-running pipelines can be attributed together once they finish.
+    
+    Args:
+        outcomes: Dicts with decision_id, outcome and optional reward
+    
+    Returns:
+        Number of decisions found and attributed
+    """
+    journal = get_decision_journal()
+    # Claimed decisions are attributed once, even if an outcome is reported again
+    decisions = journal.claim(item['decision_id'] for item in outcomes)
+    
+    # With a training worker attached, agent updates happen off the request path
+    worker = _training_worker
+    if worker is not None and worker.running:
+        found = 0
+        for item in outcomes:
+            decision = decisions.pop(item['decision_id'], None)
+            if decision is None:
+                continue
+            if worker.submit(decision, item.get('outcome') or {}, item.get('reward')):
+                found += 1
+            else:
+                journal.release([item['decision_id']])
+        return found
+    
+    rewards = {}
+    try:
+        for item in outcomes:
+            decision = decisions.get(item['decision_id'])
+            if not decision:
+                continue
+            rewards[item['decision_id']] = _apply_decision_outcome(
+                decision, item.get('outcome') or {}, item.get('reward')
+            )
+            # Only applied decisions leave the claim; the rest are released below
+            del decisions[item['decision_id']]
+    finally:
+        journal.release(decisions)
+        if rewards:
+            journal.resolve(rewards)
+    return len(rewards)
+
+
+def get_rl_agents() -> Dict[str, Any]:
+    """Get the agents currently serving decisions, keyed by agent name."""
+    return {
+        'module_selector': _module_selector,
+        'pipeline_optimizer': _pipeline_optimizer,
+        'resource_allocator': _resource_allocator,
+        'error_handler': _error_handler
+    }
+
+
+def publish_rl_agents(agents: Dict[str, Any], expected_version: Optional[int] = None) -> Optional[int]:
+    """
+    Swap in new serving agents.
+    
+    Each global is replaced by reference, so in-flight decisions keep using
+    the agent they started with and no lock is needed on the request path.
+    
+    Args:
+        agents: Agent name -> agent; names that are missing are left unchanged
+        expected_version: Only publish if the serving agents are still at
+            this version (see get_rl_agents_version)
+    
+    Returns:
+        The serving version afterwards (unchanged if every agent was already
+        serving), or None if expected_version was stale and nothing was published
+    """
+    global _module_selector, _pipeline_optimizer, _resource_allocator, _error_handler
+    global _agents_version
+    
+    with _publish_lock:
+        if expected_version is not None and expected_version != _agents_version:
+            return None
+        current = get_rl_agents()
+        if all(agent is current.get(name) for name, agent in agents.items()):
+            return _agents_version  # Nothing replaced
+        if 'module_selector' in agents:
+            _module_selector = agents['module_selector']
+        if 'pipeline_optimizer' in agents:
+            _pipeline_optimizer = agents['pipeline_optimizer']
+        if 'resource_allocator' in agents:
+            _resource_allocator = agents['resource_allocator']
+        if 'error_handler' in agents:
+            _error_handler = agents['error_handler']
+        _agents_version += 1
+        return _agents_version
+
+
+def get_rl_agents_version() -> int:
+    """
+    Get the version of the serving agents.
+    
+    Read it before get_rl_agents(): a copy taken that way is at least as
+    new as the version, so a later publish with expected_version never
+    overwrites newer agents.
+    """
+    return _agents_version
+
+
+def get_module_index() -> Dict[str, int]:
+    """Get a copy of the module name -> selector arm mapping."""
+    return dict(_module_to_index)
+
+
+def attach_training_worker(worker: Optional["TrainingWorker"]) -> None:
+    """Route decision outcomes to a background training worker (None detaches)."""
+    global _training_worker
+    _training_worker = worker
+
+
+def _apply_decision_outcome(
+    decision: Dict[str, Any],
+    outcome: Dict[str, Any],
+    reward: Optional[float] = None,
+    agents: Optional[Dict[str, Any]] = None
+) -> float:
+    """
+    Update the agent that made a decision and return the reward used.
+    
+    Updates go to the serving agents unless another set (such as a
+    training worker's private copies) is passed in.
+    """
+    agents = agents if agents is not None else get_rl_agents()
+    module_selector = agents.get('module_selector')
+    pipeline_optimizer = agents.get('pipeline_optimizer')
+    resource_allocator = agents.get('resource_allocator')
+    error_handler = agents.get('error_handler')
     
     # Calculate reward if not provided
     if reward is None:
@@ -353,7 +684,7 @@ def record_decision_outcome(
             reward = 1.0 if outcome.get('success') else -1.0
     
     # Update the appropriate agent
-    if decision['decision_type'] == 'module_selection' and _module_selector:
+    if decision['decision_type'] == 'module_selection' and module_selector:
         # Create RLState and RLReward
         state = RLState(features=np.array(decision['state']))
         rl_reward = RLReward(value=reward)
@@ -365,9 +696,9 @@ def record_decision_outcome(
         next_state = state
         
         # Update contextual bandit
-        _module_selector.update(state, rl_action, rl_reward, next_state)
+        module_selector.update(state, rl_action, rl_reward, next_state)
         
-    elif decision['decision_type'] == 'pipeline_optimization' and _pipeline_optimizer:
+    elif decision['decision_type'] == 'pipeline_optimization' and pipeline_optimizer:
         # For DQN, we need the next state
         task = {
             'type': 'pipeline_optimization',
@@ -390,18 +721,18 @@ def record_decision_outcome(
         )
         
         # Store experience (DQN will train from replay buffer)
-        _pipeline_optimizer.store_experience(exp)
+        pipeline_optimizer.store_experience(exp)
         
-    elif decision['decision_type'] == 'resource_allocation' and _resource_allocator:
+    elif decision['decision_type'] == 'resource_allocation' and resource_allocator:
         # PPO stores trajectory data
         state = RLState(features=np.array(decision['state']))
         action = RLAction(value=np.array(decision['action']))
         rl_reward = RLReward(value=reward)
         
         # Store for later training
-        _resource_allocator.store_transition(state, action, rl_reward)
+        resource_allocator.store_transition(state, action, rl_reward)
         
-    elif decision['decision_type'] == 'error_handling' and _error_handler:
+    elif decision['decision_type'] == 'error_handling' and error_handler:
         # DQN update with terminal state
         exp = Experience(
             state=np.array(decision['state']),
@@ -411,7 +742,9 @@ def record_decision_outcome(
             done=True
         )
         
-        _error_handler.store_experience(exp)
+        error_handler.store_experience(exp)
+    
+    return reward
 
 
 def _apply_pipeline_action(pipeline: List[str], action: int) -> List[str]:
@@ -441,30 +774,53 @@ def _apply_pipeline_action(pipeline: List[str], action: int) -> List[str]:
     return optimized
 
 
-# Decision logging for experience replay
-_decision_log: List[Dict[str, Any]] = []
+# Decision journal for delayed reward attribution
+_decision_journal: Optional[DecisionJournal] = None
 
 
-def _log_decision(**kwargs) -> str:
-    """Log a decision for later reward update."""
-    decision_id = f"{kwargs['decision_type']}_{datetime.now().timestamp()}"
-    kwargs['decision_id'] = decision_id
-    kwargs['timestamp'] = datetime.now().isoformat()
-    _decision_log.append(kwargs)
+def configure_decision_journal(
+    db_path: Optional[Path] = DECISION_DB_PATH,
+    max_in_memory: int = 1000,
+    ttl_seconds: float = 7 * 24 * 3600
+) -> DecisionJournal:
+    """
+    Configure the journal that stores decisions until their outcomes arrive.
     
-    # Keep only last 1000 decisions in memory
-    if len(_decision_log) > 1000:
-        _decision_log.pop(0)
+    Args:
+        db_path: SQLite path for the journal (None keeps it in memory only)
+        max_in_memory: Number of recent decisions kept in memory
+        ttl_seconds: Seconds before an unresolved decision expires
     
-    return decision_id
+    Returns:
+        The configured journal
+    """
+    global _decision_journal
+    if _decision_journal is not None:
+        _decision_journal.close()
+    _decision_journal = DecisionJournal(db_path, max_in_memory=max_in_memory, ttl_seconds=ttl_seconds)
+    return _decision_journal
+
+
+def get_decision_journal() -> DecisionJournal:
+    """Get the decision journal, creating the default one on first use."""
+    if _decision_journal is None:
+        configure_decision_journal()
+    return _decision_journal
+
+
+def get_last_decision_id() -> Optional[str]:
+    """Get the ID of the most recently logged decision."""
+    return get_decision_journal().last_decision_id
+
+
+def _log_decision(**kwargs) -> str:
+    """Log a decision for later reward update."""
+    return get_decision_journal().record(**kwargs)
 
 
 def _load_decision(decision_id: str) -> Optional[Dict[str, Any]]:
-    """Load a decision from the log."""
-    for decision in reversed(_decision_log):
-        if decision.get('decision_id') == decision_id:
-            return decision
-    return None
+    """Load a decision from the journal."""
+    return get_decision_journal().get(decision_id)
 
 
 # Module validation
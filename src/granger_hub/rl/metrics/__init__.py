@@ -10,6 +10,7 @@ reinforcement learning metrics in ArangoDB for the GRANGER dashboard.
 from .collector import RLMetricsCollector
 from .models import RLMetric, ModuleDecision, PipelineExecution, LearningProgress, ResourceUtilization
 from .arangodb_store import ArangoDBMetricsStore
+from .learning_curves import LearningCurveStore, ModuleCurve, StreamingSeries, get_learning_curve_store
 
 __all__ = [
     'RLMetricsCollector',
@@ -18,5 +19,9 @@ __all__ = [
     'PipelineExecution',
     'LearningProgress',
     'ResourceUtilization',
-    'ArangoDBMetricsStore'
+    'ArangoDBMetricsStore',
+    'LearningCurveStore',
+    'ModuleCurve',
+    'StreamingSeries',
+    'get_learning_curve_store'
 ]
@@ -197,6 +197,37 @@ class ArangoDBMetricsStore:
             logger.error(f"Error storing progress: {e}")
             raise
     
+    async def store_many(self, kind: str, documents: List[Dict[str, Any]]) -> int:
+        """Bulk insert documents into one of the metrics collections
+        
+        Args:
+            kind: Collection key ('metrics', 'decisions', 'pipelines', ...)
+            documents: Documents to insert
+            
+        Returns:
+            Number of documents inserted
+        """
+        if not documents:
+            return 0
+        if not self.db:
+            await self.initialize()
+        
+        try:
+            collection = self.db.collection(self.collections[kind])
+            results = await asyncio.to_thread(
+                collection.insert_many,
+                documents,
+                silent=True
+            )
+            if isinstance(results, list):
+                errors = [r for r in results if isinstance(r, Exception)]
+                if errors:
+                    raise errors[0]
+            return len(documents)
+        except ArangoError as e:
+            logger.error(f"Error bulk storing {kind}: {e}")
+            raise
+    
     async def get_recent_metrics(
         self, 
         limit: int = 100,
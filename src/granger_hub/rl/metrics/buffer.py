@@ -0,0 +1,267 @@
+"""
+Buffered metrics writes for RL metrics collection
+Module: buffer.py
+
+This module keeps RL metrics off the routing path: documents are queued
+in a bounded in-process buffer and written to ArangoDB in bulk by a
+periodic flush task. While the store is unavailable, flushed batches go
+to a local spool of JSONL segments that is replayed once the store is
+reachable again. Documents that fit neither the buffer nor the spool are
+counted as dropped rather than blocking the caller.
+
+Third-party documentation:
+- asyncio: https://docs.python.org/3/library/asyncio.html
+- python-arango: https://docs.python-arango.com/en/main/
+
+Sample input:
+    buffer = MetricsBuffer(store)
+    await buffer.start()
+    buffer.add("metrics", metric.dict())
+
+Expected output:
+    Metrics inserted into ArangoDB in batches every flush_interval seconds
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+from loguru import logger
+
+from .arangodb_store import ArangoDBMetricsStore
+
+# Default spool directory for metrics that could not be stored
+METRICS_SPOOL_DIR = Path("data/rl_metrics_spool")
+
+
+class JsonlSpool:
+    """Append-only JSONL segments used as the local fallback sink"""
+
+    def __init__(self, directory: Path = METRICS_SPOOL_DIR, segment_bytes: int = 8 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.segment_bytes = segment_bytes
+        self._current: Optional[Path] = None
+        self._sequence = 0
+
+    def write(self, batches: List[Tuple[str, List[Dict[str, Any]]]]) -> int:
+        """Append documents to the current segment, rolling over when full"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._current is None or (
+            self._current.exists() and self._current.stat().st_size >= self.segment_bytes
+        ):
+            self._sequence += 1
+            self._current = self.directory / f"metrics-{time.time_ns()}-{self._sequence:04d}.jsonl"
+
+        lines = [
+            json.dumps({"kind": kind, "doc": document}, default=str)
+            for kind, documents in batches
+            for document in documents
+        ]
+        with open(self._current, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return len(lines)
+
+    def segments(self) -> List[Path]:
+        """Spooled segments, oldest first"""
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob("metrics-*.jsonl"))
+
+    def read(self, segment: Path) -> Dict[str, List[Dict[str, Any]]]:
+        """Read a segment grouped by document kind"""
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        with open(segment, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    entry = json.loads(line)
+                    grouped.setdefault(entry["kind"], []).append(entry["doc"])
+        return grouped
+
+    def remove(self, segment: Path) -> None:
+        """Delete a replayed segment"""
+        if segment == self._current:
+            self._current = None
+        segment.unlink(missing_ok=True)
+
+
+class MetricsBuffer:
+    """Bounded metrics buffer with periodic bulk flushes to ArangoDB"""
+
+    def __init__(
+        self,
+        store: ArangoDBMetricsStore,
+        max_size: int = 10000,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        retry_interval: float = 30.0,
+        spool: Optional[JsonlSpool] = None
+    ):
+        """
+        Initialize the buffer.
+
+        Args:
+            store: Metrics store receiving bulk inserts
+            max_size: Documents held before new ones are dropped
+            batch_size: Buffered documents that trigger an early flush
+            flush_interval: Seconds between periodic flushes
+            retry_interval: Seconds to wait before retrying a failed store
+            spool: Fallback sink (defaults to JSONL segments in METRICS_SPOOL_DIR)
+        """
+        self.store = store
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.spool = spool or JsonlSpool()
+
+        # (kind, key) -> document; re-adding a key replaces the queued document
+        self._pending: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._early_flush: Optional[asyncio.Task] = None
+        self._store_retry_at = 0.0
+        # Segments may be left over from a previous run
+        self._replay_needed = True
+
+        self.added = 0
+        self.coalesced = 0
+        self.stored = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.store_errors = 0
+        self.flushes = 0
+
+    @property
+    def pending(self) -> int:
+        """Documents waiting to be flushed"""
+        return len(self._pending)
+
+    def add(self, kind: str, document: Dict[str, Any], key: Optional[str] = None) -> bool:
+        """
+        Queue a document without waiting for storage.
+
+        Args:
+            kind: Store collection key ('metrics', 'decisions', ...)
+            document: Document to insert
+            key: Identity used to replace a still-queued earlier version
+
+        Returns:
+            False if the buffer was full and the document was dropped
+        """
+        entry = (kind, key or f"_{self.added}")
+        if entry in self._pending:
+            self._pending[entry] = document
+            self.coalesced += 1
+            return True
+        if len(self._pending) >= self.max_size:
+            self.dropped += 1
+            return False
+
+        self._pending[entry] = document
+        self.added += 1
+        if len(self._pending) >= self.batch_size and self._flush_task is not None:
+            if self._early_flush is None or self._early_flush.done():
+                self._early_flush = asyncio.get_running_loop().create_task(self.flush())
+        return True
+
+    async def start(self):
+        """Start the periodic flush task"""
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush task and flush what is left"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Write all buffered documents.
+
+        Returns:
+            Number of documents inserted into the store
+        """
+        async with self._flush_lock:
+            pending, self._pending = self._pending, OrderedDict()
+            if not pending:
+                return 0
+            self.flushes += 1
+
+            batches: Dict[str, List[Dict[str, Any]]] = {}
+            for (kind, _), document in pending.items():
+                batches.setdefault(kind, []).append(document)
+
+            stored = 0
+            if time.monotonic() >= self._store_retry_at:
+                try:
+                    for kind in list(batches):
+                        await self.store.store_many(kind, batches[kind])
+                        stored += len(batches.pop(kind))
+                    self.stored += stored
+                    if self._replay_needed:
+                        await self._replay_spool()
+                except Exception as e:
+                    self.store_errors += 1
+                    self._store_retry_at = time.monotonic() + self.retry_interval
+                    logger.warning(f"Metrics store unavailable, spooling locally: {e}")
+
+            if batches:
+                await self._write_spool(list(batches.items()))
+            return stored
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer throughput and drop counters"""
+        return {
+            'pending': self.pending,
+            'added': self.added,
+            'coalesced': self.coalesced,
+            'stored': self.stored,
+            'spooled': self.spooled,
+            'replayed': self.replayed,
+            'dropped': self.dropped,
+            'store_errors': self.store_errors,
+            'flushes': self.flushes,
+            'store_available': time.monotonic() >= self._store_retry_at
+        }
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Metrics flush failed: {e}")
+
+    async def _write_spool(self, batches: List[Tuple[str, List[Dict[str, Any]]]]):
+        count = sum(len(documents) for _, documents in batches)
+        try:
+            await asyncio.to_thread(self.spool.write, batches)
+            self.spooled += count
+            self._replay_needed = True
+        except OSError as e:
+            self.dropped += count
+            logger.error(f"Dropped {count} metrics, spool write failed: {e}")
+
+    async def _replay_spool(self):
+        """Move spooled segments into the store, oldest first"""
+        for segment in self.spool.segments():
+            grouped = await asyncio.to_thread(self.spool.read, segment)
+            for kind, documents in grouped.items():
+                await self.store.store_many(kind, documents)
+                self.replayed += len(documents)
+            self.spool.remove(segment)
+            logger.info(f"Replayed spooled metrics segment {segment.name}")
+        self._replay_needed = False
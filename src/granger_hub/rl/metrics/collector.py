@@ -34,13 +34,27 @@ from .models import (
     LearningProgress, ResourceUtilization
 )
 from .arangodb_store import ArangoDBMetricsStore
+from .buffer import MetricsBuffer
+from .learning_curves import LearningCurveStore, get_learning_curve_store
 
 
 class RLMetricsCollector:
-    """Collects and stores RL metrics for the GRANGER dashboard"""
+    """Collects and stores RL metrics for the GRANGER dashboard
     
-    def __init__(self, store: Optional[ArangoDBMetricsStore] = None):
+    Records are queued in a MetricsBuffer and written in bulk in the
+    background, so recording never waits on ArangoDB. Read methods flush
+    the buffer first.
+    """
+    
+    def __init__(
+        self,
+        store: Optional[ArangoDBMetricsStore] = None,
+        curve_store: Optional[LearningCurveStore] = None,
+        buffer: Optional[MetricsBuffer] = None
+    ):
         self.store = store or ArangoDBMetricsStore()
+        self.curve_store = curve_store or get_learning_curve_store()
+        self.buffer = buffer or MetricsBuffer(self.store)
         self._active_pipelines: Dict[str, PipelineExecution] = {}
         self._active_decisions: Dict[str, ModuleDecision] = {}
         self._initialized = False
@@ -50,7 +64,9 @@ class RLMetricsCollector:
         """Initialize the metrics collector"""
         async with self._lock:
             if not self._initialized:
-                await self.store.initialize()
+                # The store connects on first flush; an unavailable store
+                # must not block recording
+                await self.buffer.start()
                 self._initialized = True
                 logger.info("RL Metrics Collector initialized")
     
@@ -87,8 +103,8 @@ class RLMetricsCollector:
         # Store for later update with results
         self._active_decisions[decision.id] = decision
         
-        # Store immediately
-        await self.store.store_decision(decision)
+        # Queue for the next bulk write
+        self.buffer.add('decisions', decision.dict(), key=decision.id)
         
         logger.debug(f"Recorded module selection: {selected_module} for {task_type}")
         return decision.id
@@ -109,8 +125,8 @@ class RLMetricsCollector:
             decision.reward = reward
             decision.error_message = error_message
             
-            # Re-store with updated information
-            await self.store.store_decision(decision)
+            # Re-queue with updated information (replaces the queued copy)
+            self.buffer.add('decisions', decision.dict(), key=decision.id)
             
             # Create RL metric
             metric = RLMetric(
@@ -124,7 +140,13 @@ class RLMetricsCollector:
                 module_id=decision.selected_module,
                 agent_type=decision.algorithm
             )
-            await self.store.store_metric(metric)
+            self.buffer.add('metrics', metric.dict())
+            self.curve_store.record(
+                decision.selected_module,
+                reward,
+                success_rate=1.0 if success else 0.0,
+                duration_ms=execution_time_ms
+            )
             
             # Clean up
             del self._active_decisions[decision_id]
@@ -158,8 +180,8 @@ class RLMetricsCollector:
             elif len(pipeline.modules_executed) > 0:
                 pipeline.partial_success = True
             
-            # Store pipeline
-            await self.store.store_pipeline(pipeline)
+            # Queue pipeline
+            self.buffer.add('pipelines', pipeline.dict())
             
             # Clean up
             if pipeline_id in self._active_pipelines:
@@ -191,6 +213,13 @@ class RLMetricsCollector:
             if not success:
                 pipeline.error_modules.append(module_id)
             
+            self.curve_store.record(
+                module_id,
+                reward,
+                success_rate=1.0 if success else 0.0,
+                duration_ms=duration_ms
+            )
+            
             logger.debug(
                 f"Module {module_id} in pipeline {pipeline_id}: "
                 f"duration={duration_ms}ms, reward={reward}"
@@ -222,7 +251,7 @@ class RLMetricsCollector:
             hyperparameters=performance_metrics.get('hyperparameters')
         )
         
-        await self.store.store_progress(progress)
+        self.buffer.add('progress', progress.dict())
         
         logger.info(
             f"Learning progress for {agent_type}/{module_or_pipeline}: "
@@ -241,6 +270,7 @@ class RLMetricsCollector:
         from datetime import timedelta
         time_range = timedelta(hours=time_window_hours)
         
+        await self.flush()
         return await self.store.get_module_performance(module_id, time_range)
     
     async def get_learning_curves(self, agent_type: str) -> List[Dict[str, Any]]:
@@ -248,10 +278,20 @@ class RLMetricsCollector:
         if not self._initialized:
             await self.initialize()
         
+        await self.flush()
         return await self.store.get_learning_curves(agent_type)
     
+    async def flush(self) -> int:
+        """Write buffered metrics now"""
+        return await self.buffer.flush()
+    
+    def get_buffer_stats(self) -> Dict[str, Any]:
+        """Get metrics buffer counters (stored, spooled, dropped, ...)"""
+        return self.buffer.get_stats()
+    
     async def close(self):
-        """Close connections and clean up"""
+        """Flush buffered metrics, close connections and clean up"""
+        await self.buffer.stop()
         await self.store.close()
         self._initialized = False
 
@@ -3,8 +3,14 @@ Learning curves calculation and analysis for RL metrics.
 Module: learning_curves.py
 Description: Implementation of learning curves functionality
 
-This module queries performance metrics from ArangoDB and calculates
-learning curves with moving averages and trend lines for visualization.
+This module maintains learning curves incrementally: every reward recorded
+by RLMetricsCollector updates a per-module streaming moving average, online
+regression sums (slope/intercept/R²) and Welford mean/variance over the
+points the curve retains (the last max_points). Queries read
+the precomputed series, so dashboards polling every few seconds no longer
+re-query ArangoDB or recompute rolling means and trend lines. Modules are
+seeded from ArangoDB the first time they are requested, and ranges older
+than the tracked history fall back to querying ArangoDB.
 
 Third-party docs:
 - ArangoDB Python Driver: https://python-arango.readthedocs.io/
@@ -27,8 +33,11 @@ Expected output:
 """
 import json
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Any
+import math
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Any, Union
 import numpy as np
 import pandas as pd
 from arango import ArangoClient
@@ -37,12 +46,346 @@ from arango.database import Database
 logger = logging.getLogger(__name__)
 
 
+def _epoch(timestamp: Union[datetime, str, float, None]) -> float:
+    """Convert a timestamp to epoch seconds (naive times are UTC)."""
+    if timestamp is None:
+        return datetime.now(timezone.utc).timestamp()
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def _downsample_indices(length: int, max_points: Optional[int]) -> Optional[np.ndarray]:
+    """Evenly spaced indices (first and last included), or None to keep all."""
+    if not max_points or length <= max_points:
+        return None
+    return np.unique(np.linspace(0, length - 1, max_points).round().astype(int))
+
+
+class StreamingSeries:
+    """
+    Running statistics for one metric series.
+
+    Keeps a sliding-window sum for the moving average and Welford-style
+    co-moments of (x, y), from which mean, variance and the least-squares
+    trend line are available in O(1) at any time. With a capacity, points
+    older than the last capacity are removed from the statistics again
+    (inverse Welford update, min/max from monotonic deques), so the
+    statistics always describe exactly the retained points.
+    """
+
+    def __init__(self, window_size: int = 50, capacity: Optional[int] = None):
+        self.window_size = window_size
+        self.capacity = capacity
+        self._window: deque = deque(maxlen=window_size)
+        self._window_sum = 0.0
+        self._points: deque = deque()
+        self._minima: deque = deque()
+        self._maxima: deque = deque()
+        self._added = 0
+        self._removed_since_rebuild = 0
+        self.count = 0
+        self.mean = 0.0
+        self.last = 0.0
+        self._mean_x = 0.0
+        self._sxx = 0.0
+        self._syy = 0.0
+        self._sxy = 0.0
+
+    @property
+    def min(self) -> float:
+        """Smallest retained value."""
+        return self._minima[0][1] if self._minima else math.inf
+
+    @property
+    def max(self) -> float:
+        """Largest retained value."""
+        return self._maxima[0][1] if self._maxima else -math.inf
+
+    def add(self, x: float, y: float) -> float:
+        """Add a point and return the moving average at that point."""
+        if len(self._window) == self.window_size:
+            self._window_sum -= self._window[0]
+        self._window.append(y)
+        self._window_sum += y
+
+        if self.capacity is not None and len(self._points) == self.capacity:
+            self._remove_oldest()
+        self._points.append((x, y))
+
+        self.count += 1
+        dx = x - self._mean_x
+        dy = y - self.mean
+        self._mean_x += dx / self.count
+        self.mean += dy / self.count
+        self._sxx += dx * (x - self._mean_x)
+        self._syy += dy * (y - self.mean)
+        self._sxy += dx * (y - self.mean)
+
+        while self._minima and self._minima[-1][1] >= y:
+            self._minima.pop()
+        self._minima.append((self._added, y))
+        while self._maxima and self._maxima[-1][1] <= y:
+            self._maxima.pop()
+        self._maxima.append((self._added, y))
+        self._added += 1
+
+        self.last = y
+        return self._window_sum / len(self._window)
+
+    def _remove_oldest(self) -> None:
+        """Drop the oldest retained point from the statistics."""
+        x, y = self._points.popleft()
+        position = self._added - len(self._points) - 1
+        if self._minima[0][0] == position:
+            self._minima.popleft()
+        if self._maxima[0][0] == position:
+            self._maxima.popleft()
+
+        self._removed_since_rebuild += 1
+        if self._removed_since_rebuild >= len(self._points):
+            # Recompute exactly now and then so removals cannot accumulate rounding error
+            self._rebuild()
+            return
+
+        self.count -= 1
+        mean_x = (self._mean_x * (self.count + 1) - x) / self.count
+        mean = (self.mean * (self.count + 1) - y) / self.count
+        self._sxx -= (x - mean_x) * (x - self._mean_x)
+        self._syy -= (y - mean) * (y - self.mean)
+        self._sxy -= (x - mean_x) * (y - self.mean)
+        self._mean_x = mean_x
+        self.mean = mean
+
+    def _rebuild(self) -> None:
+        """Recompute the co-moments from the retained points."""
+        self._removed_since_rebuild = 0
+        self.count = len(self._points)
+        if not self.count:
+            self._mean_x = self.mean = self._sxx = self._syy = self._sxy = 0.0
+            return
+        xs = np.fromiter((p[0] for p in self._points), dtype=float, count=self.count)
+        ys = np.fromiter((p[1] for p in self._points), dtype=float, count=self.count)
+        self._mean_x = float(xs.mean())
+        self.mean = float(ys.mean())
+        dx = xs - self._mean_x
+        dy = ys - self.mean
+        self._sxx = float(dx @ dx)
+        self._syy = float(dy @ dy)
+        self._sxy = float(dx @ dy)
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(max(self._syy, 0.0) / (self.count - 1)) if self.count > 1 else 0.0
+
+    def trend(self) -> Dict[str, float]:
+        """Least-squares trend line over the retained points."""
+        if self.count < 2 or self._sxx <= 0:
+            return {'slope': 0, 'intercept': 0, 'r_squared': 0}
+        slope = self._sxy / self._sxx
+        r_squared = self._sxy ** 2 / (self._sxx * self._syy) if self._syy > 0 else 0
+        return {
+            'slope': float(slope),
+            'intercept': float(self.mean - slope * self._mean_x),
+            'r_squared': float(r_squared)
+        }
+
+
+class ModuleCurve:
+    """Incrementally maintained learning curve for one module."""
+
+    def __init__(
+        self,
+        module_name: str,
+        window_size: int = 50,
+        max_points: int = 10000,
+        history_start: Optional[float] = None
+    ):
+        """
+        Initialize the curve.
+
+        Args:
+            module_name: Module the curve belongs to
+            window_size: Moving average window
+            max_points: Most recent points kept for the series; the running
+                statistics cover the same points
+            history_start: Epoch seconds from which the curve is complete
+        """
+        self.module_name = module_name
+        self.window_size = window_size
+        self.history_start = history_start if history_start is not None else _epoch(None)
+        self.seeded = False
+        self.rewards = StreamingSeries(window_size, max_points)
+        self.success_rates = StreamingSeries(window_size, max_points)
+        self.last_episode = -1
+        self.records: deque = deque(maxlen=max_points)
+        self.timestamps: deque = deque(maxlen=max_points)
+        self.ma_rewards: deque = deque(maxlen=max_points)
+        self.ma_success: deque = deque(maxlen=max_points)
+
+    @property
+    def count(self) -> int:
+        """Points currently kept."""
+        return self.rewards.count
+
+    def add(
+        self,
+        reward: float,
+        success_rate: float = 0.0,
+        episode: Optional[int] = None,
+        timestamp: Union[datetime, str, float, None] = None,
+        **fields
+    ) -> Dict[str, Any]:
+        """
+        Add one metric point.
+
+        Args:
+            reward: Reward received
+            success_rate: Success rate (or 1.0/0.0 for a single outcome)
+            episode: Episode number (defaults to the next episode)
+            timestamp: When the metric was recorded (defaults to now)
+            **fields: Extra fields kept on the data point
+
+        Returns:
+            The stored data point
+        """
+        if episode is None:
+            episode = self.last_episode + 1
+        self.last_episode = max(self.last_episode, episode)
+        epoch = _epoch(timestamp)
+        reward = float(reward)
+        success_rate = float(success_rate or 0.0)
+
+        record = {
+            **fields,
+            'timestamp': timestamp if isinstance(timestamp, str)
+            else datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None).isoformat(),
+            'episode': episode,
+            'reward': reward,
+            'success_rate': success_rate
+        }
+        evicting = len(self.records) == self.records.maxlen
+        self.records.append(record)
+        self.timestamps.append(epoch)
+        if evicting:
+            # Older ranges are no longer complete here
+            self.history_start = max(self.history_start, self.timestamps[0])
+        self.ma_rewards.append(self.rewards.add(episode, reward))
+        self.ma_success.append(self.success_rates.add(episode, success_rate))
+        return record
+
+
+class LearningCurveStore:
+    """Thread-safe registry of per-module learning curves."""
+
+    def __init__(self, window_size: int = 50, max_points: int = 10000):
+        self.window_size = window_size
+        self.max_points = max_points
+        self.lock = threading.RLock()
+        self._curves: Dict[str, ModuleCurve] = {}
+
+    def record(self, module_name: str, reward: float, **kwargs) -> Dict[str, Any]:
+        """Add a metric point to a module's curve (see ModuleCurve.add)."""
+        with self.lock:
+            curve = self._curves.get(module_name)
+            if curve is None:
+                curve = self._curves[module_name] = ModuleCurve(
+                    module_name, self.window_size, self.max_points
+                )
+            return curve.add(reward, **kwargs)
+
+    def get(self, module_name: str) -> Optional[ModuleCurve]:
+        """Get a module's curve, if any metrics were recorded or seeded."""
+        return self._curves.get(module_name)
+
+    def seed(
+        self,
+        module_name: str,
+        metrics: List[Dict[str, Any]],
+        history_start: float
+    ) -> ModuleCurve:
+        """
+        Rebuild a module's curve from stored metrics.
+
+        Points recorded in this process before seeding are replayed after
+        the stored metrics.
+
+        Args:
+            module_name: Module name
+            metrics: Stored metric records sorted by timestamp
+            history_start: Epoch seconds the stored metrics start from
+
+        Returns:
+            The seeded curve
+        """
+        with self.lock:
+            curve = ModuleCurve(module_name, self.window_size, self.max_points, history_start)
+            for metric in metrics:
+                fields = dict(metric)
+                curve.add(fields.pop('reward'), fields.pop('success_rate', 0.0),
+                          fields.pop('episode', None), fields.pop('timestamp', None), **fields)
+
+            previous = self._curves.get(module_name)
+            if previous is not None:
+                for record in previous.records:
+                    fields = dict(record)
+                    episode = fields.pop('episode')
+                    curve.add(fields.pop('reward'), fields.pop('success_rate'),
+                              episode if episode > curve.last_episode else None,
+                              fields.pop('timestamp'), **fields)
+            curve.seeded = True
+            self._curves[module_name] = curve
+            return curve
+
+    def modules(self) -> List[str]:
+        """Modules with a curve."""
+        return list(self._curves)
+
+    def clear(self, module_name: Optional[str] = None) -> None:
+        """Drop one module's curve, or all curves."""
+        with self.lock:
+            if module_name is None:
+                self._curves.clear()
+            else:
+                self._curves.pop(module_name, None)
+
+
+# Global curve store shared by the collector and calculators
+_curve_store: Optional[LearningCurveStore] = None
+
+
+def get_learning_curve_store() -> LearningCurveStore:
+    """Get or create the global learning curve store"""
+    global _curve_store
+    if _curve_store is None:
+        _curve_store = LearningCurveStore()
+    return _curve_store
+
+
 class LearningCurvesCalculator:
     """Calculate learning curves from RL metrics stored in ArangoDB."""
     
-    def __init__(self, db: Optional[Database] = None):
-        """Initialize with ArangoDB connection."""
+    def __init__(
+        self,
+        db: Optional[Database] = None,
+        curve_store: Optional[LearningCurveStore] = None,
+        history_days: int = 7
+    ):
+        """Initialize with ArangoDB connection.
+
+        Args:
+            db: ArangoDB database (connects to localhost when None)
+            curve_store: Incremental curves (defaults to the global store)
+            history_days: Days of stored metrics loaded when seeding a module
+        """
         self.db = db
+        self.curve_store = curve_store or get_learning_curve_store()
+        self.history_days = history_days
         if not self.db:
             # Connect to ArangoDB
             client = ArangoClient(hosts='http://localhost:8529')
@@ -53,7 +396,8 @@ class LearningCurvesCalculator:
         module_name: str,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
-        limit: int = 1000
+        limit: int = 1000,
+        newest: bool = False
     ) -> List[Dict[str, Any]]:
         """Query performance metrics for a specific module.
         
@@ -62,6 +406,8 @@ class LearningCurvesCalculator:
             start_time: Start of time range (default: 7 days ago)
             end_time: End of time range (default: now)
             limit: Maximum number of records to return
+            newest: Keep the most recent records when the limit is hit
+                (the oldest are kept otherwise)
             
         Returns:
             List of metric records sorted by timestamp
@@ -71,14 +417,14 @@ class LearningCurvesCalculator:
         if not end_time:
             end_time = datetime.utcnow()
             
-        query = '''
+        query = f'''
         FOR metric IN rl_metrics
             FILTER metric.module_name == @module_name
             FILTER metric.timestamp >= @start_time
             FILTER metric.timestamp <= @end_time
-            SORT metric.timestamp ASC
+            SORT metric.timestamp {'DESC' if newest else 'ASC'}
             LIMIT @limit
-            RETURN {
+            RETURN {{
                 timestamp: metric.timestamp,
                 episode: metric.episode,
                 reward: metric.reward,
@@ -87,7 +433,7 @@ class LearningCurvesCalculator:
                 learning_rate: metric.learning_rate,
                 loss: metric.loss,
                 duration_ms: metric.duration_ms
-            }
+            }}
         '''
         
         cursor = self.db.aql.execute(
@@ -100,7 +446,10 @@ class LearningCurvesCalculator:
             }
         )
         
-        return list(cursor)
+        metrics = list(cursor)
+        if newest:
+            metrics.reverse()
+        return metrics
     
     def calculate_moving_average(
         self, 
@@ -198,14 +547,20 @@ class LearningCurvesCalculator:
         self,
         module_name: str,
         window_size: int = 50,
-        time_range: Optional[Dict[str, str]] = None
+        time_range: Optional[Dict[str, str]] = None,
+        max_points: Optional[int] = None
     ) -> Dict[str, Any]:
         """Get complete learning curve data for a module.
         
+        Served from the module's incrementally maintained curve; ArangoDB is
+        only queried to seed a module on first use or for ranges that start
+        before the tracked history.
+        
         Args:
             module_name: Name of the module
             window_size: Window size for moving average
             time_range: Optional time range with 'start' and 'end' ISO strings
+            max_points: Downsample the returned series to at most this many points
             
         Returns:
             Complete learning curve data including raw data, moving averages,
@@ -220,9 +575,99 @@ class LearningCurvesCalculator:
             if 'end' in time_range:
                 end_time = datetime.fromisoformat(time_range['end'].replace('Z', '+00:00'))
         
-        # Query metrics
-        metrics = self.query_module_metrics(module_name, start_time, end_time)
+        curve = self._get_curve(module_name)
+        
+        # Ranges older than the tracked history need the stored metrics
+        if start_time and _epoch(start_time) < curve.history_start:
+            metrics = self.query_module_metrics(module_name, start_time, end_time)
+            return self._curves_from_metrics(module_name, metrics, window_size, max_points)
+        
+        with self.curve_store.lock:
+            if start_time or end_time or window_size != curve.window_size or curve.count < window_size:
+                # Sub-range or different window: compute over the tracked points
+                records = list(curve.records)
+                if start_time or end_time:
+                    timestamps = np.fromiter(curve.timestamps, dtype=float, count=len(records))
+                    lo = np.searchsorted(timestamps, _epoch(start_time), 'left') if start_time else 0
+                    hi = np.searchsorted(timestamps, _epoch(end_time), 'right') if end_time else len(records)
+                    records = records[lo:hi]
+                return self._curves_from_metrics(module_name, records, window_size, max_points)
+            
+            records = list(curve.records)
+            ma_rewards = list(curve.ma_rewards)
+            ma_success = list(curve.ma_success)
+            rewards = curve.rewards
+            reward_trend = rewards.trend()
+            success_trend = curve.success_rates.trend()
+            summary = {
+                'total_episodes': rewards.count,
+                'avg_reward': float(rewards.mean),
+                'max_reward': float(rewards.max),
+                'min_reward': float(rewards.min),
+                'improvement_rate': reward_trend['slope'],
+                'final_success_rate': curve.success_rates.last
+            }
+            mean = rewards.mean
+            std = rewards.std
+        
+        indices = _downsample_indices(len(records), max_points)
+        if indices is not None:
+            records = [records[i] for i in indices]
+            ma_rewards = [ma_rewards[i] for i in indices]
+            ma_success = [ma_success[i] for i in indices]
         
+        z_score = 1.96
+        margin = z_score * (std / np.sqrt(summary['total_episodes'])) if summary['total_episodes'] > 1 else 0.0
+        
+        return {
+            'module': module_name,
+            'data_points': records,
+            'moving_average': {
+                'rewards': ma_rewards,
+                'success_rates': ma_success
+            },
+            'trend_line': {
+                'rewards': reward_trend,
+                'success_rates': success_trend
+            },
+            'confidence_intervals': {
+                'upper': [mean + margin] * len(records),
+                'lower': [mean - margin] * len(records),
+                'mean': float(mean),
+                'std': float(std)
+            },
+            'summary': summary
+        }
+    
+    def reload_module(self, module_name: str) -> ModuleCurve:
+        """Re-seed a module's curve from ArangoDB.
+        
+        Use when other processes have written metrics for the module.
+        """
+        start_time = datetime.utcnow() - timedelta(days=self.history_days)
+        limit = self.curve_store.max_points
+        metrics = self.query_module_metrics(module_name, start_time, limit=limit, newest=True)
+        history_start = _epoch(start_time)
+        if len(metrics) >= limit:
+            # Truncated: the curve is only complete from its first record
+            history_start = _epoch(metrics[0]['timestamp'])
+        return self.curve_store.seed(module_name, metrics, history_start)
+    
+    def _get_curve(self, module_name: str) -> ModuleCurve:
+        """Get a module's curve, seeding it from ArangoDB on first use."""
+        curve = self.curve_store.get(module_name)
+        if curve is None or not curve.seeded:
+            curve = self.reload_module(module_name)
+        return curve
+    
+    def _curves_from_metrics(
+        self,
+        module_name: str,
+        metrics: List[Dict[str, Any]],
+        window_size: int,
+        max_points: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Compute learning curves from scratch over metric records."""
         if not metrics:
             return {
                 'module': module_name,
@@ -265,6 +710,14 @@ class LearningCurvesCalculator:
             'final_success_rate': success_rates[-1] if success_rates else 0
         }
         
+        indices = _downsample_indices(len(metrics), max_points)
+        if indices is not None:
+            metrics = [metrics[i] for i in indices]
+            ma_rewards = [ma_rewards[i] for i in indices]
+            ma_success = [ma_success[i] for i in indices]
+            reward_ci['upper'] = reward_ci['upper'][:len(indices)]
+            reward_ci['lower'] = reward_ci['lower'][:len(indices)]
+        
         return {
             'module': module_name,
             'data_points': metrics,
@@ -306,18 +759,20 @@ class LearningCurvesCalculator:
         best_module = None
         
         for module in module_names:
-            curves = self.get_learning_curves(module, window_size)
-            
-            # Extract relevant metric
-            if metric == 'reward':
-                final_score = curves['summary']['avg_reward']
-            else:
-                final_score = curves['summary']['final_success_rate']
+            # Running statistics are all a comparison needs
+            curve = self._get_curve(module)
+            with self.curve_store.lock:
+                if metric == 'reward':
+                    final_score = float(curve.rewards.mean)
+                else:
+                    final_score = curve.success_rates.last
+                improvement_rate = curve.rewards.trend()['slope']
+                total_episodes = curve.count
             
             comparison['modules'][module] = {
                 'final_score': final_score,
-                'improvement_rate': curves['trend_line']['rewards']['slope'],
-                'total_episodes': curves['summary']['total_episodes']
+                'improvement_rate': improvement_rate,
+                'total_episodes': total_episodes
             }
             
             if final_score > best_score:
@@ -0,0 +1,153 @@
+"""
+Module: ollama_cache.py
+Description: Persistent prompt -> response cache for the Ollama client
+
+Responses are stored in SQLite keyed by a hash of the request (model,
+system prompt, prompt, temperature, format and token limit). Entries
+expire after a TTL and the least recently used entries are evicted once
+the cache holds more than max_entries.
+
+Sample Input:
+>>> cache = OllamaResponseCache(Path("data/ollama_cache.db"))
+>>> cache.put(key, "qwen2.5:3b-instruct", {"response": "{...}"})
+
+Expected Output:
+>>> cache.get(key)
+{'response': '{...}'}
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+# Default response cache path
+OLLAMA_CACHE_PATH = Path("data/ollama_cache.db")
+
+# Environment variable naming an on-disk cache file for OllamaClient
+OLLAMA_CACHE_PATH_ENV = "GRANGER_OLLAMA_CACHE_PATH"
+
+
+def default_cache_path() -> Optional[Path]:
+    """On-disk cache file from the environment, or None for an in-memory cache."""
+    path = os.getenv(OLLAMA_CACHE_PATH_ENV)
+    return Path(path) if path else None
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        model TEXT NOT NULL,
+        response TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_access REAL NOT NULL
+    )
+"""
+
+
+def request_cache_key(payload: Dict[str, Any]) -> str:
+    """Hash the parts of a generate request that determine the response."""
+    return hashlib.sha256(json.dumps([
+        payload.get("model"),
+        payload.get("system"),
+        payload.get("prompt"),
+        payload.get("temperature"),
+        payload.get("format"),
+        payload.get("options", {}).get("num_predict")
+    ], sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class OllamaResponseCache:
+    """SQLite-backed response cache with TTL and LRU size eviction."""
+
+    def __init__(self, path: Optional[Path] = OLLAMA_CACHE_PATH,
+                 ttl_seconds: float = 24 * 3600, max_entries: int = 10000):
+        """
+        Args:
+            path: SQLite file; an in-memory database is used when None
+            ttl_seconds: Seconds a response stays valid
+            max_entries: Entries kept before least recently used ones are evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        else:
+            self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        self._puts_since_eviction = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get a cached response, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] >= self.ttl_seconds:
+                if row is not None:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, model: str, response: Dict[str, Any]):
+        """Store a response, evicting expired and least recently used entries."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(response), now, now)
+            )
+            self._puts_since_eviction += 1
+            # Amortize eviction over a tenth of the capacity
+            if self._puts_since_eviction >= max(1, self.max_entries // 10):
+                self._evict(now)
+            self._conn.commit()
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get entry count and hit/miss counters."""
+        with self._lock:
+            (entries,) = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "ttl_seconds": self.ttl_seconds,
+            "max_entries": self.max_entries
+        }
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self, now: float):
+        self._conn.execute("DELETE FROM responses WHERE created_at <= ?", (now - self.ttl_seconds,))
+        self._conn.execute(
+            "DELETE FROM responses WHERE key IN ("
+            "SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+        self._puts_since_eviction = 0
@@ -4,6 +4,7 @@ Description: Implementation of ollama integration functionality
 
 External Dependencies:
 - requests: https://requests.readthedocs.io/
+- aiohttp: https://docs.aiohttp.org/
 - dataclasses: [Documentation URL]
 
 Sample Input:
@@ -24,13 +25,18 @@ This module provides direct integration with the local Ollama server
 for reinforcement learning tasks.
 """
 
+import asyncio
 import requests
+import aiohttp
 import json
 import logging
-from typing import Dict, Any, Optional, List
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
 from dataclasses import dataclass, field
 import time
 
+from .ollama_cache import OllamaResponseCache, default_cache_path, request_cache_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +52,13 @@ class OllamaConfig:
     timeout: int = 30  # Reasonable timeout
     retry_attempts: int = 3
     retry_delay: float = 1.0
+    max_connections: int = 8  # Pooled HTTP connections per session
+    cache_enabled: bool = True  # Prompt -> response cache
+    # On-disk cache file (opt-in, e.g. OLLAMA_CACHE_PATH or $GRANGER_OLLAMA_CACHE_PATH);
+    # None keeps the cache in memory
+    cache_path: Optional[Path] = field(default_factory=default_cache_path)
+    cache_ttl: float = 24 * 3600
+    cache_max_entries: int = 10000
     
     def __post_init__(self):
         if self.preferred_models is None:
@@ -68,19 +81,164 @@ class OllamaConfig:
         return "http://192.168.86.49:11434"
 
 
+def _route_optimization_request(task: Dict[str, Any]) -> Tuple[str, str, float]:
+    """Build the (prompt, system prompt, temperature) for route optimization."""
+    system_prompt = """You are an expert at optimizing communication routes between modules.
+Your goal is to find the most efficient path considering latency, reliability, and schema compatibility.
+Always provide your reasoning before the route."""
+    
+    prompt = f"""Find the optimal communication route for this task:
+
+Source Module: {task.get('source')}
+Target Module: {task.get('target')}
+Constraints: {json.dumps(task.get('constraints', {}), indent=2)}
+
+Available context:
+{json.dumps(task.get('graph_context', {}), indent=2)}
+
+Think step by step:
+1. Analyze the requirements
+2. Consider available paths
+3. Evaluate trade-offs
+4. Choose the optimal route
+
+Respond with JSON in this format:
+{{
+    "reasoning": "your detailed reasoning",
+    "route": ["module1", "module2", ..., "target"],
+    "expected_latency_ms": <number>,
+    "expected_success_rate": <number between 0 and 1>
+}}"""
+    
+    # Lower temperature for more consistent routing
+    return prompt, system_prompt, 0.3
+
+
+def _schema_adaptation_request(source_schema: Dict, target_schema: Dict,
+                               sample_data: Any) -> Tuple[str, str, float]:
+    """Build the (prompt, system prompt, temperature) for schema adaptation."""
+    system_prompt = """You are an expert at data schema transformation.
+Your goal is to transform data from one schema to another while preserving as much information as possible."""
+    
+    prompt = f"""Create a schema transformation strategy:
+
+Source Schema:
+{json.dumps(source_schema, indent=2)}
+
+Target Schema:
+{json.dumps(target_schema, indent=2)}
+
+Sample Data:
+{json.dumps(sample_data, indent=2)}
+
+Provide a transformation strategy that:
+1. Maps fields appropriately
+2. Handles type conversions
+3. Preserves data integrity
+4. Minimizes information loss
+
+Respond with JSON:
+{{
+    "strategy": "description of transformation approach",
+    "field_mappings": {{
+        "source_field": "target_field",
+        ...
+    }},
+    "transformations": [
+        {{"field": "field_name", "operation": "description"}},
+        ...
+    ],
+    "data_preservation_rate": <number between 0 and 1>,
+    "complexity": <number 1-10>
+}}"""
+    
+    # Very low temperature for consistent transformations
+    return prompt, system_prompt, 0.2
+
+
+def _module_selection_request(task_description: str,
+                              available_modules: List[Dict]) -> Tuple[str, str, float]:
+    """Build the (prompt, system prompt, temperature) for module selection."""
+    system_prompt = """You are an expert at selecting optimal modules for complex tasks.
+Consider module capabilities, load, and task requirements to make the best selection."""
+    
+    modules_info = "\n".join([
+        f"- {m['name']}: {m.get('capabilities', [])} (load: {m.get('current_load', 0)}%)"
+        for m in available_modules
+    ])
+    
+    prompt = f"""Select the optimal modules for this task:
+
+Task: {task_description}
+
+Available Modules:
+{modules_info}
+
+Consider:
+1. Module capabilities vs task requirements
+2. Current load and availability
+3. Potential for parallel processing
+4. Efficiency and resource usage
+
+Respond with JSON:
+{{
+    "reasoning": "detailed selection reasoning",
+    "selected_modules": ["module1", "module2", ...],
+    "execution_order": "sequential|parallel|mixed",
+    "expected_efficiency": <number 0-1>,
+    "alternative_modules": ["backup1", "backup2", ...]
+}}"""
+    
+    return prompt, system_prompt, 0.4
+
+
+def _extract_json(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Parse the JSON object in a generate() result, or None."""
+    response_text = result.get("response", "")
+    if response_text:
+        # Find JSON in response
+        response_text = response_text.strip()
+        json_start = response_text.find('{')
+        json_end = response_text.rfind('}') + 1
+        if json_start >= 0 and json_end > json_start:
+            return json.loads(response_text[json_start:json_end])
+    return None
+
+
 class OllamaClient:
-    """Client for interacting with Ollama server."""
+    """Client for interacting with Ollama server.
+    
+    Blocking methods share a pooled requests session; the a-prefixed
+    coroutines (agenerate, astream, agenerate_route_optimization, ...)
+    share a pooled aiohttp session, and identical in-flight prompts are
+    coalesced into one request. Successful responses are kept in an
+    OllamaResponseCache (in memory unless config.cache_path is set).
+    """
     
-    def __init__(self, config: Optional[OllamaConfig] = None):
+    def __init__(self, config: Optional[OllamaConfig] = None,
+                 cache: Optional[OllamaResponseCache] = None):
         self.config = config or OllamaConfig()
         self.available_models = []
+        self.cache = cache
+        if cache is None and self.config.cache_enabled:
+            self.cache = OllamaResponseCache(
+                self.config.cache_path,
+                ttl_seconds=self.config.cache_ttl,
+                max_entries=self.config.cache_max_entries
+            )
+        self._http = requests.Session()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.requests_sent = 0
+        self.coalesced = 0
         self._select_best_model()
         self._verify_connection()
     
     def _select_best_model(self):
         """Auto-select the best available model."""
         try:
-            response = requests.get(f"{self.config.base_url}/api/tags")
+            response = self._http.get(f"{self.config.base_url}/api/tags", timeout=self.config.timeout)
             models = response.json().get('models', [])
             self.available_models = [m['name'] for m in models]
             
@@ -117,11 +275,52 @@ class OllamaClient:
             logger.error(f"Failed to connect to Ollama: {e}")
             logger.info("Ensure Ollama is running and accessible")
     
+    def _build_payload(self, prompt: str, system_prompt: Optional[str],
+                       temperature: Optional[float], format: Optional[str],
+                       stream: bool = False) -> Dict[str, Any]:
+        payload = {
+            "model": self.config.model,
+            "prompt": prompt,
+            "temperature": temperature or self.config.temperature,
+            "stream": stream,
+            "options": {
+                "num_predict": self.config.max_tokens,
+            }
+        }
+        
+        if system_prompt:
+            payload["system"] = system_prompt
+            
+        if format:
+            payload["format"] = format
+        return payload
+    
+    def _parse_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "response": result.get("response", ""),
+            "model": result.get("model", self.config.model),
+            "total_duration": result.get("total_duration", 0),
+            "prompt_eval_count": result.get("prompt_eval_count", 0),
+            "eval_count": result.get("eval_count", 0),
+        }
+    
+    def _cached(self, key: str, use_cache: bool) -> Optional[Dict[str, Any]]:
+        if use_cache and self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return {**cached, "cached": True}
+        return None
+    
+    def _remember(self, key: str, result: Dict[str, Any], use_cache: bool):
+        if use_cache and self.cache is not None and not result.get("error"):
+            self.cache.put(key, result.get("model", self.config.model), result)
+    
     def generate(self, prompt: str, 
                  system_prompt: Optional[str] = None,
                  temperature: Optional[float] = None,
                  format: Optional[str] = None,
-                 retry_on_error: bool = True) -> Dict[str, Any]:
+                 retry_on_error: bool = True,
+                 use_cache: bool = True) -> Dict[str, Any]:
         """
         Generate a response from Ollama.
         
@@ -130,33 +329,25 @@ class OllamaClient:
             system_prompt: Optional system prompt
             temperature: Override default temperature
             format: Response format (e.g., 'json')
+            use_cache: Serve and store the response in the response cache
             
         Returns:
             Dict with response and metadata
         """
         url = f"{self.config.base_url}/api/generate"
-        
-        payload = {
-            "model": self.config.model,
-            "prompt": prompt,
-            "temperature": temperature or self.config.temperature,
-            "options": {
-                "num_predict": self.config.max_tokens,
-            }
-        }
-        
-        if system_prompt:
-            payload["system"] = system_prompt
-            
-        if format:
-            payload["format"] = format
+        payload = self._build_payload(prompt, system_prompt, temperature, format)
+        key = request_cache_key(payload)
+        cached = self._cached(key, use_cache)
+        if cached is not None:
+            return cached
         
         last_error = None
         attempts = self.config.retry_attempts if retry_on_error else 1
         
         for attempt in range(attempts):
             try:
-                response = requests.post(
+                self.requests_sent += 1
+                response = self._http.post(
                     url,
                     json=payload,
                     timeout=self.config.timeout,
@@ -164,15 +355,9 @@ class OllamaClient:
                 )
                 response.raise_for_status()
                 
-                result = response.json()
-                
-                return {
-                    "response": result.get("response", ""),
-                    "model": result.get("model", self.config.model),
-                    "total_duration": result.get("total_duration", 0),
-                    "prompt_eval_count": result.get("prompt_eval_count", 0),
-                    "eval_count": result.get("eval_count", 0),
-                }
+                result = self._parse_result(response.json())
+                self._remember(key, result, use_cache)
+                return result
                 
             except requests.exceptions.Timeout:
                 last_error = f"Timeout after {self.config.timeout}s"
@@ -188,6 +373,140 @@ class OllamaClient:
         logger.error(f"All Ollama attempts failed: {last_error}")
         return {"response": "", "error": last_error}
     
+    async def agenerate(self, prompt: str,
+                        system_prompt: Optional[str] = None,
+                        temperature: Optional[float] = None,
+                        format: Optional[str] = None,
+                        retry_on_error: bool = True,
+                        use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Generate a response from Ollama without blocking the event loop.
+        
+        Concurrent calls with the same request share one HTTP request.
+        Arguments and result are the same as generate().
+        """
+        payload = self._build_payload(prompt, system_prompt, temperature, format)
+        key = request_cache_key(payload)
+        cached = self._cached(key, use_cache)
+        if cached is not None:
+            return cached
+        
+        session = self._get_session()
+        task = self._inflight.get(key)
+        if task is None:
+            attempts = self.config.retry_attempts if retry_on_error else 1
+            task = asyncio.ensure_future(
+                self._apost(session, payload, attempts, key if use_cache else None)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        
+        # A cancelled caller must not cancel the request other callers share
+        result = await asyncio.shield(task)
+        return dict(result)
+    
+    async def astream(self, prompt: str,
+                      system_prompt: Optional[str] = None,
+                      temperature: Optional[float] = None,
+                      format: Optional[str] = None,
+                      use_cache: bool = True) -> AsyncIterator[str]:
+        """
+        Stream response tokens from Ollama as they are generated.
+        
+        A cached response is yielded as a single chunk; a completed stream
+        is added to the cache.
+        
+        Yields:
+            Response text chunks
+        """
+        payload = self._build_payload(prompt, system_prompt, temperature, format, stream=True)
+        key = request_cache_key(payload)
+        cached = self._cached(key, use_cache)
+        if cached is not None:
+            yield cached["response"]
+            return
+        
+        session = self._get_session()
+        self.requests_sent += 1
+        chunks = []
+        async with session.post(f"{self.config.base_url}/api/generate", json=payload) as response:
+            response.raise_for_status()
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    chunks.append(chunk["response"])
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    self._remember(key, self._parse_result({**chunk, "response": "".join(chunks)}), use_cache)
+                    break
+    
+    async def aclose(self):
+        """Close the async HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+    
+    def close(self):
+        """Close the blocking HTTP session and the response cache."""
+        self._http.close()
+        if self.cache is not None:
+            self.cache.close()
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get request, coalescing and response cache counters."""
+        return {
+            "requests_sent": self.requests_sent,
+            "coalesced": self.coalesced,
+            "cache": self.cache.stats() if self.cache is not None else None
+        }
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Pooled session for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.config.timeout),
+                connector=aiohttp.TCPConnector(
+                    limit=self.config.max_connections,
+                    ttl_dns_cache=300
+                )
+            )
+            self._session_loop = loop
+            self._inflight = {}
+        return self._session
+    
+    async def _apost(self, session: aiohttp.ClientSession, payload: Dict[str, Any],
+                     attempts: int, cache_key: Optional[str]) -> Dict[str, Any]:
+        last_error = None
+        for attempt in range(attempts):
+            try:
+                self.requests_sent += 1
+                async with session.post(f"{self.config.base_url}/api/generate", json=payload) as response:
+                    response.raise_for_status()
+                    result = self._parse_result(await response.json(content_type=None))
+                if cache_key:
+                    self._remember(cache_key, result, True)
+                return result
+                    
+            except asyncio.TimeoutError:
+                last_error = f"Timeout after {self.config.timeout}s"
+                logger.warning(f"Ollama request timed out (attempt {attempt + 1}/{attempts})")
+                
+            except Exception as e:
+                last_error = str(e)
+                logger.warning(f"Ollama generation failed (attempt {attempt + 1}/{attempts}): {e}")
+            
+            if attempt < attempts - 1:
+                await asyncio.sleep(self.config.retry_delay)
+        
+        logger.error(f"All Ollama attempts failed: {last_error}")
+        return {"response": "", "error": last_error}
+    
     def generate_route_optimization(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """
         Generate optimized route using Ollama for RL training.
@@ -198,57 +517,35 @@ class OllamaClient:
         Returns:
             Optimized route with reasoning
         """
-        system_prompt = """You are an expert at optimizing communication routes between modules.
-Your goal is to find the most efficient path considering latency, reliability, and schema compatibility.
-Always provide your reasoning before the route."""
-        
-        prompt = f"""Find the optimal communication route for this task:
-
-Source Module: {task.get('source')}
-Target Module: {task.get('target')}
-Constraints: {json.dumps(task.get('constraints', {}), indent=2)}
-
-Available context:
-{json.dumps(task.get('graph_context', {}), indent=2)}
-
-Think step by step:
-1. Analyze the requirements
-2. Consider available paths
-3. Evaluate trade-offs
-4. Choose the optimal route
-
-Respond with JSON in this format:
-{{
-    "reasoning": "your detailed reasoning",
-    "route": ["module1", "module2", ..., "target"],
-    "expected_latency_ms": <number>,
-    "expected_success_rate": <number between 0 and 1>
-}}"""
-        
+        prompt, system_prompt, temperature = _route_optimization_request(task)
         result = self.generate(
             prompt=prompt,
             system_prompt=system_prompt,
-            temperature=0.3,  # Lower temperature for more consistent routing
+            temperature=temperature,
             format="json"
         )
-        
+        return self._route_optimization_result(task, result)
+    
+    async def agenerate_route_optimization(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Async generate_route_optimization()."""
+        prompt, system_prompt, temperature = _route_optimization_request(task)
+        result = await self.agenerate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            format="json"
+        )
+        return self._route_optimization_result(task, result)
+    
+    def _route_optimization_result(self, task: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
         if result.get("error"):
             logger.warning(f"Route optimization failed: {result['error']}")
             return self._get_fallback_route(task)
             
         try:
-            # Try to parse JSON response
-            response_text = result.get("response", "")
-            if response_text:
-                # Clean up response if needed
-                response_text = response_text.strip()
-                # Find JSON in response
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    json_text = response_text[json_start:json_end]
-                    response_data = json.loads(json_text)
-                    return response_data
+            response_data = _extract_json(result)
+            if response_data is not None:
+                return response_data
             
             logger.warning("Empty or invalid JSON response")
             return self._get_fallback_route(task)
@@ -295,61 +592,42 @@ Respond with JSON in this format:
         Returns:
             Adaptation strategy with transformation code
         """
-        system_prompt = """You are an expert at data schema transformation.
-Your goal is to transform data from one schema to another while preserving as much information as possible."""
-        
-        prompt = f"""Create a schema transformation strategy:
-
-Source Schema:
-{json.dumps(source_schema, indent=2)}
-
-Target Schema:
-{json.dumps(target_schema, indent=2)}
-
-Sample Data:
-{json.dumps(sample_data, indent=2)}
-
-Provide a transformation strategy that:
-1. Maps fields appropriately
-2. Handles type conversions
-3. Preserves data integrity
-4. Minimizes information loss
-
-Respond with JSON:
-{{
-    "strategy": "description of transformation approach",
-    "field_mappings": {{
-        "source_field": "target_field",
-        ...
-    }},
-    "transformations": [
-        {{"field": "field_name", "operation": "description"}},
-        ...
-    ],
-    "data_preservation_rate": <number between 0 and 1>,
-    "complexity": <number 1-10>
-}}"""
-        
+        prompt, system_prompt, temperature = _schema_adaptation_request(
+            source_schema, target_schema, sample_data
+        )
         result = self.generate(
             prompt=prompt,
             system_prompt=system_prompt,
-            temperature=0.2,  # Very low temperature for consistent transformations
+            temperature=temperature,
             format="json"
         )
-        
+        return self._schema_adaptation_result(source_schema, target_schema, result)
+    
+    async def agenerate_schema_adaptation(self, source_schema: Dict,
+                                          target_schema: Dict,
+                                          sample_data: Any) -> Dict[str, Any]:
+        """Async generate_schema_adaptation()."""
+        prompt, system_prompt, temperature = _schema_adaptation_request(
+            source_schema, target_schema, sample_data
+        )
+        result = await self.agenerate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            format="json"
+        )
+        return self._schema_adaptation_result(source_schema, target_schema, result)
+    
+    def _schema_adaptation_result(self, source_schema: Dict, target_schema: Dict,
+                                  result: Dict[str, Any]) -> Dict[str, Any]:
         if result.get("error"):
             logger.warning(f"Schema adaptation failed: {result['error']}")
             return self._get_fallback_adaptation(source_schema, target_schema)
             
         try:
-            response_text = result.get("response", "")
-            if response_text:
-                # Extract JSON from response
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    json_text = response_text[json_start:json_end]
-                    return json.loads(json_text)
+            response_data = _extract_json(result)
+            if response_data is not None:
+                return response_data
             
             return self._get_fallback_adaptation(source_schema, target_schema)
             
@@ -389,56 +667,41 @@ Respond with JSON:
         Returns:
             Module selection with reasoning
         """
-        system_prompt = """You are an expert at selecting optimal modules for complex tasks.
-Consider module capabilities, load, and task requirements to make the best selection."""
-        
-        modules_info = "\n".join([
-            f"- {m['name']}: {m.get('capabilities', [])} (load: {m.get('current_load', 0)}%)"
-            for m in available_modules
-        ])
-        
-        prompt = f"""Select the optimal modules for this task:
-
-Task: {task_description}
-
-Available Modules:
-{modules_info}
-
-Consider:
-1. Module capabilities vs task requirements
-2. Current load and availability
-3. Potential for parallel processing
-4. Efficiency and resource usage
-
-Respond with JSON:
-{{
-    "reasoning": "detailed selection reasoning",
-    "selected_modules": ["module1", "module2", ...],
-    "execution_order": "sequential|parallel|mixed",
-    "expected_efficiency": <number 0-1>,
-    "alternative_modules": ["backup1", "backup2", ...]
-}}"""
-        
+        prompt, system_prompt, temperature = _module_selection_request(
+            task_description, available_modules
+        )
         result = self.generate(
             prompt=prompt,
             system_prompt=system_prompt,
-            temperature=0.4,
+            temperature=temperature,
             format="json"
         )
-        
+        return self._module_selection_result(task_description, available_modules, result)
+    
+    async def agenerate_module_selection(self, task_description: str,
+                                         available_modules: List[Dict]) -> Dict[str, Any]:
+        """Async generate_module_selection()."""
+        prompt, system_prompt, temperature = _module_selection_request(
+            task_description, available_modules
+        )
+        result = await self.agenerate(
+            prompt=prompt,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            format="json"
+        )
+        return self._module_selection_result(task_description, available_modules, result)
+    
+    def _module_selection_result(self, task_description: str, available_modules: List[Dict],
+                                 result: Dict[str, Any]) -> Dict[str, Any]:
         if result.get("error"):
             logger.warning(f"Module selection failed: {result['error']}")
             return self._get_fallback_selection(task_description, available_modules)
             
         try:
-            response_text = result.get("response", "")
-            if response_text:
-                # Extract JSON from response
-                json_start = response_text.find('{')
-                json_end = response_text.rfind('}') + 1
-                if json_start >= 0 and json_end > json_start:
-                    json_text = response_text[json_start:json_end]
-                    return json.loads(json_text)
+            response_data = _extract_json(result)
+            if response_data is not None:
+                return response_data
             
             return self._get_fallback_selection(task_description, available_modules)
             
@@ -0,0 +1,140 @@
+"""
+Micro-batching front end for RL module selection.
+Module: selector_service.py
+Description: Coalesces concurrent routing requests into batched selections
+
+Routing requests that arrive within a short window are grouped and sent
+through select_modules_with_rl together, so a burst of requests pays for
+one state-matrix extraction and agent pass instead of one per request.
+Batches run in the loop's default executor, so scoring never blocks the
+event loop.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Callable, Set, Tuple
+
+from loguru import logger
+
+from granger_hub.core.modules.communication_tracker import LatencyHistogram
+from granger_hub.rl.hub_decisions import select_modules_with_rl
+
+
+class BatchingModuleSelector:
+    """
+    Collects select() calls and resolves them in micro-batches.
+
+    A batch is flushed when max_batch_size requests are waiting or
+    max_wait_ms after the first request of the batch arrived, whichever
+    comes first. Requests are grouped by their available module list.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 2.0,
+        select_fn: Callable[..., List[str]] = select_modules_with_rl
+    ):
+        """
+        Initialize the selector.
+
+        Args:
+            max_batch_size: Requests that trigger an immediate flush
+            max_wait_ms: Longest a request waits for its batch to fill
+            select_fn: Batch selection function (tasks, modules, contexts)
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.select_fn = select_fn
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.batches = 0
+        self._pending: List[Tuple[Dict[str, Any], List[str], Optional[Dict[str, Any]], asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._batches: Set[asyncio.Task] = set()
+
+    async def select(
+        self,
+        task: Dict[str, Any],
+        available_modules: List[str],
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Select a module for a task, batched with concurrent requests.
+
+        Args:
+            task: Task description
+            available_modules: Modules that can handle the task
+            context: Additional context merged into the task
+
+        Returns:
+            Selected module name
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((task, available_modules, context, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000.0, self.flush)
+
+        return await future
+
+    def flush(self) -> None:
+        """Send all waiting requests to the agent now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        groups: Dict[Tuple[str, ...], list] = {}
+        for request in pending:
+            groups.setdefault(tuple(request[1]), []).append(request)
+
+        for modules, requests in groups.items():
+            self.batches += 1
+            batch = asyncio.get_running_loop().create_task(self._resolve(list(modules), requests))
+            # Keep a reference until the batch finishes
+            self._batches.add(batch)
+            batch.add_done_callback(self._batches.discard)
+
+    async def _resolve(self, modules: List[str], requests: list) -> None:
+        """Run one batch in the executor and resolve its futures."""
+        try:
+            selections = await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.select_fn,
+                [request[0] for request in requests],
+                modules,
+                [request[2] for request in requests]
+            )
+            if len(selections) != len(requests):
+                raise RuntimeError(
+                    f"Selector returned {len(selections)} modules for {len(requests)} requests"
+                )
+        except Exception as e:
+            logger.error(f"Batched module selection failed: {e}")
+            for request in requests:
+                if not request[3].done():
+                    request[3].set_exception(e)
+            return
+
+        now = time.perf_counter()
+        for request, module in zip(requests, selections):
+            self.requests += 1
+            self.latency.record((now - request[4]) * 1000)
+            if not request[3].done():
+                request[3].set_result(module)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching and decision latency statistics."""
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "avg_batch_size": self.requests / self.batches if self.batches else 0.0,
+            "pending": len(self._pending),
+            "latency": self.latency.to_dict()
+        }
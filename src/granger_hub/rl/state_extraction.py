@@ -9,8 +9,12 @@ that RL agents can use for decision making.
 No classes, pure functions following CLAUDE.md standards.
 """
 
+import re
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+
 import numpy as np
-from typing import Dict, Any, List, Optional
+import pandas as pd
 from loguru import logger
 
 
@@ -41,6 +45,62 @@ TASK_TYPES = {
     "unknown": 9
 }
 
+# Base resource estimates per module: CPU, Memory, Network, Storage, Time, Cost
+MODULE_RESOURCES = {
+    "arxiv-mcp-server": [0.2, 0.3, 0.8, 0.1, 0.6, 0.1],
+    "marker": [0.8, 0.6, 0.1, 0.3, 0.4, 0.2],
+    "arangodb": [0.3, 0.5, 0.2, 0.8, 0.2, 0.3],
+    "sparta": [0.4, 0.4, 0.6, 0.4, 0.5, 0.2],
+    "youtube_transcripts": [0.2, 0.3, 0.9, 0.2, 0.7, 0.1],
+    "claude_max_proxy": [0.5, 0.4, 0.7, 0.1, 0.8, 0.5],
+    "mcp-screenshot": [0.6, 0.5, 0.1, 0.4, 0.3, 0.1],
+    "unsloth": [0.9, 0.8, 0.2, 0.5, 0.9, 0.4],
+    "test-reporter": [0.3, 0.3, 0.1, 0.3, 0.2, 0.1]
+}
+
+PRIORITY_LEVELS = {"low": 0.2, "medium": 0.5, "high": 0.8, "critical": 1.0}
+
+ERROR_TYPES = {
+    "timeout": 0,
+    "connection": 1,
+    "validation": 2,
+    "resource": 3,
+    "unknown": 4
+}
+
+# Description keyword features of the task state, in state order
+TASK_KEYWORD_FEATURES = [
+    ("complex", "advanced"),
+    ("multi", "multiple"),
+    ("security", "cyber"),
+    ("research", "paper")
+]
+
+# Failed-module name keywords of the error state, in state order
+ERROR_MODULE_FEATURES = [
+    ("arxiv", "youtube"),  # External service
+    ("llm", "claude"),  # LLM service
+    ("db", "arango"),  # Database
+    ("marker", "screenshot")  # Processing service
+]
+
+TASK_STATE_DIM = 20
+PIPELINE_STATE_DIM = 30
+ERROR_STATE_DIM = 15
+
+# Below this many rows the fixed cost of building a DataFrame outweighs the
+# column-wise work, so the batch extractors stack per-row states instead
+SMALL_BATCH_ROWS = 256
+
+
+def _keyword_matcher(keywords: Sequence[str]) -> re.Pattern:
+    """Compile an alternation matching any of the keywords as substrings."""
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+
+_TASK_KEYWORD_MATCHERS = [_keyword_matcher(keywords) for keywords in TASK_KEYWORD_FEATURES]
+_ERROR_MODULE_MATCHERS = [_keyword_matcher(keywords) for keywords in ERROR_MODULE_FEATURES]
+
 
 def extract_task_state(task: Dict[str, Any]) -> np.ndarray:
     """
@@ -85,20 +145,22 @@ def extract_task_state(task: Dict[str, Any]) -> np.ndarray:
     state.append(1.0 if data_size > 100 else 0.0)  # Very large data flag
     
     # Priority and urgency (2 dims)
-    priority_map = {"low": 0.2, "medium": 0.5, "high": 0.8, "critical": 1.0}
     priority = task.get("priority", "medium").lower()
-    state.append(priority_map.get(priority, 0.5))
+    state.append(PRIORITY_LEVELS.get(priority, 0.5))
     state.append(1.0 if task.get("real_time", False) else 0.0)
     
     # Complexity indicators (3 dims)
     description = task.get("description", "").lower()
-    state.append(1.0 if "complex" in description or "advanced" in description else 0.0)
-    state.append(1.0 if "multi" in description or "multiple" in description else 0.0)
+    complex_flag, multi_flag, security_flag, research_flag = (
+        1.0 if matcher.search(description) else 0.0 for matcher in _TASK_KEYWORD_MATCHERS
+    )
+    state.append(complex_flag)
+    state.append(multi_flag)
     state.append(min(1.0, len(task.get("requirements", [])) / 10.0))
     
     # Domain indicators (2 dims)
-    state.append(1.0 if "security" in description or "cyber" in description else 0.0)
-    state.append(1.0 if "research" in description or "paper" in description else 0.0)
+    state.append(security_flag)
+    state.append(research_flag)
     
     return np.array(state, dtype=np.float32)
 
@@ -128,23 +190,9 @@ def extract_pipeline_state(
     state = []
     constraints = constraints or {}
     
-    # Pipeline structure (5 dims)
-    state.append(len(modules) / 10.0)  # Normalized module count
-    state.append(1.0 if len(modules) > 3 else 0.0)  # Complex pipeline
-    state.append(1.0 if len(modules) > 5 else 0.0)  # Very complex
-    state.append(len(set(modules)) / len(modules) if modules else 1.0)  # Uniqueness
-    state.append(1.0 if len(modules) != len(set(modules)) else 0.0)  # Has duplicates
-    
-    # Module capabilities aggregate (9 dims)
-    capability_matrix = np.zeros(9)
-    for module in modules:
-        if module in MODULE_CAPABILITIES:
-            capability_matrix += np.array(MODULE_CAPABILITIES[module])
-    
-    # Normalize by module count
-    if modules:
-        capability_matrix = np.clip(capability_matrix / len(modules), 0, 1)
-    state.extend(capability_matrix.tolist())
+    # Pipeline structure (5 dims) and module capabilities aggregate (9 dims)
+    profile = _pipeline_profile(tuple(modules))
+    state.extend(profile[:14].tolist())
     
     # Task features (5 dims) - subset of task state
     task_state = extract_task_state(task)
@@ -187,39 +235,24 @@ def extract_error_state(
     state = []
     
     # Error type encoding (5 dims)
-    error_types = {
-        "timeout": 0,
-        "connection": 1,
-        "validation": 2,
-        "resource": 3,
-        "unknown": 4
-    }
-    
     error_str = str(error).lower()
-    error_vector = [0.0] * len(error_types)
+    error_vector = [0.0] * len(ERROR_TYPES)
     
     # Match error type
-    for error_type, idx in error_types.items():
+    for error_type, idx in ERROR_TYPES.items():
         if error_type in error_str or error_type in type(error).__name__.lower():
             error_vector[idx] = 1.0
             break
     else:
-        error_vector[error_types["unknown"]] = 1.0
+        error_vector[ERROR_TYPES["unknown"]] = 1.0
     
     state.extend(error_vector)
     
     # Module characteristics (5 dims)
     failed_module = context.get("module", "").lower()
-    module_vector = [0.0] * 5
-    
-    if "arxiv" in failed_module or "youtube" in failed_module:
-        module_vector[0] = 1.0  # External service
-    if "llm" in failed_module or "claude" in failed_module:
-        module_vector[1] = 1.0  # LLM service
-    if "db" in failed_module or "arango" in failed_module:
-        module_vector[2] = 1.0  # Database
-    if "marker" in failed_module or "screenshot" in failed_module:
-        module_vector[3] = 1.0  # Processing service
+    module_vector = [1.0 if matcher.search(failed_module) else 0.0 for matcher in _ERROR_MODULE_MATCHERS]
+    module_vector.append(0.0)
+    
     if not any(module_vector):
         module_vector[4] = 1.0  # Unknown
         
@@ -290,26 +323,8 @@ def estimate_pipeline_resources(
     
     Returns 6 values: CPU, Memory, Network, Storage, Time, Cost (all 0-1)
     """
-    # Base estimates per module
-    module_resources = {
-        "arxiv-mcp-server": [0.2, 0.3, 0.8, 0.1, 0.6, 0.1],
-        "marker": [0.8, 0.6, 0.1, 0.3, 0.4, 0.2],
-        "arangodb": [0.3, 0.5, 0.2, 0.8, 0.2, 0.3],
-        "sparta": [0.4, 0.4, 0.6, 0.4, 0.5, 0.2],
-        "youtube_transcripts": [0.2, 0.3, 0.9, 0.2, 0.7, 0.1],
-        "claude_max_proxy": [0.5, 0.4, 0.7, 0.1, 0.8, 0.5],
-        "mcp-screenshot": [0.6, 0.5, 0.1, 0.4, 0.3, 0.1],
-        "unsloth": [0.9, 0.8, 0.2, 0.5, 0.9, 0.4],
-        "test-reporter": [0.3, 0.3, 0.1, 0.3, 0.2, 0.1]
-    }
-    
-    resources = [0.0] * 6
-    
-    # Aggregate resources
-    for module in modules:
-        if module in module_resources:
-            for i, val in enumerate(module_resources[module]):
-                resources[i] = min(1.0, resources[i] + val)
+    # Aggregate resources (saturating at 1.0)
+    resources = _pipeline_profile(tuple(modules))[14:].tolist()
     
     # Scale by task complexity
     complexity_factor = 1.0 + (task.get("complexity", 0.5) - 0.5)
@@ -318,6 +333,264 @@ def estimate_pipeline_resources(
     return resources
 
 
+@lru_cache(maxsize=4096)
+def _pipeline_profile(modules: Tuple[str, ...]) -> np.ndarray:
+    """
+    Task-independent pipeline features, cached per module sequence.
+    
+    Returns 20 values: structure (5), capability aggregate (9) and
+    saturated base resources (6) before task complexity scaling.
+    """
+    count = len(modules)
+    unique = len(set(modules))
+    structure = [
+        count / 10.0,  # Normalized module count
+        1.0 if count > 3 else 0.0,  # Complex pipeline
+        1.0 if count > 5 else 0.0,  # Very complex
+        unique / count if modules else 1.0,  # Uniqueness
+        1.0 if count != unique else 0.0  # Has duplicates
+    ]
+    
+    capabilities = np.zeros(9)
+    resources = np.zeros(6)
+    for module in modules:
+        if module in MODULE_CAPABILITIES:
+            capabilities += np.array(MODULE_CAPABILITIES[module])
+        if module in MODULE_RESOURCES:
+            resources = np.minimum(1.0, resources + np.array(MODULE_RESOURCES[module]))
+    if modules:
+        capabilities = np.clip(capabilities / count, 0, 1)
+    
+    profile = np.concatenate([structure, capabilities, resources])
+    profile.setflags(write=False)
+    return profile
+
+
+def clear_module_cache() -> None:
+    """Drop cached pipeline features after MODULE_CAPABILITIES/MODULE_RESOURCES change."""
+    _pipeline_profile.cache_clear()
+
+
+def _as_frame(records: Union[pd.DataFrame, Sequence[Dict[str, Any]]]) -> pd.DataFrame:
+    if isinstance(records, pd.DataFrame):
+        return records
+    return pd.DataFrame.from_records(list(records))
+
+
+def _column(frame: pd.DataFrame, name: str, default: Any) -> pd.Series:
+    """Column with missing values filled, or a constant column if absent."""
+    if name not in frame:
+        return pd.Series([default] * len(frame), index=frame.index, dtype=object)
+    return frame[name].where(frame[name].notna(), default)
+
+
+def _text_codes(values: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    """
+    Factorize strings so matching runs once per distinct lowercase value.
+    
+    Task types, priorities, module names and descriptions repeat heavily in
+    replay data, so this turns N regex searches into one per unique string.
+    """
+    codes, uniques = pd.factorize(values.astype(str), use_na_sentinel=False)
+    return codes, [value.lower() for value in uniques]
+
+
+def _text_column(frame: pd.DataFrame, name: str, default: str) -> Tuple[np.ndarray, List[str]]:
+    return _text_codes(_column(frame, name, default))
+
+
+def _first_match(
+    texts: Sequence[Tuple[np.ndarray, List[str]]],
+    keys: Sequence[str],
+    fallback: int
+) -> np.ndarray:
+    """One-hot of the first key contained in any of the texts, else fallback."""
+    hits = np.zeros((len(texts[0][0]), len(keys)), dtype=bool)
+    for codes, uniques in texts:
+        unique_hits = np.array([[key in text for key in keys] for text in uniques], dtype=bool)
+        hits |= unique_hits.reshape(-1, len(keys))[codes]
+    first = np.where(hits.any(axis=1), hits.argmax(axis=1), fallback)
+    one_hot = np.zeros((len(first), len(keys)), dtype=np.float32)
+    one_hot[np.arange(len(first)), first] = 1.0
+    return one_hot
+
+
+def _flags(texts: Tuple[np.ndarray, List[str]], matchers: Sequence[re.Pattern]) -> np.ndarray:
+    """Match each precompiled keyword pattern against every text."""
+    codes, uniques = texts
+    unique_flags = np.array(
+        [[matcher.search(text) is not None for matcher in matchers] for text in uniques],
+        dtype=np.float32
+    )
+    return unique_flags.reshape(-1, len(matchers))[codes]
+
+
+def _numeric(frame: pd.DataFrame, name: str, default: float) -> np.ndarray:
+    return pd.to_numeric(_column(frame, name, default)).to_numpy(dtype=np.float64)
+
+
+def _truthy(frame: pd.DataFrame, name: str, default: bool) -> np.ndarray:
+    return _column(frame, name, default).astype(bool).to_numpy(dtype=np.float32)
+
+
+def extract_task_states(tasks: Union[pd.DataFrame, Sequence[Dict[str, Any]]]) -> np.ndarray:
+    """
+    Extract task states for many tasks at once.
+    
+    Produces the same features as extract_task_state using column-wise
+    string and NumPy operations instead of a Python loop per task.
+    
+    Args:
+        tasks: List of task dictionaries or a DataFrame with task columns
+        
+    Returns:
+        (N, 20) float32 array of task states
+    """
+    if not isinstance(tasks, pd.DataFrame) and 0 < len(tasks) < SMALL_BATCH_ROWS:
+        return np.stack([extract_task_state(task) for task in tasks])
+    
+    frame = _as_frame(tasks)
+    states = np.zeros((len(frame), TASK_STATE_DIM), dtype=np.float32)
+    if frame.empty:
+        return states
+    
+    # Task type encoding (10 dims)
+    task_types = _text_column(frame, "type", "unknown")
+    states[:, 0:10] = _first_match([task_types], list(TASK_TYPES), TASK_TYPES["unknown"])
+    
+    # Data size features (3 dims)
+    data_size = _numeric(frame, "data_size_mb", 1.0)
+    states[:, 10] = np.log1p(data_size) / 10.0
+    states[:, 11] = data_size > 10
+    states[:, 12] = data_size > 100
+    
+    # Priority and urgency (2 dims)
+    priority_codes, priorities = _text_column(frame, "priority", "medium")
+    priority_levels = np.array([PRIORITY_LEVELS.get(p, 0.5) for p in priorities], dtype=np.float32)
+    states[:, 13] = priority_levels[priority_codes]
+    states[:, 14] = _truthy(frame, "real_time", False)
+    
+    # Complexity and domain indicators (5 dims)
+    description = _text_column(frame, "description", "")
+    keyword_flags = _flags(description, _TASK_KEYWORD_MATCHERS)
+    states[:, 15:17] = keyword_flags[:, 0:2]
+    if "requirements" in frame:
+        requirement_counts = np.fromiter(
+            (len(r) if hasattr(r, "__len__") else 0 for r in frame["requirements"]),
+            dtype=np.float64, count=len(frame)
+        )
+        states[:, 17] = np.minimum(1.0, requirement_counts / 10.0)
+    states[:, 18:20] = keyword_flags[:, 2:4]
+    
+    return states
+
+
+def extract_pipeline_states(
+    pipelines: Sequence[Sequence[str]],
+    tasks: Union[pd.DataFrame, Sequence[Dict[str, Any]]],
+    constraints: Optional[Union[pd.DataFrame, Sequence[Optional[Dict[str, Any]]]]] = None
+) -> np.ndarray:
+    """
+    Extract pipeline states for many pipelines at once.
+    
+    Pipeline structure, capability and resource features are looked up per
+    distinct module sequence from a cache, so repeated pipelines cost one
+    dictionary lookup each.
+    
+    Args:
+        pipelines: Module name lists, one per row
+        tasks: Task dictionaries (or DataFrame) aligned with pipelines
+        constraints: Optional constraint dictionaries (or DataFrame) per row
+        
+    Returns:
+        (N, 30) float32 array of pipeline states
+    """
+    count = len(pipelines)
+    if 0 < count < SMALL_BATCH_ROWS and not isinstance(tasks, pd.DataFrame) \
+            and not isinstance(constraints, pd.DataFrame):
+        constraints = constraints or [None] * count
+        return np.stack([
+            extract_pipeline_state(list(modules), task, constraint)
+            for modules, task, constraint in zip(pipelines, tasks, constraints)
+        ])
+    
+    states = np.zeros((count, PIPELINE_STATE_DIM), dtype=np.float32)
+    if count == 0:
+        return states
+    
+    # Pipeline structure, capabilities and base resources per distinct pipeline
+    profiles = np.stack([_pipeline_profile(tuple(modules)) for modules in pipelines])
+    states[:, 0:14] = profiles[:, :14]
+    
+    # Task features (5 dims)
+    task_frame = _as_frame(tasks)
+    states[:, 14:19] = extract_task_states(task_frame)[:, :5]
+    
+    # Constraints (5 dims)
+    if constraints is None:
+        constraint_frame = pd.DataFrame(index=range(count))
+    elif isinstance(constraints, pd.DataFrame):
+        constraint_frame = constraints
+    else:
+        constraint_frame = _as_frame([c or {} for c in constraints])
+        constraint_frame.index = range(count)
+    states[:, 19] = _numeric(constraint_frame, "max_time_seconds", 300) / 300.0
+    states[:, 20] = _truthy(constraint_frame, "parallel_allowed", True)
+    states[:, 21] = _numeric(constraint_frame, "max_memory_mb", 1000) / 1000.0
+    states[:, 22] = _truthy(constraint_frame, "streaming_required", False)
+    states[:, 23] = np.minimum(1.0, _numeric(constraint_frame, "max_cost", 1.0))
+    
+    # Resource estimates (6 dims) scaled by task complexity
+    complexity_factor = 1.0 + (_numeric(task_frame, "complexity", 0.5) - 0.5)
+    states[:, 24:30] = np.minimum(1.0, profiles[:, 14:] * complexity_factor[:, None])
+    
+    return states
+
+
+def extract_error_states(
+    errors: Sequence[Exception],
+    contexts: Union[pd.DataFrame, Sequence[Dict[str, Any]]]
+) -> np.ndarray:
+    """
+    Extract error states for many errors at once.
+    
+    Args:
+        errors: Exceptions, one per row
+        contexts: Error context dictionaries (or DataFrame) aligned with errors
+        
+    Returns:
+        (N, 15) float32 array of error states
+    """
+    count = len(errors)
+    if 0 < count < SMALL_BATCH_ROWS and not isinstance(contexts, pd.DataFrame):
+        return np.stack([extract_error_state(error, context) for error, context in zip(errors, contexts)])
+    
+    states = np.zeros((count, ERROR_STATE_DIM), dtype=np.float32)
+    if count == 0:
+        return states
+    frame = _as_frame(contexts)
+    frame.index = range(count)
+    
+    # Error type encoding (5 dims)
+    messages = _text_codes(pd.Series([str(error) for error in errors]))
+    type_names = _text_codes(pd.Series([type(error).__name__ for error in errors]))
+    states[:, 0:5] = _first_match([messages, type_names], list(ERROR_TYPES), ERROR_TYPES["unknown"])
+    
+    # Module characteristics (5 dims)
+    module_flags = _flags(_text_column(frame, "module", ""), _ERROR_MODULE_MATCHERS)
+    states[:, 5:9] = module_flags
+    states[:, 9] = ~module_flags.any(axis=1)
+    
+    # Context features (5 dims)
+    states[:, 10] = np.minimum(1.0, _numeric(frame, "retry_count", 0) / 5.0)
+    states[:, 11] = np.minimum(1.0, _numeric(frame, "time_elapsed", 0) / 300.0)
+    states[:, 12] = _truthy(frame, "critical_path", False)
+    states[:, 13] = np.minimum(1.0, _numeric(frame, "queue_depth", 0) / 10.0)
+    states[:, 14] = _truthy(frame, "partial_success", False)
+    
+    return states
+
+
 # Validation and testing
 if __name__ == "__main__":
     logger.info("Testing state extraction functions")
@@ -0,0 +1,342 @@
+"""
+Background training loop for hub RL agents.
+Module: training_worker.py
+Description: Off-request-path agent updates with versioned policy snapshots
+
+The worker owns private copies of the hub agents. Decision outcomes are
+queued by record_decision_outcomes and applied to those copies on a
+background thread, DQN-style agents get train(batch_size) steps on a fixed
+schedule, and every publish_interval a deep copy of the trained agents is
+swapped into the serving side (and optionally checkpointed to disk).
+Routing only ever reads the published snapshot, so inference never waits
+on training. If the serving agents were replaced by someone else since
+the worker copied them (initialize_rl_agents with reset=True or new
+modules), the worker does not publish; it re-copies the serving agents,
+replays the outcomes applied since its last publish onto the copies and
+trains those from then on, so no resolved outcome is lost.
+
+start_training_worker starts a worker that checkpoints to the default
+checkpoint path, which the hub agents warm start from after a restart.
+"""
+
+import copy
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from loguru import logger
+
+from granger_hub.rl import hub_decisions
+from granger_hub.rl.checkpoints import default_checkpoint_path, save_agents_checkpoint
+
+
+@dataclass
+class PolicySnapshot:
+    """A published set of serving agents."""
+    version: int
+    published_at: float
+    events_applied: int
+    agents: Dict[str, Any] = field(repr=False)
+
+
+class TrainingWorker:
+    """
+    Thread that consumes outcome events and trains the hub agents.
+
+    Events are dropped (and counted) rather than blocking the caller when
+    the queue is full.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 32,
+        train_interval: float = 1.0,
+        train_steps_per_interval: int = 1,
+        publish_interval: float = 5.0,
+        max_queue_size: int = 10000,
+        max_events_per_cycle: int = 1000,
+        checkpoint_path: Optional[Path] = None,
+        checkpoint_interval: float = 300.0
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            batch_size: Batch size passed to agent.train()
+            train_interval: Seconds between scheduled training steps
+            train_steps_per_interval: train() calls per agent per interval
+            publish_interval: Seconds between policy snapshot swaps
+            max_queue_size: Outcome events buffered before dropping
+            max_events_per_cycle: Events applied before checking the schedule
+            checkpoint_path: Write published snapshots here (disabled when None)
+            checkpoint_interval: Minimum seconds between checkpoints
+        """
+        self.batch_size = batch_size
+        self.train_interval = train_interval
+        self.train_steps_per_interval = train_steps_per_interval
+        self.publish_interval = publish_interval
+        self.max_events_per_cycle = max_events_per_cycle
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else None
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints_written = 0
+        self._last_checkpoint = 0.0
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._agents: Dict[str, Any] = {}
+        self._agents_lock = threading.Lock()
+        # Serving agents version the private copies were taken from
+        self._agents_version = 0
+        self._snapshot: Optional[PolicySnapshot] = None
+        self.resyncs = 0
+        # Outcome events applied since the last successful publish
+        self._unpublished: list = []
+
+        self.events_received = 0
+        self.events_dropped = 0
+        self.events_applied = 0
+        self.train_steps = 0
+        self.last_losses: Dict[str, float] = {}
+        self._events_at_publish = 0
+        self._started_at = 0.0
+        self._last_train = 0.0
+
+    @property
+    def running(self) -> bool:
+        """Whether the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def snapshot(self) -> Optional[PolicySnapshot]:
+        """The most recently published snapshot."""
+        return self._snapshot
+
+    def start(self) -> "TrainingWorker":
+        """Copy the serving agents, start the thread and attach to the hub."""
+        if self.running:
+            return self
+        self._copy_serving_agents()
+        self._stop.clear()
+        self._started_at = self._last_train = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="rl-training-worker", daemon=True)
+        self._thread.start()
+        hub_decisions.attach_training_worker(self)
+        return self
+
+    def stop(self, publish: bool = True) -> None:
+        """
+        Detach from the hub, drain queued events and stop the thread.
+
+        Args:
+            publish: Train once more on the drained events and publish
+                the final agents before stopping
+        """
+        hub_decisions.attach_training_worker(None)
+        self._stop.set()
+        try:
+            # Wake the thread if it is waiting for events
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._apply_pending()
+        if publish and self.events_applied > self._events_at_publish:
+            self._train_step()
+            resyncs = self.resyncs
+            self.publish(checkpoint=True)
+            if self.resyncs > resyncs and self._unpublished:
+                # Publish the outcomes replayed onto the replaced agents
+                self._train_step()
+                self.publish(checkpoint=True)
+
+    def submit(
+        self,
+        decision: Dict[str, Any],
+        outcome: Dict[str, Any],
+        reward: Optional[float] = None
+    ) -> bool:
+        """
+        Queue a decision outcome for training.
+
+        Returns:
+            False if the queue was full and the event was dropped
+        """
+        self.events_received += 1
+        try:
+            self._queue.put_nowait((decision, outcome, reward))
+            return True
+        except queue.Full:
+            self.events_dropped += 1
+            return False
+
+    def publish(self, checkpoint: bool = False) -> Optional[PolicySnapshot]:
+        """
+        Copy the training agents and swap them into the serving side.
+
+        Nothing is published if the serving agents changed since they were
+        copied; the worker re-copies them, replays the unpublished outcomes
+        onto the copies and returns the previous snapshot.
+
+        Args:
+            checkpoint: Write the snapshot to checkpoint_path even if
+                checkpoint_interval has not elapsed
+        """
+        with self._agents_lock:
+            agents = {name: copy.deepcopy(agent) for name, agent in self._agents.items()}
+            events_applied = self.events_applied
+            agents_version = self._agents_version
+            included = len(self._unpublished)
+        published = hub_decisions.publish_rl_agents(agents, expected_version=agents_version)
+        if published is None:
+            logger.info("Serving RL agents were replaced; replaying outcomes onto fresh copies")
+            self._resync()
+            return self._snapshot
+        with self._agents_lock:
+            self._agents_version = published
+            del self._unpublished[:included]
+
+        version = self._snapshot.version + 1 if self._snapshot else 1
+        self._snapshot = PolicySnapshot(
+            version=version,
+            published_at=time.time(),
+            events_applied=events_applied,
+            agents=agents
+        )
+        self._events_at_publish = events_applied
+        logger.debug(f"Published RL policy snapshot v{version} after {events_applied} events")
+
+        now = time.monotonic()
+        if self.checkpoint_path and (checkpoint or now - self._last_checkpoint >= self.checkpoint_interval):
+            save_agents_checkpoint(agents, hub_decisions.get_module_index(), self.checkpoint_path)
+            self.checkpoints_written += 1
+            self._last_checkpoint = now
+        return self._snapshot
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get throughput and staleness metrics."""
+        uptime = time.monotonic() - self._started_at if self._started_at else 0.0
+        snapshot = self._snapshot
+        return {
+            'running': self.running,
+            'queue_depth': self._queue.qsize(),
+            'events_received': self.events_received,
+            'events_applied': self.events_applied,
+            'events_dropped': self.events_dropped,
+            'events_per_second': self.events_applied / uptime if uptime else 0.0,
+            'train_steps': self.train_steps,
+            'last_losses': dict(self.last_losses),
+            'policy_version': snapshot.version if snapshot else 0,
+            'snapshot_age_seconds': time.time() - snapshot.published_at if snapshot else None,
+            'events_since_snapshot': self.events_applied - self._events_at_publish,
+            'checkpoints_written': self.checkpoints_written,
+            'resyncs': self.resyncs
+        }
+
+    def _copy_serving_agents(self) -> None:
+        """Replace the training agents with copies of the serving agents."""
+        # Version first: the copies are then at least as new as the version
+        version = hub_decisions.get_rl_agents_version()
+        agents = {
+            name: copy.deepcopy(agent)
+            for name, agent in hub_decisions.get_rl_agents().items()
+            if agent is not None
+        }
+        with self._agents_lock:
+            self._agents = agents
+            self._agents_version = version
+            self._events_at_publish = self.events_applied
+
+    def _resync(self) -> None:
+        """Re-copy the serving agents and replay unpublished outcomes onto them."""
+        self._copy_serving_agents()
+        with self._agents_lock:
+            replayed = []
+            for decision, outcome, reward in self._unpublished:
+                try:
+                    hub_decisions._apply_decision_outcome(decision, outcome, reward, agents=self._agents)
+                    replayed.append((decision, outcome, reward))
+                except Exception as e:
+                    logger.error(f"Failed to replay outcome for {decision.get('decision_id')}: {e}")
+            self._unpublished = replayed
+            # Replayed outcomes still need publishing
+            self._events_at_publish = self.events_applied - len(replayed)
+        self.resyncs += 1
+
+    def _run(self) -> None:
+        last_publish = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                self._apply_pending(block=True)
+                now = time.monotonic()
+                if now - self._last_train >= self.train_interval:
+                    self._train_step()
+                    self._last_train = now
+                if (now - last_publish >= self.publish_interval
+                        and self.events_applied > self._events_at_publish):
+                    self.publish()
+                    last_publish = now
+            except Exception as e:
+                logger.error(f"RL training worker cycle failed: {e}")
+
+    def _apply_pending(self, block: bool = False) -> None:
+        """Apply queued outcome events to the training agents."""
+        rewards = {}
+        timeout = min(self.train_interval, self.publish_interval) if block else None
+        for _ in range(self.max_events_per_cycle):
+            try:
+                if block and not rewards:
+                    event = self._queue.get(timeout=timeout)
+                else:
+                    event = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if event is None:  # Stop sentinel
+                continue
+            decision, outcome, reward = event
+            try:
+                with self._agents_lock:
+                    rewards[decision['decision_id']] = hub_decisions._apply_decision_outcome(
+                        decision, outcome, reward, agents=self._agents
+                    )
+                    self._unpublished.append(event)
+                    self.events_applied += 1
+            except Exception as e:
+                logger.error(f"Failed to apply outcome for {decision.get('decision_id')}: {e}")
+                hub_decisions.get_decision_journal().release([decision.get('decision_id')])
+
+        if rewards:
+            hub_decisions.get_decision_journal().resolve(rewards)
+
+    def _train_step(self) -> None:
+        """Run scheduled training steps on agents that support them."""
+        with self._agents_lock:
+            for name, agent in self._agents.items():
+                if hasattr(agent, 'train') and hasattr(agent, 'can_train'):
+                    for _ in range(self.train_steps_per_interval):
+                        if not agent.can_train():
+                            break
+                        loss = agent.train(self.batch_size)
+                        self.train_steps += 1
+                        if loss is not None:
+                            self.last_losses[name] = float(loss)
+
+
+def start_training_worker(**kwargs) -> TrainingWorker:
+    """
+    Start a training worker that checkpoints to the default checkpoint path.
+
+    Args:
+        **kwargs: TrainingWorker arguments; checkpoint_path defaults to
+            default_checkpoint_path() (None when checkpoints are disabled)
+
+    Returns:
+        The running worker
+    """
+    kwargs.setdefault('checkpoint_path', default_checkpoint_path())
+    return TrainingWorker(**kwargs).start()
@@ -0,0 +1,100 @@
+"""
+Tests for tiered conversation storage (memory LRU -> SQLite -> archive).
+
+Uses real SQLite databases and archive files in a temporary directory.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import sqlite3
+
+import pytest
+from granger_hub.core.conversation.conversation_archive import ConversationArchive
+from granger_hub.core.conversation.conversation_manager import ConversationManager
+from granger_hub.core.conversation.conversation_message import ConversationMessage
+from granger_hub.core.modules.module_registry import ModuleRegistry
+
+
+async def _run_conversation(manager: ConversationManager, turns: int) -> str:
+    conversation = await manager.create_conversation("producer", "consumer", {"start": True})
+    for turn in range(1, turns + 1):
+        message = ConversationMessage.create(
+            source="producer",
+            target="consumer",
+            msg_type="data",
+            content={"turn": turn},
+            conversation_id=conversation.conversation_id,
+            turn_number=turn
+        )
+        await manager.route_message(message)
+    return conversation.conversation_id
+
+
+def test_archive_roundtrip(tmp_path):
+    """Archived records are read back through the manifest after reopening."""
+    archive = ConversationArchive(tmp_path / "archive", compression="gzip")
+    archive.write([
+        {"conversation": {"conversation_id": f"c{i}", "participants": ["a", "b"]},
+         "messages": [{"message_id": f"m{i}", "content": {"i": i}}]}
+        for i in range(3)
+    ])
+
+    reopened = ConversationArchive(tmp_path / "archive", compression="gzip")
+    assert reopened.contains("c1")
+    assert reopened.read("c2")["messages"][0]["content"] == {"i": 2}
+    assert reopened.read("missing") is None
+    assert reopened.stats()["conversations"] == 3
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_reads_through_sqlite(tmp_path):
+    """Evicted histories are reloaded from SQLite."""
+    manager = ConversationManager(ModuleRegistry(str(tmp_path / "registry.json")),
+                                  db_path=tmp_path / "conv.db",
+                                  max_cached_conversations=2)
+    first = await _run_conversation(manager, 3)
+    await _run_conversation(manager, 1)
+    await _run_conversation(manager, 1)
+
+    assert first not in manager.message_history
+    assert len(manager.message_history) == 2
+    messages = await manager.get_conversation_messages(first)
+    assert [m.content["turn"] for m in messages] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_completed_conversations_move_to_archive(tmp_path):
+    """Archived conversations leave SQLite but stay readable."""
+    db_path = tmp_path / "conv.db"
+    manager = ConversationManager(ModuleRegistry(str(tmp_path / "registry.json")),
+                                  db_path=db_path,
+                                  archive_dir=tmp_path / "archive")
+    conv_id = await _run_conversation(manager, 4)
+    await manager.complete_conversation(conv_id)
+
+    assert await manager.archive_completed_conversations() == 1
+
+    conn = sqlite3.connect(db_path)
+    remaining = conn.execute(
+        "SELECT COUNT(*) FROM conversation_messages WHERE conversation_id = ?", (conv_id,)
+    ).fetchone()[0]
+    conn.close()
+    assert remaining == 0
+
+    history = await manager.get_conversation_history(conv_id)
+    assert history[0]["status"] == "completed"
+    assert history[0]["turn_count"] == 4
+    messages = await manager.get_conversation_messages(conv_id)
+    assert [m.content["turn"] for m in messages] == [1, 2, 3, 4]
+    state = await manager.get_conversation_state(conv_id)
+    assert len(state.message_history) == 4
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,109 @@
+"""
+Tests for the SQLite-backed communication ProgressTracker.
+
+Uses a real SQLite database to check grouped commits, response lookup by
+message id, indexes and latency histograms.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import asyncio
+import json
+
+import aiosqlite
+import pytest
+from granger_hub.core.modules.communication_tracker import ProgressTracker, LatencyHistogram
+
+
+async def _count_messages(db_path: Path) -> int:
+    async with aiosqlite.connect(db_path) as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM messages")
+        return (await cursor.fetchone())[0]
+
+
+@pytest.mark.asyncio
+async def test_commits_are_grouped(tmp_path):
+    """Writes become visible to other connections once the group commits."""
+    db_path = tmp_path / "tracker.db"
+    tracker = ProgressTracker(db_path, commit_interval=60, commit_batch_size=5)
+
+    for i in range(4):
+        await tracker.log_message("a", "b", "process", {"i": i})
+    assert await _count_messages(db_path) == 0
+
+    await tracker.log_message("a", "b", "process", {"i": 4})
+    assert await _count_messages(db_path) == 5
+
+    await tracker.log_message("a", "b", "process", {"i": 5})
+    await tracker.close()
+    assert await _count_messages(db_path) == 6
+
+
+@pytest.mark.asyncio
+async def test_commit_timer_flushes(tmp_path):
+    """Pending writes are committed after the commit interval."""
+    db_path = tmp_path / "tracker.db"
+    tracker = ProgressTracker(db_path, commit_interval=0.01, commit_batch_size=100)
+
+    await tracker.log_message("a", "b", "process", {})
+    await asyncio.sleep(0.1)
+    assert await _count_messages(db_path) == 1
+    await tracker.close()
+
+
+@pytest.mark.asyncio
+async def test_log_response_by_message_id():
+    """Responses update the request identified by its message id."""
+    tracker = ProgressTracker()
+    first = await tracker.log_message("a", "b", "process", {"n": 1})
+    second = await tracker.log_message("a", "b", "process", {"n": 2})
+
+    await tracker.log_response("b", "a", {"ok": True}, message_id=first)
+    # Without an id the most recent unanswered request is used
+    await tracker.log_response("b", "a", {"ok": False})
+
+    cursor = await tracker._db.execute("SELECT id, response, status FROM messages ORDER BY id")
+    rows = {row[0]: (json.loads(row[1]), row[2]) for row in await cursor.fetchall()}
+    assert rows[first] == ({"ok": True}, "completed")
+    assert rows[second] == ({"ok": False}, "completed")
+    await tracker.close()
+
+
+@pytest.mark.asyncio
+async def test_indexes_and_latency_stats():
+    """Message indexes exist and latencies are published in stats."""
+    tracker = ProgressTracker()
+    await tracker.log_message("a", "b", "process", {})
+
+    cursor = await tracker._db.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'messages'"
+    )
+    indexes = {row[0] for row in await cursor.fetchall()}
+    assert {"idx_messages_route", "idx_messages_status"} <= indexes
+
+    stats = await tracker.get_stats()
+    assert stats["messages"]["total"] == 1
+    assert stats["latency"]["log_message"]["count"] == 1
+    await tracker.close()
+
+
+def test_latency_histogram_percentiles():
+    """Percentiles report the bucket bound holding the rank."""
+    histogram = LatencyHistogram()
+    for _ in range(99):
+        histogram.record(0.3)
+    histogram.record(40)
+
+    assert histogram.percentile(50) == 0.5
+    assert histogram.percentile(100) == 50
+    assert histogram.to_dict()["count"] == 100
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
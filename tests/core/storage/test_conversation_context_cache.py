@@ -0,0 +1,162 @@
+"""
+Tests for the sliding-window context cache in ArangoConversationStore.
+
+Uses a small in-memory stand-in for the python-arango database that counts
+round trips, so cache hits can be verified without a running server.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import pytest
+from granger_hub.core.conversation.conversation_archive import ConversationArchive
+from granger_hub.core.storage.arango_conversation import ArangoConversationStore
+
+
+class InMemoryCollection:
+    def __init__(self, db):
+        self.db = db
+        self.docs = {}
+
+    def insert(self, doc):
+        self.db.round_trips += 1
+        key = doc.get("_key") or str(len(self.docs) + 1)
+        self.docs[key] = {**doc, "_key": key}
+        return {"_key": key, "_id": f"c/{key}", "_rev": "1"}
+
+    def get(self, key):
+        self.db.round_trips += 1
+        return dict(self.docs[key]) if key in self.docs else None
+
+    def update_match(self, filters, body):
+        self.db.round_trips += 1
+        for doc in self.docs.values():
+            if all(doc.get(k) == v for k, v in filters.items()):
+                doc.update(body)
+
+    def find(self, filters, sort=None, limit=None):
+        self.db.round_trips += 1
+        docs = [d for d in self.docs.values() if all(d.get(k) == v for k, v in filters.items())]
+        docs.sort(key=lambda d: d["sequence"], reverse=True)
+        return iter(docs[:limit])
+
+
+class InMemoryAQL:
+    def __init__(self, db):
+        self.db = db
+
+    def execute(self, query, bind_vars=None, **kwargs):
+        self.db.round_trips += 1
+        messages = self.db.collections["messages"].docs
+        if "REMOVE key IN messages" in query:
+            for key in bind_vars["keys"]:
+                messages.pop(key, None)
+            return iter([])
+        docs = [d for d in messages.values() if d["conversation_id"] == bind_vars["conv_id"]]
+        if "SORT msg.sequence ASC" in query:
+            docs.sort(key=lambda d: d["sequence"])
+            if "LIMIT @offset, @limit" in query:
+                docs = docs[bind_vars["offset"]:bind_vars["offset"] + bind_vars["limit"]]
+            return iter(docs)
+        assert "SORT msg.sequence DESC" in query
+        docs.sort(key=lambda d: d["sequence"], reverse=True)
+        return iter(docs[:bind_vars["limit"]])
+
+
+class InMemoryDB:
+    def __init__(self):
+        self.round_trips = 0
+        self.collections = {
+            "conversations": InMemoryCollection(self),
+            "messages": InMemoryCollection(self)
+        }
+        self.aql = InMemoryAQL(self)
+
+    def collection(self, name):
+        return self.collections[name]
+
+
+@pytest.fixture
+def store():
+    store = ArangoConversationStore(context_window=5)
+    store.db = InMemoryDB()
+    return store
+
+
+@pytest.mark.asyncio
+async def test_context_served_from_cache(store):
+    """Context for an active conversation needs no database round trips."""
+    conv_id = await store.start_conversation(["a", "b"], topic="pipeline")
+    for i in range(8):
+        await store.add_message(conv_id, "a", "b", "process" if i % 2 else "ack", {"i": i})
+
+    before = store.db.round_trips
+    context = await store.get_conversation_context(["a", "b"], limit=3)
+    assert store.db.round_trips == before
+    assert [m["content"]["i"] for m in context["recent_messages"]] == [5, 6, 7]
+    assert context["message_count"] == 8
+    assert context["recent_action_counts"] == {"process": 3, "ack": 2}
+
+
+@pytest.mark.asyncio
+async def test_cache_miss_warms_window(store):
+    """A cold context loads the last messages once, then serves from memory."""
+    conv_id = await store.start_conversation(["a", "b"])
+    for i in range(7):
+        await store.add_message(conv_id, "a", "b", "process", {"i": i})
+    store.invalidate_context(conv_id)
+
+    context = await store.get_conversation_context(["a", "b"], limit=2)
+    assert [m["sequence"] for m in context["recent_messages"]] == [6, 7]
+
+    before = store.db.round_trips
+    await store.add_message(conv_id, "b", "a", "reply", {"i": 7})
+    assert store.db.round_trips == before + 2  # insert + conversation update
+    context = await store.get_conversation_context(["a", "b"], limit=5)
+    assert [m["sequence"] for m in context["recent_messages"]] == [4, 5, 6, 7, 8]
+
+
+@pytest.mark.asyncio
+async def test_summary_write_through_and_archive_invalidation(store):
+    """Summaries update the cached context; archiving evicts it."""
+    conv_id = await store.start_conversation(["a", "b"])
+    await store.add_message(conv_id, "a", "b", "process", {})
+
+    await store.summarize_conversation(conv_id, "short summary", tags=["t"])
+    context = await store.get_conversation_context(["a", "b"])
+    assert context["summary"] == "short summary"
+
+    await store.archive_conversation(conv_id)
+    assert conv_id not in store._context_cache
+
+
+@pytest.mark.asyncio
+async def test_archived_messages_read_through(store, tmp_path):
+    """Archived messages stay readable and later messages continue the sequence."""
+    store.archive = ConversationArchive(tmp_path / "archive", compression="gzip")
+    conv_id = await store.start_conversation(["a", "b"])
+    for i in range(4):
+        await store.add_message(conv_id, "a", "b", "process", {"i": i})
+    # A stale count must not limit what is archived
+    store.db.collections["conversations"].docs[conv_id]["message_count"] = 1
+
+    assert await store.archive_conversation(conv_id)
+    assert store.db.collections["messages"].docs == {}
+    await store.add_message(conv_id, "b", "a", "reply", {"i": 4})
+
+    messages = await store.get_conversation_messages(conv_id)
+    assert [m["sequence"] for m in messages] == [1, 2, 3, 4, 5]
+    assert [m["content"]["i"] for m in await store.get_conversation_messages(conv_id, limit=2, offset=3)] == [3, 4]
+
+    assert await store.archive_conversation(conv_id)
+    assert store.archive.read(conv_id)["conversation"]["turn_count"] == 5
+    assert [m["sequence"] for m in await store.get_conversation_messages(conv_id)] == [1, 2, 3, 4, 5]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
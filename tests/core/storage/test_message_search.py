@@ -0,0 +1,88 @@
+"""
+Tests for the local full-text and vector message search index.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import pytest
+from granger_hub.core.storage.message_search import MessageSearchIndex, HashingEmbedder
+
+
+MESSAGES = [
+    {"id": "m1", "conversation_id": "c1", "sender": "marker", "receiver": "arangodb",
+     "action": "store", "content": {"text": "extracted tables from the PDF report"}},
+    {"id": "m2", "conversation_id": "c1", "sender": "arangodb", "receiver": "marker",
+     "action": "ack", "content": {"status": "stored 12 documents"}},
+    {"id": "m3", "conversation_id": "c2", "sender": "sparta", "receiver": "arangodb",
+     "action": "store", "content": {"text": "satellite firmware vulnerability findings"}},
+    {"id": "m4", "conversation_id": "c3", "sender": "youtube", "receiver": "marker",
+     "action": "transcribe", "content": ["lecture", {"topic": "satellite orbits"}]},
+]
+
+
+@pytest.fixture
+def index():
+    index = MessageSearchIndex(embedder=HashingEmbedder(dim=128))
+    index.add_messages(MESSAGES)
+    yield index
+    index.close()
+
+
+def test_text_search_ranks_matches(index):
+    """BM25 search finds messages by content terms."""
+    results = index.search_messages("satellite firmware", mode="text")
+    assert results[0]["message_id"] == "m3"
+    assert {r["message_id"] for r in results} == {"m3", "m4"}
+
+
+def test_filters_and_query_quoting(index):
+    """Filters restrict results and FTS syntax in queries is neutralized."""
+    results = index.search_messages("satellite", participant="youtube")
+    assert [r["message_id"] for r in results] == ["m4"]
+    assert index.search_messages('"tables AND (', mode="text")[0]["message_id"] == "m1"
+
+
+def test_vector_and_hybrid_search(index):
+    """Embedding search returns nearest messages; hybrid fuses rankings."""
+    vector = index.search_messages("pdf tables", mode="vector", limit=1)
+    assert vector[0]["message_id"] == "m1"
+    hybrid = index.search_conversations("satellite", limit=2)
+    assert {c["conversation_id"] for c in hybrid} == {"c2", "c3"}
+
+
+def test_incremental_indexing_and_reload(tmp_path):
+    """Indexing is idempotent per message and survives reopening."""
+    db_path = tmp_path / "search.db"
+    index = MessageSearchIndex(db_path, embedder=HashingEmbedder(dim=256))
+    assert index.add_messages(MESSAGES[:2]) == 2
+    assert index.add_messages(MESSAGES) == 2
+    index.close()
+
+    reopened = MessageSearchIndex(db_path, embedder=HashingEmbedder(dim=256))
+    assert reopened.count() == 4
+    assert reopened.search_messages("firmware", mode="vector", limit=1)[0]["message_id"] == "m3"
+    assert reopened.remove_conversation("c2") == 1
+    assert all(r["message_id"] != "m3" for r in reopened.search_messages("firmware"))
+    reopened.close()
+
+
+def test_removed_messages_stay_removed_after_reinsert(index):
+    """Vectors of removed messages never match messages indexed later."""
+    index.add_message("a", "fruit", "marker", "arangodb", "store", {"text": "apple pie"})
+    assert index.remove_conversation("fruit") == 1
+    index.add_message("b", "dessert", "marker", "arangodb", "store", {"text": "banana split"})
+
+    results = index.search_messages("apple", mode="vector", limit=10)
+
+    assert [r["message_id"] for r in results].count("b") <= 1
+    assert all(r["score"] < 0.99 for r in results)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
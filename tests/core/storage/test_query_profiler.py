@@ -0,0 +1,84 @@
+"""
+Tests for the AQL query profiler used by the storage analytics APIs.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import pytest
+from granger_hub.core.storage.query_profiler import AQLQueryProfiler
+
+
+class FakeCursor:
+    """Cursor carrying server statistics like python-arango's Cursor."""
+
+    def __init__(self, stats):
+        self._stats = stats
+
+    def statistics(self):
+        return self._stats
+
+
+class FakeAQL:
+    def __init__(self, stats):
+        self.stats = stats
+        self.calls = []
+
+    def execute(self, query, bind_vars=None, **kwargs):
+        self.calls.append((query, bind_vars, kwargs))
+        return FakeCursor(self.stats)
+
+
+class FakeDB:
+    def __init__(self, stats):
+        self.aql = FakeAQL(stats)
+
+
+def test_execute_records_statistics():
+    """Profiled queries are executed with profiling and recorded by name."""
+    db = FakeDB({"execution_time": 0.004, "scanned_full": 0, "scanned_index": 120,
+                 "filtered": 3, "peak_memory_usage": 32768})
+    profiler = AQLQueryProfiler()
+
+    profiler.execute(db, "get_communication_stats", "RETURN 1", {"a": 1})
+    profiler.execute(db, "get_communication_stats", "RETURN 1", {"a": 1})
+
+    assert db.aql.calls[0][2]["profile"] is True
+    summary = profiler.summary()["get_communication_stats"]
+    assert summary["calls"] == 2
+    assert summary["avg_execution_time_ms"] == pytest.approx(4.0)
+    assert summary["avg_scanned_index"] == 120
+    assert summary["max_peak_memory_usage"] == 32768
+
+
+def test_disabled_profiler_does_not_record():
+    """A disabled profiler passes queries through untouched."""
+    db = FakeDB({})
+    profiler = AQLQueryProfiler(enabled=False)
+
+    profiler.execute(db, "get_conversation_analytics", "RETURN 1")
+
+    assert "profile" not in db.aql.calls[0][2]
+    assert profiler.summary() == {}
+
+
+def test_records_are_bounded_per_query():
+    """Only the most recent runs are kept for each API."""
+    db = FakeDB({"execution_time": 0.001})
+    profiler = AQLQueryProfiler(max_records_per_query=5)
+
+    for _ in range(20):
+        profiler.execute(db, "get_module_conversation_stats", "RETURN 1")
+
+    assert len(profiler.get_profiles("get_module_conversation_stats")) == 5
+    profiler.reset()
+    assert profiler.summary() == {}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
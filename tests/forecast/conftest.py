@@ -12,6 +12,60 @@ if src_path.exists() and str(src_path) not in sys.path:
 
 
 
+import numpy as np
 import pytest
 
-# No mocks - tests will use actual Ollama API
\ No newline at end of file
+from granger_hub.forecast.model_backends import ForecastBackend
+
+# No mocks - tests will use actual Ollama API
+
+
+def _steps(contexts, horizon):
+    return np.arange(1, horizon + 1).reshape((1, horizon) + (1,) * (contexts.ndim - 2))
+
+
+# Deterministic forecasts of a (batch, context_length[, n_features]) array
+FORECASTS = {
+    "mean": lambda contexts, horizon: np.repeat(contexts.mean(axis=1, keepdims=True), horizon, axis=1),
+    "last": lambda contexts, horizon: np.repeat(contexts[:, -1:], horizon, axis=1),
+    "drift": lambda contexts, horizon: contexts[:, -1:] + _steps(contexts, horizon) * (
+        (contexts[:, -1] - contexts[:, 0]) / (contexts.shape[1] - 1)
+    )[:, np.newaxis],
+}
+
+
+class RecordingBackend(ForecastBackend):
+    """Backend with a deterministic forecast that records what it is asked for."""
+
+    def __init__(self, forecast="mean", batched=True):
+        self.forecast = FORECASTS[forecast]
+        self.batched = batched
+        self.contexts = []  # windows passed to predict
+        self.batches = []  # arrays passed to predict_batch
+        self.windows = 0
+
+    def load_model(self, config):
+        pass
+
+    def predict(self, context, horizon):
+        context = np.array(context, dtype=float)
+        self.contexts.append(context)
+        self.windows += 1
+        return {"predictions": self.forecast(context[np.newaxis], horizon)[0]}
+
+    def predict_batch(self, contexts, horizon):
+        if not self.batched:
+            # Base class fallback: one predict call per window
+            return super().predict_batch(contexts, horizon)
+        self.batches.append(np.array(contexts))
+        self.windows += len(contexts)
+        return self.forecast(np.asarray(contexts, dtype=float), horizon)
+
+    def fine_tune(self, train_data, val_data):
+        raise NotImplementedError
+
+
+@pytest.fixture
+def recording_backend():
+    """Factory for RecordingBackend(forecast="mean" | "last" | "drift", batched=True)."""
+    return RecordingBackend
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Tests for batched rolling-window prediction in TimeSeriesRegressor.
+"""
+
+import numpy as np
+import pytest
+
+from granger_hub.forecast.sklearn_wrapper import TimeSeriesRegressor
+
+
+def fitted_regressor(backend, **params):
+    regressor = TimeSeriesRegressor(context_length=16, horizon=4, **params)
+    regressor.backend_ = backend
+    regressor.is_fitted_ = True
+    return regressor
+
+
+def loop_reference(backend, X, context_length, horizon):
+    return np.array([
+        backend.predict(X[i:i + context_length], horizon)["predictions"]
+        for i in range(len(X) - context_length + 1)
+    ])
+
+
+@pytest.mark.parametrize("shape", [(200,), (120, 3)])
+def test_batched_windows_match_per_window_loop(shape, recording_backend):
+    X = np.random.default_rng(0).normal(size=shape).cumsum(axis=0)
+    expected = loop_reference(recording_backend("drift"), X, 16, 4)
+
+    backend = recording_backend("drift")
+    predictions = fitted_regressor(backend, batch_size=50).predict(X)
+
+    assert predictions.shape == expected.shape
+    assert np.allclose(predictions, expected)
+    n_windows = len(X) - 15
+    sizes = [len(batch) for batch in backend.batches]
+    assert sum(sizes) == n_windows
+    assert max(sizes) == 50 and backend.contexts == []
+
+
+def test_default_predict_batch_falls_back_to_predict(recording_backend):
+    X = np.linspace(0, 10, 40)
+    backend = recording_backend("drift", batched=False)
+    predictions = fitted_regressor(backend, batch_size=8).predict(X)
+
+    assert len(backend.contexts) == 25
+    assert np.allclose(predictions, loop_reference(recording_backend("drift"), X, 16, 4))
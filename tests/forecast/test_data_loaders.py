@@ -0,0 +1,87 @@
+"""
+Tests for chunked, projected and tail-only time series loading.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from granger_hub.forecast import data_handlers
+from granger_hub.forecast.data_handlers import iter_time_series_chunks, load_time_series
+
+
+@pytest.fixture
+def metrics_csv(tmp_path):
+    rows = 5000
+    frame = pd.DataFrame({
+        "host": [f"h{i % 7}" for i in range(rows)],
+        "timestamp": pd.date_range("2025-01-01", periods=rows, freq="15min"),
+        "cpu": np.random.default_rng(0).normal(50, 5, rows),
+        "note": ["x" * 20] * rows
+    })
+    path = tmp_path / "metrics.csv"
+    frame.to_csv(path, index=False)
+    return path, frame
+
+
+def test_chunked_csv_matches_full_read(metrics_csv, monkeypatch):
+    path, frame = metrics_csv
+    monkeypatch.setattr(data_handlers, "CHUNK_ROWS", 700)
+
+    data = load_time_series(path)
+    assert data.metadata["value_column"] == "cpu"
+    assert data.metadata["timestamp_column"] == "timestamp"
+    assert np.allclose(data.values, frame["cpu"].to_numpy())
+    assert data.timestamps.dtype == np.dtype("datetime64[ns]")
+    assert np.array_equal(data.timestamps, frame["timestamp"].to_numpy())
+    assert data.frequency == "hourly"
+    assert data.last_timestamp == frame["timestamp"].iloc[-1]
+
+    chunks = list(iter_time_series_chunks(path, value_column="cpu", chunk_rows=1000))
+    assert [len(values) for values, _ in chunks] == [1000] * 5
+
+
+def test_tail_reads_only_the_end(metrics_csv):
+    path, frame = metrics_csv
+
+    data = load_time_series(path, tail=96)
+    assert np.allclose(data.values, frame["cpu"].to_numpy()[-96:])
+    assert np.array_equal(data.timestamps, frame["timestamp"].to_numpy()[-96:])
+
+    # Small blocks exercise rows split across block boundaries
+    columns = list(frame.columns)
+    tail = data_handlers._read_csv_tail(path, 250, columns, ["cpu"], block_size=333)
+    assert np.allclose(tail["cpu"].to_numpy(), frame["cpu"].to_numpy()[-250:])
+
+    # Asking for more rows than the file holds returns everything
+    everything = data_handlers._read_csv_tail(path, 10_000, columns, ["cpu"], block_size=4096)
+    assert len(everything) == len(frame)
+
+
+def test_npy_is_memory_mapped(tmp_path):
+    values = np.sin(np.arange(100_000) * 0.01)
+    path = tmp_path / "series.npy"
+    np.save(path, values)
+
+    data = load_time_series(path, tail=500)
+    assert isinstance(data.values, np.memmap)
+    assert np.array_equal(data.values, values[-500:])
+    assert len(data.timestamps) == 500
+
+    chunks = list(iter_time_series_chunks(path, chunk_rows=30_000))
+    assert [len(values) for values, _ in chunks] == [30_000, 30_000, 30_000, 10_000]
+
+
+def test_parquet_row_groups(tmp_path):
+    pytest.importorskip("pyarrow")
+    frame = pd.DataFrame({
+        "date": pd.date_range("2025-01-01", periods=1000, freq="D"),
+        "sales": np.arange(1000.0),
+        "region": ["north"] * 1000
+    })
+    path = tmp_path / "sales.parquet"
+    frame.to_parquet(path, row_group_size=100)
+
+    data = load_time_series(path, value_column="sales", tail=150)
+    assert np.array_equal(data.values, np.arange(850.0, 1000.0))
+    assert data.frequency == "daily"
@@ -0,0 +1,84 @@
+"""
+Tests for the fingerprint-keyed forecast cache.
+"""
+
+import numpy as np
+
+from granger_hub.forecast.cache import ForecastCache, forecast_cache_key
+from granger_hub.forecast.sklearn_wrapper import TimeSeriesRegressor
+
+
+def fitted_regressor(cache, backend):
+    regressor = TimeSeriesRegressor(context_length=10, horizon=3, batch_size=16, cache=cache)
+    regressor.backend_ = backend
+    regressor.is_fitted_ = True
+    return regressor, backend
+
+
+def test_unchanged_window_and_appended_points_reuse_predictions(tmp_path, recording_backend):
+    values = np.random.default_rng(0).normal(size=200)
+    cache = ForecastCache(tmp_path / "forecasts.db")
+    regressor, backend = fitted_regressor(cache, recording_backend())
+
+    first = regressor.predict(values[:10])
+    assert np.array_equal(regressor.predict(values[:10]), first)
+    assert backend.windows == 1
+
+    backend.windows = 0
+    regressor.predict(values[:150])
+    assert backend.windows == 141
+
+    # Only windows touching the appended points are computed
+    backend.windows = 0
+    appended = regressor.predict(values)
+    assert backend.windows == 50
+    assert np.allclose(appended, fitted_regressor(None, recording_backend())[0].predict(values))
+
+    # A changed point invalidates the prefix
+    changed = values.copy()
+    changed[5] += 1.0
+    backend.windows = 0
+    regressor.predict(changed)
+    assert backend.windows == 191
+
+    cache.close()
+    reopened = ForecastCache(tmp_path / "forecasts.db")
+    regressor, backend = fitted_regressor(reopened, recording_backend())
+    regressor.predict(values)
+    assert backend.windows == 0
+    assert reopened.stats()["windows_reused"] == 191
+
+
+def test_prefix_reuse_across_many_series(recording_backend):
+    rng = np.random.default_rng(1)
+    series = [rng.normal(size=41) for _ in range(20)]
+    regressor, backend = fitted_regressor(ForecastCache(None), recording_backend())
+    for values in series:
+        regressor.predict(values[:40])
+
+    backend.windows = 0
+    for values in series:
+        regressor.predict(values)
+    assert backend.windows == 20
+
+
+def test_lru_eviction():
+    cache = ForecastCache(None, max_entries=2)
+    keys = [forecast_cache_key(np.arange(i, i + 5.0), model="m", horizon=3) for i in range(3)]
+    cache.put(keys[0], "a")
+    cache.put(keys[1], "b")
+    assert cache.get(keys[0]) == "a"
+    cache.put(keys[2], "c")
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "a" and cache.get(keys[2]) == "c"
+    assert forecast_cache_key(np.arange(5.0), model="m", horizon=4) != keys[0]
+
+
+def test_clone_shares_cache():
+    from sklearn.base import clone
+
+    cache = ForecastCache(None)
+    cloned = clone(TimeSeriesRegressor(model_type="statistical", cache=cache))
+
+    assert cloned.cache is cache
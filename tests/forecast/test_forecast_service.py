@@ -0,0 +1,49 @@
+"""
+Tests for the multi-series ForecastService.
+"""
+
+import numpy as np
+import pandas as pd
+
+from granger_hub.forecast.service import ForecastService
+
+
+def test_long_format_frame_forecasts_every_series(recording_backend):
+    rng = np.random.default_rng(0)
+    rows = []
+    for i in range(25):
+        times = pd.date_range("2025-01-01", periods=10 + i, freq="15min" if i % 2 else "1h")
+        rows.append(pd.DataFrame({"series_id": f"m{i}", "timestamp": times,
+                                  "value": rng.normal(100 * i, 5, len(times))}))
+    frame = pd.concat(rows).sample(frac=1, random_state=0)
+
+    backend = recording_backend("last")
+    service = ForecastService(backend, context_length=16, horizon=3, batch_size=10, max_workers=3)
+    try:
+        result = service.forecast_many(frame)
+    finally:
+        service.close()
+
+    assert [len(b) for b in backend.batches] == [10, 10, 5]
+    assert len(result) == 25 * 3
+    for series in rows[:4]:
+        forecast = result[result.series_id == series.series_id.iloc[0]]
+        assert np.allclose(forecast.prediction, series.value.iloc[-1])
+        step = series.timestamp.iloc[-1] - series.timestamp.iloc[-2]
+        assert list(forecast.timestamp) == [series.timestamp.iloc[-1] + k * step for k in (1, 2, 3)]
+
+
+def test_dict_input_pads_and_normalizes_per_series(recording_backend):
+    backend = recording_backend("last")
+    service = ForecastService(backend, context_length=8, horizon=2, normalization="minmax")
+    try:
+        result = service.forecast_many({"a": [1.0, 2.0, 3.0], "b": np.arange(20.0)})
+    finally:
+        service.close()
+
+    contexts = backend.batches[0]
+    # Short series are padded with their first value before normalizing
+    assert np.allclose(contexts[0], [0, 0, 0, 0, 0, 0, 0.5, 1])
+    assert np.allclose(contexts[1], np.linspace(0, 1, 8))
+    assert list(result.columns) == ["series_id", "step", "prediction"]
+    assert np.allclose(result.prediction, [3, 3, 19, 19])
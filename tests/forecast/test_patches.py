@@ -0,0 +1,51 @@
+"""
+Tests for strided patch creation and overlap-add reconstruction.
+"""
+
+import numpy as np
+import pytest
+
+from granger_hub.forecast.patches import PatchTransformer
+
+
+def reference_patches(series, patch_length, stride):
+    n_patches = (len(series) - patch_length) // stride + 1
+    return np.stack([series[i * stride:i * stride + patch_length] for i in range(n_patches)])
+
+
+@pytest.mark.parametrize("patch_length,stride", [(16, 8), (10, 3), (5, 5), (4, 9)])
+@pytest.mark.parametrize("shape", [(101,), (97, 3)])
+def test_patches_match_reference_and_reconstruct(patch_length, stride, shape):
+    series = np.random.default_rng(0).normal(size=shape)
+    transformer = PatchTransformer(patch_length, stride)
+
+    patches = transformer.create_patches(series)
+    assert np.array_equal(patches, reference_patches(series, patch_length, stride))
+    assert not patches.flags.writeable
+    assert np.shares_memory(patches, series)
+
+    covered = np.zeros(len(series), dtype=bool)
+    for i in range(len(patches)):
+        covered[i * stride:i * stride + patch_length] = True
+    rebuilt = transformer.reconstruct_from_patches(patches, original_length=len(series))
+    assert rebuilt.shape == series.shape
+    # Points no patch covers come back as zero
+    assert np.allclose(rebuilt[covered], series[covered])
+    assert not rebuilt[~covered].any()
+
+
+def test_copy_dtype_and_integer_input():
+    transformer = PatchTransformer(patch_length=4, stride=2)
+    series = np.arange(20, dtype=np.float32)
+
+    patches = transformer.create_patches(series)
+    assert patches.dtype == np.float32
+    assert transformer.reconstruct_from_patches(patches).dtype == np.float32
+
+    copied = transformer.create_patches(series, copy=True)
+    assert copied.flags.writeable and copied.flags.c_contiguous
+    assert not np.shares_memory(copied, series)
+
+    assert transformer.create_patches(list(range(20))).dtype == np.float64
+    with pytest.raises(ValueError):
+        transformer.create_patches(np.arange(3.0))
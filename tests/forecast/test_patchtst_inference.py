@@ -0,0 +1,58 @@
+"""
+Tests for PatchTST CPU inference runtimes and the process model cache.
+"""
+
+import numpy as np
+import pytest
+
+from granger_hub.forecast.inference import clear_model_cache, load_patchtst_runner
+from granger_hub.forecast.model_backends import ModelConfig, create_backend
+
+
+def config(**params):
+    return ModelConfig(model_name="patchtst-test", context_length=32, patch_length=8, stride=8, **params)
+
+
+def windows(n=6):
+    t = np.arange(32)
+    return np.sin(0.3 * (t + np.arange(n)[:, np.newaxis])).astype(np.float32)
+
+
+def test_runtime_is_validated():
+    with pytest.raises(ValueError, match="Unknown runtime"):
+        load_patchtst_runner(config(runtime="tensorrt"))
+    with pytest.raises(ValueError, match="CPU-only"):
+        load_patchtst_runner(config(runtime="onnx", device="cuda"))
+
+
+def test_backends_share_one_loaded_model():
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    clear_model_cache()
+
+    first = create_backend(config())
+    second = create_backend(config(runtime="torchscript"))
+
+    assert first.model is second.model
+    assert create_backend(config())._run is first._run
+
+
+@pytest.mark.parametrize("runtime,quantize,tolerance", [
+    ("torchscript", False, 1e-4),
+    ("eager", True, 0.1),
+    ("onnx", False, 1e-4),
+    ("onnx", True, 0.1),
+])
+def test_runtimes_match_eager(runtime, quantize, tolerance):
+    pytest.importorskip("torch")
+    pytest.importorskip("transformers")
+    if runtime == "onnx":
+        pytest.importorskip("onnxruntime")
+
+    expected = create_backend(config()).predict_batch(windows(), horizon=12)
+    predictions = create_backend(config(runtime=runtime, quantize=quantize, num_threads=1)).predict_batch(
+        windows(), horizon=12
+    )
+
+    assert predictions.shape == expected.shape == (6, 12)
+    assert np.abs(predictions - expected).max() < tolerance * max(1.0, np.abs(expected).max())
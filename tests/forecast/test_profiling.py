@@ -0,0 +1,83 @@
+"""
+Tests for vectorized data profiling.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from granger_hub.cli.forecast_commands import analyze_data_profile, select_best_models
+from granger_hub.forecast.profiling import DataProfiler, autocorrelation, profile_matrix
+from granger_hub.forecast.service import ForecastService
+
+
+def test_autocorrelation_matches_lagged_corrcoef():
+    X = np.random.default_rng(0).normal(size=(20, 150)).cumsum(axis=1)
+    acf = autocorrelation(X)
+
+    assert acf.shape == (20, 76)
+    for lag in (1, 7, 24, 75):
+        expected = [np.corrcoef(x[:-lag], x[lag:])[0, 1] for x in X]
+        np.testing.assert_allclose(acf[:, lag], expected, atol=1e-10)
+
+
+def test_profile_matrix_rows():
+    rng = np.random.default_rng(1)
+    t = np.arange(300)
+    X = np.stack([
+        np.sin(2 * np.pi * t / 24) + rng.normal(0, 0.1, 300),
+        np.sin(2 * np.pi * t / 7) + 0.01 * t,
+        rng.normal(size=300),
+        rng.normal(size=300) * np.where(t < 150, 1.0, 3.0),
+    ])
+    profiles = profile_matrix(X)
+
+    assert profiles["season_length"].tolist() == [24, 7, 0, 0]
+    assert profiles["has_seasonality"].tolist() == [True, True, False, False]
+    assert profiles["dominant_period"].tolist() == [24, 7, 0, 0]
+    assert profiles["stationarity"].tolist() == [True, False, True, False]
+
+
+def test_profiler_caches_and_keeps_order():
+    rng = np.random.default_rng(2)
+    series = [rng.normal(size=length) for length in (60, 120, 60, 5)]
+    series[1][10] = np.nan
+    profiler = DataProfiler()
+
+    first = profiler.profile_many(series)
+    assert first["length"].tolist() == [60, 120, 60, 5]
+    assert first["missing_values"].tolist() == [False, True, False, False]
+    assert np.isfinite(first["variance"]).all()
+
+    second = profiler.profile_many(series[::-1])
+    assert second["length"].tolist() == [5, 60, 120, 60]
+    assert profiler.stats()["hits"] == 4 and profiler.stats()["misses"] == 4
+
+
+def test_cli_profile_is_json_serializable():
+    t = np.arange(200)
+    profile = analyze_data_profile(np.sin(2 * np.pi * t / 12) + 0.001 * t)
+
+    assert profile["has_seasonality"] and profile["season_length"] == 12
+    assert profile["is_multivariate"] is False
+    json.dumps(profile)
+
+
+def test_service_profile_many_and_model_selection():
+    t = np.arange(100)
+    frame = pd.DataFrame({
+        "series_id": np.repeat(["flat", "daily"], 100),
+        "timestamp": np.tile(pd.date_range("2025-01-01", periods=100, freq="1h"), 2),
+        "value": np.concatenate([np.ones(100), np.sin(2 * np.pi * t / 24)])
+    }).iloc[::-1]
+    service = ForecastService(backend=None)
+    try:
+        profiles = service.profile_many(frame)
+    finally:
+        service.close()
+
+    assert profiles["series_id"].tolist() == ["daily", "flat"]
+    assert profiles["season_length"].tolist() == [24, 0]
+    assert select_best_models(profiles, horizon=12)[1] == "statistical"
+    assert (select_best_models(profiles, horizon=96) == "patchtst").all()
@@ -0,0 +1,68 @@
+"""
+Tests for the vectorized statistical forecasting backend.
+"""
+
+import numpy as np
+
+from granger_hub.forecast.model_backends import ModelConfig, create_backend
+from granger_hub.forecast.ollama_forecast import OllamaForecaster
+from granger_hub.forecast.statistical import ar_forecast, detect_season_lengths, forecast_matrix
+
+
+def seasonal_series(n_series, length, period, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(length)
+    return (rng.uniform(50, 150, (n_series, 1))
+            + 20 * np.sin(2 * np.pi * t / period + rng.uniform(0, 6, (n_series, 1)))
+            + rng.normal(0, 1, (n_series, length)))
+
+
+def test_auto_detects_seasonality_and_beats_last_value():
+    Y = seasonal_series(200, 120, period=24)
+    X, future = Y[:, :96], Y[:, 96:]
+
+    assert (detect_season_lengths(X) == 24).all()
+    predictions, methods = forecast_matrix(X, horizon=24)
+    assert (methods == "holt_winters").all()
+
+    model_error = np.abs(predictions - future).mean()
+    naive_error = np.abs(X[:, -1:] - future).mean()
+    assert model_error < 0.3 * naive_error
+
+
+def test_ar_fit_recovers_process():
+    rng = np.random.default_rng(1)
+    n, length = 100, 400
+    X = np.zeros((n, length))
+    for t in range(2, length):
+        X[:, t] = 5 + 0.6 * X[:, t - 1] - 0.3 * X[:, t - 2] + rng.normal(0, 0.1, n)
+
+    # Long-run mean of the process: 5 / (1 - 0.6 + 0.3)
+    forecast = ar_forecast(X, horizon=50, order=2)
+    assert np.allclose(forecast[:, -1], 5 / 0.7, atol=0.1)
+
+
+def test_backend_registered_in_create_backend():
+    backend = create_backend(ModelConfig(model_type="statistical", model_name="auto"))
+    Y = seasonal_series(6, 96, period=12)
+
+    single = backend.predict(Y[0], horizon=12)
+    assert single["model_type"] == "statistical"
+    assert single["predictions"].shape == (12,)
+
+    batch = backend.predict_batch(Y, horizon=12)
+    assert np.allclose(batch[0], single["predictions"])
+
+    # Multivariate windows are forecast channel by channel
+    multivariate = backend.predict_batch(np.stack([Y[:3].T, Y[3:].T]), horizon=12)
+    assert multivariate.shape == (2, 12, 3)
+    assert np.allclose(multivariate[1, :, 2], batch[5])
+
+
+def test_ollama_fallback_uses_statistical_forecast():
+    forecaster = OllamaForecaster(model_name="unused")
+    values = list(np.linspace(0, 49, 50))
+
+    result = forecaster._fallback_forecast(values, horizon=5)
+    assert result["model"] == "fallback_holt_winters"
+    assert np.allclose(result["predictions"], np.arange(50, 55), atol=0.5)
@@ -0,0 +1,49 @@
+"""
+Tests for the ring-buffer StreamingForecastWrapper and multi-stream batching.
+"""
+
+import numpy as np
+
+from granger_hub.forecast.model_backends import MultiStreamForecaster, StreamingForecastWrapper
+
+
+def test_ring_buffer_contexts_and_running_metrics(recording_backend):
+    values = np.random.default_rng(0).normal(size=60)
+    backend = recording_backend("mean")
+    wrapper = StreamingForecastWrapper(backend, context_length=8, history_size=5)
+
+    predictions = [wrapper.update(value) for value in values]
+
+    assert predictions[:7] == [None] * 7
+    for i, context in enumerate(backend.contexts):
+        assert np.array_equal(context, values[i:i + 8])
+
+    # Prediction made after value t is scored against value t + 1
+    made = np.array([p for p in predictions if p is not None])
+    errors = values[8:] - made[:-1]
+    metrics = wrapper.get_metrics()
+    assert metrics["n_predictions"] == len(errors)
+    assert np.isclose(metrics["mae"], np.abs(errors).mean())
+    assert np.isclose(metrics["rmse"], np.sqrt((errors ** 2).mean()))
+    assert len(wrapper.prediction_history) == 5
+    assert wrapper.prediction_history[-1]["actual"] == values[-1]
+
+
+def test_prediction_cadence_and_multi_stream_batches(recording_backend):
+    backend = recording_backend("mean")
+    wrapper = StreamingForecastWrapper(backend, context_length=4, horizon=3, predict_every=3)
+    made = [wrapper.update(float(v)) is not None for v in range(13)]
+    assert [i for i, m in enumerate(made) if m] == [3, 6, 9, 12]
+    # Every value after the first forecast falls within some 3-step horizon
+    assert wrapper.get_metrics()["n_predictions"] == 9
+
+    forecaster = MultiStreamForecaster(backend, context_length=4, batch_size=16)
+    series = {f"s{i}": np.arange(10.0) * (i + 1) for i in range(40)}
+    for t in range(10):
+        predictions = forecaster.update_many({sid: values[t] for sid, values in series.items()})
+        if t < 3:
+            assert predictions == {}
+        else:
+            assert predictions["s5"] == series["s5"][t - 3:t + 1].mean()
+    assert [len(batch) for batch in backend.batches[:3]] == [16, 16, 8]
+    assert forecaster.get_metrics()["s0"]["mae"] == 2.5
@@ -0,0 +1,80 @@
+"""
+Tests for LTTB downsampling and the shared visualization server.
+"""
+
+import json
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pytest
+
+from granger_hub.forecast.visualization import ForecastPlotData, ForecastVisualizer, lttb_indices
+from granger_hub.forecast.viz_server import VisualizationServer
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.sin(np.arange(100_000) / 500)
+    y[31_337] = 50
+
+    kept = lttb_indices(np.arange(len(y)), y, 500)
+
+    assert len(kept) == 500
+    assert kept[0] == 0 and kept[-1] == len(y) - 1
+    assert (np.diff(kept) > 0).all()
+    assert 31_337 in kept
+    assert (lttb_indices(np.arange(10), np.arange(10), 50) == np.arange(10)).all()
+
+
+def test_graph_data_range_and_budget():
+    data = ForecastPlotData.from_arrays(
+        np.arange(10_000, dtype=float),
+        np.full(24, 5.0),
+        {0.9: (np.zeros(24), np.ones(24))}
+    )
+
+    overview = data.graph_data(max_points=100)
+    assert overview["metadata"]["points"] == 100 + 24
+    assert overview["metadata"]["historical_count"] == 10_000
+
+    detail = data.graph_data(start=data.times[2000], end=data.times[2049], max_points=100)
+    assert [node["index"] for node in detail["nodes"]] == list(range(2000, 2050))
+
+    forecast = data.graph_data(start=data.times[10_000])
+    assert all(node["type"] == "prediction" for node in forecast["nodes"])
+    assert forecast["nodes"][0]["ci_90_upper"] == 1.0
+
+
+def test_page_embeds_only_downsampled_points():
+    visualizer = ForecastVisualizer(max_points=500)
+    data = ForecastPlotData.from_arrays(np.random.default_rng(0).normal(size=200_000), np.zeros(12))
+
+    html = visualizer.render_page(data, title="Big", data_url="/api/viz/big")
+
+    assert len(html) < 200_000
+    assert '"/api/viz/big"' in html
+
+
+def test_server_serves_pages_and_range_queries():
+    server = VisualizationServer(port=0).start()
+    try:
+        data = ForecastPlotData.from_arrays(np.arange(5000, dtype=float), np.zeros(10))
+        forecast_url = server.add_forecast(data, title="Load", visualizer=ForecastVisualizer(max_points=200))
+        page_url = server.add_page("<html>static</html>", title="Static")
+        viz_id = forecast_url.rsplit("/", 1)[1]
+
+        assert b"d3.v7.min.js" in urllib.request.urlopen(forecast_url).read()
+        assert urllib.request.urlopen(page_url).read() == b"<html>static</html>"
+
+        query = f"start={data.times[100]}&end={data.times[199]}&points=1000"
+        detail = json.load(urllib.request.urlopen(f"{server.url}/api/viz/{viz_id}?{query}"))
+        assert len(detail["nodes"]) == 100
+
+        listing = json.load(urllib.request.urlopen(f"{server.url}/"))
+        assert [entry["title"] for entry in listing] == ["Load", "Static"]
+
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f"{server.url}/api/viz/{viz_id}?points=many")
+        assert error.value.code == 400
+    finally:
+        server.stop()
@@ -0,0 +1,123 @@
+"""
+Tests for incrementally maintained learning curves.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from granger_hub.rl.metrics.learning_curves import (
+    LearningCurveStore,
+    LearningCurvesCalculator,
+    _epoch
+)
+
+
+def _metrics(n=300, start=None):
+    rng = np.random.default_rng(7)
+    start = start or datetime.utcnow() - timedelta(days=1)
+    return [
+        {
+            'timestamp': (start + timedelta(minutes=i)).isoformat(),
+            'episode': i,
+            'reward': float(-50 + 0.8 * i + rng.normal(0, 5)),
+            'success_rate': float(1 / (1 + np.exp(-(i - 150) / 10)))
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def calculator():
+    store = LearningCurveStore(window_size=20)
+    store.seed('sparta', _metrics(), _epoch(datetime.utcnow() - timedelta(days=7)))
+    return LearningCurvesCalculator(curve_store=store)
+
+
+def test_incremental_matches_batch(calculator):
+    """Precomputed curves equal a from-scratch computation."""
+    curves = calculator.get_learning_curves('sparta', window_size=20)
+    batch = calculator._curves_from_metrics('sparta', _metrics(), window_size=20)
+
+    assert curves['summary']['total_episodes'] == 300
+    np.testing.assert_allclose(curves['moving_average']['rewards'], batch['moving_average']['rewards'])
+    for key in ('slope', 'intercept', 'r_squared'):
+        assert curves['trend_line']['rewards'][key] == pytest.approx(batch['trend_line']['rewards'][key])
+    assert curves['confidence_intervals']['std'] == pytest.approx(batch['confidence_intervals']['std'])
+    assert curves['summary']['avg_reward'] == pytest.approx(batch['summary']['avg_reward'])
+
+
+def test_recording_updates_curves_and_downsampling(calculator):
+    """New points extend the curve; long series are downsampled."""
+    store = calculator.curve_store
+    store.record('sparta', 200.0, success_rate=1.0)
+    curves = calculator.get_learning_curves('sparta', window_size=20, max_points=50)
+
+    assert curves['summary']['total_episodes'] == 301
+    assert curves['summary']['max_reward'] == 200.0
+    assert len(curves['data_points']) == 50
+    assert curves['data_points'][-1]['episode'] == 300
+
+    recent = calculator.get_learning_curves('sparta', time_range={
+        'start': (datetime.utcnow() - timedelta(minutes=30)).isoformat() + 'Z'
+    })
+    assert recent['summary']['total_episodes'] == 1
+
+    comparison = calculator.get_module_comparison(['sparta'])
+    assert comparison['modules']['sparta']['total_episodes'] == 301
+
+
+def test_statistics_cover_retained_points():
+    """Once old points are dropped, statistics describe only the kept ones."""
+    store = LearningCurveStore(window_size=20, max_points=100)
+    store.seed('sparta', _metrics(), _epoch(datetime.utcnow() - timedelta(days=7)))
+    calculator = LearningCurvesCalculator(curve_store=store)
+
+    curves = calculator.get_learning_curves('sparta', window_size=20)
+    batch = calculator._curves_from_metrics('sparta', _metrics()[-100:], window_size=20)
+
+    assert len(curves['data_points']) == curves['summary']['total_episodes'] == 100
+    for key in ('slope', 'intercept', 'r_squared'):
+        assert curves['trend_line']['rewards'][key] == pytest.approx(batch['trend_line']['rewards'][key])
+    for key in ('mean', 'std'):
+        assert curves['confidence_intervals'][key] == pytest.approx(batch['confidence_intervals'][key])
+    for key in ('avg_reward', 'max_reward', 'min_reward'):
+        assert curves['summary'][key] == pytest.approx(batch['summary'][key])
+    assert store.get('sparta').history_start == _epoch(curves['data_points'][0]['timestamp'])
+
+
+class StoredMetrics:
+    """Stand-in for the rl_metrics collection that honours SORT and LIMIT."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self.aql = self
+
+    def execute(self, query, bind_vars):
+        rows = sorted(self.metrics, key=lambda m: m['timestamp'], reverse='DESC' in query)
+        return iter(rows[:bind_vars['limit']])
+
+
+def test_seeding_keeps_the_newest_metrics():
+    """A truncated seed holds the latest points and starts history there."""
+    metrics = _metrics()
+    store = LearningCurveStore(window_size=20, max_points=100)
+    calculator = LearningCurvesCalculator(db=StoredMetrics(metrics), curve_store=store)
+
+    curve = calculator.reload_module('sparta')
+
+    assert [r['episode'] for r in curve.records] == list(range(200, 300))
+    assert curve.history_start == _epoch(metrics[200]['timestamp'])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
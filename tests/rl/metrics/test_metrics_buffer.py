@@ -0,0 +1,72 @@
+"""
+Tests for buffered RL metrics writes.
+
+The store points at a port nothing listens on, so every flush exercises
+the real failure path into the local spool.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import pytest
+
+from granger_hub.rl.metrics import RLMetricsCollector, ArangoDBMetricsStore
+from granger_hub.rl.metrics.buffer import JsonlSpool, MetricsBuffer
+from granger_hub.rl.metrics.learning_curves import LearningCurveStore
+
+
+@pytest.fixture
+def unreachable_store():
+    return ArangoDBMetricsStore({
+        'host': '127.0.0.1',
+        'port': 9,
+        'username': 'root',
+        'password': 'password',
+        'database': 'granger_test_rl'
+    })
+
+
+@pytest.mark.asyncio
+async def test_collector_spools_when_store_unavailable(unreachable_store, tmp_path):
+    """Recording never waits on the store; failed flushes land in the spool."""
+    buffer = MetricsBuffer(unreachable_store, flush_interval=60, spool=JsonlSpool(tmp_path))
+    collector = RLMetricsCollector(store=unreachable_store, curve_store=LearningCurveStore(),
+                                   buffer=buffer)
+
+    decision_id = await collector.record_module_selection(
+        available_modules=["marker", "surya"],
+        selected_module="marker",
+        selection_probabilities={"marker": 0.7, "surya": 0.3},
+        task_context={"type": "pdf", "complexity": 0.5}
+    )
+    await collector.update_decision_outcome(decision_id, success=True,
+                                            execution_time_ms=12.0, reward=0.9)
+    await collector.close()
+
+    stats = collector.get_buffer_stats()
+    # The outcome replaced the queued decision instead of adding a second insert
+    assert stats['coalesced'] == 1
+    assert stats['stored'] == 0 and stats['spooled'] == 2 and stats['store_errors'] == 1
+    (segment,) = buffer.spool.segments()
+    grouped = buffer.spool.read(segment)
+    assert grouped['decisions'][0]['reward'] == 0.9
+    assert grouped['metrics'][0]['action'] == "select_marker"
+
+
+@pytest.mark.asyncio
+async def test_buffer_drops_when_full(unreachable_store, tmp_path):
+    """A full buffer drops and counts new documents."""
+    buffer = MetricsBuffer(unreachable_store, max_size=3, spool=JsonlSpool(tmp_path))
+    accepted = [buffer.add('metrics', {'i': i}) for i in range(5)]
+
+    assert accepted == [True, True, True, False, False]
+    assert buffer.get_stats()['dropped'] == 2 and buffer.pending == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
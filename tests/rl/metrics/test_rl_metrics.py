@@ -167,6 +167,7 @@ async def test_insert_metrics(metrics_collector):
         )
     
     # Verify data was persisted
+    await metrics_collector.flush()
     recent_metrics = await metrics_collector.store.get_recent_metrics(limit=20)
     assert len(recent_metrics) >= 10, "Not enough metrics stored"
     
@@ -310,6 +311,7 @@ async def test_pipeline_tracking(metrics_collector):
             )
     
     # Verify pipeline was stored
+    await metrics_collector.flush()
     db = metrics_collector.store.db
     pipeline_col = db.collection('pipeline_executions')
     
@@ -406,6 +408,7 @@ async def test_concurrent_operations(metrics_collector):
     await asyncio.gather(*tasks)
     
     # Verify all were recorded
+    await metrics_collector.flush()
     recent = await metrics_collector.store.get_recent_metrics(limit=30)
     assert len(recent) >= 20, "Not all concurrent operations recorded"
     
@@ -0,0 +1,180 @@
+"""
+Tests for RL agent checkpointing and warm start.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import numpy as np
+import pytest
+from granger_hub.rl import hub_decisions
+from granger_hub.rl.checkpoints import (
+    CHECKPOINT_PATH_ENV,
+    grow_agent_actions,
+    grow_agent_arms,
+    load_agents_checkpoint,
+    read_checkpoint_header,
+    save_agents_checkpoint
+)
+from granger_hub.rl.training_worker import start_training_worker
+
+
+class TinyBandit:
+    """Bandit with per-arm arrays, a per-arm list and a step counter."""
+
+    def __init__(self, n_arms, n_features=3):
+        self.n_arms = n_arms
+        self.n_features = n_features
+        self.values = np.zeros(n_arms)
+        self.A = [np.eye(n_features) for _ in range(n_arms)]
+        self.theta_prior = np.ones(n_features)
+        self.steps = 0
+
+
+class ArgmaxBandit(TinyBandit):
+    """TinyBandit that always picks its highest-valued arm."""
+
+    def select_action(self, state):
+        return hub_decisions.RLAction(action_type="select_arm", action_id=int(np.argmax(self.values)))
+
+
+class TinyDQN:
+    """DQN-shaped agent with an output layer sized by action_dim."""
+
+    def __init__(self, name="dqn", state_dim=4, action_dim=6, hidden=5, **kwargs):
+        self.name = name
+        self.state_dim = state_dim
+        self.action_dim = action_dim
+        self.hidden_weights = np.zeros((hidden, state_dim))
+        self.output_weights = np.zeros((action_dim, hidden))
+        self.epsilon = 1.0
+
+
+def test_checkpoint_roundtrip_is_atomic(tmp_path):
+    """Header is readable on its own and no temporary files remain."""
+    bandit = TinyBandit(2)
+    bandit.values[:] = [0.5, 0.9]
+    path = save_agents_checkpoint({"module_selector": bandit, "unused": None},
+                                  {"marker": 0, "arangodb": 1}, tmp_path / "agents.ckpt",
+                                  compression="gzip")
+
+    header = read_checkpoint_header(path)
+    assert header["modules"] == {"marker": 0, "arangodb": 1}
+    assert header["agents"] == {"module_selector": {"class": "TinyBandit", "n_arms": 2, "n_features": 3}}
+    _, agents = load_agents_checkpoint(path)
+    np.testing.assert_array_equal(agents["module_selector"].values, [0.5, 0.9])
+    assert [p.name for p in tmp_path.iterdir()] == ["agents.ckpt"]
+
+    (tmp_path / "bad.ckpt").write_bytes(b"not a checkpoint")
+    with pytest.raises(ValueError):
+        read_checkpoint_header(tmp_path / "bad.ckpt")
+
+
+def test_grow_agent_arms_keeps_learned_arms():
+    """New arms start fresh while learned arms and counters carry over."""
+    trained = TinyBandit(2)
+    trained.values[:] = [0.3, 0.7]
+    trained.A[1] = trained.A[1] * 5
+    trained.steps = 42
+
+    grown = grow_agent_arms(trained, TinyBandit(4), old_arms=2)
+    np.testing.assert_array_equal(grown.values, [0.3, 0.7, 0.0, 0.0])
+    assert grown.A[1][0, 0] == 5 and grown.A[3][0, 0] == 1
+    assert grown.steps == 42 and grown.n_arms == 4
+
+
+def test_grow_agent_actions_keeps_learned_rows():
+    """Output rows of known actions and unchanged layers keep their weights."""
+    trained = TinyDQN(action_dim=6)
+    trained.hidden_weights[:] = 2.0
+    trained.output_weights[:] = np.arange(6)[:, np.newaxis]
+    trained.epsilon = 0.1
+
+    grown = grow_agent_actions(trained, TinyDQN(action_dim=9), old_actions=6)
+    np.testing.assert_array_equal(grown.output_weights[:, 0], [0, 1, 2, 3, 4, 5, 0, 0, 0])
+    assert (grown.hidden_weights == 2.0).all()
+    assert grown.epsilon == 0.1 and grown.action_dim == 9
+
+
+def test_grow_agent_actions_copies_torch_networks():
+    """Torch output layers gain rows; hidden layers are copied unchanged."""
+    torch = pytest.importorskip("torch")
+
+    class TorchDQN:
+        def __init__(self, action_dim):
+            self.action_dim = action_dim
+            self.q_network = torch.nn.Sequential(torch.nn.Linear(4, 8), torch.nn.ReLU(),
+                                                 torch.nn.Linear(8, action_dim))
+            self.optimizer = torch.optim.Adam(self.q_network.parameters())
+
+    trained = TorchDQN(6)
+    fresh = TorchDQN(9)
+    new_rows = fresh.q_network[2].weight[6:].detach().clone()
+
+    grown = grow_agent_actions(trained, fresh, old_actions=6)
+    assert torch.equal(grown.q_network[0].weight, trained.q_network[0].weight)
+    assert torch.equal(grown.q_network[2].weight[:6], trained.q_network[2].weight)
+    assert torch.equal(grown.q_network[2].weight[6:], new_rows)
+    assert grown.optimizer.param_groups[0]["params"][0] is grown.q_network[0].weight
+
+
+def test_warm_start_with_new_module(tmp_path):
+    """Restarting with an extra module keeps indices and adds an arm."""
+    path = tmp_path / "agents.ckpt"
+    hub_decisions.initialize_rl_agents(["marker", "arangodb"], reset=True)
+    hub_decisions.save_rl_checkpoint(path)
+
+    hub_decisions.publish_rl_agents({name: None for name in hub_decisions.get_rl_agents()})
+    hub_decisions.initialize_rl_agents(["sparta", "arangodb", "marker"], checkpoint_path=path)
+
+    assert hub_decisions.get_module_index() == {"marker": 0, "arangodb": 1, "sparta": 2}
+    assert hub_decisions.get_rl_agents()["module_selector"].n_arms == 3
+    hub_decisions.publish_rl_agents({name: None for name in hub_decisions.get_rl_agents()})
+
+
+def test_pipeline_optimizer_grows_with_new_modules(tmp_path, monkeypatch):
+    """The pipeline DQN keeps its weights when modules are added, warm or live."""
+    monkeypatch.setattr(hub_decisions, "DQNAgent", TinyDQN)
+    path = tmp_path / "agents.ckpt"
+    hub_decisions.initialize_rl_agents(["marker", "arangodb"], reset=True)
+    hub_decisions.get_rl_agents()["pipeline_optimizer"].output_weights[:] = 7.0
+    hub_decisions.save_rl_checkpoint(path)
+
+    hub_decisions.publish_rl_agents({name: None for name in hub_decisions.get_rl_agents()})
+    hub_decisions.initialize_rl_agents(["marker", "arangodb", "sparta"], checkpoint_path=path)
+    optimizer = hub_decisions.get_rl_agents()["pipeline_optimizer"]
+    assert optimizer.action_dim == 9
+    assert (optimizer.output_weights[:6] == 7.0).all() and (optimizer.output_weights[6:] == 0).all()
+
+    hub_decisions.initialize_rl_agents(["youtube"])
+    optimizer = hub_decisions.get_rl_agents()["pipeline_optimizer"]
+    assert optimizer.action_dim == 12 and (optimizer.output_weights[:6] == 7.0).all()
+    hub_decisions.publish_rl_agents({name: None for name in hub_decisions.get_rl_agents()})
+
+
+def test_default_checkpoint_round_trip(tmp_path, monkeypatch):
+    """A started worker checkpoints to the default path; lazy init warm starts from it."""
+    monkeypatch.setenv(CHECKPOINT_PATH_ENV, str(tmp_path / "agents.ckpt"))
+    hub_decisions.configure_decision_journal(db_path=None)
+    hub_decisions.initialize_rl_agents(["marker", "arangodb"], reset=True)
+    bandit = ArgmaxBandit(2, n_features=20)
+    bandit.values[:] = [0.1, 0.9]
+    hub_decisions.publish_rl_agents({"module_selector": bandit})
+
+    worker = start_training_worker(publish_interval=3600)
+    worker.publish(checkpoint=True)
+    worker.stop()
+    assert worker.checkpoints_written == 1
+
+    hub_decisions.publish_rl_agents({name: None for name in hub_decisions.get_rl_agents()})
+    assert hub_decisions.select_module_with_rl({"type": "extract"}, ["marker", "arangodb"]) == "arangodb"
+    hub_decisions.publish_rl_agents({name: None for name in hub_decisions.get_rl_agents()})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,125 @@
+"""
+Tests for the persistent decision journal used for delayed RL rewards.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import time
+
+import numpy as np
+import pytest
+from granger_hub.rl.decision_journal import DecisionJournal
+
+
+def test_ids_are_unique_and_evicted_decisions_load_from_disk(tmp_path):
+    """Decisions beyond the memory window are still found by ID."""
+    journal = DecisionJournal(tmp_path / "decisions.db", max_in_memory=10)
+    ids = [journal.record("module_selection", state=np.arange(3.0), action=i) for i in range(50)]
+
+    assert len(set(ids)) == 50
+    assert journal.stats()["in_memory"] == 10
+    oldest = journal.get(ids[0])
+    assert oldest["action"] == 0 and oldest["state"] == [0.0, 1.0, 2.0]
+    assert set(journal.get_many(ids[:5] + ids[-5:] + ["unknown"])) == set(ids[:5] + ids[-5:])
+
+
+def test_decisions_survive_restart(tmp_path):
+    """Unresolved decisions are readable after the journal is reopened."""
+    db_path = tmp_path / "decisions.db"
+    journal = DecisionJournal(db_path, commit_batch_size=1000, commit_interval=3600)
+    decision_id = journal.record("pipeline_optimization", pipeline=["marker", "arangodb"])
+    journal.close()
+
+    reopened = DecisionJournal(db_path)
+    assert reopened.get(decision_id)["pipeline"] == ["marker", "arangodb"]
+    reopened.resolve({decision_id: 0.75})
+    assert reopened.stats()["resolved"] == 1
+    reopened.close()
+
+
+def test_ttl_expiry():
+    """Expired decisions are no longer returned and are swept from disk."""
+    journal = DecisionJournal(ttl_seconds=0.05)
+    decision_id = journal.record("error_handling", action="retry")
+    time.sleep(0.06)
+
+    assert journal.get(decision_id) is None
+    assert journal.expire() == 1
+    assert journal.stats()["stored"] == 0
+
+
+def test_hub_batch_outcomes():
+    """record_decision_outcomes attributes rewards to logged decisions."""
+    hub_decisions = pytest.importorskip("granger_hub.rl.hub_decisions")
+    journal = hub_decisions.configure_decision_journal(db_path=None)
+    ids = [hub_decisions._log_decision(decision_type="error_handling", state=np.zeros(4),
+                                       action="retry", action_idx=0) for _ in range(3)]
+
+    outcomes = [{"decision_id": i, "outcome": {"success": True}} for i in ids]
+    outcomes.append({"decision_id": "error_handling_missing", "outcome": {}})
+    assert hub_decisions.record_decision_outcomes(outcomes) == 3
+    assert hub_decisions.get_last_decision_id() == ids[-1]
+    assert journal.stats()["resolved"] == 3
+
+
+def test_outcomes_are_attributed_once(tmp_path):
+    """A decision resolved or claimed once is not handed out again."""
+    journal = DecisionJournal(tmp_path / "decisions.db", max_in_memory=1)
+    first, second = (journal.record("module_selection", action=i) for i in range(2))
+
+    assert set(journal.claim([first, second])) == {first, second}
+    assert journal.get_many([first, second]) == {}
+    journal.resolve({first: 1.0})
+    journal.release([second])
+    assert set(journal.get_many([first, second])) == {second}
+    assert journal.get(first)["action"] == 0
+
+    hub_decisions = pytest.importorskip("granger_hub.rl.hub_decisions")
+    hub_decisions.configure_decision_journal(db_path=None)
+    decision_id = hub_decisions._log_decision(decision_type="error_handling", state=np.zeros(4),
+                                              action="retry", action_idx=0)
+    outcome = {"decision_id": decision_id, "outcome": {"success": True}}
+    assert hub_decisions.record_decision_outcomes([outcome, outcome]) == 1
+    assert hub_decisions.record_decision_outcome(decision_id, {"success": True}) is False
+
+
+def test_failed_outcome_releases_its_claim():
+    """A decision whose update raised can be attributed again."""
+    hub_decisions = pytest.importorskip("granger_hub.rl.hub_decisions")
+
+    class FlakyAgent:
+        def __init__(self):
+            self.experiences = []
+            self.fail = True
+
+        def store_experience(self, exp):
+            if self.fail:
+                raise RuntimeError("replay buffer unavailable")
+            self.experiences.append(exp)
+
+    agent = FlakyAgent()
+    previous = hub_decisions.get_rl_agents()
+    hub_decisions.configure_decision_journal(db_path=None)
+    hub_decisions.publish_rl_agents({"error_handler": agent})
+    try:
+        decision_id = hub_decisions._log_decision(decision_type="error_handling", state=np.zeros(4),
+                                                  action="retry", action_idx=0)
+        outcome = {"decision_id": decision_id, "outcome": {"success": True}}
+        with pytest.raises(RuntimeError):
+            hub_decisions.record_decision_outcomes([outcome])
+
+        agent.fail = False
+        assert hub_decisions.record_decision_outcomes([outcome]) == 1
+        assert len(agent.experiences) == 1
+    finally:
+        hub_decisions.publish_rl_agents(previous)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
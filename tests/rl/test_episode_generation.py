@@ -0,0 +1,104 @@
+"""
+Tests for parallel training episode generation.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import asyncio
+import threading
+import time
+
+import pytest
+from granger_hub.rl.episodes import CommunicationEpisode
+from granger_hub.rl.episode_generation import ParallelEpisodeGenerator, StandInRouteGenerator
+
+
+class ListGraph:
+    """Graph backend holding stored episodes in a list."""
+
+    def __init__(self):
+        self.stored = []
+        self.db = {"learning_episodes": self}
+
+    def find_shortest_path(self, source, target):
+        return [source, target]
+
+    def insert_many(self, episodes):
+        self.stored.extend(episodes)
+
+
+class SlowRouteGenerator(StandInRouteGenerator):
+    """Blocking route generator that records its peak concurrency."""
+
+    offline = False
+
+    def __init__(self):
+        super().__init__()
+        self.in_flight = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def generate_route_optimization(self, task):
+        with self._lock:
+            self.in_flight += 1
+            self.peak = max(self.peak, self.in_flight)
+        time.sleep(0.02)
+        with self._lock:
+            self.in_flight -= 1
+        return self._heuristic_route(task)
+
+
+def _summary(episodes):
+    return [(e["task"]["source"], e["optimized_route"]["path"], e["gain"]) for e in episodes]
+
+
+def test_offline_batches_are_reproducible():
+    """Same seed gives the same batch regardless of concurrency."""
+    graph = ListGraph()
+    episode = CommunicationEpisode(graph, route_generator=StandInRouteGenerator())
+
+    first = ParallelEpisodeGenerator(episode, max_concurrent=1, seed=3).generate(200)
+    second = ParallelEpisodeGenerator(episode, max_concurrent=16, seed=3).generate(200)
+    other = ParallelEpisodeGenerator(episode, seed=4).generate(200)
+
+    assert len(first) == 200 and len(graph.stored) == 600
+    assert _summary(first) == _summary(second)
+    assert _summary(first) != _summary(other)
+    assert episode.route_generator.hits > 0
+
+
+def test_blocking_generator_respects_concurrency_cap():
+    """Blocking route calls overlap but never exceed max_concurrent."""
+    route_generator = SlowRouteGenerator()
+    cache = StandInRouteGenerator()
+    episode = CommunicationEpisode(ListGraph(), route_generator=route_generator)
+
+    start = time.perf_counter()
+    episodes = ParallelEpisodeGenerator(episode, max_concurrent=4, route_cache=cache).generate(40)
+    elapsed = time.perf_counter() - start
+
+    assert len(episodes) == 40
+    assert 1 < route_generator.peak <= 4
+    assert elapsed < 40 * 0.02
+    assert cache.misses == 0 and len(cache._cache) > 0
+
+
+def test_generate_from_running_event_loop():
+    """The blocking API also works when called from async code."""
+    episode = CommunicationEpisode(ListGraph(), route_generator=StandInRouteGenerator())
+
+    async def caller():
+        return episode.generate_training_batch(batch_size=20, max_concurrent=4, seed=3)
+
+    episodes = asyncio.run(caller())
+    assert _summary(episodes) == _summary(ParallelEpisodeGenerator(episode, seed=3).generate(20))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,139 @@
+"""
+Tests for the binary experience store in granger_hub.rl.experience_collection.
+
+Uses real SQLite databases in a temporary directory.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import json
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+import granger_hub.rl.experience_collection as experience_collection
+from granger_hub.rl.experience_collection import (
+    ExperienceWriter,
+    close_experience_db,
+    get_experience_statistics,
+    load_experience_arrays,
+    load_experiences,
+    log_experience,
+    log_experiences
+)
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = tmp_path / "experiences.db"
+    monkeypatch.setattr(experience_collection, "EXPERIENCE_DB_PATH", path)
+    yield path
+    close_experience_db()
+
+
+def test_log_and_load_roundtrip(db_path):
+    """States come back as float32 vectors and stats are merged in SQL."""
+    state = np.linspace(0, 1, 10)
+    log_experience("module_selection", state, "marker", 0.5, next_state=state + 1,
+                   metadata={"module": "marker"})
+    log_experience("module_selection", state, "sparta", -0.5)
+
+    experiences = load_experiences("module_selection")
+    assert len(experiences) == 2
+    assert {exp.action for exp in experiences} == {"marker", "sparta"}
+    with_next = next(exp for exp in experiences if exp.next_state is not None)
+    np.testing.assert_allclose(with_next.next_state, state + 1, rtol=1e-6)
+    assert with_next.state.dtype == np.float32
+
+    conn = sqlite3.connect(db_path)
+    total, successes, avg = conn.execute(
+        "SELECT total_count, success_count, avg_reward FROM experience_stats"
+    ).fetchone()
+    conn.close()
+    assert (total, successes, avg) == (2, 1, pytest.approx(0.0))
+    assert get_experience_statistics()["by_module"]["marker"]["count"] == 1
+
+
+def test_load_experience_arrays_stacks_batch(db_path):
+    """The vectorized loader returns stacked arrays with a next-state mask."""
+    states = np.random.default_rng(0).random((50, 8))
+    log_experiences([
+        {"decision_type": "pipeline_optimization", "state": s, "action": i % 3,
+         "reward": float(i), "next_state": s if i % 2 else None, "done": i == 49}
+        for i, s in enumerate(states)
+    ])
+
+    batch = load_experience_arrays("pipeline_optimization", limit=100)
+    assert batch["states"].shape == (50, 8)
+    assert batch["has_next_state"].sum() == 25
+    assert np.isnan(batch["next_states"][~batch["has_next_state"]]).all()
+    order = np.argsort(batch["rewards"])
+    np.testing.assert_allclose(batch["states"][order], states, rtol=1e-6)
+    assert batch["dones"].sum() == 1
+    assert set(batch["actions"]) == {"0", "1", "2"}
+
+
+def test_writer_batches_in_background(db_path):
+    """Queued experiences are written by the background thread and on close."""
+    with ExperienceWriter(batch_size=10, flush_interval=60) as writer:
+        for i in range(25):
+            writer.append("error_handling", np.full(4, i), "retry", 1.0)
+        time.sleep(0.2)
+        assert writer.pending < 25
+    assert writer.written == 25
+    assert len(load_experiences("error_handling", limit=100)) == 25
+
+    log_experience("error_handling", np.zeros(6), "skip", 0.0)
+    with pytest.raises(ValueError):
+        load_experience_arrays("error_handling", limit=100)
+
+
+def test_experiences_without_state(db_path):
+    """Terminal or unknown states are stored with dimension 0."""
+    with ExperienceWriter(batch_size=10, flush_interval=60) as writer:
+        writer.append("error_handling", None, "escalate", -1.0, done=True)
+    log_experience("error_handling", None, "skip", 0.0)
+
+    experiences = load_experiences("error_handling")
+    assert len(experiences) == 2 and all(exp.state is None for exp in experiences)
+    assert load_experience_arrays("error_handling")["states"].shape == (2, 0)
+
+
+def test_json_rows_are_migrated(tmp_path, monkeypatch):
+    """Databases written with JSON text states are converted on open."""
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE experiences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,
+            decision_type TEXT NOT NULL, state TEXT NOT NULL, action TEXT NOT NULL,
+            reward REAL, next_state TEXT, done INTEGER DEFAULT 0, metadata TEXT,
+            module TEXT, task_type TEXT, outcome TEXT
+        )
+    """)
+    conn.execute(
+        "INSERT INTO experiences (timestamp, decision_type, state, action, reward, next_state) "
+        "VALUES ('2026-01-01T00:00:00', 'module_selection', ?, '\"marker\"', 1.0, 'null')",
+        (json.dumps([0.25, 0.5]),)
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(experience_collection, "EXPERIENCE_DB_PATH", path)
+    try:
+        batch = load_experience_arrays()
+        np.testing.assert_allclose(batch["states"], [[0.25, 0.5]])
+        assert not batch["has_next_state"][0]
+    finally:
+        close_experience_db()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,145 @@
+"""
+Tests for the Ollama client against a local stub server.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import asyncio
+import json
+import threading
+
+import pytest
+from aiohttp import web
+from granger_hub.rl.ollama_cache import OLLAMA_CACHE_PATH_ENV, OllamaResponseCache
+from granger_hub.rl.ollama_integration import OllamaClient, OllamaConfig
+
+
+class StubOllama:
+    """Minimal Ollama HTTP API served from a background thread."""
+
+    def __init__(self):
+        self.generate_calls = 0
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        ready = threading.Event()
+        threading.Thread(target=self._serve, args=(ready,), daemon=True).start()
+        ready.wait(5)
+
+    def _serve(self, ready):
+        asyncio.set_event_loop(self.loop)
+        app = web.Application()
+        app.router.add_get("/api/tags", self._tags)
+        app.router.add_post("/api/generate", self._generate)
+        self.runner = web.AppRunner(app)
+        self.loop.run_until_complete(self.runner.setup())
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        self.loop.run_until_complete(site.start())
+        self.port = site._server.sockets[0].getsockname()[1]
+        ready.set()
+        self.loop.run_forever()
+
+    async def _tags(self, request):
+        return web.json_response({"models": [{"name": "stub:latest"}]})
+
+    async def _generate(self, request):
+        self.generate_calls += 1
+        payload = await request.json()
+        await asyncio.sleep(0.05)
+        tokens = ['{"route": ', '["A", "B"], ', '"reasoning": "stub"}']
+        if not payload.get("stream"):
+            return web.json_response({"model": payload["model"], "response": "".join(tokens), "done": True})
+
+        response = web.StreamResponse()
+        await response.prepare(request)
+        for token in tokens:
+            await response.write((json.dumps({"response": token, "done": False}) + "\n").encode())
+        await response.write((json.dumps({"response": "", "done": True, "eval_count": 3}) + "\n").encode())
+        await response.write_eof()
+        return response
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result(5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+@pytest.fixture(scope="module")
+def stub():
+    server = StubOllama()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def client(stub, tmp_path):
+    config = OllamaConfig(port=stub.port, cache_path=tmp_path / "cache.db", retry_attempts=1)
+    client = OllamaClient(config)
+    yield client
+    client.close()
+
+
+def test_async_requests_are_coalesced_and_cached(client, stub):
+    """Identical concurrent prompts share one request; repeats hit the cache."""
+    async def run():
+        task = {"source": "A", "target": "B", "constraints": {}}
+        first = await asyncio.gather(*(client.agenerate_route_optimization(task) for _ in range(5)))
+        second = await client.agenerate_route_optimization(task)
+        await client.aclose()
+        return first, second
+
+    calls = stub.generate_calls
+    first, second = asyncio.run(run())
+
+    assert all(result["route"] == ["A", "B"] for result in first)
+    assert second == first[0]
+    assert stub.generate_calls - calls == 1
+    assert client.coalesced == 4
+    # The blocking path reads the same persistent cache
+    assert client.generate_route_optimization({"source": "A", "target": "B", "constraints": {}})["route"] == ["A", "B"]
+    assert stub.generate_calls - calls == 1
+
+
+def test_stream_tokens_then_cache(client, stub):
+    """Streaming yields tokens and caches the assembled response."""
+    async def collect():
+        chunks = [chunk async for chunk in client.astream("stream me", format="json")]
+        cached = [chunk async for chunk in client.astream("stream me", format="json")]
+        await client.aclose()
+        return chunks, cached
+
+    chunks, cached = asyncio.run(collect())
+    assert len(chunks) == 3
+    assert cached == ["".join(chunks)]
+
+
+def test_cache_ttl_and_size_eviction(tmp_path):
+    """Entries expire after the TTL and the least recently used are evicted."""
+    cache = OllamaResponseCache(tmp_path / "cache.db", ttl_seconds=60, max_entries=3)
+    for i in range(4):
+        cache.put(f"k{i}", "stub", {"response": str(i)})
+    assert cache.get("k0") is None
+    assert cache.get("k3") == {"response": "3"}
+
+    expired = OllamaResponseCache(tmp_path / "cache.db", ttl_seconds=0)
+    assert expired.get("k3") is None
+
+
+def test_response_cache_is_in_memory_unless_configured(stub, tmp_path, monkeypatch):
+    """Default clients write no cache file; the environment opts in."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv(OLLAMA_CACHE_PATH_ENV, raising=False)
+    OllamaClient(OllamaConfig(port=stub.port)).close()
+    assert list(tmp_path.iterdir()) == []
+
+    monkeypatch.setenv(OLLAMA_CACHE_PATH_ENV, str(tmp_path / "ollama.db"))
+    OllamaClient(OllamaConfig(port=stub.port)).close()
+    assert (tmp_path / "ollama.db").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
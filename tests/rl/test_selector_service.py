@@ -0,0 +1,119 @@
+"""
+Tests for the micro-batching module selector.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+from granger_hub.rl import hub_decisions
+from granger_hub.rl.selector_service import BatchingModuleSelector
+
+
+class RecordingSelector:
+    """Batch selection function that records the batches it receives."""
+
+    def __init__(self):
+        self.batches = []
+        self.threads = set()
+
+    def __call__(self, tasks, modules, contexts):
+        self.batches.append((len(tasks), tuple(modules)))
+        self.threads.add(threading.get_ident())
+        return [modules[task["i"] % len(modules)] for task in tasks]
+
+
+class LinUCB:
+    """LinUCB bandit scored one context at a time, like rl_commons' ContextualBandit."""
+
+    def __init__(self, n_arms, n_features, seed=0):
+        rng = np.random.default_rng(seed)
+        self.n_arms = n_arms
+        self.n_features = n_features
+        self.alpha = 0.5
+        self.A = [np.eye(n_features) + (x @ x.T) for x in rng.normal(size=(n_arms, n_features, 3))]
+        self.b = [rng.normal(size=n_features) for _ in range(n_arms)]
+        self.calls = 0
+
+    def select_action(self, state):
+        self.calls += 1
+        context = state.features
+        scores = []
+        for A, b in zip(self.A, self.b):
+            A_inv = np.linalg.inv(A)
+            scores.append(context @ A_inv @ b + self.alpha * np.sqrt(context @ A_inv @ context))
+        return hub_decisions.RLAction(action_type="select_arm", action_id=int(np.argmax(scores)))
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced():
+    """Concurrent selections share batches and get their own answers."""
+    select_fn = RecordingSelector()
+    selector = BatchingModuleSelector(max_batch_size=8, max_wait_ms=50, select_fn=select_fn)
+    modules = ["marker", "arangodb", "sparta"]
+
+    results = await asyncio.gather(*(selector.select({"i": i}, modules) for i in range(20)))
+
+    assert results == [modules[i % 3] for i in range(20)]
+    assert [size for size, _ in select_fn.batches] == [8, 8, 4]
+    stats = selector.get_stats()
+    assert stats["requests"] == 20 and stats["batches"] == 3
+    assert stats["latency"]["count"] == 20
+    assert threading.get_ident() not in select_fn.threads
+
+
+@pytest.mark.asyncio
+async def test_groups_by_module_list_and_propagates_errors():
+    """Different module lists are selected separately; failures reach callers."""
+    select_fn = RecordingSelector()
+    selector = BatchingModuleSelector(max_wait_ms=1, select_fn=select_fn)
+    first, second = await asyncio.gather(
+        selector.select({"i": 1}, ["a", "b"]),
+        selector.select({"i": 1}, ["c", "d", "e"])
+    )
+    assert (first, second) == ("b", "d")
+    assert sorted(select_fn.batches) == [(1, ("a", "b")), (1, ("c", "d", "e"))]
+
+    def failing(tasks, modules, contexts):
+        raise RuntimeError("agent unavailable")
+
+    selector.select_fn = failing
+    with pytest.raises(RuntimeError):
+        await selector.select({"i": 0}, ["a"])
+
+    selector.select_fn = lambda tasks, modules, contexts: modules[:1]
+    results = await asyncio.gather(*(selector.select({"i": i}, ["a", "b"]) for i in range(3)),
+                                   return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_batch_selection_matches_per_task_selection():
+    """The vectorized LinUCB pass picks the same arms as select_action per task."""
+    modules = ["marker", "arangodb", "sparta", "youtube"]
+    hub_decisions.configure_decision_journal(None)
+    hub_decisions.initialize_rl_agents(modules, reset=True)
+    bandit = LinUCB(len(modules), 20)
+    hub_decisions.publish_rl_agents({"module_selector": bandit})
+    tasks = [{"type": kind, "priority": priority, "data_size_mb": size}
+             for kind in ("extract", "store", "search", "transcribe")
+             for priority in ("low", "high") for size in (0.5, 50, 500)]
+
+    batched = hub_decisions.select_modules_with_rl(tasks, modules)
+    assert bandit.calls == 0
+
+    assert batched == [hub_decisions.select_module_with_rl(task, modules) for task in tasks]
+    assert len(set(batched)) > 1
+    hub_decisions.publish_rl_agents({name: None for name in hub_decisions.get_rl_agents()})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,76 @@
+"""
+Tests for batch RL state extraction.
+
+The batch functions must reproduce the per-task extractors exactly.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import numpy as np
+import pandas as pd
+import pytest
+from granger_hub.rl.state_extraction import (
+    _pipeline_profile,
+    extract_error_state,
+    extract_error_states,
+    extract_pipeline_state,
+    extract_pipeline_states,
+    extract_task_state,
+    extract_task_states
+)
+
+
+TASKS = [
+    {"type": "search", "description": "Find research papers on cyber security",
+     "data_size_mb": 15.5, "priority": "high", "requirements": ["a", "b", "c"]},
+    {"type": "Data-Extraction", "description": "Complex multi-page PDF", "real_time": True,
+     "priority": "CRITICAL", "complexity": 0.9},
+    {"type": "summarize", "data_size_mb": 250},
+    {}
+]
+
+
+def test_task_states_match_scalar():
+    """Lists and DataFrames give the same matrix as extract_task_state."""
+    expected = np.stack([extract_task_state(task) for task in TASKS])
+    batch = extract_task_states(TASKS)
+    assert batch.shape == (4, 20) and batch.dtype == np.float32
+    np.testing.assert_array_equal(batch, expected)
+    np.testing.assert_array_equal(extract_task_states(pd.DataFrame(TASKS)), expected)
+    assert extract_task_states([]).shape == (0, 20)
+
+
+def test_pipeline_states_match_scalar_and_cache():
+    """Pipeline features are cached per module sequence."""
+    pipelines = [["arxiv-mcp-server", "marker", "arangodb"], ["marker", "marker"], [], ["unknown"]]
+    constraints = [{"max_time_seconds": 120, "parallel_allowed": False}, None, {"max_cost": 4}, {}]
+    expected = np.stack([
+        extract_pipeline_state(p, t, c) for p, t, c in zip(pipelines, TASKS, constraints)
+    ])
+
+    _pipeline_profile.cache_clear()
+    batch = extract_pipeline_states(pipelines * 2, TASKS * 2, constraints * 2)
+    np.testing.assert_array_equal(batch, np.vstack([expected, expected]))
+    assert _pipeline_profile.cache_info().currsize == 4
+
+
+def test_error_states_match_scalar():
+    """Error type and module keyword matching agree with the scalar path."""
+    errors = [TimeoutError("slow"), ValueError("Validation failed"),
+              ConnectionError("refused"), KeyError("missing")]
+    contexts = [{"module": "arxiv-mcp-server", "retry_count": 2, "critical_path": True},
+                {"module": "claude_max_proxy", "time_elapsed": 900},
+                {"module": "ArangoDB", "queue_depth": 3, "partial_success": True},
+                {}]
+    expected = np.stack([extract_error_state(e, c) for e, c in zip(errors, contexts)])
+    np.testing.assert_array_equal(extract_error_states(errors, contexts), expected)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
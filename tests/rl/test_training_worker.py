@@ -0,0 +1,115 @@
+"""
+Tests for the background RL training worker.
+
+Uses small counting agents in place of the rl_commons agents so the
+snapshot and queueing behaviour can be checked deterministically.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+src_path = Path(__file__).parent.parent.parent / "src"
+if src_path.exists() and str(src_path) not in sys.path:
+    sys.path.insert(0, str(src_path))
+
+import numpy as np
+import pytest
+from granger_hub.rl import hub_decisions
+from granger_hub.rl.training_worker import TrainingWorker
+
+
+class CountingDQN:
+    """Stores experiences and reports a loss per training step."""
+
+    def __init__(self):
+        self.experiences = []
+        self.steps = 0
+
+    def store_experience(self, exp):
+        self.experiences.append(exp)
+
+    def can_train(self):
+        return len(self.experiences) >= 2
+
+    def train(self, batch_size):
+        self.steps += 1
+        return 0.5
+
+
+@pytest.fixture
+def serving_agent():
+    agent = CountingDQN()
+    previous = hub_decisions.get_rl_agents()
+    hub_decisions.configure_decision_journal(db_path=None)
+    hub_decisions.publish_rl_agents({'error_handler': agent})
+    yield agent
+    hub_decisions.attach_training_worker(None)
+    hub_decisions.publish_rl_agents(previous)
+
+
+def _log_errors(count):
+    return [hub_decisions._log_decision(decision_type="error_handling", state=np.zeros(4),
+                                        action="retry", action_idx=0) for _ in range(count)]
+
+
+def test_outcomes_train_a_private_copy_then_publish(serving_agent):
+    """Serving agents are untouched until a snapshot is published."""
+    worker = TrainingWorker(train_interval=0.0, publish_interval=3600).start()
+    ids = _log_errors(5)
+    assert hub_decisions.record_decision_outcomes(
+        [{"decision_id": i, "outcome": {"success": True}} for i in ids]
+    ) == 5
+    assert serving_agent.experiences == []
+
+    worker.stop()
+    published = hub_decisions.get_rl_agents()['error_handler']
+    assert published is not serving_agent
+    assert len(published.experiences) == 5 and published.steps >= 1
+
+    metrics = worker.get_metrics()
+    assert metrics['policy_version'] == 1
+    assert metrics['events_applied'] == 5 and metrics['events_since_snapshot'] == 0
+    assert metrics['last_losses'] == {'error_handler': 0.5}
+    assert hub_decisions.get_decision_journal().stats()['resolved'] == 5
+
+
+def test_replaced_agents_are_not_overwritten(serving_agent):
+    """A reset while the worker runs wins; its outcomes are replayed onto the new agents."""
+    worker = TrainingWorker(train_interval=0.0, publish_interval=3600).start()
+    hub_decisions.record_decision_outcomes([{"decision_id": i, "outcome": {}} for i in _log_errors(3)])
+    fresh = CountingDQN()
+    fresh.steps = 100
+    hub_decisions.publish_rl_agents({'error_handler': fresh})
+
+    worker.stop()
+    published = hub_decisions.get_rl_agents()['error_handler']
+    assert published is not fresh and published.steps > 100
+    assert len(published.experiences) == 3 and fresh.experiences == []
+    assert worker.get_metrics()['resyncs'] == 1
+    assert worker.get_metrics()['events_since_snapshot'] == 0
+
+    worker.start()
+    hub_decisions.record_decision_outcomes([{"decision_id": i, "outcome": {}} for i in _log_errors(2)])
+    worker.stop()
+    assert len(hub_decisions.get_rl_agents()['error_handler'].experiences) == 5
+
+
+def test_full_queue_drops_instead_of_blocking(serving_agent):
+    """Submitting never waits on training."""
+    worker = TrainingWorker(max_queue_size=2)
+    decision = {'decision_id': 'd', 'decision_type': 'error_handling', 'state': [0.0]}
+    results = [worker.submit(decision, {}) for _ in range(4)]
+    assert results == [True, True, False, False]
+    assert worker.get_metrics()['events_dropped'] == 2
+
+
+def test_inline_updates_without_worker(serving_agent):
+    """Without a worker, outcomes still update the serving agents directly."""
+    ids = _log_errors(2)
+    hub_decisions.record_decision_outcomes([{"decision_id": i, "outcome": {}} for i in ids])
+    assert len(serving_agent.experiences) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])